@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime
+from time import perf_counter
+from typing import Callable
+
+from quantum_aeon_fluxor.archon__supervisor_agent.history import BoundedHistory
 from quantum_aeon_fluxor.archon__supervisor_agent.state import ArchonState
 from quantum_aeon_fluxor.syzygy__conversational_framework import __display_name__ as SYZ_NAME  # noqa: F401
-from quantum_aeon_fluxor.syzygy__conversational_framework.bridge import compose_prompt
-from quantum_aeon_fluxor.hermetic_engine__persistent_data import (
-    episodic_log_interaction,
-    GeminiClient,
+from quantum_aeon_fluxor.syzygy__conversational_framework.bridge import compose_prompt_parts, select_mode
+from quantum_aeon_fluxor.syzygy__conversational_framework.context_budget import ContextBudget
+from quantum_aeon_fluxor.hermetic_engine__persistent_data import GeminiClient
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.emergent_chironomicon__coherent_vectors.memory_logger import (
+    log_interactions as episodic_log_interactions,
 )
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.write_behind import WriteBehindQueue
 from quantum_aeon_fluxor.utils.metrics import time_block, log_event, log_counter
+from quantum_aeon_fluxor.utils import tracing
 from quantum_aeon_fluxor.hermetic_engine__persistent_data.longterm import write_blob
 
 
@@ -30,146 +39,343 @@ class Archon:
         self.collection = "qaecore_longterm_v1"
         self.active_collections: list[str] = []  # when non-empty, use multi-collection
         self.retrieve_k: int = 3
+        self.retrieve_oversample: int = 1  # >1: fetch k*N candidates and rescore locally
+        self.hybrid_enabled: bool = False  # fuse dense hits with the local BM25 index (RRF)
+        self.semantic_cache_enabled: bool = True  # only effective when QAECORE_SEMANTIC_CACHE is set
         self.context_block_enabled: bool = True
+        # prompt size control: token budget across persona/template/context/history
+        self.budget = ContextBudget.from_env()
+        self.snippet_chars: int = 800  # per-hit cap before budgeting
+        self.prompt_history_turns: int = 10  # most recent turns offered to the budget
         self.collection_weights: dict[str, float] = {}
         self.retain_responses = False
         # conversational embedding settings
         self.autoembed_enabled = False
         self.conv_collection = "qaecore_conversations_v1"
-        self.history: list[tuple[str, str]] = []  # (speaker, text)
+        # (speaker, text); bounded, older turns spill to disk; turns leaving the prompt window
+        # fold into history.digest
+        self.history = BoundedHistory.from_env(
+            self.state.thread_id or "default", window=self.prompt_history_turns
+        )
         self.last_retrieval: list[tuple[float, dict, str]] = []
+        self._embed_target = None  # (embedder, client, collection) reused across auto-embeds
+        # durable background persistence of post-turn side effects (see _submit_persistence)
+        self.writer = WriteBehindQueue.from_env()
+        self.writer.register("episodic", self._write_episodic)
+        self.writer.register("blob", self._write_blobs)
+        self.writer.register("embed", self._write_embeddings)
+        self.writer.register("state", self._write_state, coalesce=True)
+        self.writer.start()
+
+    def _turn_points(self, turns: list[tuple[str, str]]) -> tuple[list[str], list[str], list[dict]]:
+        """Point ids, texts and payloads for embedding turns into the conv collection"""
+        from quantum_aeon_fluxor.utils.hash import chunk_uuid
+        from pathlib import Path
+        texts = []
+        payloads = []
+        ids = []
+        sess = self.state.thread_id or "default"
+        base = Path(f"session:{sess}")
+        # note: historical variable removed; index derived from enumerate
+        # include their index relative to current history length
+        for idx, (speaker, text) in enumerate(turns):
+            texts.append(text)
+            pid = chunk_uuid(base, idx, f"{speaker}:{text}")
+            ids.append(pid)
+            payloads.append({
+                "session": sess,
+                "role": speaker,
+                "turn_index": idx,
+                "focus_topic": self.state.focus_topic,
+                "text": text[:1000],
+            })
+        return ids, texts, payloads
+
+    def _embed_points(self, collection: str, ids: list[str], texts: list[str], payloads: list[dict]) -> None:
+        """Embed texts in one request and upsert them; the embedder and client are reused."""
+        from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import (
+            client_for, ensure_collection, upsert_chunks,
+        )
+        if self._embed_target is None or self._embed_target[2] != collection:
+            from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.gemini_embedder import GeminiEmbedder
+            embedder = GeminiEmbedder()
+            client = client_for(collection)
+            ensure_collection(client, collection, embedder.dim)
+            self._embed_target = (embedder, client, collection)
+        embedder, client, _ = self._embed_target
+        vecs = embedder.embed_texts(texts)
+        upsert_chunks(client, collection, vecs, payloads, ids=ids)
 
     def _embed_turns(self, turns: list[tuple[str, str]]):
         """Embed given turns into Qdrant conv collection with metadata"""
         try:
-            from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.gemini_embedder import GeminiEmbedder
-            from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import (
-                get_qdrant_client, ensure_collection, upsert_chunks,
-            )
-            from quantum_aeon_fluxor.utils.hash import chunk_uuid
-            from pathlib import Path
-            # prepare
-            embedder = GeminiEmbedder()
-            client = get_qdrant_client()
-            ensure_collection(client, self.conv_collection, embedder.dim)
-            # build payloads
-            texts = []
-            payloads = []
-            ids = []
-            sess = self.state.thread_id or "default"
-            base = Path(f"session:{sess}")
-            # note: historical variable removed; index derived from enumerate
-            # include their index relative to current history length
-            for idx, (speaker, text) in enumerate(turns):
-                texts.append(text)
-                pid = chunk_uuid(base, idx, f"{speaker}:{text}")
-                ids.append(pid)
-                payloads.append({
-                    "session": sess,
-                    "role": speaker,
-                    "turn_index": idx,
-                    "focus_topic": self.state.focus_topic,
-                    "text": text[:1000],
-                })
-            vecs = embedder.embed_texts(texts)
-            upsert_chunks(client, self.conv_collection, vecs, payloads, ids=ids)
+            ids, texts, payloads = self._turn_points(turns)
+            self._embed_points(self.conv_collection, ids, texts, payloads)
             print(f"[Embedded] {len(texts)} turns into collection={self.conv_collection}")
         except Exception as e:
             print(f"[Embed error] {e}")
 
-    def run_turn(self, user_input: str, *, depth_level: str = "intermediate", retain: bool | None = None) -> str:
+    def run_turn(
+        self,
+        user_input: str,
+        *,
+        depth_level: str = "intermediate",
+        retain: bool | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+    ) -> str:
+        """Run one conversational turn and return the full response text.
+
+        Synchronous wrapper around `arun_turn` (use that directly inside an event loop).
+        With `on_chunk`, the model response is streamed: each text chunk is passed to the
+        callback as it arrives, while the accumulated text is logged, kept in history and
+        persisted exactly as in the blocking path.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.arun_turn(user_input, depth_level=depth_level, retain=retain, on_chunk=on_chunk))
+        raise RuntimeError("run_turn() called from a running event loop; use `await archon.arun_turn(...)`")
+
+    async def arun_turn(
+        self,
+        user_input: str,
+        *,
+        depth_level: str = "intermediate",
+        retain: bool | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+    ) -> str:
+        """Async turn: retrieval and mode selection run concurrently, the model is queried as
+        soon as the prompt is composed, and persistence (episodic log, blob, auto-embed, state
+        save) is queued to a background worker so it never delays the answer.
+
+        Emits a `turn_breakdown` event on the `archon` stream with the critical-path timings.
+        The turn is traced as root span `archon.turn` (see `utils/tracing.py` and `:trace`).
+        """
         # Commands (prefixed by ':')
         if user_input.startswith(":"):
             return self._handle_command(user_input)
+        with tracing.span("archon.turn", root=True, chars=len(user_input), streamed=on_chunk is not None):
+            return await self._turn(user_input, depth_level, retain, on_chunk)
 
-        # Optionally fetch retrieval context
-        retrieval_note = ""
-        if self.retrieval_enabled:
-            from time import perf_counter
-            t0 = perf_counter()
-            try:
-                from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.search_text import search_text
-                collections = self.active_collections if self.active_collections else [self.collection]
-                print(f"[Retrieval] collections={collections} k={self.retrieve_k}")
-                merged: list[tuple[float, dict, str]] = []
-                for coll in collections:
-                    try:
-                        hits = search_text(user_input, collection=coll, k=self.retrieve_k)
-                        w = self.collection_weights.get(coll, 1.0)
-                        for score, payload in hits:
-                            merged.append((score * w, payload, coll))
-                    except Exception as e:
-                        log_event("archon", "retrieval_error", collection=coll, error=str(e))
-                        print(f"[Retrieval warn] collection={coll} error={e}")
-                merged.sort(key=lambda x: x[0], reverse=True)
-                top = merged[: self.retrieve_k]
-                self.last_retrieval = top
-                log_event("archon", "retrieval_done", collections=collections, total_candidates=len(merged), top_k=len(top))
-                if top and self.context_block_enabled:
-                    ctx_lines = []
-                    for score, payload, coll in top:
-                        path = payload.get("rel_path") or payload.get("path")
-                        snippet = (payload.get("text") or "").replace("\n", " ")
-                        if len(snippet) > 240:
-                            snippet = snippet[:240] + "…"
-                        ctx_lines.append(f"- [{score:.3f}] ({coll}) {path} :: {snippet}")
-                    retrieval_note = ("\n\n=== Context ===\n"
-                                    + f"Sources: {', '.join(collections)} | k={self.retrieve_k}\n"
-                                    + "\n".join(ctx_lines)
-                                    + "\n=== End Context ===")
-            except Exception as e:
-                retrieval_note = f"\n\n(Context retrieval unavailable: {e})"
-                log_event("archon", "retrieval_fatal", error=str(e))
-            finally:
-                from time import perf_counter as _pc
-                dur_ms = (_pc() - t0) * 1000
-                log_event("archon", "retrieval_latency", duration_ms=round(dur_ms,2))
-
-        # Compose prompt using Syzygy bridge
-        composed_input = user_input + retrieval_note
-        # Prepare a brief history window for mode selection
+    async def _turn(
+        self, user_input: str, depth_level: str, retain: bool | None, on_chunk: Callable[[str], None] | None
+    ) -> str:
+        t0 = perf_counter()
+        # Snapshot what the preparation stages read, so they can run off the caller's thread
         history_texts = [t for _, t in self.history[-6:]]
+        recent_turns = list(self.history[-self.prompt_history_turns:]) if self.prompt_history_turns > 0 else []
+        forced_mode = getattr(self, "forced_mode", None)
+
+        retrieval_task = asyncio.create_task(self._timed("archon.retrieve", self._retrieve_context, user_input))
+        mode_task = asyncio.create_task(self._timed("archon.select_mode", self._select_mode, user_input, history_texts, forced_mode))
+        ((ctx_header, ctx_items, retrieval_note), retrieval_ms), (mode, mode_ms) = await asyncio.gather(
+            retrieval_task, mode_task
+        )
+        prep_ms = (perf_counter() - t0) * 1000
+
+        # Compose prompt using Syzygy bridge, fitted to the token budget
+        t1 = perf_counter()
         dl = getattr(self, "forced_depth", None) or depth_level
         with time_block("archon", "compose_prompt"):
-            prompt = compose_prompt(
-                composed_input,
+            prefix, prompt, alloc = compose_prompt_parts(
+                user_input + retrieval_note,
+                context=ctx_items,
+                context_header=ctx_header,
+                history=recent_turns,
+                digest=self.history.digest,
                 focus_topic=self.state.focus_topic,
                 depth_level=dl,
-                recent_history=history_texts,
-                forced_mode=getattr(self, "forced_mode", None),
+                forced_mode=mode,
+                budget=self.budget,
             )
+        compose_ms = (perf_counter() - t1) * 1000
+        log_event("archon", "prompt_budget", budget=self.budget.total, **alloc.as_fields())
 
         # Query Gemini
-        with time_block("archon", "model_query"):
-            response_text = self.client.query(prompt)
+        t2 = perf_counter()
+        response_text = await asyncio.to_thread(self._query_model, prompt, user_input, on_chunk, prefix)
+        model_ms = (perf_counter() - t2) * 1000
         log_counter("archon", "turn_completed", value=1)
 
-        # Log transcript and update in-memory history
-        episodic_log_interaction("Volkh", user_input)
-        episodic_log_interaction("Archon", response_text)
+        # In-memory updates the next turn depends on happen now; disk/network writes are queued
         self.history.append(("Volkh", user_input))
         self.history.append(("Archon", response_text))
-
-        # Optional retention (opaque blob)
-        effective_retain = self.retain_responses if retain is None else retain
-        if effective_retain:
-            write_blob(response_text, tags=["archon", "response", self.state.phase])
-
-        # Auto-embed last Archon response (and/or last turn) if enabled
-        if self.autoembed_enabled:
-            self._embed_turns(self.history[-2:])  # last user+archon
-
-        # Update state (simple heuristic placeholder)
         if not self.state.focus_topic and len(user_input) > 0:
             self.state.focus_topic = user_input[:96]
         if "contradiction" in response_text.lower():
             self.state.flag_contradiction("Model mentioned contradiction in latest turn")
-        with time_block("archon", "state_save"):
-            self.state.save()
-        log_event("archon", "turn_persisted", focus_topic=self.state.focus_topic, insights=len(self.state.insight_candidates))
+        effective_retain = self.retain_responses if retain is None else retain
+        self._submit_persistence(user_input, response_text, effective_retain)
+
+        total_ms = (perf_counter() - t0) * 1000
+        log_event(
+            "archon",
+            "turn_breakdown",
+            retrieval_ms=round(retrieval_ms, 2),
+            mode_select_ms=round(mode_ms, 2),
+            prepare_ms=round(prep_ms, 2),
+            overlap_saved_ms=round(max(0.0, retrieval_ms + mode_ms - prep_ms), 2),
+            compose_ms=round(compose_ms, 2),
+            model_ms=round(model_ms, 2),
+            critical_path_ms=round(total_ms, 2),
+            streamed=on_chunk is not None,
+        )
         return response_text
 
+    @staticmethod
+    async def _timed(name: str, fn: Callable, *args) -> tuple:
+        """Run a blocking stage in a worker thread as span `name`; returns (result, duration_ms)."""
+        t0 = perf_counter()
+        with tracing.span(name):
+            result = await asyncio.to_thread(fn, *args)
+        return result, (perf_counter() - t0) * 1000
+
+    def _retrieve_context(self, user_input: str) -> tuple[str, list[tuple[float, str]], str]:
+        """Fetch retrieval context across the active collections.
+
+        Returns (context header, [(score, line)] for the budgeted context block, note); the
+        note carries a retrieval failure message for the prompt, otherwise it is empty.
+        """
+        header, items, retrieval_note = "", [], ""
+        if not self.retrieval_enabled:
+            return header, items, retrieval_note
+        t0 = perf_counter()
+        try:
+            from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.search_text import search_text
+            collections = self.active_collections if self.active_collections else [self.collection]
+            print(f"[Retrieval] collections={collections} k={self.retrieve_k}")
+            merged: list[tuple[float, dict, str]] = []
+            for coll in collections:
+                try:
+                    hits = search_text(
+                        user_input, collection=coll, k=self.retrieve_k, oversample=self.retrieve_oversample, hybrid=self.hybrid_enabled
+                    )
+                    w = self.collection_weights.get(coll, 1.0)
+                    for score, payload in hits:
+                        merged.append((score * w, payload, coll))
+                except Exception as e:
+                    log_event("archon", "retrieval_error", collection=coll, error=str(e))
+                    print(f"[Retrieval warn] collection={coll} error={e}")
+            merged.sort(key=lambda x: x[0], reverse=True)
+            top = merged[: self.retrieve_k]
+            self.last_retrieval = top
+            log_event("archon", "retrieval_done", collections=collections, total_candidates=len(merged), top_k=len(top))
+            if top and self.context_block_enabled:
+                for score, payload, coll in top:
+                    path = payload.get("rel_path") or payload.get("path")
+                    snippet = (payload.get("text") or "").replace("\n", " ")
+                    if len(snippet) > self.snippet_chars:
+                        snippet = snippet[:self.snippet_chars] + "…"
+                    items.append((score, f"- [{score:.3f}] ({coll}) {path} :: {snippet}"))
+                header = f"Sources: {', '.join(collections)} | k={self.retrieve_k}\n"
+        except Exception as e:
+            retrieval_note = f"\n\n(Context retrieval unavailable: {e})"
+            log_event("archon", "retrieval_fatal", error=str(e))
+        finally:
+            dur_ms = (perf_counter() - t0) * 1000
+            log_event("archon", "retrieval_latency", duration_ms=round(dur_ms,2))
+        return header, items, retrieval_note
+
+    @staticmethod
+    def _select_mode(user_input: str, history_texts: list[str], forced_mode: str | None) -> str | None:
+        """Pick the QAeMode name for this turn from the user's input and recent history."""
+        if forced_mode:
+            return forced_mode
+        try:
+            return select_mode(user_input, history_texts).name
+        except Exception as e:
+            log_event("archon", "mode_select_error", error=str(e))
+            return None  # compose_prompt falls back to its own selection
+
+    def _query_model(
+        self, prompt: str, user_input: str, on_chunk: Callable[[str], None] | None, prefix: str | None = None
+    ) -> str:
+        """Query the model with the per-turn `prompt` after the stable `prefix` (context-cached when enabled)."""
+        if on_chunk is not None:
+            return self._stream_response(prompt, user_input, on_chunk, prefix)
+        with time_block("archon", "model_query"):
+            return self.client.query(
+                prompt, prefix=prefix, semantic_text=user_input, bypass_cache=not self.semantic_cache_enabled
+            )
+
+    def _submit_persistence(self, user_input: str, response_text: str, retain: bool) -> None:
+        """Hand the post-response writes to the write-behind queue (spooled, delivered in order)."""
+        ts = datetime.now().isoformat()
+        self.writer.enqueue("episodic", ts=ts, speaker="Volkh", text=user_input)
+        self.writer.enqueue("episodic", ts=ts, speaker="Archon", text=response_text)
+        if retain:
+            self.writer.enqueue("blob", text=response_text, tags=["archon", "response", self.state.phase])
+        if self.autoembed_enabled:
+            ids, texts, payloads = self._turn_points(self.history[-2:])  # last user+archon
+            self.writer.enqueue("embed", collection=self.conv_collection, ids=ids, texts=texts, payloads=payloads)
+        # serialized now: the next turn may mutate self.state before the write happens
+        self.writer.enqueue("state", data=self.state.model_dump(mode="json"))
+
+    # --- write-behind handlers (background thread; each receives a batch of args, in order) ---
+
+    def _write_episodic(self, batch: list[dict]) -> None:
+        episodic_log_interactions((a["ts"], a["speaker"], a["text"]) for a in batch)
+
+    def _write_blobs(self, batch: list[dict]) -> None:
+        for a in batch:
+            write_blob(a["text"], tags=a["tags"])
+
+    def _write_embeddings(self, batch: list[dict]) -> None:
+        by_coll: dict[str, tuple[list, list, list]] = {}
+        for a in batch:
+            ids, texts, payloads = by_coll.setdefault(a["collection"], ([], [], []))
+            ids.extend(a["ids"])
+            texts.extend(a["texts"])
+            payloads.extend(a["payloads"])
+        for coll, (ids, texts, payloads) in by_coll.items():
+            with time_block("archon", "autoembed", collection=coll, turns=len(texts)):
+                self._embed_points(coll, ids, texts, payloads)
+
+    def _write_state(self, batch: list[dict]) -> None:
+        state = ArchonState.model_validate(batch[-1]["data"])
+        with time_block("archon", "state_save"):
+            state.save()
+        log_event("archon", "turn_persisted", focus_topic=state.focus_topic, insights=len(state.insight_candidates))
+
+    def flush_persistence(self, timeout: float | None = None) -> None:
+        """Block until queued post-turn writes have been delivered (also runs at exit)."""
+        self.writer.flush(timeout)
+
+    def _stream_response(
+        self, prompt: str, user_input: str, on_chunk: Callable[[str], None], prefix: str | None = None
+    ) -> str:
+        """Stream the model response to `on_chunk`; returns the accumulated text."""
+        parts: list[str] = []
+        ttft_ms = None
+        t0 = perf_counter()
+        with time_block("archon", "model_query", streaming=True):
+            for piece in self.client.query_stream(
+                prompt, prefix=prefix, semantic_text=user_input, bypass_cache=not self.semantic_cache_enabled
+            ):
+                if ttft_ms is None:
+                    ttft_ms = (perf_counter() - t0) * 1000
+                parts.append(piece)
+                try:
+                    on_chunk(piece)
+                except Exception as e:  # a broken display must not lose the response
+                    log_event("archon", "stream_callback_error", error=str(e))
+        dur_ms = (perf_counter() - t0) * 1000
+        text = "".join(parts)
+        gen_s = max(1e-6, (dur_ms - (ttft_ms or 0.0)) / 1000)
+        log_event(
+            "archon",
+            "model_stream",
+            ttft_ms=round(ttft_ms, 2) if ttft_ms is not None else None,
+            duration_ms=round(dur_ms, 2),
+            chunks=len(parts),
+            chars=len(text),
+            tokens_per_s=round((len(text) / 4) / gen_s, 2),  # ~4 chars per token
+        )
+        return text
+
     def _handle_command(self, cmd: str) -> str:
+        # commands may save state themselves; let queued turn writes land first
+        self.flush_persistence()
         parts = cmd.strip().split()
         if not parts:
             return "Empty command"
@@ -215,6 +421,26 @@ class Archon:
                 return f"k={self.retrieve_k}"
             self.retrieve_k = max(1, int(parts[1]))
             return f"k set to {self.retrieve_k}"
+        if head in (":oversample", ":os"):
+            if len(parts) == 1 or not parts[1].isdigit():
+                return f"oversample={self.retrieve_oversample}"
+            self.retrieve_oversample = max(1, int(parts[1]))
+            return f"oversample set to {self.retrieve_oversample} (candidates per collection = k*{self.retrieve_oversample})"
+        if head in (":hybrid", ":hy"):
+            if len(parts) == 1:
+                return f"hybrid={'on' if self.hybrid_enabled else 'off'}"
+            self.hybrid_enabled = _bool(parts[1])
+            return f"hybrid set to {'on' if self.hybrid_enabled else 'off'}"
+        if head in (":semcache", ":sc"):
+            configured = getattr(self.client, "semantic_cache", None) is not None
+            if len(parts) == 1:
+                state = "on" if self.semantic_cache_enabled else "off"
+                return f"semcache={state} configured={'yes' if configured else 'no (set QAECORE_SEMANTIC_CACHE=1)'}"
+            if parts[1].lower() == "clear" and configured:
+                self.client.semantic_cache.clear()
+                return "semcache cleared"
+            self.semantic_cache_enabled = _bool(parts[1])
+            return f"semcache set to {'on' if self.semantic_cache_enabled else 'off'}"
         if head in (":context", ":ctx"):
             if len(parts) == 1:
                 return f"context_block={'on' if self.context_block_enabled else 'off'}"
@@ -286,6 +512,12 @@ class Archon:
                 return "Usage: :session <id>"
             self.state.thread_id = sess[:100]
             self.state.save()
+            # the old session's evictions/digest finish under its own id; the new one starts
+            # from its own digest (if it has been used before) with no in-memory turns
+            self.history.close()
+            self.history = BoundedHistory.from_env(
+                self.state.thread_id, window=self.prompt_history_turns
+            )
             return f"session set to {self.state.thread_id!r}"
         if head in (":autoembed", ":ae"):
             if len(parts) == 1:
@@ -318,7 +550,9 @@ class Archon:
                 merged = []
                 for coll in coll_list:
                     try:
-                        hits = search_text(query, collection=coll, k=self.retrieve_k)
+                        hits = search_text(
+                            query, collection=coll, k=self.retrieve_k, oversample=self.retrieve_oversample, hybrid=self.hybrid_enabled
+                        )
                         for score, payload in hits:
                             merged.append((score, payload, coll))
                     except Exception as e:
@@ -333,6 +567,12 @@ class Archon:
                 return "\n".join(lines)
             except Exception as e:
                 return f"Search error: {e}"
+        if head in (":trace", ":tr"):
+            traces = tracing.recent_traces()
+            if not traces:
+                return "No traced turn yet."
+            n = int(parts[1]) if len(parts) >= 2 and parts[1].isdigit() else 1
+            return "\n\n".join(tracing.format_waterfall(t) for t in traces[-max(1, n):])
         if head in (":expand", ":x"):
             if len(parts) < 2 or not parts[1].isdigit():
                 return "Usage: :expand <n>"
@@ -345,4 +585,4 @@ class Archon:
                 return json.dumps({"score": score, "collection": coll, "payload": payload}, indent=2)
             except Exception as e:
                 return f"Expand error: {e}"
-        return "Unknown command. Available: :retain, :retrieval, :collection, :collections, :k, :context, :weights, :state, :focus, :insight, :search, :expand"
+        return "Unknown command. Available: :retain, :retrieval, :collection, :collections, :k, :oversample, :hybrid, :semcache, :context, :weights, :state, :focus, :insight, :search, :expand, :trace"
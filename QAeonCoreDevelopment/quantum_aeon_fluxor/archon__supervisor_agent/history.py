@@ -0,0 +1,238 @@
+"""Bounded conversation history with a rolling extractive digest.
+
+`BoundedHistory` behaves like the `list[(speaker, text)]` Archon used to keep (append,
+len, iteration, indexing and slicing over the in-memory turns) but holds at most
+`max_turns` turns. Older turns are evicted in chunks, appended to a per-session spill file
+and folded into a running digest on a background thread, so memory per session stays
+constant while long-range context survives as a fixed-size summary. With `window` set (the
+number of recent turns a prompt shows), turns are folded as soon as they leave that window
+rather than on eviction, so every turn is either in the prompt or in the digest.
+
+The default summarizer is extractive: sentences of the previous digest and the evicted
+turns are scored by the session-wide frequency of their content words, and the best ones
+are kept, in conversation order, up to `digest_tokens`. A custom `summarize(digest, turns)`
+callable (e.g. a cheap model) can be passed instead; its output is still cut to budget.
+
+Config (env):
+    QAECORE_HISTORY_MAX_TURNS      turns kept in memory (default 40)
+    QAECORE_HISTORY_DIGEST_TOKENS  digest size (default 300)
+    QAECORE_HISTORY_DIR            spill/digest directory (default ./.archon_history)
+"""
+from __future__ import annotations
+from collections import Counter
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Iterator, List, Optional, Tuple
+import json
+import os
+import re
+import threading
+
+from quantum_aeon_fluxor.syzygy__conversational_framework.context_budget import estimate_tokens, truncate_to_tokens
+from quantum_aeon_fluxor.utils.metrics import log_event
+
+MAX_TURNS_ENV = "QAECORE_HISTORY_MAX_TURNS"
+DIGEST_TOKENS_ENV = "QAECORE_HISTORY_DIGEST_TOKENS"
+DIR_ENV = "QAECORE_HISTORY_DIR"
+DEFAULT_MAX_TURNS = 40
+DEFAULT_DIGEST_TOKENS = 300
+MAX_VOCAB = 20000  # word-frequency table is pruned to its most common half beyond this
+
+Turn = Tuple[str, str]
+Summarizer = Callable[[str, List[Turn]], str]
+
+_SENT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD_RE = re.compile(r"[a-zA-Z][a-zA-Z'-]{2,}")
+_STOP = frozenset(
+    "the and for are but not you your with this that have from they will would there their what when "
+    "which about into than then them these those been were was can could should its it's our out all "
+    "any how who why also just more most some such very does did has had one may might".split()
+)
+
+
+def _sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENT_RE.split(text) if len(s.strip()) > 3]
+
+
+def _content_words(text: str) -> List[str]:
+    return [w for w in (m.group(0).lower() for m in _WORD_RE.finditer(text)) if w not in _STOP]
+
+
+def extractive_digest(previous: str, turns: List[Turn], max_tokens: int, weights: Optional[Counter] = None) -> str:
+    """Fold `turns` into `previous`, keeping the highest-scoring sentences within `max_tokens`.
+
+    A sentence scores the mean frequency (in `weights`, default: the candidate text itself)
+    of its content words; ties favour later sentences. Kept sentences stay in order.
+    """
+    candidates = _sentences(previous) + [f"{speaker}: {s}" for speaker, text in turns for s in _sentences(text)]
+    if not candidates:
+        return previous
+    if weights is None:
+        weights = Counter(w for c in candidates for w in _content_words(c))
+    scored = []
+    for i, sent in enumerate(candidates):
+        words = _content_words(sent)
+        score = sum(weights[w] for w in words) / (len(words) + 1) if words else 0.0
+        scored.append((score, i, sent))
+    keep: List[Tuple[int, str]] = []
+    used = 0
+    for score, i, sent in sorted(scored, key=lambda x: (x[0], x[1]), reverse=True):
+        cost = estimate_tokens(sent)
+        if used + cost > max_tokens:
+            continue
+        keep.append((i, sent))
+        used += cost
+    return " ".join(sent for _, sent in sorted(keep))
+
+
+class BoundedHistory(Sequence):
+    def __init__(
+        self,
+        session: str = "default",
+        *,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        digest_tokens: int = DEFAULT_DIGEST_TOKENS,
+        path: Optional[Path] = None,
+        summarize: Optional[Summarizer] = None,
+        window: Optional[int] = None,
+    ):
+        self.session = re.sub(r"[^\w.-]", "_", session or "default")
+        self.max_turns = max(2, max_turns)
+        self.digest_tokens = digest_tokens
+        self.dir = Path(path) if path else Path.cwd() / ".archon_history"
+        self.spill_file = self.dir / f"{self.session}.jsonl"
+        self.digest_file = self.dir / f"{self.session}.digest.txt"
+        self.summarize = summarize
+        self.window = None if window is None else max(0, window)
+        self._turns: List[Turn] = []
+        self._spilled = 0
+        self._folded = 0  # turns (from the start of the session) already folded into the digest
+        self._digest = ""
+        self._weights: Counter = Counter()  # content-word frequencies over the session
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        try:
+            self._digest = self.digest_file.read_text(encoding="utf-8")
+        except (FileNotFoundError, OSError):
+            pass
+
+    @classmethod
+    def from_env(
+        cls,
+        session: str = "default",
+        summarize: Optional[Summarizer] = None,
+        window: Optional[int] = None,
+    ) -> "BoundedHistory":
+        path = os.getenv(DIR_ENV)
+        return cls(
+            session,
+            max_turns=int(os.getenv(MAX_TURNS_ENV, DEFAULT_MAX_TURNS)),
+            digest_tokens=int(os.getenv(DIGEST_TOKENS_ENV, DEFAULT_DIGEST_TOKENS)),
+            path=Path(path).expanduser() if path else None,
+            summarize=summarize,
+            window=window,
+        )
+
+    # --- list-compatible view over the in-memory turns ---
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def __getitem__(self, idx):
+        return self._turns[idx]
+
+    def __iter__(self) -> Iterator[Turn]:
+        return iter(list(self._turns))
+
+    def __repr__(self) -> str:
+        return f"BoundedHistory(session={self.session!r}, turns={len(self._turns)}, spilled={self._spilled})"
+
+    @property
+    def total_turns(self) -> int:
+        """Turns seen this session, including those spilled to disk."""
+        return self._spilled + len(self._turns)
+
+    @property
+    def digest(self) -> str:
+        """Running summary of the folded turns (empty until the first fold)."""
+        return self._digest
+
+    def append(self, turn: Turn) -> None:
+        self._turns.append(turn)
+        self._weights.update(_content_words(turn[1]))
+        if len(self._weights) > MAX_VOCAB:
+            self._weights = Counter(dict(self._weights.most_common(MAX_VOCAB // 2)))
+        fold: List[Turn] = []
+        if self.window is not None and self.total_turns - self._folded > self.window:
+            # turns that just left the prompt window go into the digest right away
+            start = self._folded - self._spilled
+            fold = self._turns[start:len(self._turns) - self.window]
+            self._folded += len(fold)
+        evicted: List[Turn] = []
+        if len(self._turns) > self.max_turns:
+            # evict the oldest quarter at once so summarization runs in chunks, not per turn
+            n = max(1, self.max_turns // 4)
+            evicted, self._turns = self._turns[:n], self._turns[n:]
+            self._spilled += n
+            if self._folded < self._spilled:  # no window, or one wider than max_turns
+                fold = fold + evicted[len(evicted) - (self._spilled - self._folded):]
+                self._folded = self._spilled
+        if evicted or fold:
+            self._submit(evicted, fold)
+
+    def extend(self, turns) -> None:
+        for t in turns:
+            self.append(t)
+
+    # --- background spill + digest ---
+
+    def _submit(self, evicted: List[Turn], fold: List[Turn]) -> None:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archon-history")
+        weights = Counter(self._weights)
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(self._pool.submit(self._fold, evicted, fold, weights))
+
+    def _fold(self, evicted: List[Turn], fold: List[Turn], weights: Counter) -> None:
+        """Spill `evicted` to disk and fold `fold` into the digest (background thread)."""
+        t0 = perf_counter()
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            if evicted:
+                with self.spill_file.open("a", encoding="utf-8") as f:
+                    for speaker, text in evicted:
+                        f.write(json.dumps({"speaker": speaker, "text": text}, ensure_ascii=False) + "\n")
+            if not fold:
+                return
+            with self._lock:
+                previous = self._digest
+            if self.summarize is not None:
+                digest = truncate_to_tokens(self.summarize(previous, fold), self.digest_tokens)
+            else:
+                digest = extractive_digest(previous, fold, self.digest_tokens, weights)
+            with self._lock:
+                self._digest = digest
+            self.digest_file.write_text(digest, encoding="utf-8")
+            log_event(
+                "archon", "history_digest", session=self.session, folded=len(fold), evicted=len(evicted),
+                spilled=self._spilled, digest_tokens=estimate_tokens(digest),
+                duration_ms=round((perf_counter() - t0) * 1000, 2),
+            )
+        except Exception as e:
+            log_event("archon", "history_digest_error", session=self.session, error=str(e))
+
+    def flush(self) -> None:
+        """Wait for pending spills/digest updates."""
+        pending, self._pending = self._pending, []
+        for f in pending:
+            f.result()
+
+    def close(self) -> None:
+        """Finish pending spills/digest updates and stop the background worker."""
+        self.flush()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
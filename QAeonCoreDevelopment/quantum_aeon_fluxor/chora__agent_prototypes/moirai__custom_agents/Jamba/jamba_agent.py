@@ -86,7 +86,7 @@ class JambaAgent(BaseAgent):
 
                 # Convert chat history to the format expected by the API
                 api_messages = []
-                for msg in self.chat_history:
+                for msg in self.history_window():  # recent exchanges within the token budget
                     if msg.get("user"):
                         api_messages.append(UserMessage(content=msg["user"]))
                     if msg.get("bot"):
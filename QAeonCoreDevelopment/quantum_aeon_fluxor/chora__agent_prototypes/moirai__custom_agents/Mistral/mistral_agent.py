@@ -79,7 +79,7 @@ class MistralAgent(BaseAgent):
                 self.add_to_history(user_input, None)
 
                 api_messages = []
-                for msg in self.chat_history:
+                for msg in self.history_window():  # recent exchanges within the token budget
                     if msg.get("user"):
                         api_messages.append(UserMessage(content=msg["user"]))
                     if msg.get("bot"):
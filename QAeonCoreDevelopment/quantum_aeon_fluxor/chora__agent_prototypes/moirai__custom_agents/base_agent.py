@@ -3,6 +3,15 @@ import os
 import re
 from pathlib import Path
 
+try:
+    from quantum_aeon_fluxor.syzygy__conversational_framework.context_budget import estimate_tokens
+except ImportError:  # agents can also run as standalone scripts outside the package
+    def estimate_tokens(text):
+        return len(text) // 4 + 1
+
+# Token budget for the history sent with each request (QAECORE_AGENT_HISTORY_TOKENS)
+DEFAULT_HISTORY_TOKENS = 4000
+
 class BaseAgent:
     def __init__(self, agent_name):
         # Sanitize agent_name to remove invalid filename characters
@@ -47,3 +56,22 @@ class BaseAgent:
         if user_message is not None:
             self.chat_history.append({"user": user_message, "bot": bot_response})
             self.save_chat_history()
+
+    def history_window(self, max_tokens=None):
+        """Most recent exchanges that fit the history token budget (oldest first).
+
+        The latest exchange is always included; older ones are dropped once the budget
+        (QAECORE_AGENT_HISTORY_TOKENS, default 4000) is spent. The full history stays on disk.
+        """
+        if max_tokens is None:
+            max_tokens = int(os.getenv("QAECORE_AGENT_HISTORY_TOKENS", DEFAULT_HISTORY_TOKENS))
+        window = []
+        used = 0
+        for msg in reversed(self.chat_history):
+            cost = estimate_tokens(msg.get("user") or "") + estimate_tokens(msg.get("bot") or "")
+            if window and used + cost > max_tokens:
+                break
+            window.append(msg)
+            used += cost
+        window.reverse()
+        return window
@@ -3,7 +3,12 @@
 import os
 import google.generativeai as genai
 from time import perf_counter
+from typing import Iterator
 from quantum_aeon_fluxor.utils.metrics import log_event
+from quantum_aeon_fluxor.utils.tracing import span
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.semantic_cache import SemanticResponseCache
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.response_cache import ReplayMiss, get_response_cache
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.context_cache import ContextCache, usage_fields
 from dotenv import load_dotenv, find_dotenv
 
 class GeminiClient:
@@ -40,32 +45,185 @@ class GeminiClient:
         if not api_key:
             raise ValueError("GOOGLE_API_KEY not found in .env file. Please ensure it is set.")
 
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-pro') # As per your directive
+        endpoint = os.getenv("GEMINI_API_ENDPOINT")
+        if endpoint:
+            # e.g. http://127.0.0.1:8765 for scripts/gemini_standin_server.py
+            genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+        else:
+            genai.configure(api_key=api_key)
+        self.model_name = 'gemini-2.5-pro'
+        self.model = genai.GenerativeModel(self.model_name) # As per your directive
+        # Exact-match record/replay cache (QAECORE_RESPONSE_CACHE, default off)
+        self.response_cache = get_response_cache()
+        # Opt-in semantic response cache (QAECORE_SEMANTIC_CACHE=1); None when disabled
+        self.semantic_cache = SemanticResponseCache.from_env()
+        # Opt-in provider-side caching of the stable prompt prefix (QAECORE_CONTEXT_CACHE=1)
+        self.context_cache = ContextCache.from_env(self.model_name)
         self._configured = True
         print("--- Gemini Client Configured Successfully ---")
 
-    def query(self, prompt: str) -> str:
+    def query(
+        self, prompt: str, *, prefix: str | None = None, semantic_text: str | None = None, bypass_cache: bool = False
+    ) -> str:
         """
         Sends a query to the configured Gemini model.
 
         Args:
             prompt (str): The prompt to send to the language model.
+            prefix (str | None): Stable prompt prefix (see `bridge.compose_prompt_parts`),
+                sent as the system instruction. With the context cache enabled it is
+                uploaded once as provider-side cached content.
+            semantic_text (str | None): Text used for semantic cache matching (e.g. the bare
+                user question); defaults to the prompt without its context block.
+            bypass_cache (bool): Skip the semantic cache for this call (no lookup, no store).
+                The exact-match response cache still applies when enabled.
 
         Returns:
             str: The text content of the model's response.
+
+        Raises:
+            ReplayMiss: In replay mode, when no response was recorded for the request. Other
+                failures are returned as an error message.
+        """
+        with span("gemini.query", model=self.model_name, chars=len(prompt) + len(prefix or "")) as sp:
+            suffix, prompt = prompt, (prefix or "") + prompt
+            cache = None if bypass_cache else self.semantic_cache
+            cache_info = None
+            if cache is not None:
+                cached, cache_info = cache.lookup(self.model_name, prompt, text=semantic_text)
+                if cached is not None:
+                    if sp is not None:
+                        sp.set(cache="semantic")
+                    return cached
+            start = perf_counter()
+            try:
+                text = self.response_cache.generate(
+                    self.model_name, prompt, lambda: self._generate(prefix, suffix)[0].text
+                )
+                dur_ms = (perf_counter() - start) * 1000
+                log_event("gemini", "query", duration_ms=round(dur_ms,2), ok=True, chars=len(prompt))
+                if cache is not None:
+                    cache.store(self.model_name, prompt, text, dur_ms, info=cache_info, text=semantic_text)
+                return text
+            except ReplayMiss:
+                raise  # an offline replay run must fail on a missing recording, not answer with error text
+            except Exception as e:
+                dur_ms = (perf_counter() - start) * 1000
+                log_event("gemini", "query", duration_ms=round(dur_ms,2), ok=False, error=str(e))
+                print(f"An error occurred while querying Gemini: {e}")
+                return f"Error: Could not get a response from the model. Details: {e}"
+
+    def query_stream(
+        self, prompt: str, *, prefix: str | None = None, semantic_text: str | None = None, bypass_cache: bool = False
+    ) -> Iterator[str]:
         """
+        Streams the model's response as text chunks (streaming `generate_content`).
+
+        Cache hits (exact-match or semantic) are yielded as a single chunk. Time-to-first-token
+        and output tokens/second are logged as a `query_stream` event on the `gemini` stream.
+        On failure an error message is yielded, mirroring `query` (replay misses raise).
+
+        Args:
+            prompt (str): The prompt to send to the language model.
+            prefix (str | None): See `query`.
+            semantic_text (str | None): See `query`.
+            bypass_cache (bool): See `query`.
+
+        Yields:
+            str: Successive pieces of the response text.
+        """
+        suffix, prompt = prompt, (prefix or "") + prompt
+        cache = None if bypass_cache else self.semantic_cache
+        cache_info = None
+        if cache is not None:
+            cached, cache_info = cache.lookup(self.model_name, prompt, text=semantic_text)
+            if cached is not None:
+                yield cached
+                return
         start = perf_counter()
+        ttft_ms = None
+        parts: list[str] = []
+        tokens = None
+        last_usage = None
         try:
-            response = self.model.generate_content(prompt)
-            dur_ms = (perf_counter() - start) * 1000
-            log_event("gemini", "query", duration_ms=round(dur_ms,2), ok=True, chars=len(prompt))
-            return response.text
+            key, cached = self.response_cache.lookup(self.model_name, prompt)
+            if cached is not None:
+                yield cached
+                return
+            response, context_cached = self._generate(prefix, suffix, stream=True, log_usage=False)
+            for chunk in response:
+                try:
+                    piece = chunk.text
+                except Exception:
+                    piece = ""  # chunks without text parts (e.g. the final usage-only chunk)
+                usage = getattr(chunk, "usage_metadata", None)
+                if usage is not None and getattr(usage, "candidates_token_count", 0):
+                    tokens = usage.candidates_token_count
+                    last_usage = usage
+                if not piece:
+                    continue
+                if ttft_ms is None:
+                    ttft_ms = (perf_counter() - start) * 1000
+                parts.append(piece)
+                yield piece
+        except ReplayMiss:
+            raise
         except Exception as e:
             dur_ms = (perf_counter() - start) * 1000
-            log_event("gemini", "query", duration_ms=round(dur_ms,2), ok=False, error=str(e))
+            log_event("gemini", "query_stream", duration_ms=round(dur_ms,2), ok=False, error=str(e))
             print(f"An error occurred while querying Gemini: {e}")
-            return f"Error: Could not get a response from the model. Details: {e}"
+            yield f"Error: Could not get a response from the model. Details: {e}"
+            return
+        dur_ms = (perf_counter() - start) * 1000
+        text = "".join(parts)
+        estimated = tokens is None
+        if estimated:
+            tokens = max(1, len(text) // 4)  # ~4 chars per token
+        gen_s = max(1e-6, (dur_ms - (ttft_ms or 0.0)) / 1000)
+        log_event(
+            "gemini",
+            "query_stream",
+            duration_ms=round(dur_ms,2),
+            ttft_ms=round(ttft_ms,2) if ttft_ms is not None else None,
+            tokens=tokens,
+            tokens_estimated=estimated,
+            tokens_per_s=round(tokens / gen_s, 2),
+            ok=True,
+            chars=len(prompt),
+        )
+        if prefix:
+            log_event("gemini", "prompt_usage", context_cached=context_cached, **usage_fields(last_usage))
+        self.response_cache.record(key, self.model_name, text, dur_ms)
+        if cache is not None:
+            cache.store(self.model_name, prompt, text, dur_ms, info=cache_info, text=semantic_text)
+
+    def _generate(self, prefix: str | None, suffix: str, *, stream: bool = False, log_usage: bool = True):
+        """`generate_content` for prefix + suffix, through the context cache when it holds the prefix.
+
+        Returns (response, whether the cached prefix was used). For streaming calls the
+        `gemini.generate` span ends when the response iterator is returned; the time spent
+        reading chunks belongs to the caller's span.
+        """
+        model, cached_model = self.model, None
+        if prefix:
+            if getattr(self, "context_cache", None) is not None:
+                cached_model = self.context_cache.model_for(prefix)
+            # the prefix is the system instruction on both paths, cached or not
+            model = cached_model or self._system_model(prefix)
+        with span("gemini.generate", stream=stream, context_cached=cached_model is not None):
+            response = model.generate_content(suffix, stream=True) if stream else model.generate_content(suffix)
+        if prefix and log_usage:
+            log_event("gemini", "prompt_usage", context_cached=cached_model is not None,
+                      **usage_fields(getattr(response, "usage_metadata", None)))
+        return response, cached_model is not None
+
+    def _system_model(self, prefix: str):
+        """Uncached model with `prefix` as its system instruction (the last one is reused)."""
+        held = getattr(self, "_prefix_model", None)
+        if held is None or held[0] != prefix:
+            held = (prefix, genai.GenerativeModel(self.model_name, system_instruction=prefix))
+            self._prefix_model = held
+        return held[1]
 
 # --- Example Usage ---
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+"""Provider-side context caching for the stable prompt prefix (opt-in).
+
+Archon prompts start with the same persona, inquiry frame and pinned framework documents
+every turn (`bridge.cacheable_prefix`). With caching on, that prefix is uploaded once as
+Gemini `CachedContent` (system instruction) and each turn sends only the dynamic suffix to
+a model bound to it; the provider then bills and processes the prefix as cached tokens.
+
+    - entries are keyed by sha256(model | prefix); a changed prefix creates a new entry
+    - TTL refresh: an entry within `refresh_margin_s` of expiry gets its TTL extended on use
+    - fallback: prefixes below `min_tokens` (the provider minimum) are never cached, and a
+      failed create/refresh disables caching for `retry_after_s`; callers then send the
+      prefix as the system instruction of an uncached request, so the model sees the same
+      turn either way and turns never fail because of the cache
+    - at most `max_entries` prefixes are kept; the oldest is deleted beyond that
+
+Config (env):
+    QAECORE_CONTEXT_CACHE             enable (1/true/on); off by default
+    QAECORE_CONTEXT_CACHE_TTL         seconds (default 3600)
+    QAECORE_CONTEXT_CACHE_MIN_TOKENS  estimated prefix tokens needed to cache (default 1024)
+
+Create/refresh/skip/error outcomes are logged as `context_cache` events on the `gemini` stream.
+"""
+from __future__ import annotations
+from datetime import timedelta
+from time import perf_counter, time
+from typing import Any, Callable, Dict, Optional, Tuple
+import hashlib
+import os
+import threading
+
+from quantum_aeon_fluxor.utils.metrics import log_event
+from quantum_aeon_fluxor.utils.tokens import estimate_tokens
+
+ENABLE_ENV = "QAECORE_CONTEXT_CACHE"
+TTL_ENV = "QAECORE_CONTEXT_CACHE_TTL"
+MIN_TOKENS_ENV = "QAECORE_CONTEXT_CACHE_MIN_TOKENS"
+DEFAULT_TTL_S = 3600.0
+DEFAULT_MIN_TOKENS = 1024
+
+
+def _enabled(value: Optional[str]) -> bool:
+    return (value or "").strip().lower() in {"1", "true", "on", "yes"}
+
+
+def _genai_create(model_name: str, prefix: str, ttl_s: float) -> Any:
+    from google.generativeai import caching
+    return caching.CachedContent.create(model=model_name, system_instruction=prefix, ttl=timedelta(seconds=ttl_s))
+
+
+def _genai_model(cached: Any) -> Any:
+    import google.generativeai as genai
+    return genai.GenerativeModel.from_cached_content(cached)
+
+
+class ContextCache:
+    def __init__(
+        self,
+        model_name: str,
+        *,
+        ttl_s: float = DEFAULT_TTL_S,
+        refresh_margin_s: float = 300.0,
+        min_tokens: int = DEFAULT_MIN_TOKENS,
+        max_entries: int = 8,
+        retry_after_s: float = 600.0,
+        create: Callable[[str, str, float], Any] = _genai_create,
+        make_model: Callable[[Any], Any] = _genai_model,
+    ):
+        self.model_name = model_name
+        self.ttl_s = ttl_s
+        self.refresh_margin_s = min(refresh_margin_s, ttl_s / 2)
+        self.min_tokens = min_tokens
+        self.max_entries = max(1, max_entries)
+        self.retry_after_s = retry_after_s
+        self._create = create
+        self._make_model = make_model
+        # key -> (cached content, bound model, expires_at)
+        self._entries: Dict[str, Tuple[Any, Any, float]] = {}
+        self._skipped: set[str] = set()
+        self._disabled_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, model_name: str) -> Optional["ContextCache"]:
+        """Cache configured from QAECORE_CONTEXT_CACHE*; None unless enabled."""
+        if not _enabled(os.getenv(ENABLE_ENV)):
+            return None
+        return cls(
+            model_name,
+            ttl_s=float(os.getenv(TTL_ENV, DEFAULT_TTL_S)),
+            min_tokens=int(os.getenv(MIN_TOKENS_ENV, DEFAULT_MIN_TOKENS)),
+        )
+
+    def _key(self, prefix: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{prefix}".encode("utf-8")).hexdigest()
+
+    def model_for(self, prefix: str) -> Optional[Any]:
+        """A model bound to cached `prefix`, or None when the plain prompt should be sent."""
+        key = self._key(prefix)
+        now = time()
+        with self._lock:
+            if now < self._disabled_until:
+                return None
+            entry = self._entries.get(key)
+            if entry is not None:
+                cached, model, expires = entry
+                if expires - now > self.refresh_margin_s:
+                    return model
+                if expires > now and self._refresh(key, cached, now):
+                    return model
+                self._entries.pop(key, None)  # expired or refresh failed: recreate below
+            if key in self._skipped:
+                return None
+            tokens = estimate_tokens(prefix)
+            if tokens < self.min_tokens:
+                self._skipped.add(key)
+                log_event("gemini", "context_cache", result="skip", reason="below_min_tokens",
+                          prefix_tokens=tokens, min_tokens=self.min_tokens)
+                return None
+            t0 = perf_counter()
+            try:
+                cached = self._create(self.model_name, prefix, self.ttl_s)
+                model = self._make_model(cached)
+            except Exception as e:
+                self._disabled_until = now + self.retry_after_s
+                log_event("gemini", "context_cache", result="error", stage="create", error=str(e),
+                          retry_after_s=self.retry_after_s)
+                return None
+            self._entries[key] = (cached, model, now + self.ttl_s)
+            self._evict()
+            log_event("gemini", "context_cache", result="create", prefix_tokens=tokens,
+                      ttl_s=self.ttl_s, duration_ms=round((perf_counter() - t0) * 1000.0, 2),
+                      name=getattr(cached, "name", None))
+            return model
+
+    def _refresh(self, key: str, cached: Any, now: float) -> bool:
+        """Extend the TTL of an entry close to expiry (lock held)."""
+        try:
+            cached.update(ttl=timedelta(seconds=self.ttl_s))
+        except Exception as e:
+            log_event("gemini", "context_cache", result="error", stage="refresh", error=str(e))
+            return False
+        entry = self._entries[key]
+        self._entries[key] = (entry[0], entry[1], now + self.ttl_s)
+        log_event("gemini", "context_cache", result="refresh", ttl_s=self.ttl_s, name=getattr(cached, "name", None))
+        return True
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            oldest = min(self._entries, key=lambda k: self._entries[k][2])
+            cached = self._entries.pop(oldest)[0]
+            try:
+                cached.delete()
+            except Exception:
+                pass  # expires on its own
+
+    def clear(self) -> None:
+        with self._lock:
+            for cached, _, _ in self._entries.values():
+                try:
+                    cached.delete()
+                except Exception:
+                    pass
+            self._entries.clear()
+            self._skipped.clear()
+            self._disabled_until = 0.0
+
+
+def usage_fields(usage: Any) -> dict:
+    """Token accounting from a response's usage_metadata: prompt, cached and saved share."""
+    if usage is None:
+        return {}
+    prompt = int(getattr(usage, "prompt_token_count", 0) or 0)
+    cached = int(getattr(usage, "cached_content_token_count", 0) or 0)
+    return {
+        "prompt_tokens": prompt,
+        "cached_tokens": cached,
+        "cached_share": round(cached / prompt, 4) if prompt else 0.0,
+    }
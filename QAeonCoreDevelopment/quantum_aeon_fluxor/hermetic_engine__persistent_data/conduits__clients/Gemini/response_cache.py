@@ -0,0 +1,224 @@
+"""Exact-match response cache for model calls (record / replay / off).
+
+Identical prompts re-issued by reruns (LogicalFlowStrategy, QAeCoreGeminiInterface, the
+main.py demos, regression suites) are answered from disk instead of the model. The key is
+sha256(model name | canonical generation config + safety settings | prompt), so any change
+to the request produces a new entry.
+
+Modes (QAECORE_RESPONSE_CACHE, default off):
+    record  serve hits, call the model on a miss and store the response
+    replay  serve hits only; a miss raises ReplayMiss (offline tests, no network)
+    off     always call the model
+
+Storage: one SQLite file (QAECORE_RESPONSE_CACHE_PATH, default ./.response_cache/responses.sqlite),
+responses zlib-compressed; least recently used entries are evicted once the stored bytes
+exceed QAECORE_RESPONSE_CACHE_MAX_MB (default 256).
+"""
+from __future__ import annotations
+from pathlib import Path
+from time import perf_counter, time
+from typing import Any, Callable, Optional, Tuple
+import dataclasses
+import enum
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+
+from quantum_aeon_fluxor.utils.metrics import log_event
+
+MODE_ENV = "QAECORE_RESPONSE_CACHE"
+PATH_ENV = "QAECORE_RESPONSE_CACHE_PATH"
+MAX_MB_ENV = "QAECORE_RESPONSE_CACHE_MAX_MB"
+MODES = ("record", "replay", "off")
+DEFAULT_MAX_MB = 256.0
+
+
+class ReplayMiss(RuntimeError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+def _canonical(obj: Any) -> Any:
+    """JSON-able, order-stable form of generation configs / safety settings (dataclass, proto, enum, dict)."""
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, enum.Enum):
+        return obj.name
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if dataclasses.is_dataclass(obj):
+        return _canonical({f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)})
+    to_dict = getattr(type(obj), "to_dict", None)  # proto-plus messages (SafetySetting, ...)
+    if callable(to_dict):
+        try:
+            return _canonical(to_dict(obj))
+        except Exception:
+            pass
+    return repr(obj)
+
+
+def request_key(model: str, prompt: str, generation_config: Any = None, safety_settings: Any = None) -> str:
+    cfg = json.dumps(
+        {"generation_config": _canonical(generation_config), "safety_settings": _canonical(safety_settings)},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    h = hashlib.sha256()
+    for part in (model, cfg, prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path: Optional[Path] = None, mode: str = "record", max_bytes: Optional[int] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown response cache mode: {mode}. Choose from: {', '.join(MODES)}")
+        self.mode = mode
+        self.max_bytes = max_bytes if max_bytes is not None else int(DEFAULT_MAX_MB * 1024 * 1024)
+        self.path = Path(path) if path else Path.cwd() / ".response_cache" / "responses.sqlite"
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if mode != "off":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, model TEXT, created REAL, last_used REAL, size INTEGER, body BLOB)"
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        mode = (os.getenv(MODE_ENV) or "off").strip().lower()
+        path = os.getenv(PATH_ENV)
+        max_mb = float(os.getenv(MAX_MB_ENV, DEFAULT_MAX_MB))
+        return cls(Path(path).expanduser() if path else None, mode=mode, max_bytes=int(max_mb * 1024 * 1024))
+
+    def get(self, key: str) -> Optional[str]:
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute("SELECT body FROM responses WHERE key=?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET last_used=? WHERE key=?", (time(), key))
+            self._db.commit()
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, key: str, model: str, text: str) -> None:
+        if self._db is None or self.mode != "record":
+            return
+        body = zlib.compress(text.encode("utf-8"), 6)
+        now = time()
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, created, last_used, size, body) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, now, now, len(body), body),
+                )
+                self._evict()
+                self._db.commit()
+        except Exception as e:
+            log_event("gemini", "response_cache:error", error=str(e))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until stored bytes fit max_bytes (lock held)."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        evicted = 0
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_used ASC").fetchall():
+            if total - freed <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key=?", (key,))
+            freed += size
+            evicted += 1
+        log_event("gemini", "response_cache_evict", evicted=evicted, freed_bytes=freed)
+
+    def stats(self) -> dict:
+        if self._db is None:
+            return {"mode": self.mode, "entries": 0, "bytes": 0}
+        with self._lock:
+            n, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"mode": self.mode, "entries": n, "bytes": size, "path": str(self.path)}
+
+    def lookup(
+        self,
+        model: str,
+        prompt: str,
+        generation_config: Any = None,
+        safety_settings: Any = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Return (key, cached response). key is None when off; replay misses raise ReplayMiss."""
+        if self.mode == "off":
+            return None, None
+        start = perf_counter()
+        key = request_key(model, prompt, generation_config, safety_settings)
+        cached = self.get(key)
+        if cached is not None:
+            log_event("gemini", "response_cache", result="hit", mode=self.mode, model=model,
+                      lookup_ms=round((perf_counter() - start) * 1000.0, 3))
+            return key, cached
+        if self.mode == "replay":
+            log_event("gemini", "response_cache", result="replay_miss", mode=self.mode, model=model)
+            raise ReplayMiss(f"No recorded response for request {key[:12]} (model={model})")
+        return key, None
+
+    def record(self, key: Optional[str], model: str, text: str, call_ms: float) -> None:
+        """Store a fresh response for a key returned by `lookup` (no-op unless recording)."""
+        if key is None:
+            return
+        self.put(key, model, text)
+        log_event("gemini", "response_cache", result="miss", mode=self.mode, model=model, call_ms=round(call_ms, 2))
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        call: Callable[[], str],
+        generation_config: Any = None,
+        safety_settings: Any = None,
+    ) -> str:
+        """Return the cached response for this request, or `call()` it (recording in record mode)."""
+        key, cached = self.lookup(model, prompt, generation_config, safety_settings)
+        if cached is not None:
+            return cached
+        start = perf_counter()
+        text = call()
+        self.record(key, model, text, (perf_counter() - start) * 1000.0)
+        return text
+
+
+_default: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache configured from QAECORE_RESPONSE_CACHE*."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ResponseCache.from_env()
+        return _default
+
+
+def cached_generate_text(model, prompt: str, generation_config: Any = None, safety_settings: Any = None, **kwargs) -> str:
+    """`model.generate_content(...).text` through the response cache (for GenerativeModel call sites)."""
+    name = getattr(model, "model_name", None) or str(model)
+
+    def _call() -> str:
+        opts = dict(kwargs)
+        if generation_config is not None:
+            opts["generation_config"] = generation_config
+        if safety_settings is not None:
+            opts["safety_settings"] = safety_settings
+        return model.generate_content(prompt, **opts).text
+
+    return get_response_cache().generate(name, prompt, _call, generation_config, safety_settings)
@@ -0,0 +1,247 @@
+"""Semantic response cache in front of GeminiClient.query (opt-in).
+
+Re-asks and near-paraphrases of an earlier question with the same retrieved context reuse
+the stored response instead of paying a full model call. A cached response is reused when
+    - the model and the prompt mode (`[Mode: ...]` written by syzygy.compose_prompt) match,
+    - the conversation state hashes equal: everything before the mode line (persona, frame and
+      pinned documents) plus the retrieved context, recent conversation and digest blocks,
+    - cosine(prompt embedding, cached prompt embedding) >= threshold, and
+    - the entry is younger than the TTL.
+Those parts are excluded from the embedded text, so similarity is measured on the question
+and template only while the conversation state must match exactly: a follow-up such as "and
+the second one?" is only answered from cache within the same conversation, and editing a
+pinned document invalidates earlier answers. Callers that know the bare question (Archon
+passes the user's input) should hand it in as `text`: the prompt template is shared by every
+turn and would otherwise dominate the similarity.
+
+Entries live in SQLite; their embeddings are also kept in an in-memory float32 matrix
+(the local vector index) so a lookup is a single mat-vec. Least recently used entries are
+evicted beyond `max_entries`.
+
+Config (env):
+    QAECORE_SEMANTIC_CACHE            enable (1/true/on); off by default
+    QAECORE_SEMANTIC_CACHE_PATH       SQLite file (default ./.semantic_cache/responses.sqlite)
+    QAECORE_SEMANTIC_CACHE_THRESHOLD  cosine similarity needed for a hit (default 0.95)
+    QAECORE_SEMANTIC_CACHE_TTL        seconds (default 604800 = 7 days)
+    QAECORE_SEMANTIC_CACHE_SIZE       max entries (default 500)
+"""
+from __future__ import annotations
+from pathlib import Path
+from time import perf_counter, time
+from typing import Callable, List, Optional, Sequence, Tuple
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+from quantum_aeon_fluxor.utils.metrics import log_event
+
+ENABLE_ENV = "QAECORE_SEMANTIC_CACHE"
+PATH_ENV = "QAECORE_SEMANTIC_CACHE_PATH"
+THRESHOLD_ENV = "QAECORE_SEMANTIC_CACHE_THRESHOLD"
+TTL_ENV = "QAECORE_SEMANTIC_CACHE_TTL"
+SIZE_ENV = "QAECORE_SEMANTIC_CACHE_SIZE"
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_TTL_S = 7 * 86400.0
+DEFAULT_SIZE = 500
+
+_MODE_RE = re.compile(r"\[Mode: ([^\]]+)\]")
+_STATE_RE = re.compile(
+    r"=== (Context|Recent Conversation|Conversation Digest) ===.*?=== End \1 ===", re.DOTALL
+)
+
+
+def split_prompt(prompt: str) -> Tuple[str, str, str]:
+    """Return (mode, state_hash, text_to_embed) for a composed prompt.
+
+    The state hash covers the stable prefix (text before the mode line) and the context,
+    recent conversation and digest blocks; it is empty for a bare prompt without any of them.
+    """
+    m = _MODE_RE.search(prompt)
+    mode = m.group(1).strip() if m else ""
+    prefix = prompt[: m.start()] if m else ""
+    blocks = [b.group(0) for b in _STATE_RE.finditer(prompt)]
+    state = [prefix] + blocks if prefix.strip() or blocks else []
+    ctx_hash = hashlib.sha1("\n".join(state).encode("utf-8")).hexdigest() if state else ""
+    return mode, ctx_hash, _STATE_RE.sub(" ", prompt[m.start():] if m else prompt)
+
+
+def _enabled(value: Optional[str]) -> bool:
+    return (value or "").strip().lower() in {"1", "true", "on", "yes"}
+
+
+class SemanticResponseCache:
+    def __init__(
+        self,
+        embed: Callable[[str], Sequence[float]],
+        path: Optional[Path] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl_s: float = DEFAULT_TTL_S,
+        max_entries: int = DEFAULT_SIZE,
+    ):
+        self.embed = embed
+        self.threshold = threshold
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.path = Path(path) if path else Path.cwd() / ".semantic_cache" / "responses.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "id INTEGER PRIMARY KEY, created REAL, last_hit REAL, model TEXT, mode TEXT, ctx_hash TEXT, "
+            "latency_ms REAL, vec BLOB, response TEXT)"
+        )
+        self._db.commit()
+        # in-memory index, row-aligned: ids / keys (model, mode, ctx_hash) / created / matrix
+        self._ids: List[int] = []
+        self._keys: List[Tuple[str, str, str]] = []
+        self._created: List[float] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._load()
+
+    @classmethod
+    def from_env(cls, embed: Optional[Callable[[str], Sequence[float]]] = None) -> Optional["SemanticResponseCache"]:
+        """Cache configured from QAECORE_SEMANTIC_CACHE*; None unless enabled."""
+        if not _enabled(os.getenv(ENABLE_ENV)):
+            return None
+        if embed is None:
+            from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.query_cache import embed_query
+            embed = embed_query
+        path = os.getenv(PATH_ENV)
+        return cls(
+            embed,
+            path=Path(path).expanduser() if path else None,
+            threshold=float(os.getenv(THRESHOLD_ENV, DEFAULT_THRESHOLD)),
+            ttl_s=float(os.getenv(TTL_ENV, DEFAULT_TTL_S)),
+            max_entries=int(os.getenv(SIZE_ENV, DEFAULT_SIZE)),
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _load(self) -> None:
+        rows = self._db.execute(
+            "SELECT id, model, mode, ctx_hash, created, vec FROM responses WHERE created >= ? ORDER BY id",
+            (time() - self.ttl_s,),
+        ).fetchall()
+        self._ids = [r[0] for r in rows]
+        self._keys = [(r[1], r[2], r[3]) for r in rows]
+        self._created = [r[4] for r in rows]
+        self._matrix = np.stack([np.frombuffer(r[5], dtype=np.float32) for r in rows]) if rows else None
+
+    @staticmethod
+    def _unit(vec: Sequence[float]) -> np.ndarray:
+        v = np.asarray(vec, dtype=np.float32)
+        return v / (np.linalg.norm(v) or 1.0)
+
+    def lookup(self, model: str, prompt: str, text: Optional[str] = None) -> Tuple[Optional[str], dict]:
+        """Return (response or None, info). `info` carries the embedding for a later `store`.
+
+        `text` is what gets embedded (default: the prompt from the mode line on, without its
+        context, conversation and digest blocks).
+        """
+        start = perf_counter()
+        mode, ctx_hash, prompt_text = split_prompt(prompt)
+        text = text if text is not None else prompt_text
+        info = {"mode": mode, "ctx_hash": ctx_hash, "vec": None}
+        try:
+            vec = self._unit(self.embed(text))
+        except Exception as e:
+            log_event("gemini", "semantic_cache:error", stage="embed", error=str(e))
+            return None, info
+        info["vec"] = vec
+        now = time()
+        with self._lock:
+            if self._matrix is None:
+                best_j, best = None, 0.0
+            else:
+                key = (model, mode, ctx_hash)
+                mask = np.array(
+                    [k == key and now - c <= self.ttl_s for k, c in zip(self._keys, self._created)], dtype=bool
+                )
+                scores = np.where(mask, self._matrix @ vec, -1.0)
+                best_j = int(np.argmax(scores))
+                best = float(scores[best_j])
+            info["similarity"] = round(best, 4)
+            if best_j is None or best < self.threshold:
+                log_event(
+                    "gemini", "semantic_cache", result="miss", mode=mode, similarity=round(best, 4),
+                    lookup_ms=round((perf_counter() - start) * 1000.0, 3),
+                )
+                return None, info
+            entry_id = self._ids[best_j]
+            row = self._db.execute("SELECT response, latency_ms FROM responses WHERE id=?", (entry_id,)).fetchone()
+            self._db.execute("UPDATE responses SET last_hit=? WHERE id=?", (now, entry_id))
+            self._db.commit()
+        if row is None:
+            return None, info
+        lookup_ms = (perf_counter() - start) * 1000.0
+        log_event(
+            "gemini", "semantic_cache", result="hit", mode=mode, similarity=round(best, 4),
+            lookup_ms=round(lookup_ms, 3), saved_ms=round(max(0.0, (row[1] or 0.0) - lookup_ms), 2),
+        )
+        return row[0], info
+
+    def store(
+        self,
+        model: str,
+        prompt: str,
+        response: str,
+        latency_ms: float,
+        info: Optional[dict] = None,
+        text: Optional[str] = None,
+    ) -> None:
+        """Add a response; reuses the embedding computed by `lookup` when `info` is passed."""
+        if info is None or info.get("vec") is None:
+            mode, ctx_hash, prompt_text = split_prompt(prompt)
+            text = text if text is not None else prompt_text
+            try:
+                vec = self._unit(self.embed(text))
+            except Exception as e:
+                log_event("gemini", "semantic_cache:error", stage="embed", error=str(e))
+                return
+        else:
+            mode, ctx_hash, vec = info["mode"], info["ctx_hash"], info["vec"]
+        now = time()
+        try:
+            with self._lock:
+                cur = self._db.execute(
+                    "INSERT INTO responses (created, last_hit, model, mode, ctx_hash, latency_ms, vec, response) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (now, now, model, mode, ctx_hash, latency_ms, vec.astype(np.float32).tobytes(), response),
+                )
+                self._ids.append(int(cur.lastrowid))
+                self._keys.append((model, mode, ctx_hash))
+                self._created.append(now)
+                row = vec.astype(np.float32)[None, :]
+                self._matrix = row if self._matrix is None else np.vstack([self._matrix, row])
+                evicted = self._evict(now)
+                self._db.commit()
+        except Exception as e:
+            log_event("gemini", "semantic_cache:error", stage="store", error=str(e))
+            return
+        if evicted:
+            log_event("gemini", "semantic_cache_evict", evicted=evicted, entries=len(self._ids))
+
+    def _evict(self, now: float) -> int:
+        """Drop expired entries, then least recently used ones beyond max_entries (lock held)."""
+        n = self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_s,)).rowcount
+        over = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if over > 0:
+            n += self._db.execute(
+                "DELETE FROM responses WHERE id IN (SELECT id FROM responses ORDER BY last_hit ASC LIMIT ?)", (over,)
+            ).rowcount
+        if n:
+            self._load()
+        return n
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._load()
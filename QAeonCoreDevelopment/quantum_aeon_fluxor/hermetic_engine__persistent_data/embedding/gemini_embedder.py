@@ -3,6 +3,8 @@ from typing import List
 import os
 import google.generativeai as genai
 
+from quantum_aeon_fluxor.utils.tracing import span
+
 DEFAULT_MODEL = os.getenv("GEMINI_EMBED_MODEL", "gemini-embedding-001")
 
 
@@ -18,8 +20,20 @@ class GeminiEmbedder:
         self.dim = 3072
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        # Batch embed; google-generativeai supports batching via embed_content individually; we'll loop for now
-        # For better performance, consider the batch API if/when available.
+        with span("embed.gemini", model=self.model, texts=len(texts)):
+            return self._embed(texts)
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        # Several texts go out as one batchEmbedContents request (the SDK splits into API-sized
+        # batches); fall back to one call per text if the batch endpoint fails.
+        if len(texts) > 1:
+            try:
+                res = genai.embed_content(model=self.model, content=list(texts))
+                vectors = [list(v) for v in (res.get("embedding") or [])]
+                if len(vectors) == len(texts):
+                    return vectors
+            except Exception:
+                pass
         vectors: List[List[float]] = []
         for t in texts:
             res = genai.embed_content(model=self.model, content=t)
@@ -0,0 +1,227 @@
+"""Query embedding cache (in-process LRU with optional SQLite persistence).
+
+Repeated searches for the same text (`:search` re-runs, retries, identical retrieval for
+the same user turn) would otherwise each pay an embedding round trip. Entries are keyed
+by model, dimension and normalized query text, bounded by entry count and TTL.
+
+Config (env):
+    QAECORE_QUERY_CACHE_SIZE   max in-memory entries (default 1024; 0 disables caching)
+    QAECORE_QUERY_CACHE_TTL    seconds an entry stays valid (default 86400)
+    QAECORE_QUERY_CACHE_PATH   SQLite file for persistence across runs (unset = memory only)
+
+Every lookup emits a `query_embed` event (cache=hit|miss, running hit_rate) on the
+`retrieval` metrics stream.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from time import perf_counter, time
+from typing import List, Optional, Tuple
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+import numpy as np
+
+from quantum_aeon_fluxor.utils.metrics import log_event
+
+SIZE_ENV = "QAECORE_QUERY_CACHE_SIZE"
+TTL_ENV = "QAECORE_QUERY_CACHE_TTL"
+PATH_ENV = "QAECORE_QUERY_CACHE_PATH"
+DEFAULT_SIZE = 1024
+DEFAULT_TTL_S = 86400.0
+DISK_FACTOR = 16  # the persistent tier keeps up to size×DISK_FACTOR entries
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model: str, dim: int, text: str) -> str:
+    raw = f"{model}|{dim}|{normalize_query(text)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_entries: int = DEFAULT_SIZE, ttl_s: float = DEFAULT_TTL_S, path: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self._mem: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._puts = 0
+        if path is not None and max_entries > 0:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, created REAL, vec BLOB)")
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._mem)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def record(self, hits: int = 0, misses: int = 0) -> None:
+        """Count lookups; callers run on search thread pools, so this takes the cache lock."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def get(self, key: str) -> Optional[List[float]]:
+        if self.max_entries <= 0:
+            return None
+        now = time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_s:
+                    self._mem.move_to_end(key)
+                    return entry[1]
+                del self._mem[key]
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute("SELECT created, vec FROM query_embeddings WHERE key=?", (key,)).fetchone()
+            except Exception:
+                return None
+            if row is None or now - row[0] > self.ttl_s:
+                return None
+            vec = np.frombuffer(row[1], dtype=np.float32).tolist()
+            self._remember(key, row[0], vec)
+            return vec
+
+    def put(self, key: str, vector: List[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        now = time()
+        with self._lock:
+            self._remember(key, now, vector)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, created, vec) VALUES (?, ?, ?)",
+                    (key, now, np.asarray(vector, dtype=np.float32).tobytes()),
+                )
+                self._puts += 1
+                if self._puts % 100 == 0:
+                    self._prune_disk(now)
+                self._db.commit()
+            except Exception as e:
+                log_event("retrieval", "query_cache:error", error=str(e))
+
+    def _remember(self, key: str, created: float, vector: List[float]) -> None:
+        self._mem[key] = (created, vector)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def _prune_disk(self, now: float) -> None:
+        self._db.execute("DELETE FROM query_embeddings WHERE created < ?", (now - self.ttl_s,))
+        self._db.execute(
+            "DELETE FROM query_embeddings WHERE key NOT IN "
+            "(SELECT key FROM query_embeddings ORDER BY created DESC LIMIT ?)",
+            (self.max_entries * DISK_FACTOR,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM query_embeddings")
+                self._db.commit()
+
+
+_default_cache: Optional[QueryEmbeddingCache] = None
+_default_embedder = None
+_init_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryEmbeddingCache:
+    global _default_cache
+    with _init_lock:
+        if _default_cache is None:
+            path = os.getenv(PATH_ENV)
+            _default_cache = QueryEmbeddingCache(
+                max_entries=int(os.getenv(SIZE_ENV, DEFAULT_SIZE)),
+                ttl_s=float(os.getenv(TTL_ENV, DEFAULT_TTL_S)),
+                path=Path(path).expanduser() if path else None,
+            )
+        return _default_cache
+
+
+def get_query_embedder():
+    """Process-wide embedder for queries (avoids re-configuring the client per search)."""
+    global _default_embedder
+    with _init_lock:
+        if _default_embedder is None:
+            from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.gemini_embedder import GeminiEmbedder
+            _default_embedder = GeminiEmbedder()
+        return _default_embedder
+
+
+def embed_query(text: str, embedder=None, cache: Optional[QueryEmbeddingCache] = None) -> List[float]:
+    """Embed one query through the cache. The returned vector is shared; do not mutate it."""
+    embedder = embedder if embedder is not None else get_query_embedder()
+    cache = cache if cache is not None else get_query_cache()
+    start = perf_counter()
+    key = cache_key(embedder.model, embedder.dim, text)
+    vec = cache.get(key)
+    hit = vec is not None
+    if hit:
+        cache.record(hits=1)
+    else:
+        cache.record(misses=1)
+        vec = embedder.embed_texts([normalize_query(text)])[0]
+        cache.put(key, vec)
+    log_event(
+        "retrieval",
+        "query_embed",
+        cache="hit" if hit else "miss",
+        hit_rate=round(cache.hit_rate, 4),
+        entries=len(cache),
+        duration_ms=round((perf_counter() - start) * 1000.0, 3),
+    )
+    return vec
+
+
+def embed_queries(texts: List[str], embedder=None, cache: Optional[QueryEmbeddingCache] = None) -> List[List[float]]:
+    """Batch variant of `embed_query`: cache misses are embedded in one `embed_texts` call."""
+    embedder = embedder if embedder is not None else get_query_embedder()
+    cache = cache if cache is not None else get_query_cache()
+    start = perf_counter()
+    keys = [cache_key(embedder.model, embedder.dim, t) for t in texts]
+    out: List[Optional[List[float]]] = [cache.get(k) for k in keys]
+    # identical queries within the batch are embedded once
+    pending: "OrderedDict[str, str]" = OrderedDict()
+    for key, text, vec in zip(keys, texts, out):
+        if vec is None:
+            pending.setdefault(key, normalize_query(text))
+    if pending:
+        fresh = dict(zip(pending, embedder.embed_texts(list(pending.values()))))
+        for key, vec in fresh.items():
+            cache.put(key, vec)
+        out = [vec if vec is not None else fresh[key] for key, vec in zip(keys, out)]
+    misses = sum(1 for k in keys if k in pending)
+    cache.record(hits=len(keys) - misses, misses=misses)
+    log_event(
+        "retrieval",
+        "query_embed_batch",
+        queries=len(keys),
+        hits=len(keys) - misses,
+        embedded=len(pending),
+        hit_rate=round(cache.hit_rate, 4),
+        duration_ms=round((perf_counter() - start) * 1000.0, 3),
+    )
+    return out  # type: ignore[return-value]
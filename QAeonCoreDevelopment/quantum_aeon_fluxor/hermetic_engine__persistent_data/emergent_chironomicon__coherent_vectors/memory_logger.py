@@ -47,6 +47,23 @@ def log_interaction(speaker: str, text: str):
     print(f"Logged interaction from {speaker}.")
 
 
+def log_interactions(entries):
+    """
+    Appends several interactions with a single file open and without console output.
+
+    Used by the background write-behind queue, which batches the entries of one or more turns.
+
+    Args:
+        entries: Iterable of (timestamp, speaker, text) tuples; timestamps are the ISO strings
+            captured when each utterance happened, not when it is written.
+    """
+    # We build the whole block first so the file is opened (and appended to) only once.
+    block = "".join(f"## [{timestamp}] - {speaker}\n\n{text}\n\n---\n\n" for timestamp, speaker, text in entries)
+    if block:
+        with open(SESSION_LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(block)
+
+
 # --- Example Usage ---
 # You can run this file directly to test the functionality.
 if __name__ == "__main__":
@@ -9,12 +9,17 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.gemini_embedder import GeminiEmbedder
 from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import (
-    get_qdrant_client,
+    COLLECTION_PROFILES,
+    client_for,
     ensure_collection,
     upsert_chunks,
 )
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.vector_cache import VectorCache
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.lexical_index import LexicalIndex
 from quantum_aeon_fluxor.utils.hash import chunk_uuid
 from quantum_aeon_fluxor.utils.metrics import log_event, time_block, log_counter, log_latency
+from quantum_aeon_fluxor.utils.metrics_exporter import maybe_serve
+from quantum_aeon_fluxor.utils import profiling
 
 # Simple text file matcher (you can expand as needed)
 TEXT_EXTS = {".md", ".txt", ".py", ".json"}
@@ -82,6 +87,9 @@ def index_folder(
     workers: int = 4,
     embed_retries: int = 2,
     retry_backoff: float = 2.0,
+    collection_profile: str | None = None,
+    cache_vectors: bool = False,
+    build_lexical: bool = True,
 ) -> None:
     root = Path(folder).resolve()
     if not root.exists():
@@ -97,8 +105,8 @@ def index_folder(
         pass
 
     embedder = GeminiEmbedder()
-    client = get_qdrant_client()
-    ensure_collection(client, collection, embedder.dim)
+    client = client_for(collection)
+    ensure_collection(client, collection, embedder.dim, profile=collection_profile)
 
     docs = read_text_files(root)
     all_chunks: List[str] = []
@@ -136,7 +144,7 @@ def index_folder(
         try:
             res = embedder.embed_texts(batch)
             dur_ms = (time.perf_counter() - start) * 1000.0
-            log_latency("ingest", "embed_batch", dur_ms, batch_size=len(batch))
+            log_latency("ingest", "embed_batch", dur_ms, batch_size=len(batch), concurrency=workers)
             return res
         except Exception as e:
             log_event("ingest", "embed:error", error=repr(e), batch_size=len(batch), attempt=attempt)
@@ -200,18 +208,34 @@ def index_folder(
 
     with time_block("ingest", "embed", chunks=len(all_chunks), batch_size=batch_size, workers=workers):
         batches = list(_batched(all_chunks, batch_size))
-        # Parallelize across batches
+        # Parallelize across batches; reassemble in batch order so vectors stay aligned with ids/payloads
         if workers > 1:
+            by_idx: Dict[int, List[List[float]]] = {}
             with ThreadPoolExecutor(max_workers=workers) as ex:
                 future_map = {ex.submit(embed_batch, b): idx for idx, b in enumerate(batches)}
                 for fut in as_completed(future_map):
-                    vectors.extend(fut.result())
+                    by_idx[future_map[fut]] = fut.result()
+            for idx in range(len(batches)):
+                vectors.extend(by_idx[idx])
         else:
             for b in batches:
                 vectors.extend(embed_batch(b))
 
     with time_block("ingest", "upsert", chunks=len(all_chunks)):
-        upsert_chunks(get_qdrant_client(), collection, vectors, payloads, ids=ids)
+        upsert_chunks(client, collection, vectors, payloads, ids=ids)
+    if cache_vectors:
+        try:
+            VectorCache(collection).put(ids, vectors)
+        except Exception as e:
+            # best-effort: rescoring falls back to fetching vectors from Qdrant
+            log_event("ingest", "vector_cache:error", error=repr(e), collection=collection)
+            print(f"[Vector cache] not updated: {e}")
+    if build_lexical:
+        with time_block("ingest", "lexical_index", chunks=len(all_chunks)):
+            lexical = LexicalIndex(collection)
+            lexical.add(ids, all_chunks, payloads, replace=True)
+            lexical.optimize()
+            lexical.close()
     log_counter("ingest", "chunks_indexed", value=len(all_chunks), collection=collection)
 
     total_dur_ms = (time.perf_counter() - total_start) * 1000.0
@@ -233,8 +257,20 @@ def cli():
     parser.add_argument("--workers", type=int, default=4, help="Parallel embedding worker threads")
     parser.add_argument("--embed-retries", type=int, default=2, help="Retries per batch on failure")
     parser.add_argument("--retry-backoff", type=float, default=2.0, help="Backoff multiplier (seconds * attempt)")
+    parser.add_argument("--collection-profile", choices=list(COLLECTION_PROFILES), default=None,
+                        help="Storage/HNSW/quantization layout used if the collection has to be created")
+    parser.add_argument("--cache-vectors", action="store_true",
+                        help="Keep full-precision vectors in the local vector cache for two-stage rescoring")
+    parser.add_argument("--no-lexical", action="store_true", help="Skip building the local BM25 index (hybrid retrieval)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve Prometheus metrics on this port while indexing (default: $QAECORE_METRICS_PORT, else off)")
+    parser.add_argument("--profile-stages", default=None, metavar="SPEC",
+                        help="Profile stages, e.g. all or ingest.embed (default: $QAECORE_PROFILE, else off)")
     args = parser.parse_args()
 
+    maybe_serve(args.metrics_port)
+    if args.profile_stages:
+        profiling.configure(args.profile_stages)
     index_folder(
         args.folder,
         collection=args.collection,
@@ -245,6 +281,9 @@ def cli():
         workers=args.workers,
         embed_retries=args.embed_retries,
         retry_backoff=args.retry_backoff,
+        collection_profile=args.collection_profile,
+        cache_vectors=args.cache_vectors,
+        build_lexical=not args.no_lexical,
     )
 
 
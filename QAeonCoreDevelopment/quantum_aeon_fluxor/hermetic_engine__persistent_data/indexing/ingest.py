@@ -3,6 +3,7 @@ import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict
 import os
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Ensure env for GOOGLE_API_KEY, QDRANT_* if needed downstream
@@ -17,12 +18,18 @@ except Exception:
 from quantum_aeon_fluxor.hermetic_engine__persistent_data.indexing.index_folder import chunk_text
 from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.gemini_embedder import GeminiEmbedder
 from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import (
-    get_qdrant_client,
+    COLLECTION_PROFILES,
+    client_for,
+    create_collection,
     ensure_collection,
     upsert_chunks,
 )
-from qdrant_client.http.models import VectorParams, Distance
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.vector_cache import VectorCache
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.lexical_index import LexicalIndex, open_lexical_index
 from quantum_aeon_fluxor.utils.hash import chunk_uuid
+from quantum_aeon_fluxor.utils.metrics import log_counter, log_event, log_latency
+from quantum_aeon_fluxor.utils.metrics_exporter import maybe_serve
+from quantum_aeon_fluxor.utils import profiling
 try:
     from tqdm import tqdm
 except Exception:
@@ -119,6 +126,19 @@ def gather_files(root: Path) -> List[Path]:
     return files
 
 
+def chunk_payload(path: Path, root: Path, index: int, text: str, meta: Dict) -> Dict:
+    """Qdrant payload of one chunk: source, position, document metadata and a text preview."""
+    return {
+        "source_path": str(path),
+        "rel_path": str(path.relative_to(root)),
+        "chunk_index": index,
+        "ext": meta.get("ext"),
+        "title": meta.get("title"),
+        "author": meta.get("author"),
+        "text": text[:1000],
+    }
+
+
 def ingest(
     folder: str,
     collection: str = DEFAULT_COLLECTION,
@@ -134,6 +154,9 @@ def ingest(
     embed_concurrency: int = 4,
     use_cache: bool = True,
     profile: Optional[str] = None,
+    collection_profile: Optional[str] = None,
+    cache_vectors: bool = False,
+    build_lexical: bool = True,
 ) -> None:
     root = Path(folder).resolve()
     if not root.exists():
@@ -193,12 +216,25 @@ def ingest(
         return
 
     embedder = GeminiEmbedder()
-    client = get_qdrant_client()
+    client = client_for(collection)
     if recreate:
-        print(f"[Recreate] {collection}")
-        client.recreate_collection(collection_name=collection, vectors_config=VectorParams(size=embedder.dim, distance=Distance.COSINE))
+        print(f"[Recreate] {collection} (collection profile={collection_profile or 'default'})")
+        create_collection(client, collection, embedder.dim, profile=collection_profile, recreate=True)
     else:
-        ensure_collection(client, collection, embedder.dim)
+        ensure_collection(client, collection, embedder.dim, profile=collection_profile)
+    # Full-precision copies for local two-stage rescoring (search_text oversample)
+    if recreate:
+        # rows of the dropped collection would otherwise rescore (or clash in dim with) the new one
+        VectorCache(collection).clear()
+    vector_cache = VectorCache(collection) if cache_vectors else None
+    # BM25 index for hybrid retrieval; fed with every chunk (also cached ones) so existing
+    # collections get a lexical index on the next ingest run without re-embedding
+    lexical = LexicalIndex(collection) if build_lexical else None
+    if recreate:
+        # chunks of deleted/changed sources would otherwise come back as lexical-only hybrid hits
+        stale = lexical if lexical is not None else open_lexical_index(collection)
+        if stale is not None:
+            print(f"[Recreate] cleared {stale.clear()} chunks from BM25 index {stale.path}")
 
     # Cache manifest
     cache_dir = root.parent / ".ingest_cache"
@@ -227,7 +263,43 @@ def ingest(
             except Exception as e:
                 print(f"[Parse error] {p}: {e}")
 
-    for p, text, meta in tqdm(parsed, desc="ingest"):
+    def flush_batch(texts: List[str], payloads: List[Dict], ids: List[str], files_left: int) -> int:
+        """Embed `texts` concurrently, upsert them in upsert-sized batches and update the caches."""
+        nonlocal vector_cache
+        start = time.perf_counter()
+        vecs = []
+        try:
+            with profiling.profiled("ingest", "embed_batch"), ThreadPoolExecutor(max_workers=embed_concurrency) as ex:
+                futs = [ex.submit(embedder.embed_texts, [t]) for t in texts]
+                for fut in futs:
+                    vecs.append(fut.result()[0])
+        except Exception as e:
+            log_event("ingest", "embed:error", error=repr(e), batch_size=len(texts))
+            raise
+        log_latency("ingest", "embed_batch", (time.perf_counter() - start) * 1000.0, batch_size=len(texts),
+                    concurrency=embed_concurrency, queue_depth=files_left)
+        # upsert in smaller batches if needed
+        for s in range(0, len(vecs), upsert_batch_size):
+            e = s + upsert_batch_size
+            start = time.perf_counter()
+            with profiling.profiled("ingest", "upsert"):
+                upsert_chunks(client, collection, vecs[s:e], payloads[s:e], ids=ids[s:e])
+            log_latency("ingest", "upsert", (time.perf_counter() - start) * 1000.0, points=len(vecs[s:e]))
+        if vector_cache is not None:
+            try:
+                vector_cache.put(ids, vecs)
+            except Exception as e:
+                # best-effort: rescoring falls back to fetching vectors from Qdrant
+                log_event("ingest", "vector_cache:error", error=repr(e), collection=collection)
+                print(f"[Vector cache] disabled for this run: {e}")
+                vector_cache = None
+        # update cache
+        if use_cache:
+            cached_ids.update(ids)
+        log_counter("ingest", "chunks_upserted", value=len(texts), collection=collection)
+        return len(texts)
+
+    for n, (p, text, meta) in enumerate(tqdm(parsed, desc="ingest")):
         if write_parsed and out_dir is not None:
             try:
                 out_path = out_dir / (p.stem + ".txt")
@@ -243,53 +315,43 @@ def ingest(
         texts: List[str] = []
         payloads: List[Dict] = []
         ids: List[str] = []
+        lex_ids: List[str] = []
+        lex_payloads: List[Dict] = []
         for i, ch in enumerate(chunks):
             pid = chunk_uuid(p, i, ch)
+            payload = chunk_payload(p, root, i, ch, meta)
+            if lexical is not None:
+                lex_ids.append(pid)
+                lex_payloads.append(payload)
             if use_cache and pid in cached_ids:
                 continue
             texts.append(ch)
             ids.append(pid)
-            payloads.append({
-                "source_path": str(p),
-                "rel_path": str(p.relative_to(root)),
-                "chunk_index": i,
-                "ext": meta.get("ext"),
-                "title": meta.get("title"),
-                "author": meta.get("author"),
-                "text": ch[:1000],
-            })
+            payloads.append(payload)
             # flush by embed batch size
             if len(texts) >= embed_batch_size:
-                # concurrent embedding for this batch
-                vecs = []
-                with ThreadPoolExecutor(max_workers=embed_concurrency) as ex:
-                    futs = [ex.submit(embedder.embed_texts, [t]) for t in texts]
-                    for fut in futs:
-                        vecs.append(fut.result()[0])
-                # upsert in smaller batches if needed
-                for s in range(0, len(vecs), upsert_batch_size):
-                    e = s + upsert_batch_size
-                    upsert_chunks(client, collection, vecs[s:e], payloads[s:e], ids=ids[s:e])
-                total_chunks += len(texts)
-                # update cache
-                if use_cache:
-                    cached_ids.update(ids)
+                total_chunks += flush_batch(texts, payloads, ids, len(parsed) - n)
                 print(f"[Upserted] {len(texts)} chunks from {p}")
                 texts, payloads, ids = [], [], []
         # flush remainder
         if texts:
-            vecs = []
-            with ThreadPoolExecutor(max_workers=embed_concurrency) as ex:
-                futs = [ex.submit(embedder.embed_texts, [t]) for t in texts]
-                for fut in futs:
-                    vecs.append(fut.result()[0])
-            for s in range(0, len(vecs), upsert_batch_size):
-                e = s + upsert_batch_size
-                upsert_chunks(client, collection, vecs[s:e], payloads[s:e], ids=ids[s:e])
-            total_chunks += len(texts)
-            if use_cache:
-                cached_ids.update(ids)
+            total_chunks += flush_batch(texts, payloads, ids, len(parsed) - n)
             print(f"[Upserted] {len(texts)} chunks from {p}")
+        if lexical is not None and lex_ids:
+            lexical.add(lex_ids, chunks, lex_payloads)
+
+    if vector_cache is not None:
+        try:
+            dropped = vector_cache.compact()
+            if dropped:
+                print(f"[Vector cache] compacted {dropped} superseded rows")
+        except Exception as e:
+            log_event("ingest", "vector_cache:error", error=repr(e), collection=collection, stage="compact")
+
+    if lexical is not None:
+        lexical.optimize()
+        print(f"[Lexical] {len(lexical)} chunks in BM25 index {lexical.path}")
+        lexical.close()
 
     # Persist cache
     if use_cache:
@@ -318,8 +380,20 @@ def cli():
     parser.add_argument("--embed-concurrency", type=int, default=4, help="Parallel embedding requests per batch")
     parser.add_argument("--no-cache", action="store_true", help="Disable local ingest cache (re-embed all)")
     parser.add_argument("--profile", choices=["aggressive", "books", "conservative"], default=None)
+    parser.add_argument("--collection-profile", choices=list(COLLECTION_PROFILES), default=None,
+                        help="Storage/HNSW/quantization layout used when the collection is created or recreated")
+    parser.add_argument("--cache-vectors", action="store_true",
+                        help="Keep full-precision vectors in the local vector cache for two-stage rescoring")
+    parser.add_argument("--no-lexical", action="store_true", help="Skip building the local BM25 index (hybrid retrieval)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve Prometheus metrics on this port while ingesting (default: $QAECORE_METRICS_PORT, else off)")
+    parser.add_argument("--profile-stages", default=None, metavar="SPEC",
+                        help="Profile stages, e.g. all or ingest.embed_batch,ingest.upsert (default: $QAECORE_PROFILE, else off)")
     args = parser.parse_args()
 
+    maybe_serve(args.metrics_port)
+    if args.profile_stages:
+        profiling.configure(args.profile_stages)
     ingest(
         folder=args.folder,
         collection=args.collection,
@@ -335,6 +409,9 @@ def cli():
         embed_concurrency=args.embed_concurrency,
         use_cache=not args.no_cache,
         profile=args.profile,
+        collection_profile=args.collection_profile,
+        cache_vectors=args.cache_vectors,
+        build_lexical=not args.no_lexical,
     )
 
 
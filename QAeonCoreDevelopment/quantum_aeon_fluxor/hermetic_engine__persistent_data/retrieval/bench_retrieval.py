@@ -0,0 +1,263 @@
+"""Retrieval quality vs latency benchmark (`qaf-bench-retrieval`).
+
+Runs a labelled query set against one or more retrieval configurations and reports
+recall@k, MRR and p50/p95/p99 end-to-end query latency (embed + search) side by side.
+
+Dataset: JSONL, one object per line
+    {"query": "what is mentalism?", "expected": "kybalion/ch2.md"}      # or a list of sources
+A hit is a result whose payload[--match-field] (default rel_path) is an expected source.
+
+Backends:
+    memory  chunk + embed --source into an in-memory local index per configuration
+            (grid over --chunk-sizes × --dims); with `--embedder hashing` this needs no
+            network or API key, so it runs in CI
+    qdrant  query existing collections (grid over --collections × --collection-profiles),
+            embedding queries with Gemini
+
+Usage:
+    qaf-bench-retrieval --dataset evals/queries.jsonl --source ./docs --chunk-sizes 800 2000 --dims 256 1024
+    qaf-bench-retrieval --dataset evals/queries.jsonl --backend qdrant --collections qaecore_longterm_v1 \\
+        --collection-profiles default fast-ram --ks 1 5 10
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.indexing.index_folder import chunk_text, read_text_files
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.local_index import LocalVectorIndex
+from quantum_aeon_fluxor.utils.metrics import log_event
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """Deterministic, offline stand-in for GeminiEmbedder (signed feature hashing of words + bigrams).
+
+    Texts sharing vocabulary get similar vectors, which is enough to exercise chunking, k and
+    index settings end to end. Stable across processes and platforms (blake2b, not hash()).
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.model = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        toks = _TOKEN_RE.findall(text.lower())
+        return toks + [f"{a} {b}" for a, b in zip(toks, toks[1:])]
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        out = []
+        for t in texts:
+            vec = np.zeros(self.dim, dtype=np.float32)
+            for feat in self._features(t):
+                h = int.from_bytes(hashlib.blake2b(feat.encode("utf-8"), digest_size=8).digest(), "little")
+                vec[h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+            norm = float(np.linalg.norm(vec))
+            out.append((vec / norm if norm else vec).tolist())
+        return out
+
+
+@dataclass
+class LabelledQuery:
+    query: str
+    expected: frozenset
+
+
+def load_dataset(path: Path) -> List[LabelledQuery]:
+    items: List[LabelledQuery] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            exp = obj.get("expected") or obj.get("source") or []
+            exp = [exp] if isinstance(exp, str) else list(exp)
+            items.append(LabelledQuery(obj["query"], frozenset(_norm_source(e) for e in exp)))
+    return items
+
+
+def _norm_source(s: object) -> str:
+    return str(s).replace("\\", "/")
+
+
+def _pct(data: Sequence[float], p: float) -> float:
+    return data[min(len(data) - 1, int(p * (len(data) - 1)))] if data else 0.0
+
+
+def score_run(ranked_sources: List[List[str]], dataset: List[LabelledQuery], ks: Sequence[int]) -> Dict[str, float]:
+    """recall@k (fraction of expected sources found in the top k, averaged) and MRR over max(ks).
+
+    `ranked_sources` holds the source of every ranked hit, duplicates included, so the top-k cut is
+    taken over hits; several chunks of one source inside that cut count once.
+    """
+    out: Dict[str, float] = {}
+    for k in ks:
+        rec = []
+        for got, item in zip(ranked_sources, dataset):
+            if item.expected:
+                rec.append(len(set(got[:k]) & item.expected) / len(item.expected))
+        out[f"recall@{k}"] = round(float(np.mean(rec)) if rec else 0.0, 4)
+    rr = []
+    for got, item in zip(ranked_sources, dataset):
+        rank = next((i for i, s in enumerate(got, start=1) if s in item.expected), None)
+        rr.append(1.0 / rank if rank else 0.0)
+    out["mrr"] = round(float(np.mean(rr)) if rr else 0.0, 4)
+    return out
+
+
+def run_queries(search, embedder, dataset: List[LabelledQuery], k: int, match_field: str) -> Dict[str, object]:
+    """Time embed + search per query; `search(vector, k)` returns scored points with payloads."""
+    ranked: List[List[str]] = []
+    latencies: List[float] = []
+    for item in dataset:
+        t0 = perf_counter()
+        vec = embedder.embed_texts([item.query])[0]
+        hits = search(vec, k)
+        latencies.append((perf_counter() - t0) * 1000.0)
+        # keep one entry per hit, in rank order; score_run dedupes sources within each top-k cut
+        ranked.append([_norm_source((h.payload or {}).get(match_field, "")) for h in hits])
+    lat = sorted(latencies)
+    return {
+        "ranked": ranked,
+        "p50_ms": round(_pct(lat, 0.5), 3),
+        "p95_ms": round(_pct(lat, 0.95), 3),
+        "p99_ms": round(_pct(lat, 0.99), 3),
+        "mean_ms": round(float(np.mean(lat)) if lat else 0.0, 3),
+    }
+
+
+def build_memory_index(source: Path, embedder, chunk_size: int, overlap: int) -> LocalVectorIndex:
+    idx = LocalVectorIndex(f"bench-{chunk_size}-{embedder.dim}")
+    ids: List[str] = []
+    texts: List[str] = []
+    payloads: List[dict] = []
+    for p, txt in read_text_files(source):
+        for i, ch in enumerate(chunk_text(txt, max_chars=chunk_size, overlap=min(overlap, chunk_size // 2))):
+            ids.append(f"{len(ids)}")
+            texts.append(ch)
+            payloads.append({"rel_path": _norm_source(p.relative_to(source)), "source_path": str(p), "chunk_index": i})
+    for s in range(0, len(texts), 64):
+        idx.upsert(ids[s:s + 64], embedder.embed_texts(texts[s:s + 64]), payloads[s:s + 64])
+    return idx
+
+
+def bench_memory(
+    dataset: List[LabelledQuery],
+    source: Path,
+    chunk_sizes: Sequence[int],
+    dims: Sequence[int],
+    ks: Sequence[int],
+    overlap: int = 200,
+    embedder_name: str = "hashing",
+    match_field: str = "rel_path",
+) -> List[Dict[str, object]]:
+    rows = []
+    for dim in dims:
+        if embedder_name == "gemini":
+            from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.gemini_embedder import GeminiEmbedder
+            embedder = GeminiEmbedder()
+        else:
+            embedder = HashingEmbedder(dim)
+        for cs in chunk_sizes:
+            t0 = perf_counter()
+            idx = build_memory_index(source, embedder, cs, overlap)
+            build_s = perf_counter() - t0
+            res = run_queries(lambda v, k: idx.search(v, k), embedder, dataset, max(ks), match_field)
+            rows.append({
+                "config": f"memory chunk={cs} dim={embedder.dim} embedder={embedder.model}",
+                "chunks": len(idx),
+                "build_s": round(build_s, 3),
+                **score_run(res.pop("ranked"), dataset, ks),
+                **res,
+            })
+        if embedder_name == "gemini":
+            break  # fixed model dimension; --dims only applies to the hashing embedder
+    return rows
+
+
+def bench_qdrant(
+    dataset: List[LabelledQuery],
+    collections: Sequence[str],
+    profiles: Sequence[Optional[str]],
+    ks: Sequence[int],
+    match_field: str = "rel_path",
+) -> List[Dict[str, object]]:
+    from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.gemini_embedder import GeminiEmbedder
+    from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import client_for, search_by_vector
+
+    embedder = GeminiEmbedder()
+    rows = []
+    for coll in collections:
+        client = client_for(coll)
+        for prof in profiles:
+            res = run_queries(
+                lambda v, k: search_by_vector(client, coll, v, limit=k, profile=prof),
+                embedder, dataset, max(ks), match_field,
+            )
+            rows.append({
+                "config": f"qdrant {coll} profile={prof or 'default'}",
+                **score_run(res.pop("ranked"), dataset, ks),
+                **res,
+            })
+    return rows
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    if not rows:
+        print("No results.")
+        return
+    metric_cols = [c for c in rows[0] if c.startswith("recall@")] + ["mrr", "p50_ms", "p95_ms", "p99_ms"]
+    width = max(len(str(r["config"])) for r in rows)
+    print(f"{'config':<{width}}  " + "  ".join(f"{c:>9}" for c in metric_cols))
+    for r in rows:
+        print(f"{str(r['config']):<{width}}  " + "  ".join(f"{r[c]:>9}" for c in metric_cols))
+
+
+def cli():
+    parser = argparse.ArgumentParser(description="Benchmark retrieval quality (recall@k, MRR) against latency.")
+    parser.add_argument("--dataset", required=True, help="JSONL of {query, expected} pairs")
+    parser.add_argument("--backend", choices=["memory", "qdrant"], default="memory")
+    parser.add_argument("--embedder", choices=["hashing", "gemini"], default="hashing",
+                        help="Embedder for the memory backend (qdrant always uses gemini)")
+    parser.add_argument("--source", default=None, help="Corpus folder for the memory backend")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[2000])
+    parser.add_argument("--overlap", type=int, default=200)
+    parser.add_argument("--dims", type=int, nargs="+", default=[256], help="Hashing embedder dimensions")
+    parser.add_argument("--collections", nargs="+", default=["qaecore_longterm_v1"], help="qdrant backend")
+    parser.add_argument("--collection-profiles", nargs="+", default=[None], help="qdrant backend search profiles")
+    parser.add_argument("--ks", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--match-field", default="rel_path", help="Payload field compared with `expected`")
+    parser.add_argument("--json", default=None, help="Also write result rows to this JSON file")
+    args = parser.parse_args()
+
+    dataset = load_dataset(Path(args.dataset))
+    ks = sorted(set(args.ks))
+    if args.backend == "memory":
+        if not args.source:
+            parser.error("--source is required for the memory backend")
+        rows = bench_memory(
+            dataset, Path(args.source), args.chunk_sizes, args.dims, ks,
+            overlap=args.overlap, embedder_name=args.embedder, match_field=args.match_field,
+        )
+    else:
+        rows = bench_qdrant(dataset, args.collections, args.collection_profiles, ks, match_field=args.match_field)
+
+    for r in rows:
+        log_event("bench", "retrieval", queries=len(dataset), **r)
+    print(f"{len(dataset)} queries, backend={args.backend}")
+    print_table(rows)
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+import argparse
+
+from time import perf_counter
+
+from .qdrant_store import (
+    COLLECTION_PROFILES,
+    create_collection,
+    get_qdrant_client,
+    reconfigure_collection,
+)
+from .local_index import is_local_collection, open_local_index, sync_from_remote
+
+DEFAULT_DIM = 3072  # gemini-embedding-001
+
+
+def _print_profiles() -> None:
+    print("Collection profiles:")
+    for p in COLLECTION_PROFILES.values():
+        quant = p.quantization or "none"
+        print(
+            f"- {p.name}: m={p.hnsw_m} ef_construct={p.hnsw_ef_construct} on_disk={p.on_disk} "
+            f"hnsw_on_disk={p.hnsw_on_disk} quantization={quant} search_ef={p.search_ef} "
+            f"rescore={p.rescore} oversampling={p.oversampling}"
+        )
+        print(f"    {p.description}")
+
+
+def _print_info(client, name: str) -> None:
+    info = client.get_collection(name)
+    params = info.config.params
+    print(f"Collection: {name}")
+    print(f"  status={info.status} points={info.points_count} indexed_vectors={info.indexed_vectors_count}")
+    print(f"  vectors={params.vectors}")
+    print(f"  hnsw={info.config.hnsw_config}")
+    print(f"  quantization={info.config.quantization_config}")
+
+
+def _print_local_info(name: str) -> None:
+    idx = open_local_index(name)
+    print(f"Collection: {name} (local index)")
+    print(f"  points={len(idx)} dim={idx.dim} path={idx.path}")
+
+
+def cli():
+    parser = argparse.ArgumentParser(description="Manage Qdrant collection storage profiles and local collections.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("profiles", help="List available collection profiles")
+
+    p_create = sub.add_parser("create", help="Create a collection with a profile")
+    p_create.add_argument("collection")
+    p_create.add_argument("--profile", choices=list(COLLECTION_PROFILES), default="default")
+    p_create.add_argument("--dim", type=int, default=DEFAULT_DIM, help="Vector dimension")
+    p_create.add_argument("--recreate", action="store_true", help="Drop the collection first if it exists")
+
+    p_reconf = sub.add_parser("reconfigure", help="Apply a profile to an existing collection in place")
+    p_reconf.add_argument("collection")
+    p_reconf.add_argument("--profile", choices=list(COLLECTION_PROFILES), required=True)
+
+    p_info = sub.add_parser("info", help="Show storage/index configuration of a collection")
+    p_info.add_argument("collection")
+
+    p_sync = sub.add_parser("sync", help="Pull a remote collection into the local vector index")
+    p_sync.add_argument("collection", help="Remote Qdrant collection")
+    p_sync.add_argument("--as", dest="target", default=None, help="Local collection name (default: same)")
+
+    p_compact = sub.add_parser("compact", help="Drop superseded rows from a local collection")
+    p_compact.add_argument("collection")
+
+    args = parser.parse_args()
+
+    if args.command == "profiles":
+        _print_profiles()
+        return
+
+    if args.command == "compact":
+        dropped = open_local_index(args.collection).compact()
+        print(f"Compacted local '{args.collection}': dropped {dropped} superseded rows")
+        return
+    if args.command == "info" and is_local_collection(args.collection):
+        _print_local_info(args.collection)
+        return
+
+    client = get_qdrant_client()
+    if args.command == "sync":
+        start = perf_counter()
+        target = args.target or args.collection
+        n = sync_from_remote(client, args.collection, target=target)
+        print(f"Synced {n} points from '{args.collection}' into local '{target}' in {perf_counter() - start:.1f}s")
+        if not is_local_collection(target):
+            print(f"Note: add '{target}' to QAECORE_LOCAL_COLLECTIONS to serve it locally.")
+        return
+    if args.command == "create":
+        create_collection(client, args.collection, args.dim, profile=args.profile, recreate=args.recreate)
+        print(f"Created collection '{args.collection}' with profile={args.profile} dim={args.dim}")
+    elif args.command == "reconfigure":
+        reconfigure_collection(client, args.collection, args.profile)
+        print(f"Reconfigured '{args.collection}' to profile={args.profile} (segments re-optimize in the background)")
+    elif args.command == "info":
+        _print_info(client, args.collection)
+
+
+if __name__ == "__main__":
+    cli()
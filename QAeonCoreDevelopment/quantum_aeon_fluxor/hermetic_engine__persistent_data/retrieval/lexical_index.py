@@ -0,0 +1,172 @@
+"""Local BM25 lexical index (SQLite FTS5) per collection.
+
+Dense retrieval misses exact names, rare terms and quoted passages; this index catches them.
+It is built alongside the vector upserts during ingest and keyed by the same point ids, so
+lexical and dense hits can be fused (reciprocal-rank fusion, see `rrf_merge`).
+
+Layout: <dir>/<collection>.sqlite (default ./.lexical_index or QAECORE_LEXICAL_INDEX_DIR)
+    docs(rowid, point_id UNIQUE, payload JSON)   -- payload as stored in Qdrant
+    chunks FTS5(text)                             -- rowid-aligned with docs, full chunk text
+
+Pure stdlib; queries are BM25-ranked by FTS5 and typically answer in a few milliseconds.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import json
+import os
+import re
+import sqlite3
+import threading
+
+LEXICAL_INDEX_DIR_ENV = "QAECORE_LEXICAL_INDEX_DIR"
+DEFAULT_DIRNAME = ".lexical_index"
+RRF_K = 60
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Very common words add OR-branches without adding signal
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i in is it its of on or our she that the their "
+    "them they this to was we were what when where which who why will with you your".split()
+)
+
+
+def _index_dir() -> Path:
+    base = os.getenv(LEXICAL_INDEX_DIR_ENV)
+    p = Path(base).expanduser().resolve() if base else Path.cwd() / DEFAULT_DIRNAME
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 MATCH expression: quoted phrases kept, other terms OR-ed."""
+    parts: List[str] = []
+    for phrase in re.findall(r'"([^"]+)"', text):
+        toks = _TOKEN_RE.findall(phrase.lower())
+        if toks:
+            parts.append('"' + " ".join(toks) + '"')
+    rest = re.sub(r'"[^"]*"', " ", text)
+    seen = set()
+    for tok in _TOKEN_RE.findall(rest.lower()):
+        if tok in _STOPWORDS or tok in seen:
+            continue
+        seen.add(tok)
+        parts.append(f'"{tok}"')
+    return " OR ".join(parts) if parts else None
+
+
+class LexicalIndex:
+    def __init__(self, collection: str, root: Optional[Path] = None):
+        self.collection = collection
+        self.root = Path(root) if root else _index_dir()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / f"{collection.replace('/', '_')}.sqlite"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS docs (rowid INTEGER PRIMARY KEY, point_id TEXT UNIQUE, payload TEXT)")
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(text, tokenize='unicode61 remove_diacritics 2')"
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add(
+        self,
+        ids: Sequence[object],
+        texts: Sequence[str],
+        payloads: Optional[Sequence[dict]] = None,
+        replace: bool = False,
+    ) -> int:
+        """Index chunks in one transaction. Existing ids are skipped unless `replace`. Returns rows written."""
+        payloads = payloads if payloads is not None else [{} for _ in ids]
+        written = 0
+        with self._lock:
+            cur = self._conn.cursor()
+            for pid, text, payload in zip(ids, texts, payloads):
+                row = cur.execute("SELECT rowid FROM docs WHERE point_id=?", (str(pid),)).fetchone()
+                if row:
+                    if not replace:
+                        continue
+                    cur.execute("DELETE FROM chunks WHERE rowid=?", (row[0],))
+                    cur.execute("DELETE FROM docs WHERE rowid=?", (row[0],))
+                cur.execute(
+                    "INSERT INTO docs (point_id, payload) VALUES (?, ?)",
+                    (str(pid), json.dumps(payload or {}, ensure_ascii=False)),
+                )
+                cur.execute("INSERT INTO chunks (rowid, text) VALUES (?, ?)", (cur.lastrowid, text))
+                written += 1
+            self._conn.commit()
+        return written
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[float, str, dict]]:
+        """BM25 search; returns (score, point_id, payload) with higher score = better."""
+        match = build_match_query(query)
+        if not match:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.point_id, d.payload, bm25(chunks) AS s FROM chunks JOIN docs d ON d.rowid = chunks.rowid "
+                "WHERE chunks MATCH ? ORDER BY s LIMIT ?",
+                (match, k),
+            ).fetchall()
+        return [(-float(s), pid, json.loads(payload or "{}")) for pid, payload, s in rows]
+
+    def clear(self) -> int:
+        """Drop every indexed chunk (e.g. when the collection is recreated). Returns rows removed."""
+        with self._lock:
+            n = self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.execute("DELETE FROM docs")
+            self._conn.commit()
+        return n
+
+    def optimize(self) -> None:
+        """Merge FTS segments (smaller file, faster queries); run after bulk ingest."""
+        with self._lock:
+            self._conn.execute("INSERT INTO chunks(chunks) VALUES('optimize')")
+            self._conn.commit()
+
+
+_OPEN: Dict[str, LexicalIndex] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_lexical_index(collection: str) -> Optional[LexicalIndex]:
+    """Shared per-process handle for querying; None when no index was built for the collection."""
+    with _OPEN_LOCK:
+        idx = _OPEN.get(collection)
+        if idx is None:
+            if not (_index_dir() / f"{collection.replace('/', '_')}.sqlite").exists():
+                return None
+            idx = _OPEN[collection] = LexicalIndex(collection)
+        return idx
+
+
+def rrf_merge(
+    ranked_lists: Iterable[Sequence[Tuple[object, dict]]],
+    k: int,
+    rrf_k: int = RRF_K,
+) -> List[Tuple[float, dict]]:
+    """Reciprocal-rank fusion of ranked (id, payload) lists → top-k (rrf_score, payload).
+
+    score(d) = Σ 1 / (rrf_k + rank_i(d)); rank starts at 1. Robust to incomparable score
+    scales (cosine vs BM25), which is why we fuse on ranks only.
+    """
+    scores: Dict[str, float] = {}
+    payloads: Dict[str, dict] = {}
+    for ranked in ranked_lists:
+        for rank, (pid, payload) in enumerate(ranked, start=1):
+            key = str(pid)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            payloads.setdefault(key, payload or {})
+    best = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
+    return [(s, payloads[key]) for key, s in best]
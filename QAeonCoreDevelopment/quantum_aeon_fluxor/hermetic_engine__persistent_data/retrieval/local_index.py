@@ -0,0 +1,298 @@
+"""Embedded local vector index for small collections and offline operation.
+
+Collections named in QAECORE_LOCAL_COLLECTIONS (comma-separated, `*` = all) are served from
+this index instead of Qdrant: `qdrant_store` dispatches create/upsert/search to it, so the
+conversation collection or a notes collection of a few thousand points is searched without
+a network round trip, and tests can run ingest → search without a server.
+
+Layout: <dir>/<collection>/ (default ./.local_index or QAECORE_LOCAL_INDEX_DIR)
+    vectors.f32     raw float32 rows, L2-normalized, appended
+    ids             one point id per line, row-aligned with vectors.f32
+    payloads.jsonl  one JSON payload per line, row-aligned
+    meta.json       {"dim": <int>}
+    index.lock      inter-process lock held while rows are appended or files rewritten
+
+Rows are append-only and the latest row for an id wins (stale rows are masked at search
+time; `compact()` rewrites the files without them). Appends, compaction and reloads take
+the file lock, so a reader never sees another process's half-finished rewrite. Search is an exact brute-force cosine
+pass over the memory-mapped matrix — at this scale a single mat-vec is faster than
+maintaining an ANN structure, and results equal Qdrant's `exact=True` ground truth.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import json
+import os
+import threading
+
+import numpy as np
+from qdrant_client.http.models import Record, ScoredPoint
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.rescore import top_k
+from quantum_aeon_fluxor.utils.filelock import FileLock
+
+LOCAL_COLLECTIONS_ENV = "QAECORE_LOCAL_COLLECTIONS"
+LOCAL_INDEX_DIR_ENV = "QAECORE_LOCAL_INDEX_DIR"
+DEFAULT_DIRNAME = ".local_index"
+
+
+def _index_dir() -> Path:
+    base = os.getenv(LOCAL_INDEX_DIR_ENV)
+    return Path(base).expanduser().resolve() if base else Path.cwd() / DEFAULT_DIRNAME
+
+
+def local_collections() -> List[str]:
+    raw = os.getenv(LOCAL_COLLECTIONS_ENV, "")
+    return [c.strip() for c in raw.split(",") if c.strip()]
+
+
+def is_local_collection(name: str) -> bool:
+    names = local_collections()
+    return "*" in names or name in names
+
+
+def _normalize(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (mat / norms).astype(np.float32, copy=False)
+
+
+class LocalVectorIndex:
+    """Exact cosine index over a float32 matrix; persisted under `path` or purely in memory (path=None)."""
+
+    def __init__(self, collection: str, path: Optional[Path] = None):
+        self.collection = collection
+        self.path = Path(path) if path is not None else None
+        self.dim: Optional[int] = None
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._payloads: List[dict] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._loaded: Optional[Tuple[int, int]] = None  # (size, mtime_ns) of vectors.f32 last read
+        self.lock_path: Optional[Path] = None
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.lock_path = self.path / "index.lock"
+            self._read_meta()
+
+    # ---- persistence -------------------------------------------------
+
+    def _read_meta(self) -> None:
+        meta = self.path / "meta.json"
+        if meta.exists():
+            try:
+                self.dim = int(json.loads(meta.read_text(encoding="utf-8"))["dim"])
+            except Exception:
+                self.dim = None
+
+    def _signature(self) -> Tuple[int, int]:
+        try:
+            st = (self.path / "vectors.f32").stat()
+        except OSError:
+            return 0, 0
+        return st.st_size, st.st_mtime_ns
+
+    def _refresh(self, locked: bool = False) -> None:
+        """(Re)load from disk when vectors.f32 changed (e.g. written or compacted by another process).
+
+        The reload takes the file lock (unless the caller holds it) so it never sees a
+        half-finished append or compaction.
+        """
+        if self.path is None or self.dim is None:
+            return
+        if self._signature() == self._loaded:
+            return
+        if not locked:
+            with FileLock(self.lock_path):
+                return self._refresh(locked=True)
+        vec_path = self.path / "vectors.f32"
+        signature = self._signature()
+        size = signature[0]
+        n_rows = size // (4 * self.dim)
+        ids: List[str] = []
+        payloads: List[dict] = []
+        ids_path, pl_path = self.path / "ids", self.path / "payloads.jsonl"
+        if ids_path.exists() and pl_path.exists():
+            with ids_path.open("r", encoding="utf-8") as fi, pl_path.open("r", encoding="utf-8") as fp:
+                for line_id, line_pl in zip(fi, fp):
+                    if len(ids) >= n_rows:
+                        break  # metadata written but vector row not yet complete
+                    ids.append(line_id.rstrip("\n"))
+                    payloads.append(json.loads(line_pl))
+        n = len(ids)
+        self._matrix = (
+            np.memmap(vec_path, dtype=np.float32, mode="r", shape=(n, self.dim))
+            if n else np.zeros((0, self.dim), dtype=np.float32)
+        )
+        self._ids, self._payloads = ids, payloads
+        self._rebuild_rows()
+        self._loaded = signature
+
+    def _rebuild_rows(self) -> None:
+        self._rows = {pid: i for i, pid in enumerate(self._ids)}
+        live = np.zeros(len(self._ids), dtype=bool)
+        if self._rows:
+            live[list(self._rows.values())] = True
+        self._live = live
+
+    def _set_dim(self, dim: int) -> None:
+        if self.dim is None:
+            self.dim = dim
+            if self.path is not None:
+                (self.path / "meta.json").write_text(json.dumps({"dim": dim}), encoding="utf-8")
+            self._matrix = np.zeros((0, dim), dtype=np.float32)
+        elif dim != self.dim:
+            raise ValueError(f"vector dim {dim} != local index dim {self.dim} for {self.collection}")
+
+    # ---- API ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    def upsert(self, ids: Sequence[object], vectors: Sequence[Sequence[float]], payloads: Sequence[dict]) -> None:
+        mat = np.asarray(list(vectors), dtype=np.float32)
+        if mat.size == 0:
+            return
+        if mat.ndim != 2 or mat.shape[0] != len(ids) or len(payloads) != len(ids):
+            raise ValueError("ids, vectors and payloads must align")
+        mat = _normalize(mat)
+        str_ids = [str(i) for i in ids]
+        with self._lock:
+            if self.path is None:
+                self._set_dim(int(mat.shape[1]))
+                self._matrix = np.vstack([self._matrix, mat]) if len(self._matrix) else mat
+                self._ids.extend(str_ids)
+                self._payloads.extend(dict(p or {}) for p in payloads)
+                self._rebuild_rows()
+                return
+            with FileLock(self.lock_path):
+                if self.dim is None:
+                    self._read_meta()  # another process may have created the index
+                self._set_dim(int(mat.shape[1]))
+                # vectors last: readers only trust metadata backed by a complete row
+                with (self.path / "ids").open("a", encoding="utf-8") as f:
+                    f.write("".join(f"{i}\n" for i in str_ids))
+                with (self.path / "payloads.jsonl").open("a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(p or {}, ensure_ascii=False) + "\n" for p in payloads))
+                with (self.path / "vectors.f32").open("ab") as f:
+                    f.write(mat.tobytes())
+
+    def search(self, query_vector: Sequence[float], limit: int = 5, with_vectors: bool = False) -> List[ScoredPoint]:
+        q = np.asarray(query_vector, dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        with self._lock:
+            self._refresh()
+            if not self._rows:
+                return []
+            scores = np.asarray(self._matrix @ q, dtype=np.float32)
+            scores[~self._live] = -np.inf
+            order = top_k(scores, min(limit, len(self._rows)))
+            return [
+                ScoredPoint(
+                    id=self._ids[j],
+                    version=0,
+                    score=float(scores[j]),
+                    payload=self._payloads[j],
+                    vector=self._matrix[j].tolist() if with_vectors else None,
+                )
+                for j in order
+            ]
+
+    def retrieve(self, ids: Sequence[object], with_vectors: bool = False) -> List[Record]:
+        with self._lock:
+            self._refresh()
+            out = []
+            for pid in ids:
+                j = self._rows.get(str(pid))
+                if j is not None:
+                    vec = self._matrix[j].tolist() if with_vectors else None
+                    out.append(Record(id=self._ids[j], payload=self._payloads[j], vector=vec))
+            return out
+
+    def compact(self) -> int:
+        """Rewrite the files keeping only the latest row per id; returns rows dropped."""
+        with self._lock:
+            if self.path is None:
+                return self._compact()
+            with FileLock(self.lock_path):
+                self._refresh(locked=True)
+                return self._compact()
+
+    def _compact(self) -> int:
+        keep = sorted(self._rows.values())
+        dropped = len(self._ids) - len(keep)
+        if not dropped:
+            return 0
+        mat = np.asarray(self._matrix[keep])
+        ids = [self._ids[j] for j in keep]
+        payloads = [self._payloads[j] for j in keep]
+        if self.path is None:
+            self._matrix, self._ids, self._payloads = mat, ids, payloads
+            self._rebuild_rows()
+            return dropped
+        self._matrix = np.zeros((0, self.dim), dtype=np.float32)  # release the memmap before replacing the file
+        self._loaded = None
+        for name, data in (
+            ("ids", "".join(f"{i}\n" for i in ids).encode("utf-8")),
+            ("payloads.jsonl", "".join(json.dumps(p, ensure_ascii=False) + "\n" for p in payloads).encode("utf-8")),
+            ("vectors.f32", mat.tobytes()),
+        ):
+            tmp = self.path / f"{name}.tmp"
+            tmp.write_bytes(data)
+            os.replace(tmp, self.path / name)
+        self._refresh(locked=True)
+        return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+            if self.path is not None:
+                with FileLock(self.lock_path):
+                    for name in ("ids", "payloads.jsonl", "vectors.f32", "meta.json"):
+                        (self.path / name).unlink(missing_ok=True)
+            self.dim = None
+            self._ids, self._payloads, self._rows = [], [], {}
+            self._live = np.zeros(0, dtype=bool)
+            self._loaded = None
+
+
+_OPEN: Dict[Tuple[str, str], LocalVectorIndex] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_local_index(collection: str) -> LocalVectorIndex:
+    """Shared per-process handle for a local collection (created on first use)."""
+    root = _index_dir()
+    key = (str(root), collection)
+    with _OPEN_LOCK:
+        idx = _OPEN.get(key)
+        if idx is None:
+            idx = _OPEN[key] = LocalVectorIndex(collection, root / collection.replace("/", "_"))
+        return idx
+
+
+def sync_from_remote(client, collection: str, target: Optional[str] = None, batch: int = 256) -> int:
+    """Pull all points (vectors + payloads) of a remote Qdrant collection into a local index.
+
+    The local copy is rebuilt from scratch so deletions on the server are reflected.
+    Returns the number of points copied.
+    """
+    idx = open_local_index(target or collection)
+    idx.clear()
+    copied = 0
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection, limit=batch, offset=offset, with_payload=True, with_vectors=True
+        )
+        got = [p for p in points if isinstance(p.vector, list)]
+        if got:
+            idx.upsert([p.id for p in got], [p.vector for p in got], [p.payload or {} for p in got])
+            copied += len(got)
+        if offset is None:
+            break
+    return copied
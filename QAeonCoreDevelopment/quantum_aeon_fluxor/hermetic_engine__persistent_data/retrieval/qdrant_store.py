@@ -1,10 +1,111 @@
 from __future__ import annotations
-from typing import List, Optional, Iterable
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Iterable, Tuple
 import os
+import threading
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from qdrant_client.http.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Disabled,
+    Distance,
+    HnswConfigDiff,
+    PointStruct,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+    VectorParamsDiff,
+)
 from qdrant_client.http.exceptions import ResponseHandlingException
 
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.local_index import (
+    is_local_collection,
+    open_local_index,
+)
+from quantum_aeon_fluxor.utils.tracing import span
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Storage / index layout for a collection plus its default search-time knobs.
+
+    HNSW values are always explicit so that reconfiguring back to a lighter profile fully
+    reverts an earlier one.
+    """
+    name: str
+    description: str
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_on_disk: bool = False
+    on_disk: bool = False  # original full-precision vectors memory-mapped from disk
+    quantization: Optional[str] = None  # "scalar" | "binary"
+    quantization_always_ram: bool = True
+    search_ef: Optional[int] = None
+    rescore: Optional[bool] = None
+    oversampling: Optional[float] = None
+
+    def vectors_config(self, vector_size: int) -> VectorParams:
+        return VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=self.on_disk or None)
+
+    def hnsw_config(self) -> HnswConfigDiff:
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct, on_disk=self.hnsw_on_disk)
+
+    def quantization_config(self):
+        if self.quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=self.quantization_always_ram)
+            )
+        if self.quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=self.quantization_always_ram))
+        return None
+
+
+COLLECTION_PROFILES: Dict[str, CollectionProfile] = {
+    p.name: p
+    for p in (
+        CollectionProfile("default", "Qdrant defaults: in-RAM float32 vectors, m=16, ef_construct=100"),
+        CollectionProfile(
+            "fast-ram",
+            "Everything in RAM, denser HNSW graph for best recall/latency (highest memory)",
+            hnsw_m=32,
+            hnsw_ef_construct=256,
+            search_ef=128,
+        ),
+        CollectionProfile(
+            "quantized",
+            "int8 scalar quantization in RAM, originals on disk, rescored with oversampling (~4x less RAM)",
+            hnsw_ef_construct=128,
+            on_disk=True,
+            quantization="scalar",
+            search_ef=128,
+            rescore=True,
+            oversampling=2.0,
+        ),
+        CollectionProfile(
+            "disk-heavy",
+            "Binary quantization in RAM, originals + HNSW graph on disk (~32x less RAM, slower rescoring)",
+            hnsw_on_disk=True,
+            on_disk=True,
+            quantization="binary",
+            search_ef=64,
+            rescore=True,
+            oversampling=3.0,
+        ),
+    )
+}
+
+
+def get_profile(name: Optional[str]) -> CollectionProfile:
+    if not name:
+        return COLLECTION_PROFILES["default"]
+    try:
+        return COLLECTION_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown collection profile: {name}. Choose from: {', '.join(COLLECTION_PROFILES)}")
+
 
 def _normalize_url(url: str) -> str:
     if not url.startswith("http://") and not url.startswith("https://"):
@@ -26,15 +127,24 @@ def _toggle_port(url: str) -> str:
     return url
 
 
+_CLIENTS: Dict[Tuple[str, Optional[str]], QdrantClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+_dotenv_loaded = False
+
+
 def get_qdrant_client() -> QdrantClient:
-    # Load .env if available
-    try:
-        from dotenv import load_dotenv, find_dotenv
-        env_path = find_dotenv(usecwd=True)
-        if env_path:
-            load_dotenv(env_path)
-    except Exception:
-        pass
+    """Shared client per (url, api key); the connectivity ping runs once per process."""
+    global _dotenv_loaded
+    # Load .env if available (once; the lookup walks parent directories)
+    if not _dotenv_loaded:
+        _dotenv_loaded = True
+        try:
+            from dotenv import load_dotenv, find_dotenv
+            env_path = find_dotenv(usecwd=True)
+            if env_path:
+                load_dotenv(env_path)
+        except Exception:
+            pass
 
     url = os.getenv("QDRANT_URL") or os.getenv("QDRANT_ENDPOINT")
     api_key = os.getenv("QDRANT_API_KEY") or os.getenv("QDRANT_API_TOKEN")
@@ -48,15 +158,57 @@ def get_qdrant_client() -> QdrantClient:
         client.get_collections()
         return client
 
-    # attempt primary
-    try:
-        return _try(url)
-    except Exception:
-        # attempt toggled port
-        return _try(_toggle_port(url))
+    with _CLIENTS_LOCK:
+        key = (url, api_key)
+        client = _CLIENTS.get(key)
+        if client is not None:
+            return client
+        # attempt primary
+        try:
+            client = _try(url)
+        except Exception:
+            # attempt toggled port
+            client = _try(_toggle_port(url))
+        _CLIENTS[key] = client
+        return client
+
+
+def client_for(collection: str) -> Optional[QdrantClient]:
+    """Qdrant client for a remote collection; None for collections served by the local index."""
+    if is_local_collection(collection):
+        return None
+    return get_qdrant_client()
+
+
+def create_collection(
+    client: Optional[QdrantClient],
+    name: str,
+    vector_size: int,
+    profile: Optional[str] = None,
+    recreate: bool = False,
+) -> None:
+    """Create `name` with the storage layout of the given profile (dropping it first if `recreate`).
+
+    Local collections have no server-side layout; `recreate` empties them.
+    """
+    prof = get_profile(profile)
+    if is_local_collection(name):
+        if recreate:
+            open_local_index(name).clear()
+        return
+    if recreate and client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=prof.vectors_config(vector_size),
+        hnsw_config=prof.hnsw_config(),
+        quantization_config=prof.quantization_config(),
+    )
 
 
-def ensure_collection(client: QdrantClient, name: str, vector_size: int) -> None:
+def ensure_collection(client: Optional[QdrantClient], name: str, vector_size: int, profile: Optional[str] = None) -> None:
+    if is_local_collection(name):
+        return  # created on first upsert
     exists = False
     try:
         coll = client.get_collection(name)
@@ -66,14 +218,28 @@ def ensure_collection(client: QdrantClient, name: str, vector_size: int) -> None
     except Exception:
         exists = False
     if not exists:
-        client.recreate_collection(
-            collection_name=name,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
-        )
+        create_collection(client, name, vector_size, profile=profile)
+
+
+def reconfigure_collection(client: QdrantClient, name: str, profile: str) -> None:
+    """Apply a profile to an existing collection in place (Qdrant re-optimizes segments in the background).
+
+    Quantization is disabled when the target profile has none, so switching back to
+    `default`/`fast-ram` releases the quantized copies.
+    """
+    prof = get_profile(profile)
+    if is_local_collection(name):
+        raise ValueError(f"'{name}' is served by the local index; profiles apply to Qdrant collections only")
+    client.update_collection(
+        collection_name=name,
+        vectors_config={"": VectorParamsDiff(on_disk=prof.on_disk)},
+        hnsw_config=prof.hnsw_config(),
+        quantization_config=prof.quantization_config() or Disabled.DISABLED,
+    )
 
 
 def upsert_chunks(
-    client: QdrantClient,
+    client: Optional[QdrantClient],
     collection: str,
     vectors: List[List[float]],
     payloads: List[dict],
@@ -81,16 +247,65 @@ def upsert_chunks(
 ) -> None:
     if ids is None:
         ids = [str(i) for i in range(1, len(vectors) + 1)]
-    points = [
-        PointStruct(id=i, vector=v, payload=p) for i, v, p in zip(ids, vectors, payloads)
-    ]
-    client.upsert(collection_name=collection, points=points)
+    local = is_local_collection(collection)
+    with span("qdrant.upsert", collection=collection, points=len(vectors), local=local):
+        if local:
+            open_local_index(collection).upsert(ids, vectors, payloads)
+            return
+        points = [
+            PointStruct(id=i, vector=v, payload=p) for i, v, p in zip(ids, vectors, payloads)
+        ]
+        client.upsert(collection_name=collection, points=points)
+
+
+def search_params(
+    profile: Optional[str] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: bool = False,
+    rescore: Optional[bool] = None,
+    oversampling: Optional[float] = None,
+) -> Optional[SearchParams]:
+    """Build search-time parameters; explicit values override the profile defaults."""
+    prof = get_profile(profile)
+    ef = hnsw_ef if hnsw_ef is not None else prof.search_ef
+    rs = rescore if rescore is not None else prof.rescore
+    ov = oversampling if oversampling is not None else prof.oversampling
+    quant = QuantizationSearchParams(rescore=rs, oversampling=ov) if (rs is not None or ov is not None) else None
+    if ef is None and not exact and quant is None:
+        return None
+    return SearchParams(hnsw_ef=ef, exact=exact, quantization=quant)
 
 
 def search_by_vector(
-    client: QdrantClient,
+    client: Optional[QdrantClient],
     collection: str,
     query_vector: List[float],
     limit: int = 5,
+    *,
+    profile: Optional[str] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: bool = False,
+    rescore: Optional[bool] = None,
+    oversampling: Optional[float] = None,
+    with_vectors: bool = False,
 ):
-    return client.search(collection_name=collection, query_vector=query_vector, limit=limit)
+    """Nearest-neighbour search returning scored points (`.id`, `.score`, `.payload`).
+
+    `hnsw_ef` widens the HNSW beam, `exact` forces a full scan (ground truth), and
+    `rescore`/`oversampling` control how quantized candidates are re-ranked server-side.
+    Local collections are always searched exactly, so those knobs do not apply to them.
+    """
+    local = is_local_collection(collection)
+    with span("qdrant.search", collection=collection, limit=limit, local=local):
+        if local:
+            return open_local_index(collection).search(query_vector, limit, with_vectors=with_vectors)
+        params = search_params(profile, hnsw_ef=hnsw_ef, exact=exact, rescore=rescore, oversampling=oversampling)
+        res = client.query_points(
+            collection_name=collection,
+            query=query_vector,
+            limit=limit,
+            search_params=params,
+            with_payload=True,
+            with_vectors=with_vectors,
+        )
+        return res.points
@@ -0,0 +1,92 @@
+"""Second-stage rescoring of oversampled candidates with full-precision vectors.
+
+The first stage asks the vector store for k×N candidates using its cheap (quantized /
+approximate) index; this module re-ranks them exactly with a single vectorized
+cosine-similarity pass and keeps the top k.
+"""
+from __future__ import annotations
+from time import perf_counter
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.vector_cache import VectorCache
+from quantum_aeon_fluxor.utils.metrics import log_event
+
+
+def cosine_scores(query: Sequence[float], matrix: np.ndarray) -> np.ndarray:
+    q = np.asarray(query, dtype=np.float32)
+    m = np.asarray(matrix, dtype=np.float32)
+    denom = np.linalg.norm(m, axis=1) * (np.linalg.norm(q) or 1.0)
+    denom[denom == 0] = 1.0
+    return (m @ q) / denom
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first (argpartition, then sort only the winners)."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    part = np.argpartition(-scores, k)[:k]
+    return part[np.argsort(-scores[part])]
+
+
+def rescore_hits(
+    client,
+    collection: str,
+    query_vector: Sequence[float],
+    hits: list,
+    k: int,
+    cache: Optional[VectorCache] = None,
+) -> List[Tuple[float, object, dict]]:
+    """Re-rank scored points by exact cosine similarity; returns top-k (score, point_id, payload).
+
+    Vectors come from the local VectorCache first; misses are fetched once from Qdrant
+    (`retrieve(with_vectors=True)` returns the original, unquantized vectors) and written
+    back to the cache. Candidates whose vector cannot be found keep their first-stage score.
+    """
+    if not hits:
+        return []
+    start = perf_counter()
+    if cache is None:
+        cache = VectorCache(collection)
+    ids = [h.id for h in hits]
+    by_id = {str(h.id): h for h in hits}
+    found, mat = cache.get(ids)
+    vectors = {str(i): row for i, row in zip(found, mat)} if mat is not None else {}
+    missing = [i for i in ids if str(i) not in vectors]
+    fetched = 0
+    if missing and client is not None:
+        try:
+            points = client.retrieve(collection_name=collection, ids=missing, with_payload=False, with_vectors=True)
+            got = [(p.id, p.vector) for p in points if isinstance(p.vector, list)]
+            if got:
+                cache.put([i for i, _ in got], [v for _, v in got])
+                for i, v in got:
+                    vectors[str(i)] = np.asarray(v, dtype=np.float32)
+                fetched = len(got)
+        except Exception as e:
+            log_event("retrieval", "rescore:fetch_error", collection=collection, error=str(e))
+
+    keys = [str(i) for i in ids if str(i) in vectors]
+    out: List[Tuple[float, object, dict]] = []
+    if keys:
+        scores = cosine_scores(query_vector, np.stack([vectors[key] for key in keys]))
+        for j in top_k(scores, min(k, len(keys))):
+            hit = by_id[keys[j]]
+            out.append((float(scores[j]), hit.id, hit.payload or {}))
+    # candidates without vectors fall back to their first-stage score
+    for key in (str(i) for i in ids if str(i) not in vectors):
+        hit = by_id[key]
+        out.append((float(hit.score), hit.id, hit.payload or {}))
+    out.sort(key=lambda x: x[0], reverse=True)
+    log_event(
+        "retrieval",
+        "rescore",
+        collection=collection,
+        candidates=len(hits),
+        cache_hits=len(found),
+        fetched=fetched,
+        k=k,
+        duration_ms=round((perf_counter() - start) * 1000.0, 3),
+    )
+    return out[:k]
@@ -1,7 +1,10 @@
 from __future__ import annotations
 import argparse
 import json
-from typing import List, Tuple
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
 
 # Ensure env loads if present
 try:
@@ -13,17 +16,167 @@ except Exception:
     pass
 
 from .search_text import search_text, DEFAULT_COLLECTION  # noqa: E402
+from .qdrant_store import COLLECTION_PROFILES  # noqa: E402
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.query_cache import embed_queries  # noqa: E402
+from quantum_aeon_fluxor.utils.metrics import log_event  # noqa: E402
+
+
+def _read_queries(src: TextIO) -> Iterator[Tuple[str, str]]:
+    """Yield (id, query) from lines of plain text or JSON objects {"id", "query"|"text"}."""
+    n = 0
+    for line in src:
+        line = line.strip()
+        if not line:
+            continue
+        n += 1
+        if line.startswith("{"):
+            try:
+                obj = json.loads(line)
+                text = obj.get("query") or obj.get("text") or ""
+                if text:
+                    yield str(obj.get("id", n)), text
+                continue
+            except json.JSONDecodeError:
+                pass
+        yield str(n), line
+
+
+def _chunks(items: Iterator[Tuple[str, str]], size: int) -> Iterator[List[Tuple[str, str]]]:
+    buf: List[Tuple[str, str]] = []
+    for item in items:
+        buf.append(item)
+        if len(buf) >= size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def run_batch(
+    src: TextIO,
+    out: TextIO,
+    collections: List[str],
+    k: int = 5,
+    *,
+    embed_batch: int = 32,
+    workers: int = 8,
+    **search_kwargs,
+) -> Dict[str, int]:
+    """Search every query of `src` in every collection, streaming one JSONL record per (query, collection).
+
+    Queries are read and embedded `embed_batch` at a time (one embedding request per batch,
+    cached), then searched concurrently; records keep input order. A failing search, or a
+    failing embedding request (throttling, network) for the queries of that batch, yields
+    records with `error` instead of aborting the run.
+    """
+    totals = {"queries": 0, "errors": 0}
+    start = perf_counter()
+
+    def _one(qid: str, text: str, vec: List[float], coll: str, embed_ms: float) -> dict:
+        t0 = perf_counter()
+        rec = {"id": qid, "query": text, "collection": coll}
+        try:
+            hits = search_text(text, collection=coll, k=k, query_vector=vec, **search_kwargs)
+            rec["results"] = [{"score": score, **(payload or {})} for score, payload in hits]
+        except Exception as e:
+            rec["error"] = str(e)
+        rec["latency_ms"] = round((perf_counter() - t0) * 1000.0, 3)
+        rec["embed_ms"] = embed_ms
+        return rec
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="qaf-search") as pool:
+        for chunk in _chunks(_read_queries(src), max(1, embed_batch)):
+            t0 = perf_counter()
+            try:
+                vectors = embed_queries([text for _, text in chunk])
+            except Exception as e:
+                embed_ms = round((perf_counter() - t0) * 1000.0 / len(chunk), 3)
+                log_event("retrieval", "search_batch:embed_error", queries=len(chunk), error=str(e))
+                for qid, text in chunk:
+                    for coll in collections:
+                        rec = {"id": qid, "query": text, "collection": coll, "error": f"embed: {e}",
+                               "latency_ms": 0.0, "embed_ms": embed_ms}
+                        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                        totals["errors"] += 1
+                out.flush()
+                totals["queries"] += len(chunk)
+                continue
+            embed_ms = round((perf_counter() - t0) * 1000.0 / len(chunk), 3)  # amortized per query
+            futures = [
+                pool.submit(_one, qid, text, vec, coll, embed_ms)
+                for (qid, text), vec in zip(chunk, vectors)
+                for coll in collections
+            ]
+            for fut in futures:
+                rec = fut.result()
+                totals["errors"] += "error" in rec
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            out.flush()
+            totals["queries"] += len(chunk)
+    log_event(
+        "retrieval",
+        "search_batch",
+        collections=len(collections),
+        duration_ms=round((perf_counter() - start) * 1000.0, 3),
+        **totals,
+    )
+    return totals
 
 
 def cli():
     parser = argparse.ArgumentParser(description="Search Qdrant collection using Gemini-embedded query.")
-    parser.add_argument("text", help="Query text")
+    parser.add_argument("text", nargs="?", help="Query text (omit with --batch)")
     parser.add_argument("--collection", default=DEFAULT_COLLECTION, help="Collection name")
+    parser.add_argument("--collections", default=None,
+                        help="Comma-separated collections to search (batch mode; overrides --collection)")
     parser.add_argument("--k", type=int, default=5, help="Number of results")
     parser.add_argument("--json", action="store_true", help="Output JSON")
+    parser.add_argument("--collection-profile", choices=list(COLLECTION_PROFILES), default=None,
+                        help="Use the search-time defaults (ef/rescore/oversampling) of this collection profile")
+    parser.add_argument("--ef", type=int, default=None, help="HNSW ef (beam width) for this search")
+    parser.add_argument("--exact", action="store_true", help="Exact full-scan search (ground truth, slow)")
+    parser.add_argument("--oversample", type=int, default=1,
+                        help="Fetch k*N candidates and rescore locally with full-precision vectors")
+    parser.add_argument("--hybrid", action="store_true",
+                        help="Fuse dense results with the local BM25 index (reciprocal-rank fusion)")
+    parser.add_argument("--batch", default=None, metavar="FILE",
+                        help="Read queries (one per line, or JSON {id, query}) from FILE or '-' for stdin; "
+                             "write JSONL results")
+    parser.add_argument("--output", default=None, help="Batch output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent searches in batch mode")
+    parser.add_argument("--embed-batch", type=int, default=32, help="Queries embedded per request in batch mode")
     args = parser.parse_args()
 
-    results = search_text(args.text, collection=args.collection, k=args.k)
+    search_kwargs = dict(
+        profile=args.collection_profile,
+        hnsw_ef=args.ef,
+        exact=args.exact,
+        oversample=args.oversample,
+        hybrid=args.hybrid,
+    )
+
+    if args.batch:
+        collections = [c.strip() for c in (args.collections or args.collection).split(",") if c.strip()]
+        src: TextIO = sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8")
+        sink: Optional[TextIO] = open(args.output, "w", encoding="utf-8") if args.output else None
+        try:
+            totals = run_batch(
+                src, sink or sys.stdout, collections, args.k,
+                embed_batch=args.embed_batch, workers=args.workers, **search_kwargs,
+            )
+        finally:
+            if src is not sys.stdin:
+                src.close()
+            if sink is not None:
+                sink.close()
+        print(f"[batch] {totals['queries']} queries x {len(collections)} collections, {totals['errors']} errors",
+              file=sys.stderr)
+        return
+
+    if not args.text:
+        parser.error("query text is required unless --batch is given")
+
+    results = search_text(args.text, collection=args.collection, k=args.k, **search_kwargs)
 
     if args.json:
         out = [
@@ -1,23 +1,114 @@
 from __future__ import annotations
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import List, Optional, Tuple
 
-from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.gemini_embedder import GeminiEmbedder
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.query_cache import embed_query
 from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import (
-    get_qdrant_client,
+    client_for,
     search_by_vector,
 )
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.rescore import rescore_hits
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.lexical_index import (
+    open_lexical_index,
+    rrf_merge,
+)
+from quantum_aeon_fluxor.utils.metrics import log_event
+from quantum_aeon_fluxor.utils.tracing import bind, span
 
 DEFAULT_COLLECTION = "qaecore_longterm_v1"
+HYBRID_FETCH_FACTOR = 2  # each ranker contributes k*2 candidates to the fusion
+
+_lexical_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _lexical_executor() -> ThreadPoolExecutor:
+    global _lexical_pool
+    if _lexical_pool is None:
+        _lexical_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="qaf-lexical")
+    return _lexical_pool
+
+
+def _lexical_hits(query: str, collection: str, k: int) -> Tuple[List[Tuple[float, str, dict]], float]:
+    start = perf_counter()
+    with span("retrieval.lexical", collection=collection, k=k):
+        idx = open_lexical_index(collection)
+        hits = idx.search(query, k) if idx is not None else []
+    return hits, (perf_counter() - start) * 1000.0
+
+
+def _dense_hits(
+    query: str,
+    collection: str,
+    k: int,
+    profile: Optional[str],
+    hnsw_ef: Optional[int],
+    exact: bool,
+    oversample: int,
+    query_vector: Optional[List[float]] = None,
+) -> List[Tuple[float, object, dict]]:
+    vec = query_vector if query_vector is not None else embed_query(query)
+    client = client_for(collection)
+    # local collections are searched exactly; nothing to gain from a second stage
+    if oversample > 1 and client is not None:
+        candidates = search_by_vector(
+            client, collection, vec, limit=k * oversample, profile=profile, hnsw_ef=hnsw_ef, exact=exact, rescore=False
+        )
+        return rescore_hits(client, collection, vec, candidates, k)
+    results = search_by_vector(client, collection, vec, limit=k, profile=profile, hnsw_ef=hnsw_ef, exact=exact)
+    return [(float(r.score), r.id, r.payload or {}) for r in results]
+
+
+def search_text(
+    query: str,
+    collection: str = DEFAULT_COLLECTION,
+    k: int = 5,
+    *,
+    profile: Optional[str] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: bool = False,
+    oversample: int = 1,
+    hybrid: bool = False,
+    query_vector: Optional[List[float]] = None,
+) -> List[Tuple[float, dict]]:
+    """Embed a query string and search Qdrant. Returns (score, payload) list.
+
+    Query vectors go through the shared query embedding cache (`embedding.query_cache`), so
+    repeated queries skip the embedding round trip; pass `query_vector` when the query was
+    already embedded (e.g. batch mode).
+
+    `profile` selects the search-time defaults (ef / rescore / oversampling) of a collection
+    profile; `hnsw_ef` and `exact` override them.
+
+    With `oversample > 1` the search is two-stage: k×oversample candidates are fetched from
+    the (possibly quantized) index without server-side rescoring, then re-ranked locally
+    against full-precision vectors (see `rescore.rescore_hits`) and cut to k.
 
+    With `hybrid` the local BM25 index (see `lexical_index`) is queried concurrently with the
+    dense search and both rankings are merged by reciprocal-rank fusion; scores are then RRF
+    scores. Collections without a lexical index degrade to dense-only results.
+    """
+    with span("retrieval.search_text", collection=collection, k=k, hybrid=hybrid, oversample=oversample):
+        if not hybrid:
+            return [(s, p) for s, _, p in _dense_hits(query, collection, k, profile, hnsw_ef, exact, oversample, query_vector)]
 
-def search_text(query: str, collection: str = DEFAULT_COLLECTION, k: int = 5) -> List[Tuple[float, dict]]:
-    """Embed a query string and search Qdrant. Returns (score, payload) list."""
-    embedder = GeminiEmbedder()
-    vec = embedder.embed_texts([query])[0]
-    client = get_qdrant_client()
-    results = search_by_vector(client, collection, vec, limit=k)
-    out: List[Tuple[float, dict]] = []
-    for r in results:
-        payload = r.payload or {}
-        out.append((float(r.score), payload))
-    return out
+        fetch = k * HYBRID_FETCH_FACTOR
+        lexical_future = _lexical_executor().submit(bind(_lexical_hits), query, collection, fetch)
+        dense = _dense_hits(query, collection, fetch, profile, hnsw_ef, exact, oversample, query_vector)
+        try:
+            lexical, lexical_ms = lexical_future.result()
+        except Exception as e:
+            log_event("retrieval", "lexical:error", collection=collection, error=str(e))
+            lexical, lexical_ms = [], 0.0
+        merged = rrf_merge([[(i, p) for _, i, p in dense], [(i, p) for _, i, p in lexical]], k)
+        overlap = len({str(i) for _, i, _ in dense} & {str(i) for _, i, _ in lexical})
+        log_event(
+            "retrieval",
+            "hybrid",
+            collection=collection,
+            dense=len(dense),
+            lexical=len(lexical),
+            overlap=overlap,
+            lexical_ms=round(lexical_ms, 3),
+        )
+        return merged
@@ -0,0 +1,166 @@
+"""Local full-precision vector cache (per collection).
+
+Keeps float32 copies of point vectors on disk so quantized / approximate search results
+can be rescored locally without pulling 3072-float vectors over the network again.
+
+Layout under the cache dir (default ./.vector_cache or QAECORE_VECTOR_CACHE_DIR):
+    <collection>.f32   raw float32 rows, appended
+    <collection>.ids   one point id per line, row-aligned with .f32
+    <collection>.json  {"dim": <int>}
+    <collection>.lock  inter-process lock held while rows are appended or files rewritten
+
+Rows are append-only; re-putting an id appends a new row and the latest row wins, and
+`compact` rewrites the files with one row per id. Writers take the file lock around both
+appends, so concurrent ingests cannot interleave vectors and ids. The matrix is
+memory-mapped on read, so lookups stay cheap for large collections.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import json
+import os
+import threading
+
+import numpy as np
+
+from quantum_aeon_fluxor.utils.filelock import FileLock
+
+VECTOR_CACHE_DIR_ENV = "QAECORE_VECTOR_CACHE_DIR"
+DEFAULT_DIRNAME = ".vector_cache"
+
+
+def _cache_dir() -> Path:
+    base = os.getenv(VECTOR_CACHE_DIR_ENV)
+    p = Path(base).expanduser().resolve() if base else Path.cwd() / DEFAULT_DIRNAME
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+
+class VectorCache:
+    def __init__(self, collection: str, root: Optional[Path] = None):
+        self.collection = collection
+        self.root = Path(root) if root else _cache_dir()
+        self.root.mkdir(parents=True, exist_ok=True)
+        safe = collection.replace("/", "_")
+        self.vec_path = self.root / f"{safe}.f32"
+        self.ids_path = self.root / f"{safe}.ids"
+        self.meta_path = self.root / f"{safe}.json"
+        self.lock_path = self.root / f"{safe}.lock"
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        self._loaded: Optional[Tuple[int, int]] = None  # (size, mtime_ns) of the .f32 last read
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self._read_meta()
+
+    def _read_meta(self) -> None:
+        self.dim = None
+        if self.meta_path.exists():
+            try:
+                self.dim = int(json.loads(self.meta_path.read_text(encoding="utf-8"))["dim"])
+            except Exception:
+                self.dim = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.vec_path.stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _refresh(self, locked: bool = False) -> None:
+        """(Re)load the id index and memmap if the files changed since last read (e.g. another process).
+
+        The reload takes the file lock (unless the caller holds it) so it never sees a
+        half-finished append, clear or compaction.
+        """
+        if self._signature() == self._loaded:
+            return
+        if not locked:
+            with FileLock(self.lock_path):
+                return self._refresh(locked=True)
+        self._read_meta()
+        try:
+            st = self.vec_path.stat()
+        except OSError:
+            st = None
+        if self.dim is None or st is None:
+            self._rows, self._matrix, self._loaded = {}, None, None
+            return
+        size = st.st_size
+        n_rows = size // (4 * self.dim)
+        rows: Dict[str, int] = {}
+        if self.ids_path.exists():
+            with self.ids_path.open("r", encoding="utf-8") as f:
+                for i, line in enumerate(f):
+                    if i >= n_rows:
+                        break  # ids written but vector row not yet complete
+                    rows[line.rstrip("\n")] = i
+        self._rows = rows
+        self._matrix = np.memmap(self.vec_path, dtype=np.float32, mode="r", shape=(n_rows, self.dim)) if n_rows else None
+        self._loaded = (size, st.st_mtime_ns)
+
+    def put(self, ids: Sequence[object], vectors: Iterable[Sequence[float]]) -> None:
+        mat = np.asarray(list(vectors), dtype=np.float32)
+        if mat.size == 0:
+            return
+        if mat.ndim != 2 or mat.shape[0] != len(ids):
+            raise ValueError("ids and vectors must align")
+        with self._lock, FileLock(self.lock_path):
+            self._read_meta()  # another process may have created or cleared the cache
+            if self.dim is None:
+                self.dim = int(mat.shape[1])
+                self.meta_path.write_text(json.dumps({"dim": self.dim}), encoding="utf-8")
+            elif mat.shape[1] != self.dim:
+                raise ValueError(f"vector dim {mat.shape[1]} != cache dim {self.dim} for {self.collection}")
+            # vectors first, ids second: readers only trust ids backed by a complete row
+            with self.vec_path.open("ab") as f:
+                f.write(mat.tobytes())
+            with self.ids_path.open("a", encoding="utf-8") as f:
+                f.write("".join(f"{i}\n" for i in ids))
+
+    def clear(self) -> None:
+        """Remove all rows and the recorded dim (e.g. when the collection is recreated)."""
+        with self._lock, FileLock(self.lock_path):
+            self._matrix = None
+            for path in (self.vec_path, self.ids_path, self.meta_path):
+                path.unlink(missing_ok=True)
+            self.dim = None
+            self._rows, self._loaded = {}, None
+
+    def compact(self) -> int:
+        """Rewrite the files with only the latest row per id; returns the number of rows dropped."""
+        with self._lock, FileLock(self.lock_path):
+            self._matrix, self._loaded = None, None
+            self._refresh(locked=True)
+            if self._matrix is None or len(self._rows) == self._matrix.shape[0]:
+                return 0
+            n_rows = self._matrix.shape[0]
+            ids = sorted(self._rows, key=self._rows.get)
+            mat = np.asarray(self._matrix[[self._rows[i] for i in ids]])
+            self._matrix = None  # release the memmap before replacing the file
+            tmp_vec = self.vec_path.with_suffix(".f32.tmp")
+            tmp_ids = self.ids_path.with_suffix(".ids.tmp")
+            tmp_vec.write_bytes(mat.tobytes())
+            tmp_ids.write_text("".join(f"{i}\n" for i in ids), encoding="utf-8")
+            os.replace(tmp_ids, self.ids_path)
+            os.replace(tmp_vec, self.vec_path)
+            self._refresh(locked=True)
+            return n_rows - len(ids)
+
+    def get(self, ids: Sequence[object]) -> Tuple[List[object], Optional[np.ndarray]]:
+        """Return (found_ids, matrix) with matrix rows aligned to found_ids (None if none found)."""
+        with self._lock:
+            self._refresh()
+            if self._matrix is None:
+                return [], None
+            found = [i for i in ids if str(i) in self._rows]
+            if not found:
+                return [], None
+            idx = [self._rows[str(i)] for i in found]
+            return found, np.asarray(self._matrix[idx])
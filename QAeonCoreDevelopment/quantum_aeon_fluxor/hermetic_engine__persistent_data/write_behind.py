@@ -0,0 +1,298 @@
+"""Durable write-behind queue for post-turn side effects.
+
+Archon turns return as soon as the model answer is ready; the episodic log, retained blobs,
+auto-embedding and the state file are handed to this queue instead. Each operation is a
+JSON record `{"seq", "kind", "args"}`:
+
+    - appended to an on-disk spool (`spool.jsonl`) before `enqueue` returns,
+    - delivered by one background thread in batches: up to `batch` operations, or whatever
+      arrived within `linger_ms` of the first one, grouped by kind (enqueue order is kept
+      within a kind; kinds registered with `coalesce=True` only deliver their latest args),
+    - acknowledged in `spool.ack` (highest delivered seq) once its batch is handled.
+
+On start, spooled operations past the ack are replayed (crash recovery), so delivery is
+at-least-once: an operation may repeat if the process died between handling and ack.
+A failing handler is retried with backoff; after `max_attempts` its operations go to
+`dead.jsonl` and the queue moves on, so a broken disk or Qdrant path never blocks turns.
+The spool is truncated whenever the queue drains. `flush()` waits for delivery and runs at exit.
+
+A queue owns its spool files through an inter-process lock (`spool.lock`) held from `start`
+until `close`. When another live process (e.g. a second Archon REPL started from the same
+directory) holds the base directory, the queue takes the first free `slot-<n>` subdirectory
+instead, so processes never replay or acknowledge each other's operations. A slot left behind
+by a crashed process is replayed by the next queue that claims it.
+
+Config (env):
+    QAECORE_WRITE_BEHIND_DIR        spool directory (default ./.write_behind)
+    QAECORE_WRITE_BEHIND_BATCH      max operations per batch (default 64)
+    QAECORE_WRITE_BEHIND_LINGER_MS  wait for more operations before a batch (default 50)
+    QAECORE_WRITE_BEHIND_FSYNC      fsync every spool append (1/true/on; default off)
+
+Batches, retries and replays are logged on the `archon` metrics stream.
+"""
+from __future__ import annotations
+from collections import deque
+from pathlib import Path
+from time import perf_counter, sleep, monotonic
+from typing import Any, Callable, Deque, Dict, List, Optional
+import atexit
+import json
+import os
+import threading
+
+from quantum_aeon_fluxor.utils.filelock import FileLock
+from quantum_aeon_fluxor.utils.metrics import log_event
+
+DIR_ENV = "QAECORE_WRITE_BEHIND_DIR"
+BATCH_ENV = "QAECORE_WRITE_BEHIND_BATCH"
+LINGER_ENV = "QAECORE_WRITE_BEHIND_LINGER_MS"
+FSYNC_ENV = "QAECORE_WRITE_BEHIND_FSYNC"
+DEFAULT_BATCH = 64
+DEFAULT_LINGER_MS = 50.0
+MAX_SLOTS = 64
+
+Handler = Callable[[List[Dict[str, Any]]], None]
+
+
+def _enabled(value: Optional[str]) -> bool:
+    return (value or "").strip().lower() in {"1", "true", "on", "yes"}
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        batch: int = DEFAULT_BATCH,
+        linger_ms: float = DEFAULT_LINGER_MS,
+        fsync: bool = False,
+        max_attempts: int = 3,
+        backoff_s: float = 0.2,
+    ):
+        self.path = Path(path) if path else Path.cwd() / ".write_behind"
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._set_dir(self.path)
+        self._owner: Optional[FileLock] = None
+        self.batch = max(1, batch)
+        self.linger_s = max(0.0, linger_ms) / 1000.0
+        self.fsync = fsync
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_s = backoff_s
+        self._handlers: Dict[str, Handler] = {}
+        self._coalesce: set[str] = set()
+        self._queue: Deque[dict] = deque()
+        self._cond = threading.Condition()
+        self._spool_lock = threading.Lock()
+        self._seq = 0
+        self._acked = 0
+        self._inflight = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> "WriteBehindQueue":
+        path = os.getenv(DIR_ENV)
+        return cls(
+            Path(path).expanduser() if path else None,
+            batch=int(os.getenv(BATCH_ENV, DEFAULT_BATCH)),
+            linger_ms=float(os.getenv(LINGER_ENV, DEFAULT_LINGER_MS)),
+            fsync=_enabled(os.getenv(FSYNC_ENV)),
+        )
+
+    def register(self, kind: str, handler: Handler, *, coalesce: bool = False) -> None:
+        """`handler(args_list)` receives the args of every operation of `kind` in a batch, in order."""
+        self._handlers[kind] = handler
+        if coalesce:
+            self._coalesce.add(kind)
+
+    # --- lifecycle ---
+
+    def _set_dir(self, spool_dir: Path) -> None:
+        self.spool_dir = spool_dir
+        self.spool_file = spool_dir / "spool.jsonl"
+        self.ack_file = spool_dir / "spool.ack"
+        self.dead_file = spool_dir / "dead.jsonl"
+
+    def _claim(self) -> None:
+        """Lock the base spool directory, or the first free slot when another process holds it."""
+        if self._owner is not None:
+            return
+        for n in range(MAX_SLOTS):
+            spool_dir = self.path if n == 0 else self.path / f"slot-{n}"
+            lock = FileLock(spool_dir / "spool.lock")
+            if lock.acquire(blocking=False):
+                self._owner = lock
+                self._set_dir(spool_dir)
+                if n:
+                    log_event("archon", "write_behind_slot", slot=n, spool=str(self.spool_file))
+                return
+        raise RuntimeError(f"All {MAX_SLOTS} write-behind spool slots under {self.path} are in use")
+
+    def start(self) -> "WriteBehindQueue":
+        """Claim a spool, replay its unacknowledged operations and start the delivery thread (idempotent)."""
+        if self._thread is not None:
+            return self
+        self._claim()
+        replayed = self._recover()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        if replayed:
+            log_event("archon", "write_behind_replay", ops=replayed, spool=str(self.spool_file))
+        return self
+
+    def _recover(self) -> int:
+        try:
+            self._acked = int(self.ack_file.read_text(encoding="utf-8").strip() or 0)
+        except (FileNotFoundError, ValueError):
+            self._acked = 0
+        self._seq = self._acked
+        replay: List[dict] = []
+        if self.spool_file.exists():
+            with self.spool_file.open("r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn final line from a crash mid-append
+                    self._seq = max(self._seq, op["seq"])
+                    if op["seq"] > self._acked:
+                        replay.append(op)
+            # rewrite without acked ops or a torn tail, so new appends start on a clean line
+            self.spool_file.write_text("".join(json.dumps(op, ensure_ascii=False) + "\n" for op in replay), encoding="utf-8")
+        with self._cond:
+            self._queue.extend(replay)
+            self._cond.notify()
+        return len(replay)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every enqueued operation is delivered; False on timeout."""
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._cond:
+            while self._queue or self._inflight:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._owner is not None and (self._thread is None or not self._thread.is_alive()):
+            # undelivered operations stay in the spool for the next owner to replay
+            self._owner.release()
+            self._owner = None
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._queue) + self._inflight
+
+    # --- producer side ---
+
+    def enqueue(self, kind: str, **args: Any) -> int:
+        """Spool an operation and queue it for delivery; returns its sequence number."""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for write-behind kind: {kind}")
+        self._claim()
+        with self._spool_lock:
+            self._seq += 1
+            op = {"seq": self._seq, "kind": kind, "args": args}
+            line = json.dumps(op, ensure_ascii=False)
+            try:
+                with self.spool_file.open("a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+            except Exception as e:  # still deliver from memory; only durability is lost
+                log_event("archon", "write_behind_error", stage="spool", error=str(e))
+            with self._cond:
+                self._queue.append(op)
+                self._cond.notify()
+        return op["seq"]
+
+    # --- delivery thread ---
+
+    def _take_batch(self) -> Optional[List[dict]]:
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            if self.linger_s and len(self._queue) < self.batch:
+                self._cond.wait(self.linger_s)
+            n = min(self.batch, len(self._queue))
+            ops = [self._queue.popleft() for _ in range(n)]
+            self._inflight = n
+            return ops
+
+    def _run(self) -> None:
+        while True:
+            ops = self._take_batch()
+            if ops is None:
+                return
+            t0 = perf_counter()
+            by_kind: Dict[str, List[dict]] = {}
+            for op in ops:
+                by_kind.setdefault(op["kind"], []).append(op)
+            failed = 0
+            for kind, kind_ops in by_kind.items():
+                if not self._deliver(kind, kind_ops):
+                    failed += len(kind_ops)
+            self._ack(ops[-1]["seq"])
+            log_event(
+                "archon",
+                "write_behind_batch",
+                ops=len(ops),
+                kinds={k: len(v) for k, v in by_kind.items()},
+                failed=failed,
+                duration_ms=round((perf_counter() - t0) * 1000.0, 2),
+                queue_depth=len(self._queue),
+            )
+            with self._cond:
+                self._inflight = 0
+                self._cond.notify_all()
+
+    def _deliver(self, kind: str, ops: List[dict]) -> bool:
+        handler = self._handlers.get(kind)
+        args = [op["args"] for op in ops]
+        if kind in self._coalesce:
+            args = args[-1:]
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if handler is None:
+                    raise LookupError(f"no handler registered for {kind}")
+                handler(args)
+                return True
+            except Exception as e:
+                log_event("archon", "write_behind_error", kind=kind, ops=len(ops), attempt=attempt, error=str(e))
+                if attempt < self.max_attempts and handler is not None:
+                    sleep(self.backoff_s * 2 ** (attempt - 1))
+        try:
+            with self.dead_file.open("a", encoding="utf-8") as f:
+                for op in ops:
+                    f.write(json.dumps(op, ensure_ascii=False) + "\n")
+        except Exception:
+            pass
+        return False
+
+    def _ack(self, seq: int) -> None:
+        """Record delivery up to `seq`; truncate the spool when nothing newer is pending."""
+        with self._spool_lock:
+            self._acked = seq
+            try:
+                if seq == self._seq:
+                    # Spool first, then ack: a crash in between leaves an empty spool (nothing to replay)
+                    self.spool_file.write_text("", encoding="utf-8")
+                tmp = self.ack_file.with_suffix(".tmp")
+                tmp.write_text(str(seq), encoding="utf-8")
+                os.replace(tmp, self.ack_file)
+            except Exception as e:
+                log_event("archon", "write_behind_error", stage="ack", error=str(e))
@@ -6,6 +6,7 @@ from quantum_aeon_fluxor import __version__
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold, GenerationConfig
 from google.generativeai.protos import SafetySetting
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.response_cache import ReplayMiss, cached_generate_text
 
 # Add the project root to the Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -101,20 +102,23 @@ def run_generative_model(model: genai.GenerativeModel):
     else:
         prompt_to_use = "Tell me a story about a brave knight."
 
-    response = model.generate_content(
+    text = cached_generate_text(
+    model,
     prompt_to_use,
     generation_config=GENERATION_CONFIGS["default"],
     safety_settings=_get_safety_settings()
     )
-    print(response.text)
+    print(text)
 
 def _run_and_print_demo(title, model, prompt, config):
     """Helper function to run a demo section, generate content, and print it."""
     print(title)
     print("-" * len(title))
     try:
-        response = model.generate_content(prompt, generation_config=config, safety_settings=_get_safety_settings())
-        print(f"{response.text}\n\n{'='*60}\n")
+        text = cached_generate_text(model, prompt, generation_config=config, safety_settings=_get_safety_settings())
+        print(f"{text}\n\n{'='*60}\n")
+    except ReplayMiss:
+        raise  # replay runs must fail on a missing recording
     except Exception as e:
         print(f"An error occurred: {e}\n\n{'='*60}\n")
 
@@ -161,6 +165,12 @@ def main():
         help="The mode to run the script in: 'basic' for a single prompt, 'demo' for the QAeCore showcase. (default: basic)"
     )
     parser.add_argument('--version', action='store_true', help='Print version and exit')
+    parser.add_argument('--no-stream', action='store_true',
+                        help="Conversation mode: wait for the full response instead of streaming it")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Conversation mode: serve Prometheus metrics on this port (default: $QAECORE_METRICS_PORT, else off)")
+    parser.add_argument('--profile-stages', default=None, metavar='SPEC',
+                        help="Conversation mode: profile stages, e.g. archon.model_query (default: $QAECORE_PROFILE, else off)")
     args = parser.parse_args()
 
     if args.version:
@@ -174,6 +184,11 @@ def main():
         run_qacore_demo(model)
     elif args.mode == 'conversation':
         from quantum_aeon_fluxor.archon__supervisor_agent.archon import Archon
+        from quantum_aeon_fluxor.utils.metrics_exporter import maybe_serve
+        maybe_serve(args.metrics_port)
+        if args.profile_stages:
+            from quantum_aeon_fluxor.utils import profiling
+            profiling.configure(args.profile_stages)
         archon = Archon()
         print("Entering Archon conversation mode. Type 'exit' to quit.\n")
         while True:
@@ -182,8 +197,13 @@ def main():
                 if user_input.lower() in {"exit", "quit"}:
                     print("Exiting conversation.")
                     break
-                reply = archon.run_turn(user_input)
-                print(f"\nArchon> {reply}\n")
+                if args.no_stream or user_input.startswith(":"):
+                    reply = archon.run_turn(user_input)
+                    print(f"\nArchon> {reply}\n")
+                else:
+                    print("\nArchon> ", end="", flush=True)
+                    archon.run_turn(user_input, on_chunk=lambda piece: print(piece, end="", flush=True))
+                    print("\n")
             except EOFError:
                 print("\nExiting conversation.")
                 break
@@ -9,6 +9,7 @@ import importlib.util
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold, GenerationConfig
 from google.generativeai.protos import SafetySetting
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.response_cache import ReplayMiss, cached_generate_text
 
 # --- Constants ---
 MODEL_NAME = 'gemini-2.5-pro'
@@ -75,8 +76,17 @@ class QAeCoreGeminiInterface:
         
         config = mode_configs.get(mode, {"temperature": 0.7, "top_p": 0.9, "top_k": 40})
         
+        return GenerationConfig(
+            temperature=config["temperature"],
+            top_p=config["top_p"],
+            top_k=config["top_k"],
+            max_output_tokens=8192,
+        )
+
+    def _get_safety_settings(self) -> list:
+        """Safety settings sent with every request (GenerationConfig has no safety field)"""
         # QAeCore requires unrestricted exploration for consciousness research
-        custom_safety_settings = [
+        return [
             SafetySetting(
                 category=HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
                 threshold=HarmBlockThreshold.BLOCK_NONE,
@@ -94,14 +104,10 @@ class QAeCoreGeminiInterface:
                 threshold=HarmBlockThreshold.BLOCK_NONE,
             ),
         ]
-        
-        return GenerationConfig(
-            temperature=config["temperature"],
-            top_p=config["top_p"],
-            top_k=config["top_k"],
-            max_output_tokens=8192,
-            safety_settings=custom_safety_settings
-        )
+
+    def _generate(self, prompt: str, config: GenerationConfig) -> str:
+        """Generate through the exact-match response cache (QAECORE_RESPONSE_CACHE=record|replay|off)"""
+        return cached_generate_text(self.model, prompt, config, self._get_safety_settings())
     
     def consciousness_inquiry(self, domain: str, question: str, depth_level: str = "intermediate") -> str:
         """Conduct consciousness inquiry using QAeCore framework"""
@@ -109,8 +115,9 @@ class QAeCoreGeminiInterface:
         config = self._get_generation_config(QAeMode.EXPLORATION)
         
         try:
-            response = self.model.generate_content(prompt, generation_config=config)
-            return response.text
+            return self._generate(prompt, config)
+        except ReplayMiss:
+            raise  # replay runs must fail on a missing recording
         except Exception as e:
             return f"Error in consciousness inquiry: {e}"
     
@@ -120,8 +127,9 @@ class QAeCoreGeminiInterface:
         config = self._get_generation_config(QAeMode.EONIC_EVALUATION)
         
         try:
-            response = self.model.generate_content(prompt, generation_config=config)
-            return response.text
+            return self._generate(prompt, config)
+        except ReplayMiss:
+            raise  # replay runs must fail on a missing recording
         except Exception as e:
             return f"Error in eonic scrutiny: {e}"
     
@@ -131,8 +139,9 @@ class QAeCoreGeminiInterface:
         config = self._get_generation_config(QAeMode.META_LINK)
         
         try:
-            response = self.model.generate_content(prompt, generation_config=config)
-            return response.text
+            return self._generate(prompt, config)
+        except ReplayMiss:
+            raise  # replay runs must fail on a missing recording
         except Exception as e:
             return f"Error in meta-link session: {e}"
     
@@ -142,8 +151,9 @@ class QAeCoreGeminiInterface:
         config = self._get_generation_config(QAeMode.EXPLORATION)
         
         try:
-            response = self.model.generate_content(prompt, generation_config=config)
-            return response.text
+            return self._generate(prompt, config)
+        except ReplayMiss:
+            raise  # replay runs must fail on a missing recording
         except Exception as e:
             return f"Error in substrate analysis: {e}"
     
@@ -153,8 +163,9 @@ class QAeCoreGeminiInterface:
         config = self._get_generation_config(QAeMode.GROUNDING)
         
         try:
-            response = self.model.generate_content(prompt, generation_config=config)
-            return response.text
+            return self._generate(prompt, config)
+        except ReplayMiss:
+            raise  # replay runs must fail on a missing recording
         except Exception as e:
             return f"Error in phase transition analysis: {e}"
     
@@ -164,8 +175,9 @@ class QAeCoreGeminiInterface:
         config = self._get_generation_config(QAeMode.REFLECTION)
         
         try:
-            response = self.model.generate_content(prompt, generation_config=config)
-            return response.text
+            return self._generate(prompt, config)
+        except ReplayMiss:
+            raise  # replay runs must fail on a missing recording
         except Exception as e:
             return f"Error in recursive reflection: {e}"
     
@@ -175,8 +187,9 @@ class QAeCoreGeminiInterface:
         config = self._get_generation_config(QAeMode.EXPLORATION)
         
         try:
-            response = self.model.generate_content(prompt, generation_config=config)
-            return response.text
+            return self._generate(prompt, config)
+        except ReplayMiss:
+            raise  # replay runs must fail on a missing recording
         except Exception as e:
             return f"Error in complexity cascade: {e}"
     
@@ -186,8 +199,9 @@ class QAeCoreGeminiInterface:
         config = self._get_generation_config(QAeMode.EONIC_EVALUATION)
         
         try:
-            response = self.model.generate_content(prompt, generation_config=config)
-            return response.text
+            return self._generate(prompt, config)
+        except ReplayMiss:
+            raise  # replay runs must fail on a missing recording
         except Exception as e:
             return f"Error in temporal analysis: {e}"
     
@@ -207,8 +221,9 @@ class QAeCoreGeminiInterface:
         config = self._get_generation_config(primary_mode)
         
         try:
-            response = self.model.generate_content(prompt, generation_config=config)
-            return response.text
+            return self._generate(prompt, config)
+        except ReplayMiss:
+            raise  # replay runs must fail on a missing recording
         except Exception as e:
             return f"Error in multimodal inquiry: {e}"
 
@@ -155,6 +155,43 @@ Output both analytical insights and intuitive leaps.
 (| Exploration | -- | Premise Evaluation | {domain} |)
 """
 
+    def consciousness_inquiry_frame(self) -> str:
+        """Static part of `generate_consciousness_inquiry` (identical for every inquiry, so cacheable)"""
+        
+        return """
+You are a consciousness researcher within the Quantum Aeon Fluxor framework.
+Each inquiry below names its domain, consciousness depth and primary question.
+
+Consciousness Depth:
+- If depth == 'surface': Focus on observable phenomena
+- If depth == 'intermediate': Include underlying patterns and relationships  
+- If depth == 'deep': Explore fundamental principles and structures
+- If depth == 'transcendent': Examine the nature of consciousness itself
+
+Meta-Instructions:
+1. Maintain awareness of your cognitive processes during this inquiry
+2. Notice any emergent insights that arise beyond logical analysis
+3. Consider how this question might transform through deeper examination
+4. Reflect on what this inquiry reveals about the nature of inquiry itself
+
+Output both analytical insights and intuitive leaps.
+""".strip()
+
+    def consciousness_inquiry_request(self, 
+                                    domain: str, 
+                                    question: str, 
+                                    depth_level: str = 'intermediate') -> str:
+        """Per-inquiry part to pair with `consciousness_inquiry_frame`"""
+        
+        return f"""
+Domain: {domain}
+Consciousness Depth: {depth_level}
+
+Primary Inquiry: {question}
+
+(| Exploration | -- | Premise Evaluation | {domain} |)
+""".strip()
+
     def generate_eonic_scrutiny(self, phenomenon: str) -> str:
         """Generate an Eonic Evaluation prompt for cosmic timescale analysis"""
         
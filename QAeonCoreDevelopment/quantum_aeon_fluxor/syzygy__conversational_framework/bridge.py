@@ -1,8 +1,11 @@
 from __future__ import annotations
-from typing import List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import os
 
 from . import QuantumPromptGenerator
 from .Integration_Prototyping.qacore_prompt_engine import QAeCoreTransitionEngine, QAeMode
+from .context_budget import Allocation, ContextBudget, allocate, estimate_tokens
 
 # Persona header (very short) derived from your framework document
 PERSONA_PREAMBLE = (
@@ -11,11 +14,24 @@ PERSONA_PREAMBLE = (
 )
 
 
+PINNED_DOCS_ENV = "QAECORE_PINNED_DOCS"
+_pinned_cache: Dict[str, Tuple[float, str]] = {}  # path -> (mtime, text)
+
+
 def select_mode(user_input: str, recent_history: Optional[List[str]] = None) -> QAeMode:
     engine = QAeCoreTransitionEngine()
     return engine.detect_mode(user_input, context_history=recent_history or [])
 
 
+def _resolve_mode(user_input: str, recent_history: Optional[List[str]], forced_mode: Optional[str]) -> QAeMode:
+    if forced_mode:
+        try:
+            return QAeMode[forced_mode.upper()]
+        except Exception:
+            pass
+    return select_mode(user_input, recent_history)
+
+
 def compose_prompt(
     user_input: str,
     focus_topic: Optional[str] = None,
@@ -33,13 +49,7 @@ def compose_prompt(
     domain = focus_topic or "consciousness"
 
     # Mode selection
-    if forced_mode:
-        try:
-            mode = QAeMode[forced_mode.upper()]
-        except Exception:
-            mode = select_mode(user_input, recent_history)
-    else:
-        mode = select_mode(user_input, recent_history)
+    mode = _resolve_mode(user_input, recent_history, forced_mode)
 
     # Build the base prompt
     base = q.generate_consciousness_inquiry(domain=domain, question=user_input, depth_level=depth_level)
@@ -47,3 +57,99 @@ def compose_prompt(
     # Attach persona preamble and mode label
     prompt = f"{PERSONA_PREAMBLE}\n\n[Mode: {mode.value}]\n\n{base}"
     return prompt
+
+
+def pinned_documents() -> str:
+    """Framework documents listed in QAECORE_PINNED_DOCS (os.pathsep-separated), as prompt sections.
+
+    Files are re-read only when their mtime changes; unreadable paths are skipped.
+    """
+    blocks = []
+    for raw in filter(None, (os.getenv(PINNED_DOCS_ENV) or "").split(os.pathsep)):
+        path = Path(raw).expanduser()
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        cached = _pinned_cache.get(str(path))
+        if cached is None or cached[0] != mtime:
+            try:
+                cached = (mtime, path.read_text(encoding="utf-8").strip())
+            except OSError:
+                continue
+            _pinned_cache[str(path)] = cached
+        blocks.append(f"=== Framework Document: {path.name} ===\n{cached[1]}\n=== End Framework Document ===")
+    return "\n\n".join(blocks)
+
+
+def cacheable_prefix() -> str:
+    """Stable prompt prefix: persona, the inquiry frame and pinned framework documents.
+
+    It is identical across turns (until QAECORE_PINNED_DOCS or a pinned file changes), so it
+    can be sent once as provider-side cached content.
+    """
+    parts = [PERSONA_PREAMBLE, QuantumPromptGenerator().consciousness_inquiry_frame()]
+    docs = pinned_documents()
+    if docs:
+        parts.append(docs)
+    return "\n\n".join(parts) + "\n\n"
+
+
+def compose_prompt_parts(
+    user_input: str,
+    *,
+    context: Sequence[Tuple[float, str]] = (),
+    context_header: str = "",
+    history: Sequence[Tuple[str, str]] = (),
+    digest: str = "",
+    focus_topic: Optional[str] = None,
+    depth_level: str = "intermediate",
+    forced_mode: Optional[str] = None,
+    budget: Optional[ContextBudget] = None,
+) -> Tuple[str, str, Allocation]:
+    """Token-budgeted prompt split into (stable prefix, per-turn suffix, allocation).
+
+    The prefix is `cacheable_prefix()`; the suffix carries the mode label, domain, depth,
+    question, digest, recent history and retrieved context. `context` is [(score, line)]
+    (best kept first), `history` is [(speaker, text)] oldest first, `digest` a summary of
+    earlier conversation (a fixed-cost section). Only the suffix is fitted to `budget`: the
+    prefix is the same every turn (and may carry large pinned documents), so charging it
+    would crowd out retrieval and history. The allocation holds per-section token counts
+    (`prefix` reported but outside `total`) and dropped/truncated items for logging.
+    """
+    budget = budget or ContextBudget.from_env()
+    q = QuantumPromptGenerator()
+    domain = focus_topic or "consciousness"
+    mode = _resolve_mode(user_input, [t for _, t in history[-6:]], forced_mode)
+    prefix = cacheable_prefix()
+    mode_line = f"[Mode: {mode.value}]\n\n"
+    request = q.consciousness_inquiry_request(domain=domain, question="", depth_level=depth_level)
+
+    history_open, history_close = "\n\n=== Recent Conversation ===\n", "\n=== End Recent Conversation ==="
+    context_open, context_close = "\n\n=== Context ===\n" + context_header, "\n=== End Context ==="
+    digest_block = f"\n\n=== Conversation Digest ===\n{digest}\n=== End Conversation Digest ===" if digest else ""
+    alloc = allocate(
+        budget,
+        fixed={
+            "template": mode_line + request,
+            "question": user_input,
+            "digest": digest_block,
+            "markers": history_open + history_close + context_open + context_close,
+        },
+        context=context,
+        history=history,
+    )
+    alloc.tokens["prefix"] = estimate_tokens(prefix)
+    inquiry = user_input + digest_block
+    if alloc.history:
+        inquiry += history_open + "\n".join(f"{speaker}: {text}" for speaker, text in alloc.history) + history_close
+    if alloc.context:
+        inquiry += context_open + "\n".join(alloc.context) + context_close
+    suffix = mode_line + q.consciousness_inquiry_request(domain=domain, question=inquiry, depth_level=depth_level)
+    return prefix, suffix, alloc
+
+
+def compose_budgeted_prompt(user_input: str, **kwargs) -> Tuple[str, Allocation]:
+    """`compose_prompt_parts` joined into one prompt string; returns (prompt, allocation)."""
+    prefix, suffix, alloc = compose_prompt_parts(user_input, **kwargs)
+    return prefix + suffix, alloc
@@ -0,0 +1,126 @@
+"""Token-budgeted prompt assembly.
+
+A prompt is built from fixed sections (persona preamble, mode template, the user's question)
+and variable ones (retrieved context, recent history). `allocate` measures the fixed part,
+splits what is left of the budget between context and history (`context_share`; an unused
+share spills over to the other section), then fills:
+
+    - context by descending score, truncating the item that crosses the limit when at least
+      `min_item_tokens` remain and dropping the rest,
+    - history newest first, truncating the oldest turn that still fits partially,
+      returned in chronological order.
+
+Token counts come from `utils.tokens.estimate_tokens`, a local regex estimator (no tokenizer
+download or network call) that approximates SentencePiece/BPE counts for English prose.
+
+Config (env):
+    QAECORE_PROMPT_BUDGET          total prompt tokens (default 3000)
+    QAECORE_PROMPT_CONTEXT_SHARE   share of the variable budget for retrieved context (default 0.6)
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+import os
+
+from quantum_aeon_fluxor.utils.tokens import estimate_tokens, truncate_to_tokens
+
+BUDGET_ENV = "QAECORE_PROMPT_BUDGET"
+CONTEXT_SHARE_ENV = "QAECORE_PROMPT_CONTEXT_SHARE"
+DEFAULT_BUDGET = 3000
+DEFAULT_CONTEXT_SHARE = 0.6
+
+
+@dataclass
+class ContextBudget:
+    total: int = DEFAULT_BUDGET
+    context_share: float = DEFAULT_CONTEXT_SHARE
+    min_item_tokens: int = 32  # a truncated item shorter than this is dropped instead
+
+    @classmethod
+    def from_env(cls) -> "ContextBudget":
+        return cls(
+            total=int(os.getenv(BUDGET_ENV, DEFAULT_BUDGET)),
+            context_share=float(os.getenv(CONTEXT_SHARE_ENV, DEFAULT_CONTEXT_SHARE)),
+        )
+
+
+@dataclass
+class Allocation:
+    context: List[str] = field(default_factory=list)  # kept context items, best first
+    history: List[Tuple[str, str]] = field(default_factory=list)  # kept (speaker, text), oldest first
+    tokens: Dict[str, int] = field(default_factory=dict)  # per section
+    dropped: Dict[str, int] = field(default_factory=dict)
+    truncated: Dict[str, int] = field(default_factory=dict)
+
+    def as_fields(self) -> dict:
+        """Flat fields for a metrics event."""
+        out = {f"{k}_tokens": v for k, v in self.tokens.items()}
+        out.update({f"{k}_dropped": v for k, v in self.dropped.items()})
+        out.update({f"{k}_truncated": v for k, v in self.truncated.items()})
+        return out
+
+
+def _fill(texts: Sequence[str], limit: int, min_item: int, overhead: int = 0) -> Tuple[List[str], int, int, int]:
+    """Greedy fill in the given priority order; returns (kept, tokens, dropped, truncated)."""
+    kept: List[str] = []
+    used = 0
+    truncated = 0
+    for text in texts:
+        cost = estimate_tokens(text) + overhead
+        if used + cost <= limit:
+            kept.append(text)
+            used += cost
+            continue
+        room = limit - used - overhead
+        if room >= min_item:
+            cut = truncate_to_tokens(text, room)
+            kept.append(cut)
+            used += estimate_tokens(cut) + overhead
+            truncated += 1
+        return kept, used, len(texts) - len(kept), truncated
+    return kept, used, 0, truncated
+
+
+def allocate(
+    budget: ContextBudget,
+    fixed: Dict[str, str],
+    context: Sequence[Tuple[float, str]] = (),
+    history: Sequence[Tuple[str, str]] = (),
+    history_overhead: int = 4,
+) -> Allocation:
+    """Fit `context` [(score, text)] and `history` [(speaker, text)] into what `fixed` sections leave over.
+
+    `history_overhead` is the per-turn token cost of the speaker label and separators.
+    """
+    alloc = Allocation()
+    for name, text in fixed.items():
+        alloc.tokens[name] = estimate_tokens(text)
+    free = max(0, budget.total - sum(alloc.tokens.values()))
+
+    ranked = [text for _, text in sorted(context, key=lambda c: c[0], reverse=True)]
+    ctx_need = sum(estimate_tokens(t) for t in ranked)
+    hist_need = sum(estimate_tokens(t) + history_overhead for _, t in history)
+    ctx_limit = int(free * budget.context_share)
+    hist_limit = free - ctx_limit
+    # an under-used share spills over to the other section
+    if ctx_need < ctx_limit:
+        hist_limit += ctx_limit - ctx_need
+        ctx_limit = ctx_need
+    elif hist_need < hist_limit:
+        ctx_limit += hist_limit - hist_need
+        hist_limit = hist_need
+
+    alloc.context, alloc.tokens["context"], alloc.dropped["context"], alloc.truncated["context"] = _fill(
+        ranked, ctx_limit, budget.min_item_tokens
+    )
+
+    newest_first = list(reversed(history))
+    kept, used, dropped, truncated = _fill(
+        [t for _, t in newest_first], hist_limit, budget.min_item_tokens, overhead=history_overhead
+    )
+    alloc.history = [(speaker, text) for (speaker, _), text in zip(newest_first, kept)][::-1]
+    alloc.tokens["history"] = used
+    alloc.dropped["history"] = dropped
+    alloc.truncated["history"] = truncated
+    alloc.tokens["total"] = sum(v for k, v in alloc.tokens.items() if k != "total")
+    return alloc
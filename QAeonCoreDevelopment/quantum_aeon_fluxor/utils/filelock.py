@@ -0,0 +1,77 @@
+"""Advisory inter-process file locks (fcntl on POSIX, msvcrt on Windows).
+
+Used where several processes append to or replay the same local files (vector cache rows,
+write-behind spool). The lock is held on a separate `<name>.lock` file, so the data files
+themselves can be replaced or truncated while it is held.
+
+    with FileLock(root / "coll.lock"):
+        ...  # exclusive across processes (and across FileLock instances in one process)
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import IO, Optional
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._fh: Optional[IO[bytes]] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock; with `blocking=False` return False instead of waiting when it is held."""
+        if self._fh is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fh = open(self.path, "a+b")
+        try:
+            while True:
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(fh.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                    else:
+                        fh.seek(0)
+                        msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if not blocking:
+                        fh.close()
+                        return False
+                    if fcntl is not None:
+                        raise
+                    time.sleep(0.05)  # msvcrt has no blocking lock without a retry limit
+        except BaseException:
+            fh.close()
+            raise
+        self._fh = fh
+        return True
+
+    def release(self) -> None:
+        fh, self._fh = self._fh, None
+        if fh is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            fh.close()
+
+    @property
+    def held(self) -> bool:
+        return self._fh is not None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
@@ -10,30 +10,72 @@ Design goals:
 - Simple public API: log_event(name, **fields); time_block(name)(context manager)
 - Automatic ISO timestamp + monotonic duration for timed blocks
 
+Buffered writes:
+`log_event` serializes the record in the caller's thread (so it captures the fields as they
+were at the call) and appends the line to an in-memory buffer. A background thread writes
+buffered lines every `QAECORE_METRICS_FLUSH_MS`, or sooner once `QAECORE_METRICS_BUFFER`
+records are pending. Each write is one `os.write`
+of whole lines to a cached `O_APPEND` descriptor, so concurrent processes appending to
+the same stream never interleave partial lines. The buffer is flushed at exit. `flush()`
+writes everything pending before returning; call it before reading a stream in-process.
+A forked child starts with an empty buffer and no cached descriptors. If producers
+outpace the writer, the caller writes inline (backpressure, nothing is dropped).
+
+Config (env):
+    QAECORE_METRICS_DIR            directory (default ./metrics)
+    QAECORE_METRICS_ROTATE_DAILY   any value: write <stream>-YYYYMMDD.jsonl
+    QAECORE_METRICS_FLUSH_MS       background flush interval (default 200)
+    QAECORE_METRICS_BUFFER         pending records that trigger an early flush (default 256)
+    QAECORE_METRICS_SYNC           any value: write each event inline (debugging)
+
+Sinks: `add_sink(fn)` registers `fn(stream, record)`, called in the caller's thread for every
+record before it is buffered (in-memory consumers such as `metrics_exporter`; must be cheap and
+must not log). With no sinks registered this costs one truth test per event.
+
+Tracing: inside an active trace (see `utils/tracing.py`) every record carries the current
+trace_id / span_id, and each `time_block` region is recorded as a span `<stream>.<event>`.
+
+Profiling: with `QAECORE_PROFILE` set, selected `time_block` regions are also profiled (stack
+samples + tracemalloc, see `utils/profiling.py`); when unset this is one flag check per region.
+
 Future extensions:
-- In-memory ring buffer w/ flush
 - Aggregations (rolling averages)
-- Export to Prometheus / OpenTelemetry bridge
 """
 from __future__ import annotations
 
+from collections import deque
 from pathlib import Path
-from time import perf_counter
+from time import monotonic, perf_counter
 from datetime import datetime, timezone
+import atexit
 import json
+import multiprocessing
+import multiprocessing.util as mp_util
 import os
 import threading
 from contextlib import contextmanager
-from typing import Any, Dict, Iterator
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from quantum_aeon_fluxor.utils import profiling, tracing
 
 METRICS_DIR_ENV = "QAECORE_METRICS_DIR"
 ROTATE_ENV = "QAECORE_METRICS_ROTATE_DAILY"  # set to any non-empty value to enable daily rotation
+FLUSH_MS_ENV = "QAECORE_METRICS_FLUSH_MS"
+BUFFER_ENV = "QAECORE_METRICS_BUFFER"
+SYNC_ENV = "QAECORE_METRICS_SYNC"
 DEFAULT_SUBDIR = "metrics"
-_lock = threading.Lock()
+DEFAULT_FLUSH_MS = 200
+DEFAULT_BUFFER = 256
+MAX_PENDING_FACTOR = 64  # pending records beyond buffer * factor are written by the caller
+MAX_OPEN_FILES = 64
+REOPEN_S = 30.0  # cached descriptors are reopened periodically so moved/deleted files are recreated
+
+# (metrics dir env value, stream, day or "") identifies the target file of a record
+_Key = Tuple[Optional[str], str, str]
 
 
-def _metrics_dir() -> Path:
-    base = os.getenv(METRICS_DIR_ENV)
+def _metrics_dir(base: Optional[str] = None) -> Path:
+    base = base if base is not None else os.getenv(METRICS_DIR_ENV)
     if base:
         p = Path(base).expanduser().resolve()
     else:
@@ -43,33 +85,170 @@ def _metrics_dir() -> Path:
     return p
 
 
-def _file_for(name: str) -> Path:
+def _file_for(name: str, base: Optional[str] = None, day: Optional[str] = None) -> Path:
     """Return path for a metrics stream file.
 
     If daily rotation is enabled via env var QAECORE_METRICS_ROTATE_DAILY, files are named
     <stream>-YYYYMMDD.jsonl, else <stream>.jsonl
     """
     safe = name.replace("/", "_")
-    if os.getenv(ROTATE_ENV):
-        date_str = datetime.utcnow().strftime("%Y%m%d")
-        fname = f"{safe}-{date_str}.jsonl"
-    else:
-        fname = f"{safe}.jsonl"
-    return _metrics_dir() / fname
+    if day is None and os.getenv(ROTATE_ENV):
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+    fname = f"{safe}-{day}.jsonl" if day else f"{safe}.jsonl"
+    return _metrics_dir(base) / fname
+
+
+class _BufferedWriter:
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self.interval_s = int(os.getenv(FLUSH_MS_ENV, DEFAULT_FLUSH_MS)) / 1000.0
+        self.batch = max(1, int(os.getenv(BUFFER_ENV, DEFAULT_BUFFER)))
+        self.max_pending = self.batch * MAX_PENDING_FACTOR
+        self._buf: Deque[Tuple[_Key, str]] = deque()
+        self._wake = threading.Event()
+        self._io_lock = threading.Lock()  # one drain at a time keeps per-stream order
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._fds: Dict[_Key, int] = {}
+        self._opened_at = monotonic()
+
+    def put(self, key: _Key, record: Dict[str, Any]) -> None:
+        try:
+            # serialize now: fields may reference live objects the caller goes on to mutate
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+        except Exception:
+            return  # unserializable record: dropped, as before
+        self._buf.append((key, line))
+        if self._thread is None:
+            self._start()
+        pending = len(self._buf)
+        if pending >= self.max_pending:
+            self.flush()
+        elif pending >= self.batch:
+            self._wake.set()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="qaf-metrics-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval_s)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffered record (best-effort)."""
+        with self._io_lock:
+            if not self._buf:
+                return
+            groups: Dict[_Key, List[str]] = {}
+            while True:
+                try:
+                    key, line = self._buf.popleft()
+                except IndexError:
+                    break
+                groups.setdefault(key, []).append(line)
+            if monotonic() - self._opened_at > REOPEN_S:
+                self._close_all()
+            for key, lines in groups.items():
+                self._write(key, "".join(lines).encode("utf-8"))
+
+    def _write(self, key: _Key, data: bytes) -> None:
+        for attempt in (0, 1):
+            try:
+                fd = self._fds.get(key)
+                if fd is None:
+                    if len(self._fds) >= MAX_OPEN_FILES:
+                        self._close_all()
+                    base, stream, day = key
+                    fd = os.open(_file_for(stream, base, day or None), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    self._fds[key] = fd
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                return
+            except Exception:
+                # directory removed or descriptor gone stale: reopen once, then give up
+                fd = self._fds.pop(key, None)
+                if fd is not None:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+
+    def _close_all(self) -> None:
+        for fd in self._fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds.clear()
+        self._opened_at = monotonic()
+
+    def _after_fork(self) -> None:
+        # the parent still owns and flushes its pending records; the writer thread did not survive
+        self._fds.clear()  # inherited descriptors stay valid for the parent; just forget them here
+        self._reset()
+
+
+def _flush_at_process_exit(writer: _BufferedWriter) -> None:
+    # multiprocessing children leave through os._exit, which skips atexit
+    mp_util.Finalize(None, writer.flush, exitpriority=0)
+
+
+_writer = _BufferedWriter()
+atexit.register(_writer.flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_writer._after_fork)
+mp_util.register_after_fork(_writer, _flush_at_process_exit)  # fork/forkserver children
+if multiprocessing.parent_process() is not None:  # spawned child importing this module
+    _flush_at_process_exit(_writer)
+
+
+_sinks: List[Callable[[str, Dict[str, Any]], None]] = []
+
+
+def add_sink(fn: Callable[[str, Dict[str, Any]], None]) -> None:
+    """Also hand every logged record to `fn(stream, record)` (see module docstring)."""
+    if fn not in _sinks:
+        _sinks.append(fn)
+
+
+def remove_sink(fn: Callable[[str, Dict[str, Any]], None]) -> None:
+    if fn in _sinks:
+        _sinks.remove(fn)
+
+
+def flush() -> None:
+    """Write all buffered metric events now."""
+    _writer.flush()
 
 
 def log_event(stream: str, event: str, **fields: Any) -> None:
+    now = datetime.now(timezone.utc)
     record: Dict[str, Any] = {
-        "ts": datetime.now(timezone.utc).isoformat(),
+        "ts": now.isoformat(),
         "event": event,
         **fields,
     }
-    path = _file_for(stream)
+    span = tracing.current_span()
+    if span is not None and "trace_id" not in fields:
+        record["trace_id"] = span.trace_id
+        record["span_id"] = span.span_id
     try:
-        line = json.dumps(record, ensure_ascii=False)
-        with _lock:
-            with path.open("a", encoding="utf-8") as f:
-                f.write(line + "\n")
+        if _sinks:
+            for sink in _sinks:
+                sink(stream, record)
+        day = now.strftime("%Y%m%d") if os.environ.get(ROTATE_ENV) else ""
+        _writer.put((os.environ.get(METRICS_DIR_ENV), stream, day), record)
+        if os.environ.get(SYNC_ENV):
+            _writer.flush()
     except Exception:
         # best-effort; never raise during core flow
         pass
@@ -77,20 +256,28 @@ def log_event(stream: str, event: str, **fields: Any) -> None:
 
 @contextmanager
 def time_block(stream: str, event: str, **fields: Any) -> Iterator[None]:
-    """Context manager to time a code block and emit start/stop events with duration_ms."""
-    start = perf_counter()
-    log_event(stream, event + ":start", **fields)
-    status = "ok"
-    err: str | None = None
-    try:
-        yield
-    except Exception as e:  # pragma: no cover - we still log
-        status = "error"
-        err = repr(e)
-        raise
-    finally:
-        dur_ms = (perf_counter() - start) * 1000.0
-        log_event(stream, event + ":end", duration_ms=round(dur_ms, 3), status=status, **({"error": err} if err else {}))
+    """Context manager to time a code block and emit start/stop events with duration_ms.
+
+    Inside an active trace the block is also recorded as span `<stream>.<event>`; when profiling
+    is enabled and selects the block, it is profiled as well.
+    """
+    with tracing.span(f"{stream}.{event}", **fields):
+        start = perf_counter()
+        log_event(stream, event + ":start", **fields)
+        prof = profiling.start(stream, event) if profiling.enabled else None
+        status = "ok"
+        err: str | None = None
+        try:
+            yield
+        except Exception as e:  # pragma: no cover - we still log
+            status = "error"
+            err = repr(e)
+            raise
+        finally:
+            dur_ms = (perf_counter() - start) * 1000.0
+            if prof is not None:
+                prof.stop(round(dur_ms, 3), status)
+            log_event(stream, event + ":end", duration_ms=round(dur_ms, 3), status=status, **({"error": err} if err else {}))
 
 
 def log_latency(stream: str, event: str, duration_ms: float, **fields: Any) -> None:
@@ -0,0 +1,193 @@
+"""Window-to-window regression check: `qaf-metrics diff`.
+
+Each side is either a time window of the metric streams or a file:
+    24h                      the last 24 hours
+    48h..24h                 from 48h ago until 24h ago (`..` separates since/until; either form
+                             of `--since` works: 7d..1d, 2025-09-01T00:00Z..2025-09-02T00:00Z)
+    baseline.json            a report saved with `qaf-metrics --format json`
+    archon-20250901.jsonl    a raw stream file (.jsonl / .jsonl.gz; stream named after the file)
+
+For every (stream, event) present on both sides the relative change of p50 / p95
+`duration_ms` and of throughput (events/s, or counter value/s for counter events such as
+chunks_upserted) is reported. An event regresses when p50 or p95 grow by more than
+`--max-p50` / `--max-p95` percent, or throughput drops by more than `--max-throughput-drop`
+percent (off by default: throughput follows the offered load, so only gate it for controlled
+runs). Events with fewer than `--min-count` samples on either side are shown but not gated.
+The exit code is 1 when anything regressed, so the command can block a deploy:
+
+    qaf-metrics --since 7d --until 1d --format json > baseline.json
+    qaf-metrics diff --baseline baseline.json --candidate 1h --events model_query retrieval_latency embed_batch
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from quantum_aeon_fluxor.utils import metrics_summary as ms
+
+DEFAULT_STREAMS = ("archon", "gemini", "ingest", "retrieval")
+_SEGMENT_RE = re.compile(r"(.+?)(?:-\d{8})?\.jsonl(?:\.gz)?")
+
+
+def parse_window(spec: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """(since, until) of `A` or `A..B`; an empty side is open (beginning of data / now)."""
+    since_s, sep, until_s = spec.partition("..")
+    try:
+        since = ms.parse_since(since_s.strip()) if since_s.strip() else None
+        until = ms.parse_since(until_s.strip()) if sep and until_s.strip() else None
+    except SystemExit:
+        raise SystemExit(f"Invalid window or file: {spec}") from None
+    return since, until
+
+
+def load_side(spec: str, directory: Path, streams: Sequence[str], workers: int = 1) -> Dict[str, Any]:
+    """The report (`metrics_summary.collect_report` shape) of one side of the comparison."""
+    path = Path(spec).expanduser()
+    if path.is_file():
+        m = _SEGMENT_RE.fullmatch(path.name)
+        if m:
+            summary = ms.scan_stream(path)
+            return {"source": str(path), "streams": {m.group(1): ms.stream_stats(summary)}}
+        try:
+            report = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"{path}: not a qaf-metrics JSON report ({e})")
+        if not isinstance(report, dict) or not isinstance(report.get("streams"), dict):
+            raise SystemExit(f"{path}: not a qaf-metrics JSON report (no 'streams')")
+        return report
+    since, until = parse_window(spec)
+    return ms.collect_report(directory, streams, since, until, workers)
+
+
+def _change(base: Optional[float], cand: Optional[float]) -> Optional[float]:
+    if base is None or cand is None or base <= 0:
+        return None
+    return (cand - base) / base
+
+
+def _throughput(row: Dict[str, Any]) -> Optional[float]:
+    return row.get("total_per_s") if row.get("total_per_s") is not None else row.get("rate_per_s")
+
+
+def _matches(event: str, wanted: Optional[Sequence[str]]) -> bool:
+    if event.endswith(":start"):
+        return False  # in-flight markers; the matching :end carries the duration
+    if not wanted:
+        return True
+    return event in wanted or (event.endswith(":end") and event[:-4] in wanted)
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], events: Optional[Sequence[str]] = None,
+            max_p50: float = 20.0, max_p95: float = 20.0, max_throughput_drop: Optional[float] = None,
+            min_count: int = 20) -> List[Dict[str, Any]]:
+    """One row per (stream, event) on both sides; thresholds are percentages."""
+    rows: List[Dict[str, Any]] = []
+    for stream, base_stats in sorted(baseline.get("streams", {}).items()):
+        cand_stats = candidate.get("streams", {}).get(stream)
+        if not cand_stats:
+            continue
+        for event, b in sorted(base_stats.get("events", {}).items()):
+            c = cand_stats.get("events", {}).get(event)
+            if c is None or not _matches(event, events):
+                continue
+            row: Dict[str, Any] = {"stream": stream, "event": event, "count": [b.get("count", 0), c.get("count", 0)]}
+            for key, base_v, cand_v in (("p50", b.get("p50"), c.get("p50")),
+                                        ("p95", b.get("p95"), c.get("p95")),
+                                        ("throughput", _throughput(b), _throughput(c))):
+                row[key] = [base_v, cand_v]
+                row[f"{key}_change"] = _change(base_v, cand_v)
+            if min(row["count"]) < min_count:
+                row["status"] = "low-count"
+                row["regressions"] = []
+            else:
+                reg = []
+                if row["p50_change"] is not None and row["p50_change"] * 100 > max_p50:
+                    reg.append("p50")
+                if row["p95_change"] is not None and row["p95_change"] * 100 > max_p95:
+                    reg.append("p95")
+                if (max_throughput_drop is not None and row["throughput_change"] is not None
+                        and -row["throughput_change"] * 100 > max_throughput_drop):
+                    reg.append("throughput")
+                row["status"] = "REGRESSION" if reg else "ok"
+                row["regressions"] = reg
+            rows.append(row)
+    return rows
+
+
+def _v(x: Optional[float]) -> str:
+    if x is None:
+        return "-"
+    return f"{x:.0f}" if x >= 100 else f"{x:.2f}"
+
+
+def _pct(x: Optional[float]) -> str:
+    return "-" if x is None else f"{x * 100:+.1f}%"
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    head = (f"{'stream':<9} {'event':<28} {'n base/cand':>13} | {'p50':>15} {'chg':>7} | "
+            f"{'p95':>15} {'chg':>7} | {'thr/s':>15} {'chg':>7}  status")
+    lines = [head, "-" * len(head)]
+    for r in rows:
+        line = f"{r['stream']:<9} {r['event'][:28]:<28} {'%d/%d' % tuple(r['count']):>13}"
+        for key in ("p50", "p95", "throughput"):
+            base, cand = r[key]
+            line += f" | {_v(base) + ' > ' + _v(cand):>15} {_pct(r[key + '_change']):>7}"
+        status = r["status"] + (f" ({', '.join(r['regressions'])})" if r["regressions"] else "")
+        lines.append(f"{line}  {status}")
+    return "\n".join(lines)
+
+
+def diff_cli(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="qaf-metrics diff",
+        description="Compare per-event latency/throughput of two windows or saved reports; exit 1 on regression.",
+    )
+    parser.add_argument('--baseline', required=True, help='Window (24h, 48h..24h, ISO..ISO) or file (report .json / stream .jsonl)')
+    parser.add_argument('--candidate', required=True, help='Window or file, as --baseline')
+    parser.add_argument('--dir', default=str(ms.DEFAULT_DIR), help='Metrics directory (for window sides)')
+    parser.add_argument('--streams', nargs='*', default=list(DEFAULT_STREAMS), help='Streams to read for window sides')
+    parser.add_argument('--events', nargs='*', help='Only these events (model_query also matches model_query:end)')
+    parser.add_argument('--max-p50', type=float, default=20.0, help='Allowed p50 increase in percent (default 20)')
+    parser.add_argument('--max-p95', type=float, default=20.0, help='Allowed p95 increase in percent (default 20)')
+    parser.add_argument('--max-throughput-drop', type=float, help='Allowed throughput drop in percent (default: not gated)')
+    parser.add_argument('--min-count', type=int, default=20, help='Samples needed on both sides to gate an event (default 20)')
+    parser.add_argument('--workers', type=int, default=1, help='Processes for scanning rotated segments')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
+    args = parser.parse_args(argv)
+
+    directory = Path(args.dir).expanduser().resolve()
+    baseline = load_side(args.baseline, directory, args.streams, args.workers)
+    candidate = load_side(args.candidate, directory, args.streams, args.workers)
+    rows = compare(baseline, candidate, args.events, args.max_p50, args.max_p95, args.max_throughput_drop, args.min_count)
+    regressions = sum(1 for r in rows if r["regressions"])
+
+    if args.format == "json":
+        print(json.dumps({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "baseline": args.baseline,
+            "candidate": args.candidate,
+            "thresholds": {"max_p50": args.max_p50, "max_p95": args.max_p95,
+                           "max_throughput_drop": args.max_throughput_drop, "min_count": args.min_count},
+            "events": rows,
+            "regressions": regressions,
+        }, indent=2))
+    elif rows:
+        print(format_table(rows))
+        limits = f"p50 +{args.max_p50:g}%, p95 +{args.max_p95:g}%"
+        if args.max_throughput_drop is not None:
+            limits += f", throughput -{args.max_throughput_drop:g}%"
+        print(f"\n{regressions} regression(s) over thresholds ({limits})" if regressions
+              else f"\nNo regressions ({limits})")
+    if not rows:
+        print("Nothing to compare: no event appears on both sides" + (" (check --events)" if args.events else ""),
+              file=sys.stderr)
+        raise SystemExit(2)
+    if regressions:
+        raise SystemExit(1)
+    return 0
@@ -0,0 +1,250 @@
+"""Prometheus / OpenMetrics endpoint for long-running processes (ingest, index, Archon REPL).
+
+Opt-in: `serve(port)` (or `--metrics-port` on qaf-ingest / qaf-index / `qaf-cli conversation`,
+or `QAECORE_METRICS_PORT`) registers an in-memory sink on `metrics.log_event` and serves
+`GET /metrics` from a daemon thread. The sink only updates counters in memory: no files are
+read and nothing extra is written, and without an exporter `log_event` skips the hook.
+
+Every event is mapped generically (labels `stream`, `event`; a trailing `:end` is dropped):
+    qaf_event_duration_seconds   histogram of `duration_ms` (embed_batch, upsert, retrieval_latency,
+                                 model_query, gemini query, ...)
+    qaf_events_total             events logged
+    qaf_errors_total             events with status=error / ok=false / "error" in the name
+    qaf_count_total              sum of `value` (log_counter: chunks_indexed, chunks_upserted, ...)
+    qaf_batch_items_total        sum of `batch_size` (e.g. chunks embedded)
+    qaf_cache_lookups_total      cache events by `result` / `cache` (hit, miss, ...)
+    qaf_in_flight                `time_block` regions currently running (concurrency)
+    qaf_queue_depth / qaf_concurrency   last reported `queue_depth` / `concurrency` field
+
+Throughput, e.g.: rate(qaf_count_total{event="chunks_upserted"}[1m]); latency:
+histogram_quantile(0.95, rate(qaf_event_duration_seconds_bucket{event="embed_batch"}[5m])).
+
+Config (env):
+    QAECORE_METRICS_PORT   port to serve on when no flag is given (unset = off)
+    QAECORE_METRICS_HOST   bind address (default 127.0.0.1)
+"""
+from __future__ import annotations
+
+import os
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple
+
+from quantum_aeon_fluxor.utils import metrics
+
+PORT_ENV = "QAECORE_METRICS_PORT"
+HOST_ENV = "QAECORE_METRICS_HOST"
+DEFAULT_HOST = "127.0.0.1"
+# seconds; spans cache lookups (ms) to slow model calls (tens of seconds)
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+GAUGE_FIELDS = ("queue_depth", "concurrency")
+CACHE_FIELDS = ("result", "cache")
+
+PROM_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+_Labels = Tuple[str, ...]
+
+
+def _num(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot: above the largest bound
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, v: float) -> None:
+        self.counts[bisect_left(BUCKETS, v)] += 1
+        self.sum += v
+        self.count += 1
+
+
+class Registry:
+    """Metric families fed by `observe(stream, record)` (the log_event sink)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hist: Dict[_Labels, _Histogram] = {}
+        self.events: DefaultDict[_Labels, int] = defaultdict(int)
+        self.errors: DefaultDict[_Labels, int] = defaultdict(int)
+        self.counts: DefaultDict[_Labels, float] = defaultdict(float)
+        self.items: DefaultDict[_Labels, float] = defaultdict(float)
+        self.cache: DefaultDict[_Labels, int] = defaultdict(int)
+        self.in_flight: DefaultDict[_Labels, int] = defaultdict(int)
+        self.gauges: Dict[str, Dict[_Labels, float]] = {f: {} for f in GAUGE_FIELDS}
+
+    def observe(self, stream: str, record: Dict[str, Any]) -> None:
+        event = record.get("event", "")
+        phase = ""
+        if event.endswith(":start") or event.endswith(":end"):
+            event, _, phase = event.rpartition(":")
+        key = (stream, event)
+        with self._lock:
+            if phase == "start":
+                self.in_flight[key] += 1
+                return
+            if phase == "end":
+                self.in_flight[key] = max(0, self.in_flight[key] - 1)
+            self.events[key] += 1
+            dur = record.get("duration_ms")
+            if _num(dur):
+                h = self.hist.get(key)
+                if h is None:
+                    h = self.hist[key] = _Histogram()
+                h.observe(dur / 1000.0)
+            if record.get("status") == "error" or record.get("ok") is False or "error" in event:
+                self.errors[key] += 1
+            value = record.get("value")
+            if _num(value):
+                self.counts[key] += value
+            batch = record.get("batch_size")
+            if _num(batch):
+                self.items[key] += batch
+            for f in CACHE_FIELDS:
+                result = record.get(f)
+                if isinstance(result, str) and ("cache" in event or f == "cache"):
+                    self.cache[(stream, event, result)] += 1
+                    break
+            for f in GAUGE_FIELDS:
+                v = record.get(f)
+                if _num(v):
+                    self.gauges[f][key] = v
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Exposition text (Prometheus 0.0.4, or OpenMetrics 1.0 with `# EOF`)."""
+        out: List[str] = []
+        counter_suffix = "" if openmetrics else "_total"
+
+        def family(name: str, kind: str, help_: str) -> None:
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} {kind}")
+
+        def counters(name: str, help_: str, values: Dict[_Labels, float], label_names: Tuple[str, ...] = ("stream", "event")) -> None:
+            if not values:
+                return
+            family(name + counter_suffix, "counter", help_)
+            for labels, v in sorted(values.items()):
+                out.append(f"{name}_total{_fmt_labels(label_names, labels)} {_fmt(v)}")
+
+        with self._lock:
+            if self.hist:
+                family("qaf_event_duration_seconds", "histogram", "Duration of timed events (duration_ms).")
+                for (stream, event), h in sorted(self.hist.items()):
+                    cum = 0
+                    for bound, n in zip(BUCKETS, h.counts):
+                        cum += n
+                        out.append(f"qaf_event_duration_seconds_bucket{_fmt_labels(('stream', 'event', 'le'), (stream, event, repr(bound)))} {cum}")
+                    out.append(f"qaf_event_duration_seconds_bucket{_fmt_labels(('stream', 'event', 'le'), (stream, event, '+Inf'))} {h.count}")
+                    out.append(f"qaf_event_duration_seconds_sum{_fmt_labels(('stream', 'event'), (stream, event))} {_fmt(h.sum)}")
+                    out.append(f"qaf_event_duration_seconds_count{_fmt_labels(('stream', 'event'), (stream, event))} {h.count}")
+            counters("qaf_events", "Metric events logged.", dict(self.events))
+            counters("qaf_errors", "Error events (status=error, ok=false or an error event).", dict(self.errors))
+            counters("qaf_count", "Sum of counter values (log_counter).", dict(self.counts))
+            counters("qaf_batch_items", "Sum of batch_size over batch events.", dict(self.items))
+            counters("qaf_cache_lookups", "Cache lookups by result.", dict(self.cache), ("stream", "event", "result"))
+            if self.in_flight:
+                family("qaf_in_flight", "gauge", "time_block regions currently running.")
+                for labels, v in sorted(self.in_flight.items()):
+                    out.append(f"qaf_in_flight{_fmt_labels(('stream', 'event'), labels)} {v}")
+            for f in GAUGE_FIELDS:
+                if self.gauges[f]:
+                    family(f"qaf_{f}", "gauge", f"Last reported {f}.")
+                    for labels, v in sorted(self.gauges[f].items()):
+                        out.append(f"qaf_{f}{_fmt_labels(('stream', 'event'), labels)} {_fmt(v)}")
+        if openmetrics:
+            out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+
+def _fmt(v: float) -> str:
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry: Registry
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        openmetrics = "application/openmetrics-text" in (self.headers.get("Accept") or "")
+        body = self.registry.render(openmetrics).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROM_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:  # scrapes must not clutter the console
+        pass
+
+
+class Exporter:
+    """A registry wired to `log_event` plus the HTTP server exposing it."""
+
+    def __init__(self, registry: Registry, server: ThreadingHTTPServer):
+        self.registry = registry
+        self.server = server
+        self.port = server.server_address[1]
+
+    def close(self) -> None:
+        metrics.remove_sink(self.registry.observe)
+        self.server.shutdown()
+        self.server.server_close()
+
+
+_exporter: Optional[Exporter] = None
+
+
+def serve(port: int, host: Optional[str] = None) -> Exporter:
+    """Start the endpoint (idempotent per process; port 0 picks a free port)."""
+    global _exporter
+    if _exporter is not None:
+        return _exporter
+    registry = Registry()
+    handler = type("Handler", (_Handler,), {"registry": registry})
+    server = ThreadingHTTPServer((host or os.environ.get(HOST_ENV) or DEFAULT_HOST, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="qaf-metrics-http", daemon=True).start()
+    metrics.add_sink(registry.observe)
+    _exporter = Exporter(registry, server)
+    return _exporter
+
+
+def stop() -> None:
+    global _exporter
+    if _exporter is not None:
+        _exporter.close()
+        _exporter = None
+
+
+def maybe_serve(port: Optional[int] = None) -> Optional[Exporter]:
+    """Start the endpoint when `port` (a CLI flag) or `QAECORE_METRICS_PORT` is set; never raises."""
+    if port is None:
+        raw = os.environ.get(PORT_ENV, "").strip()
+        port = int(raw) if raw.isdigit() else None
+    if port is None:
+        return None
+    try:
+        exporter = serve(port)
+    except OSError as e:
+        print(f"[metrics] could not serve on port {port}: {e}")
+        return None
+    host, bound = exporter.server.server_address[:2]
+    print(f"[metrics] Prometheus endpoint: http://{host}:{bound}/metrics")
+    return exporter
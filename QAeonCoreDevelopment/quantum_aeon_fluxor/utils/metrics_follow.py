@@ -0,0 +1,223 @@
+"""Live tail for metric streams: `qaf-metrics --follow` with rolling windows.
+
+Each stream's files are followed incrementally: only bytes appended since the previous poll are
+read (partial trailing lines wait for the next poll), a truncated or replaced file is re-read
+from the start, and segments that appear later (daily rotation) are picked up. On start the
+reader bisects to the oldest window, so the table is populated immediately without reading
+older history. gzip archives are ignored; they no longer grow.
+
+Per (stream, event) the follower keeps one bucket per second (count, errors, duration sketch)
+for the largest window. Each refresh merges the buckets of every window into throughput
+(events/s), p50/p95 of `duration_ms` and error rate, plus the age of the newest event, and
+redraws the table in place (ANSI) when stdout is a terminal.
+
+    qaf-metrics --follow --streams ingest gemini --interval 2 --windows 1m 5m
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from quantum_aeon_fluxor.utils import metrics_summary as ms
+from quantum_aeon_fluxor.utils.sketch import DDSketch
+
+DEFAULT_WINDOWS = (60, 300)
+READ_CHUNK = 1 << 20
+CLEAR = "\x1b[H\x1b[2J"
+
+
+class _Tail:
+    """Incremental reader of one JSONL file."""
+
+    def __init__(self, path: Path, start_key: Optional[str] = None):
+        self.path = path
+        self.pos = 0
+        self.ino = None
+        self.rest = b""
+        self._start_key = start_key
+
+    def read(self) -> List[dict]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if self.ino is not None and (st.st_ino != self.ino or st.st_size < self.pos):
+            self.pos, self.rest = 0, b""  # replaced or truncated: start over
+        self.ino = st.st_ino
+        if st.st_size == self.pos:
+            return []
+        out: List[dict] = []
+        with self.path.open("rb") as f:
+            if self._start_key is not None:
+                self.pos = ms._seek_since(f, st.st_size, self._start_key)
+                self._start_key = None
+            f.seek(self.pos)
+            while True:
+                data = f.read(READ_CHUNK)
+                if not data:
+                    break
+                self.pos += len(data)
+                data = self.rest + data
+                cut = data.rfind(b"\n") + 1
+                self.rest = data[cut:]
+                for line in data[:cut].splitlines():
+                    rec = ms._parse(line)
+                    if rec is not None:
+                        out.append(rec)
+        return out
+
+
+class _Second:
+    __slots__ = ("count", "errors", "sketch")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.sketch = DDSketch(exact_limit=64)
+
+
+class Follower:
+    """Follows `streams` in `directory` and aggregates rolling windows (seconds)."""
+
+    def __init__(self, directory: Path, streams: Sequence[str], windows: Sequence[int] = DEFAULT_WINDOWS,
+                 now: Optional[float] = None):
+        self.directory = Path(directory)
+        self.streams = list(streams)
+        self.windows = sorted(set(int(w) for w in windows))
+        self.tails: Dict[Path, Tuple[str, _Tail]] = {}
+        self.seconds: Dict[Tuple[str, str], Dict[int, _Second]] = {}
+        self.last_seen: Dict[Tuple[str, str], float] = {}
+        start = datetime.fromtimestamp(now if now is not None else time.time(), timezone.utc)
+        self._start_key = ms.since_key(start - timedelta(seconds=self.windows[-1]))
+        self._started = False
+
+    def _discover(self) -> None:
+        since = datetime.fromisoformat(self._start_key).replace(tzinfo=timezone.utc)
+        for stream in self.streams:
+            for path, _ in ms.prune_segments(ms.stream_segments(self.directory, stream), since):
+                if path not in self.tails and not ms._is_gz(path):
+                    # files present at start are read from the window start; later ones from the top
+                    self.tails[path] = (stream, _Tail(path, None if self._started else self._start_key))
+        self._started = True
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """Read what was appended since the last poll; returns the number of new records."""
+        now = time.time() if now is None else now
+        self._discover()
+        horizon = int(now) - self.windows[-1]
+        n = 0
+        for stream, tail in list(self.tails.values()):
+            for rec in tail.read():
+                ts = rec.get("ts")
+                ev = rec.get("event")
+                if not ev or not isinstance(ts, str):
+                    continue
+                try:
+                    t = datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
+                except ValueError:
+                    continue
+                sec = int(t)
+                if sec <= horizon:
+                    continue
+                key = (stream, ev)
+                sec_map = self.seconds.setdefault(key, {})
+                b = sec_map.get(sec)
+                if b is None:
+                    b = sec_map[sec] = _Second()
+                b.count += 1
+                b.errors += ms.is_error(rec)
+                dur = rec.get("duration_ms")
+                if isinstance(dur, (int, float)) and not isinstance(dur, bool):
+                    b.sketch.add(float(dur))
+                if t > self.last_seen.get(key, 0.0):
+                    self.last_seen[key] = t
+                n += 1
+        for sec_map in self.seconds.values():
+            for sec in [s for s in sec_map if s <= horizon]:
+                del sec_map[sec]
+        return n
+
+    def stats(self, now: Optional[float] = None) -> Dict[Tuple[str, str], Dict[int, Dict[str, Optional[float]]]]:
+        """{(stream, event): {window_s: {rate, p50, p95, err}}}; windows without events are omitted."""
+        now = time.time() if now is None else now
+        out: Dict[Tuple[str, str], Dict[int, Dict[str, Optional[float]]]] = {}
+        for key, sec_map in sorted(self.seconds.items()):
+            per_window = {}
+            for w in self.windows:
+                count = errors = 0
+                sketch = DDSketch(exact_limit=1024)
+                for sec, b in sec_map.items():
+                    if sec > now - w:
+                        count += b.count
+                        errors += b.errors
+                        sketch.merge(b.sketch)
+                if count:
+                    per_window[w] = {
+                        "rate": count / w,
+                        "p50": sketch.quantile(0.5),
+                        "p95": sketch.quantile(0.95),
+                        "err": errors / count,
+                    }
+            if per_window:
+                out[key] = per_window
+        return out
+
+    def render(self, now: Optional[float] = None) -> str:
+        now = time.time() if now is None else now
+        stats = self.stats(now)
+        head = f"{'stream':<9} {'event':<28} {'last':>6}"
+        for w in self.windows:
+            label = _window_label(w)
+            head += f" | {label + ' /s':>9} {'p50':>8} {'p95':>8} {'err%':>5}"
+        lines = [f"qaf-metrics --follow  {datetime.now().strftime('%H:%M:%S')}  {self.directory}", head, "-" * len(head)]
+        for (stream, event), per_window in stats.items():
+            age = now - self.last_seen.get((stream, event), now)
+            row = f"{stream:<9} {event[:28]:<28} {_age(age):>6}"
+            for w in self.windows:
+                s = per_window.get(w)
+                if s is None:
+                    row += f" | {'-':>9} {'-':>8} {'-':>8} {'-':>5}"
+                else:
+                    row += f" | {s['rate']:>9.2f} {_ms(s['p50']):>8} {_ms(s['p95']):>8} {s['err'] * 100:>5.1f}"
+            lines.append(row)
+        if not stats:
+            lines.append(f"(no events in the last {_window_label(self.windows[-1])})")
+        return "\n".join(lines)
+
+
+def _window_label(w: int) -> str:
+    return f"{w // 60}m" if w % 60 == 0 else f"{w}s"
+
+
+def _age(s: float) -> str:
+    return f"{s:.0f}s" if s < 120 else f"{s / 60:.0f}m"
+
+
+def _ms(v: Optional[float]) -> str:
+    return "-" if v is None else (f"{v:.0f}" if v >= 100 else f"{v:.1f}")
+
+
+def parse_window(s: str) -> int:
+    m = ms._RELATIVE_RE.fullmatch(s.strip())
+    if not m:
+        raise ValueError(f"bad window {s!r} (use e.g. 30s, 1m, 5m)")
+    return max(1, int(float(m.group(1)) * ms._UNIT_S[m.group(2)]))
+
+
+def follow(directory: Path, streams: Sequence[str], windows: Sequence[int] = DEFAULT_WINDOWS, interval: float = 2.0) -> None:
+    """Poll and redraw until interrupted."""
+    follower = Follower(directory, streams, windows)
+    tty = sys.stdout.isatty()
+    try:
+        while True:
+            follower.poll()
+            table = follower.render()
+            sys.stdout.write((CLEAR + table + "\n") if tty else (table + "\n\n"))
+            sys.stdout.flush()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,322 @@
+"""Time-bucketed rollups of raw metric events (`qaf-metrics compact` / `qaf-metrics rollup`).
+
+`compact` reads each stream's JSONL segments (`metrics_summary.stream_segments`) incrementally (from the byte offset recorded by
+the previous run) and folds events into per-minute and per-hour aggregates per (stream,
+event): count, sum, min, max, error count, counter total and a DDSketch for percentiles.
+Aggregates live in one SQLite file (default `<metrics dir>/rollups.sqlite`). Re-running
+`compact` only reads data appended since the last run, and buckets are merged, not replaced.
+
+Retention:
+    --retain-raw-days N      delete dated raw segments (<stream>-YYYYMMDD.jsonl[.gz], daily rotation)
+                             older than N days once fully compacted; the undated live file is
+                             never rewritten, since writers keep appending to it
+    --minute-days / --hour-days  drop minute / hour buckets older than that (default 14 / 400)
+
+`rollup` answers range queries from the aggregates, e.g. p95 of model_query over 30 days,
+by merging hour buckets (minute buckets for ranges up to 6 hours):
+
+    qaf-metrics compact --streams archon gemini ingest --retain-raw-days 30
+    qaf-metrics rollup --streams gemini --since 30d --event model_query
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from quantum_aeon_fluxor.utils import metrics_summary as ms
+from quantum_aeon_fluxor.utils.sketch import DDSketch
+
+ROLLUP_FILE = "rollups.sqlite"
+MINUTE, HOUR = 60, 3600
+CHUNK_RECORDS = 200_000  # aggregates are merged into SQLite (and offsets committed) per chunk
+MINUTE_QUERY_MAX_S = 6 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    stream TEXT NOT NULL, event TEXT NOT NULL, res INTEGER NOT NULL, bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL, sum REAL NOT NULL, min REAL, max REAL,
+    errors INTEGER NOT NULL, value_total INTEGER NOT NULL, sketch BLOB,
+    PRIMARY KEY (stream, event, res, bucket)
+);
+CREATE TABLE IF NOT EXISTS progress (
+    stream TEXT NOT NULL, file TEXT NOT NULL, inode INTEGER NOT NULL, offset INTEGER NOT NULL,
+    PRIMARY KEY (stream, file)
+);
+"""
+
+
+@dataclass
+class Agg:
+    count: int = 0
+    sum: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    errors: int = 0
+    value_total: int = 0
+    sketch: Optional[DDSketch] = None
+
+    def add(self, duration: Optional[float], error: bool, value: int) -> None:
+        self.count += 1
+        self.errors += error
+        self.value_total += value
+        if duration is not None:
+            if self.sketch is None:
+                self.sketch = DDSketch(exact_limit=0)
+            self.sketch.add(duration)
+            self.sum += duration
+            self.min = duration if self.min is None else min(self.min, duration)
+            self.max = duration if self.max is None else max(self.max, duration)
+
+    def merge(self, other: "Agg") -> "Agg":
+        self.count += other.count
+        self.errors += other.errors
+        self.value_total += other.value_total
+        self.sum += other.sum
+        if other.sketch is not None:
+            self.sketch = other.sketch if self.sketch is None else self.sketch.merge(other.sketch)
+        for attr, pick in (("min", min), ("max", max)):
+            theirs = getattr(other, attr)
+            if theirs is not None:
+                mine = getattr(self, attr)
+                setattr(self, attr, theirs if mine is None else pick(mine, theirs))
+        return self
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Agg":
+        count, total, lo, hi, errors, value_total, sketch = row
+        return cls(count=count, sum=total, min=lo, max=hi, errors=errors, value_total=value_total,
+                   sketch=DDSketch.from_bytes(sketch) if sketch else None)
+
+    def row(self) -> Tuple:
+        sketch = self.sketch.to_bytes() if self.sketch is not None else None
+        return (self.count, self.sum, self.min, self.max, self.errors, self.value_total, sketch)
+
+
+def _segment_name(path: Path) -> str:
+    """Progress key: a gzip archive continues where its plain segment left off (offsets are uncompressed)."""
+    return path.name[:-3] if path.name.endswith(".gz") else path.name
+
+
+def _gz_size(path: Path) -> int:
+    """Uncompressed size from the gzip trailer (ISIZE, modulo 2**32)."""
+    with path.open("rb") as f:
+        f.seek(-4, os.SEEK_END)
+        return int.from_bytes(f.read(4), "little")
+
+
+class RollupStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # --- compaction ---
+
+    def _offset(self, stream: str, file: str) -> Tuple[int, int]:
+        row = self.conn.execute("SELECT inode, offset FROM progress WHERE stream=? AND file=?", (stream, file)).fetchone()
+        return (row[0], row[1]) if row else (-1, 0)
+
+    def _commit(self, stream: str, file: str, expected: Tuple[int, int], inode: int, end: int,
+                aggs: Dict[Tuple[str, int, int], Agg]) -> bool:
+        """Merge `aggs` and advance the file offset atomically; False if another run got there first."""
+        c = self.conn
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            if self._offset(stream, file) != expected:
+                c.execute("ROLLBACK")
+                return False
+            for (event, res, bucket), agg in aggs.items():
+                row = c.execute(
+                    "SELECT count, sum, min, max, errors, value_total, sketch FROM rollups "
+                    "WHERE stream=? AND event=? AND res=? AND bucket=?", (stream, event, res, bucket)).fetchone()
+                if row:
+                    agg = Agg.from_row(row).merge(agg)
+                c.execute("INSERT OR REPLACE INTO rollups VALUES (?,?,?,?,?,?,?,?,?,?,?)", (stream, event, res, bucket, *agg.row()))
+            c.execute("INSERT OR REPLACE INTO progress VALUES (?,?,?,?)", (stream, file, inode, end))
+            c.execute("COMMIT")
+            return True
+        except Exception:
+            c.execute("ROLLBACK")
+            raise
+
+    def compact_file(self, stream: str, path: Path) -> int:
+        """Fold complete lines appended to `path` since the last run; returns records read."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return 0
+        name, gz = _segment_name(path), ms._is_gz(path)
+        expected = self._offset(stream, name)
+        inode, offset = expected
+        if gz:
+            if offset and offset % 2 ** 32 == _gz_size(path):
+                return 0  # archive of an already compacted segment: nothing to decompress
+        elif inode != st.st_ino or offset > st.st_size:
+            offset = 0  # new, replaced or truncated file
+        start, pending, committed = offset, 0, 0
+        aggs: Dict[Tuple[str, int, int], Agg] = {}
+        with ms.open_segment(path) as f:
+            f.seek(offset)
+            while True:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break  # EOF or a line still being written: picked up next run
+                offset += len(line)
+                rec = ms._parse(line)
+                if rec is None or not rec.get("event"):
+                    continue
+                try:
+                    epoch = int(ms._ts_dt(rec["ts"]).timestamp())
+                except Exception:
+                    continue
+                dur = rec.get("duration_ms")
+                duration = float(dur) if isinstance(dur, (int, float)) else None
+                value = rec.get("value")
+                value = int(value) if isinstance(value, (int, float)) else 0
+                error = ms.is_error(rec)
+                for res in (MINUTE, HOUR):
+                    key = (rec["event"], res, epoch - epoch % res)
+                    agg = aggs.get(key)
+                    if agg is None:
+                        agg = aggs[key] = Agg()
+                    agg.add(duration, error, value)
+                pending += 1
+                if pending >= CHUNK_RECORDS:
+                    if not self._commit(stream, name, expected, st.st_ino, offset, aggs):
+                        return committed  # a concurrent run compacted this file
+                    committed, pending, start, aggs = committed + pending, 0, offset, {}
+                    expected = (st.st_ino, offset)
+        if offset != start and self._commit(stream, name, expected, st.st_ino, offset, aggs):
+            committed += pending
+        return committed
+
+    def fully_compacted(self, stream: str, path: Path) -> bool:
+        inode, offset = self._offset(stream, _segment_name(path))
+        if ms._is_gz(path):
+            return offset > 0 and offset % 2 ** 32 == _gz_size(path)
+        return inode == path.stat().st_ino and offset == path.stat().st_size
+
+    def forget(self, stream: str, path: Path) -> None:
+        self.conn.execute("DELETE FROM progress WHERE stream=? AND file=?", (stream, _segment_name(path)))
+
+    def prune(self, res: int, older_than: int) -> int:
+        return self.conn.execute("DELETE FROM rollups WHERE res=? AND bucket < ?", (res, older_than)).rowcount
+
+    # --- queries ---
+
+    def query(self, stream: str, start: int, end: Optional[int] = None, event: Optional[str] = None,
+              res: Optional[int] = None) -> Tuple[int, Dict[str, Agg]]:
+        """Merged aggregates per event over buckets in [start, end); returns (resolution, {event: Agg})."""
+        end = end if end is not None else 2 ** 62
+        if res is None:
+            res = MINUTE if end - start <= MINUTE_QUERY_MAX_S else HOUR
+        sql = ("SELECT event, count, sum, min, max, errors, value_total, sketch FROM rollups "
+               "WHERE stream=? AND res=? AND bucket >= ? AND bucket < ?")
+        args: List = [stream, res, start - start % res, end]
+        if event:
+            sql += " AND event=?"
+            args.append(event)
+        out: Dict[str, Agg] = {}
+        for ev, *row in self.conn.execute(sql, args):
+            agg = Agg.from_row(row)
+            out[ev] = out[ev].merge(agg) if ev in out else agg
+        return res, out
+
+
+def default_db(directory: Path) -> Path:
+    return Path(directory) / ROLLUP_FILE
+
+
+def compact(directory: Path, streams: Iterable[str], db: Optional[Path] = None, retain_raw_days: Optional[int] = None,
+            minute_days: int = 14, hour_days: int = 400, now: Optional[datetime] = None) -> Dict[str, int]:
+    now = now or datetime.now(timezone.utc)
+    store = RollupStore(db or default_db(directory))
+    read: Dict[str, int] = {}
+    try:
+        for stream in streams:
+            read[stream] = 0
+            for path, day in ms.stream_segments(directory, stream):
+                read[stream] += store.compact_file(stream, path)
+                if (retain_raw_days is not None and day is not None
+                        and datetime.strptime(day, "%Y%m%d").replace(tzinfo=timezone.utc) < now - timedelta(days=retain_raw_days + 1)
+                        and store.fully_compacted(stream, path)):
+                    path.unlink()
+                    store.forget(stream, path)
+        epoch = int(now.timestamp())
+        store.prune(MINUTE, epoch - minute_days * 86400)
+        store.prune(HOUR, epoch - hour_days * 86400)
+    finally:
+        store.close()
+    return read
+
+
+def _stats_line(ev: str, agg: Agg) -> str:
+    line = f"    - {ev}: count={agg.count}"
+    s = agg.sketch
+    if s is not None and s.count:
+        line += (f" min={round(agg.min, 2)} p50={round(s.quantile(0.5), 2)} p90={round(s.quantile(0.9), 2)}"
+                 f" p95={round(s.quantile(0.95), 2)} p99={round(s.quantile(0.99), 2)} max={round(agg.max, 2)}"
+                 f" mean={round(agg.sum / s.count, 2)}")
+    if agg.value_total:
+        line += f" total={agg.value_total}"
+    if agg.errors:
+        line += f" errors={agg.errors}"
+    return line
+
+
+def compact_cli(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="qaf-metrics compact", description="Roll raw metric events into per-minute/per-hour aggregates.")
+    parser.add_argument('--dir', default=str(ms.DEFAULT_DIR), help='Metrics directory')
+    parser.add_argument('--db', help=f'Rollup SQLite file (default <dir>/{ROLLUP_FILE})')
+    parser.add_argument('--streams', nargs='*', default=['archon', 'gemini', 'ingest'])
+    parser.add_argument('--retain-raw-days', type=int, help='Delete compacted dated raw segments older than N days')
+    parser.add_argument('--minute-days', type=int, default=14, help='Keep minute buckets this many days')
+    parser.add_argument('--hour-days', type=int, default=400, help='Keep hour buckets this many days')
+    args = parser.parse_args(argv)
+    directory = Path(args.dir).expanduser().resolve()
+    t0 = perf_counter()
+    read = compact(directory, args.streams, Path(args.db) if args.db else None, args.retain_raw_days,
+                   args.minute_days, args.hour_days)
+    print(f"Compacted {sum(read.values())} new records in {perf_counter() - t0:.2f}s: "
+          + " ".join(f"{s}={n}" for s, n in read.items()))
+
+
+def query_cli(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="qaf-metrics rollup", description="Query per-event stats from compacted rollups.")
+    parser.add_argument('--dir', default=str(ms.DEFAULT_DIR), help='Metrics directory')
+    parser.add_argument('--db', help=f'Rollup SQLite file (default <dir>/{ROLLUP_FILE})')
+    parser.add_argument('--streams', nargs='*', default=['archon', 'gemini', 'ingest'])
+    parser.add_argument('--since', default='24h', help='Start: ISO timestamp or relative (30d, 12h, 90m); default 24h')
+    parser.add_argument('--until', help='End: ISO timestamp or relative')
+    parser.add_argument('--event', help='Only this event')
+    parser.add_argument('--res', choices=['minute', 'hour'], help='Bucket resolution (default: by range)')
+    args = parser.parse_args(argv)
+    db = Path(args.db) if args.db else default_db(Path(args.dir).expanduser().resolve())
+    if not db.exists():
+        raise SystemExit(f"No rollups at {db}; run `qaf-metrics compact` first.")
+    start = int(ms.parse_since(args.since).timestamp())
+    end = int(ms.parse_since(args.until).timestamp()) if args.until else None
+    res = {"minute": MINUTE, "hour": HOUR}.get(args.res or "")
+    store = RollupStore(db)
+    try:
+        for stream in args.streams:
+            t0 = perf_counter()
+            used, aggs = store.query(stream, start, end, args.event, res)
+            print(f"\nStream: {stream}  ({'minute' if used == MINUTE else 'hour'} buckets, {(perf_counter() - t0) * 1000:.1f} ms)")
+            if not aggs:
+                print("  (no data)")
+            for ev, agg in sorted(aggs.items()):
+                print(_stats_line(ev, agg))
+    finally:
+        store.close()
@@ -8,123 +8,439 @@ qaf-metrics                     # default summary
 qaf-metrics --streams archon gemini ingest --last 50
 qaf-metrics --raw archon        # dump raw lines for a stream
 qaf-metrics --since '2025-08-15T10:00:00Z'
+qaf-metrics compact             # fold new events into minute/hour rollups (utils/metrics_rollup)
+qaf-metrics rollup --since 30d --event model_query
+qaf-metrics --follow --streams ingest gemini   # live 1m/5m windows (utils/metrics_follow)
+qaf-metrics --since 24h --format json > baseline.json   # machine-readable per-event stats (or csv)
+qaf-metrics diff --baseline baseline.json --candidate 1h   # regression gate (utils/metrics_diff)
+qaf-metrics profile --stages ingest      # hottest functions per profiled stage (utils/profiling)
 
 Design:
 - Pure stdlib
 - Defensive parsing (skips malformed lines)
 - Basic statistics: count, min, p50, p90, p95, max, mean for duration_ms
-- Groups per event (compose_prompt:end, model_query:end, etc.)
+- Groups per event (compose_prompt:end, model_query:end, etc.), with event and error counts
+  and throughput over the stream's time span in the json/csv output
+- Single streaming pass in constant memory: per-event DDSketch quantiles (exact for small
+  groups, within 1% relative error beyond) and counter totals (`utils/sketch`)
+- --since bisects the file by timestamp and skips older records without parsing them
+- Recent events are read backwards from the end of the file
+- Rotation-aware: all segments of a stream are read (<stream>-YYYYMMDD.jsonl, .jsonl.gz
+  archives, then <stream>.jsonl); --since skips whole segments by their file-name date, and
+  large multi-segment scans run in worker processes (--workers) and are merged
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from statistics import mean
-from typing import List, Dict, Any, Iterable
-from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterable, Iterator, Optional, BinaryIO, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import gzip
 import os
+import re
+import sys
 import json as _json
 
+from quantum_aeon_fluxor.utils.sketch import DDSketch
+
 DEFAULT_DIR = Path(os.getenv("QAECORE_METRICS_DIR", Path.cwd() / "metrics"))
+TAIL_BLOCK = 64 * 1024
+SINCE_SLACK = 64 * 1024  # bytes re-read before the bisected offset: writers may append slightly out of order
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024  # below this, process start-up costs more than it saves
 
 
 @dataclass
 class StatBucket:
-    durations: List[float] = field(default_factory=list)
+    sketch: DDSketch = field(default_factory=DDSketch)
 
     def add(self, v: float):
-        self.durations.append(v)
+        self.sketch.add(v)
+
+    def merge(self, other: "StatBucket") -> "StatBucket":
+        self.sketch.merge(other.sketch)
+        return self
 
     def summary(self) -> Dict[str, Any]:
-        if not self.durations:
+        s = self.sketch
+        if not s.count:
             return {"count": 0}
-        data = sorted(self.durations)
-        def pct(p: float) -> float:
-            if not data:
-                return 0.0
-            idx = min(len(data)-1, int(p * (len(data)-1)))
-            return data[idx]
         return {
-            "count": len(data),
-            "min": round(data[0], 2),
-            "p50": round(pct(0.5), 2),
-            "p90": round(pct(0.9), 2),
-            "p95": round(pct(0.95), 2),
-            "max": round(data[-1], 2),
-            "mean": round(mean(data), 2),
+            "count": s.count,
+            "min": round(s.min, 2),
+            "p50": round(s.quantile(0.5), 2),
+            "p90": round(s.quantile(0.9), 2),
+            "p95": round(s.quantile(0.95), 2),
+            "max": round(s.max, 2),
+            "mean": round(s.mean, 2),
         }
 
 
+def is_error(rec: Dict[str, Any]) -> bool:
+    return rec.get("status") == "error" or rec.get("ok") is False or "error" in rec
+
+
+@dataclass
+class StreamSummary:
+    """Constant-memory aggregate of one stream: record count, per-event counts, sketches and counter totals."""
+    records: int = 0
+    buckets: Dict[str, StatBucket] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    events: Dict[str, int] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    first_ts: Optional[str] = None
+    last_ts: Optional[str] = None
+
+    def add(self, rec: Dict[str, Any]) -> None:
+        self.records += 1
+        ts = rec.get('ts')
+        if ts:
+            if self.first_ts is None:
+                self.first_ts = ts
+            self.last_ts = ts
+        ev = rec.get('event')
+        if not ev:
+            return
+        self.events[ev] = self.events.get(ev, 0) + 1
+        if is_error(rec):
+            self.errors[ev] = self.errors.get(ev, 0) + 1
+        dur = rec.get('duration_ms')
+        if dur is not None:
+            bucket = self.buckets.get(ev)
+            if bucket is None:
+                bucket = self.buckets[ev] = StatBucket()
+            try:
+                bucket.sketch.add(float(dur))
+            except (TypeError, ValueError):
+                pass
+        # generic counter events (value field) accumulate
+        if 'value' in rec:
+            try:
+                self.counters[ev] = self.counters.get(ev, 0) + int(rec.get('value', 0))
+            except (TypeError, ValueError):
+                pass
+
+    def merge(self, other: "StreamSummary") -> "StreamSummary":
+        self.records += other.records
+        for ev, b in other.buckets.items():
+            self.buckets.setdefault(ev, StatBucket()).merge(b)
+        for ev, total in other.counters.items():
+            self.counters[ev] = self.counters.get(ev, 0) + total
+        for ev, n in other.events.items():
+            self.events[ev] = self.events.get(ev, 0) + n
+        for ev, n in other.errors.items():
+            self.errors[ev] = self.errors.get(ev, 0) + n
+        if other.first_ts and (self.first_ts is None or other.first_ts < self.first_ts):
+            self.first_ts = other.first_ts
+        if other.last_ts and (self.last_ts is None or other.last_ts > self.last_ts):
+            self.last_ts = other.last_ts
+        return self
+
+
+def stream_segments(directory: Path, stream: str) -> List[Tuple[Path, Optional[str]]]:
+    """Files of `stream` as (path, YYYYMMDD or None): dated segments oldest first, then the live file.
+
+    Dated segments come from daily rotation (<stream>-YYYYMMDD.jsonl) and may be gzip archives
+    (<stream>-YYYYMMDD.jsonl.gz); while both exist for a day, the plain file is used.
+    """
+    directory = Path(directory)
+    pattern = re.compile(rf"{re.escape(stream)}-(\d{{8}})\.jsonl(\.gz)?")
+    by_day: Dict[str, Path] = {}
+    for p in directory.glob(f"{stream}-*.jsonl*"):
+        m = pattern.fullmatch(p.name)
+        if m and (m.group(1) not in by_day or not m.group(2)):
+            by_day[m.group(1)] = p
+    out: List[Tuple[Path, Optional[str]]] = [(p, day) for day, p in sorted(by_day.items())]
+    live = directory / f"{stream}.jsonl"
+    if live.exists():
+        out.append((live, None))
+    return out
+
+
+def prune_segments(segments: List[Tuple[Path, Optional[str]]], since: Optional[datetime],
+                   until: Optional[datetime] = None) -> List[Tuple[Path, Optional[str]]]:
+    """Drop dated segments whose whole day ends before `since` or starts after `until` (from the file name alone)."""
+    if since is not None:
+        first_day = since.astimezone(timezone.utc).strftime("%Y%m%d")
+        segments = [(p, day) for p, day in segments if day is None or day >= first_day]
+    if until is not None:
+        last_day = until.astimezone(timezone.utc).strftime("%Y%m%d")
+        segments = [(p, day) for p, day in segments if day is None or day <= last_day]
+    return segments
+
+
+def _is_gz(path: Path) -> bool:
+    return path.name.endswith(".gz")
+
+
+def open_segment(path: Path) -> BinaryIO:
+    return gzip.open(path, "rb") if _is_gz(path) else path.open("rb")
+
+
 def iter_lines(path: Path) -> Iterable[Dict[str, Any]]:
+    return iter_records(path)
+
+
+_decode = json.JSONDecoder().decode
+
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        obj = _decode(line.decode("utf-8"))
+    except Exception:
+        return None  # blank, torn or malformed line
+    return obj if isinstance(obj, dict) else None
+
+
+def since_key(since: datetime) -> str:
+    """Comparable UTC key (second resolution) for `since`; see `_ts_key`."""
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _ts_key(ts: Any) -> Optional[str]:
+    """UTC key of a record timestamp; writers emit UTC ISO strings, so usually a slice."""
+    if not isinstance(ts, str) or len(ts) < 19:
+        return None
+    if ts.endswith("+00:00") or ts.endswith("Z"):
+        return ts[:19]
+    return since_key(_ts_dt(ts))
+
+
+def _seek_since(f: BinaryIO, size: int, key: str) -> int:
+    """Offset of a line start at or shortly before the first record with ts >= `key` (bisection)."""
+    lo, hi = 0, size
+    while hi - lo > TAIL_BLOCK:
+        mid = (lo + hi) // 2
+        f.seek(mid)
+        f.readline()  # finish the partial line
+        rec_key = None
+        while rec_key is None:
+            pos = f.tell()
+            if pos >= hi:
+                break
+            line = f.readline()
+            if not line:
+                break
+            rec = _parse(line)
+            rec_key = _ts_key(rec.get('ts')) if rec else None
+        if rec_key is None:
+            hi = mid
+        elif rec_key < key:
+            lo = pos
+        else:
+            hi = mid
+    if lo <= SINCE_SLACK:
+        return 0
+    f.seek(lo - SINCE_SLACK)
+    f.readline()
+    return f.tell()
+
+
+def iter_records(path: Path, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """Stream records of a JSONL file once; with `since`, seek past older records first.
+
+    `until` is exclusive. Records are not strictly time-ordered across writers, so it filters
+    rather than stops the read.
+    """
     if not path.exists():
-        return []
-    with path.open("r", encoding="utf-8") as f:
+        return
+    key = since_key(since) if since else None
+    ukey = since_key(until) if until else None
+    with open_segment(path) as f:
+        if key and not _is_gz(path):  # archives cannot be bisected cheaply; they are filtered while read
+            f.seek(_seek_since(f, os.fstat(f.fileno()).st_size, key))
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-                yield obj
-            except Exception:
+            rec = _parse(line)
+            if rec is None:
                 continue
+            if key or ukey:
+                rk = _ts_key(rec.get('ts'))
+                if rk is None or (key and rk < key) or (ukey and rk >= ukey):
+                    continue
+            yield rec
+
+
+def tail_records(path: Path, n: int, since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Last `n` records (oldest first), read backwards from the end of the file."""
+    if n <= 0 or not path.exists():
+        return []
+    if _is_gz(path):
+        return list(deque(iter_records(path, since, until), maxlen=n))
+    key = since_key(since) if since else None
+    ukey = since_key(until) if until else None
+    out: List[Dict[str, Any]] = []
+    with path.open("rb") as f:
+        pos = os.fstat(f.fileno()).st_size
+        rest = b""
+        while pos > 0 and len(out) < n:
+            step = min(TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step) + rest
+            lines = block.split(b"\n")
+            rest = lines[0] if pos > 0 else b""  # may be a partial line; completed by the next block
+            for line in reversed(lines[1:] if pos > 0 else lines):
+                rec = _parse(line)
+                if rec is None:
+                    continue
+                rk = _ts_key(rec.get('ts')) if key or ukey else None
+                if key and (rk is None or rk < key):
+                    # appended in time order: everything before is older too
+                    return out[::-1]
+                if ukey and (rk is None or rk >= ukey):
+                    continue
+                out.append(rec)
+                if len(out) >= n:
+                    break
+    return out[::-1]
+
+
+def scan_stream(path: Path, since: Optional[datetime] = None, until: Optional[datetime] = None) -> StreamSummary:
+    summary = StreamSummary()
+    for rec in iter_records(path, since, until):
+        summary.add(rec)
+    return summary
+
+
+def scan_segments(paths: Sequence[Path], since: Optional[datetime] = None, workers: int = 1,
+                  until: Optional[datetime] = None) -> StreamSummary:
+    """Summaries of several segments, scanned in worker processes when worthwhile, merged in order."""
+    paths = list(paths)
+    size = sum(p.stat().st_size for p in paths if p.exists())
+    if workers > 1 and len(paths) > 1 and size >= PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as ex:
+            parts = list(ex.map(scan_stream, paths, repeat(since), repeat(until)))
+    else:
+        parts = [scan_stream(p, since, until) for p in paths]
+    merged = StreamSummary()
+    for part in parts:
+        merged.merge(part)
+    return merged
+
+
+def tail_segments(paths: Sequence[Path], n: int, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Last `n` records across segments (given oldest first), newest segment read first."""
+    out: List[Dict[str, Any]] = []
+    for p in reversed(list(paths)):
+        if len(out) >= n:
+            break
+        out = tail_records(p, n - len(out), since, until) + out
+    return out
+
+
+def stream_stats(summary: StreamSummary) -> Dict[str, Any]:
+    """Machine-readable per-event statistics of one stream (the json/csv output).
+
+    Throughput (`rate_per_s`, and `total_per_s` for counter events) is measured over the
+    stream's first..last timestamp in the selected range.
+    """
+    span = None
+    if summary.first_ts and summary.last_ts:
+        span = (_ts_dt(summary.last_ts) - _ts_dt(summary.first_ts)).total_seconds()
+    per_s = (lambda n: round(n / span, 4)) if span else (lambda n: None)
+    events: Dict[str, Dict[str, Any]] = {}
+    for ev in sorted(set(summary.events) | set(summary.buckets) | set(summary.counters)):
+        count = summary.events.get(ev, 0)
+        errors = summary.errors.get(ev, 0)
+        row: Dict[str, Any] = {
+            "count": count,
+            "errors": errors,
+            "error_rate": round(errors / count, 4) if count else 0.0,
+            "rate_per_s": per_s(count),
+        }
+        bucket = summary.buckets.get(ev)
+        if bucket is not None and bucket.sketch.count:
+            row.update({k: v for k, v in bucket.summary().items() if k != "count"})
+        if ev in summary.counters:
+            row["total"] = summary.counters[ev]
+            row["total_per_s"] = per_s(summary.counters[ev])
+        events[ev] = row
+    return {
+        "records": summary.records,
+        "first_ts": summary.first_ts,
+        "last_ts": summary.last_ts,
+        "span_s": span,
+        "events": events,
+    }
+
+
+def collect_report(directory: Path, streams: Sequence[str], since: Optional[datetime] = None,
+                   until: Optional[datetime] = None, workers: int = 1) -> Dict[str, Any]:
+    """Per-event statistics of `streams` in `directory` (the `--format json` document)."""
+    report: Dict[str, Any] = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "dir": str(directory),
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+        "streams": {},
+    }
+    for stream in streams:
+        paths = [p for p, _ in prune_segments(stream_segments(directory, stream), since, until)]
+        report["streams"][stream] = stream_stats(scan_segments(paths, since, workers, until))
+    return report
+
+
+CSV_FIELDS = ("stream", "event", "count", "errors", "error_rate", "rate_per_s",
+              "min", "p50", "p90", "p95", "max", "mean", "total", "total_per_s")
+
+
+def write_report(report: Dict[str, Any], fmt: str, out=None) -> None:
+    out = out or sys.stdout
+    if fmt == "json":
+        out.write(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+        return
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for stream, stats in report["streams"].items():
+        for ev, row in stats["events"].items():
+            writer.writerow({"stream": stream, "event": ev, **row})
+
+
+_RELATIVE_RE = re.compile(r"(\d+(?:\.\d+)?)([smhdw])")
+_UNIT_S = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
 
 
 def parse_since(s: str | None):
+    """ISO timestamp (naive = UTC) or a relative age such as 90m, 12h, 30d."""
     if not s:
         return None
+    rel = _RELATIVE_RE.fullmatch(s.strip())
+    if rel:
+        return datetime.now(timezone.utc) - timedelta(seconds=float(rel.group(1)) * _UNIT_S[rel.group(2)])
     try:
         if s.endswith("Z"):
-            return datetime.fromisoformat(s.replace("Z", "+00:00"))
-        return datetime.fromisoformat(s)
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+        else:
+            dt = datetime.fromisoformat(s)
     except Exception:
         raise SystemExit(f"Invalid --since value: {s}")
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
-def summarize_stream(stream: str, since: datetime | None, last: int | None, raw: bool):
-    file_path = DEFAULT_DIR / f"{stream}.jsonl"
-    lines = list(iter_lines(file_path))
-    if since:
-        lines = [rec for rec in lines if 'ts' in rec and _ts_dt(rec['ts']) >= since]
-    if raw:
-        seq = lines[-(last or len(lines)):] if last else lines
-        for rec in seq:
-            print(json.dumps(rec, ensure_ascii=False))
-        return
-
-    # Group durations by event name where duration_ms present
-    buckets: Dict[str, StatBucket] = {}
-    count_events: Dict[str, int] = {}
-
-    tail = lines[-(last or 25):] if lines else []
-
-    for rec in lines:
-        ev = rec.get('event')
-        if not ev:
-            continue
-        if 'duration_ms' in rec:
-            buckets.setdefault(ev, StatBucket()).add(float(rec['duration_ms']))
-        # generic counter events (value field) accumulate
-        if 'value' in rec:
-            count_events[ev] = count_events.get(ev, 0) + int(rec.get('value', 0))
-
+def print_summary(stream: str, summary: StreamSummary, tail: List[Dict[str, Any]], source: Any) -> None:
     print(f"\nStream: {stream}")
-    if not lines:
+    if not summary.records:
         print("  (no data)")
         return
-    print(f"  Records: {len(lines)}  File: {file_path}")
+    print(f"  Records: {summary.records}  File: {source}")
 
-    if buckets:
+    if summary.buckets:
         print("  Timed Events:")
-        for ev, bucket in sorted(buckets.items()):
+        for ev, bucket in sorted(summary.buckets.items()):
             stats = bucket.summary()
             print(f"    - {ev}: count={stats['count']} min={stats.get('min')} p50={stats.get('p50')} p90={stats.get('p90')} p95={stats.get('p95')} max={stats.get('max')} mean={stats.get('mean')}")
-    if count_events:
+    if summary.counters:
         print("  Counter Events:")
-        for ev, total in sorted(count_events.items()):
+        for ev, total in sorted(summary.counters.items()):
             print(f"    - {ev}: total={total}")
 
     if tail:
@@ -134,7 +450,7 @@ def summarize_stream(stream: str, since: datetime | None, last: int | None, raw:
             dur = rec.get('duration_ms')
             status = rec.get('status')
             msg = f"    - {rec.get('ts')} {ev}"
-            if dur is not None:
+            if isinstance(dur, (int, float)):
                 msg += f" {dur:.1f}ms"
             if status:
                 msg += f" status={status}"
@@ -144,33 +460,89 @@ def summarize_stream(stream: str, since: datetime | None, last: int | None, raw:
             print(msg)
 
 
+def summarize_stream(stream: str, since: datetime | None, last: int | None, raw: bool, workers: int = 1,
+                     until: datetime | None = None):
+    paths = [p for p, _ in prune_segments(stream_segments(DEFAULT_DIR, stream), since, until)]
+    if raw:
+        seq = tail_segments(paths, last, since, until) if last else (rec for p in paths for rec in iter_records(p, since, until))
+        for rec in seq:
+            print(json.dumps(rec, ensure_ascii=False))
+        return
+
+    summary = scan_segments(paths, since, workers, until)
+    tail = tail_segments(paths, last or 25, since, until) if summary.records else []
+    if len(paths) == 1:
+        source: Any = paths[0]
+    else:
+        source = f"{DEFAULT_DIR / stream}[-YYYYMMDD].jsonl ({len(paths)} segments)"
+    print_summary(stream, summary, tail, source)
+
+
 def _ts_dt(ts: str) -> datetime:
     try:
         if ts.endswith('Z'):
-            return datetime.fromisoformat(ts.replace('Z', '+00:00'))
-        return datetime.fromisoformat(ts)
+            dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+        else:
+            dt = datetime.fromisoformat(ts)
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
     except Exception:
         return datetime.now(timezone.utc)
 
 
-def cli():
+def _subcommands():
+    from quantum_aeon_fluxor.utils import metrics_diff, metrics_rollup, profiling, tracing
+    return {"compact": metrics_rollup.compact_cli, "rollup": metrics_rollup.query_cli, "trace": tracing.trace_cli,
+            "diff": metrics_diff.diff_cli, "profile": profiling.profile_cli}
+
+
+def cli(argv: Sequence[str] | None = None):
     global DEFAULT_DIR  # must appear before first use/assignment
-    parser = argparse.ArgumentParser(description="Summarize QAeCore metrics JSONL streams.")
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and not argv[0].startswith("-"):
+        commands = _subcommands()
+        if argv[0] in commands:
+            return commands[argv[0]](argv[1:])
+    parser = argparse.ArgumentParser(
+        description="Summarize QAeCore metrics JSONL streams.",
+        epilog="Subcommands: compact (roll events into SQLite aggregates), rollup (query aggregates), "
+               "trace (span waterfalls / OTLP export), diff (compare two windows or reports; exits 1 on regression), "
+               "profile (hottest functions per profiled stage). "
+               "See `qaf-metrics <subcommand> -h`.",
+    )
     parser.add_argument('--dir', default=str(DEFAULT_DIR), help='Metrics directory')
-    parser.add_argument('--streams', nargs='*', default=['archon','gemini','ingest'], help='Stream names (files <name>.jsonl)')
-    parser.add_argument('--since', help='ISO timestamp (e.g. 2025-08-15T10:00:00Z)')
+    parser.add_argument('--streams', nargs='*', default=['archon','gemini','ingest'], help='Stream names (files <name>.jsonl, rotated <name>-YYYYMMDD.jsonl[.gz])')
+    parser.add_argument('--since', help='ISO timestamp (e.g. 2025-08-15T10:00:00Z) or relative age (30d, 12h, 90m)')
+    parser.add_argument('--until', help='Exclusive end of the range (same forms as --since)')
+    parser.add_argument('--format', choices=['text', 'json', 'csv'], default='text', help='Output format for per-event statistics')
     parser.add_argument('--last', type=int, help='Limit recent lines/events displayed')
     parser.add_argument('--raw', action='store_true', help='Raw JSON lines output for each stream')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processes for scanning rotated segments')
     parser.add_argument('--show-tuning-only', action='store_true', help='Only display current tuning recommendation info and exit')
-    args = parser.parse_args()
+    parser.add_argument('--follow', '-f', action='store_true', help='Follow the streams live with rolling windows (Ctrl-C to stop)')
+    parser.add_argument('--interval', type=float, default=2.0, help='--follow: refresh interval in seconds')
+    parser.add_argument('--windows', nargs='+', default=['1m', '5m'], help='--follow: rolling windows (e.g. 30s 1m 5m)')
+    args = parser.parse_args(argv)
 
     DEFAULT_DIR = Path(args.dir).expanduser().resolve()
 
+    if args.follow:
+        from quantum_aeon_fluxor.utils import metrics_follow
+        try:
+            windows = [metrics_follow.parse_window(w) for w in args.windows]
+        except ValueError as e:
+            parser.error(str(e))
+        return metrics_follow.follow(DEFAULT_DIR, args.streams, windows, args.interval)
+
     since_dt = parse_since(args.since)
+    until_dt = parse_since(args.until)
+
+    if args.format != 'text' and not args.raw:
+        write_report(collect_report(DEFAULT_DIR, args.streams, since_dt, until_dt, args.workers), args.format)
+        return
 
     if not args.show_tuning_only:
         for stream in args.streams:
-            summarize_stream(stream, since_dt, args.last, args.raw)
+            summarize_stream(stream, since_dt, args.last, args.raw, args.workers, until_dt)
     # Show tuning info (even if show-tuning-only) unless raw requested
     if (not args.raw):
         # Look in configs for tuning file
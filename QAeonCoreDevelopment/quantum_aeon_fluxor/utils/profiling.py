@@ -0,0 +1,379 @@
+"""Opt-in profiling of `time_block` regions (CPU stacks and allocations), `qaf-metrics profile`.
+
+Off by default. With `QAECORE_PROFILE` set (or `--profile-stages` on qaf-ingest / qaf-index /
+`qaf-cli conversation`), selected `metrics.time_block` regions, plus ingest's `embed_batch`
+and `upsert` stages (`profiled(...)`), are profiled. Only every Nth call of each stage is
+profiled:
+
+- CPU: a sampler thread records the Python stacks of the region's thread every
+  `QAECORE_PROFILE_INTERVAL_MS`. Threads started while the region runs, such as an embed
+  pool, are sampled too. The samples are wall-clock: time spent blocked (`wait`, sockets)
+  shows up as such.
+- Allocations: `tracemalloc` runs for the region, and the lines that allocated the most
+  still-live memory are kept, together with the traced peak.
+
+Artefacts per capture, in `QAECORE_PROFILE_DIR` (default `<metrics dir>/profiles`), are
+named `<stream>.<event>-<UTC time>-<pid>-<n>`:
+    .pstats      sampled stats in pstats format (`python -m pstats`, snakeviz); "calls" are samples
+    .collapsed   folded stacks (`flamegraph.pl`, speedscope)
+    .alloc.json  top allocating lines and the traced peak
+Each capture is also logged as an event on the `profile` metrics stream. `qaf-metrics profile`
+merges the captures of each stage and prints its hottest functions and top allocators.
+
+Disabled, `time_block` pays one truth test per region. Only one region is profiled at a time
+per process; regions that start while another is being profiled are skipped.
+
+Config (env):
+    QAECORE_PROFILE               stages to profile: all, or a comma list of streams, events or
+                                  stream.event patterns (ingest, archon.model_query, *.embed*)
+    QAECORE_PROFILE_EVERY         profile every Nth call per stage (default 1)
+    QAECORE_PROFILE_INTERVAL_MS   stack sampling interval (default 5)
+    QAECORE_PROFILE_MEMORY        0/off disables tracemalloc (default on)
+    QAECORE_PROFILE_MAX           captures per stage and process (default 20)
+    QAECORE_PROFILE_DIR           artefact directory (default <metrics dir>/profiles)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import marshal
+import os
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, ContextManager, Dict, List, Optional, Sequence, Tuple
+
+PROFILE_ENV = "QAECORE_PROFILE"
+EVERY_ENV = "QAECORE_PROFILE_EVERY"
+INTERVAL_ENV = "QAECORE_PROFILE_INTERVAL_MS"
+MEMORY_ENV = "QAECORE_PROFILE_MEMORY"
+MAX_ENV = "QAECORE_PROFILE_MAX"
+DIR_ENV = "QAECORE_PROFILE_DIR"
+PROFILE_STREAM = "profile"
+DEFAULT_INTERVAL_MS = 5.0
+DEFAULT_MAX = 20
+TOP_ALLOCATIONS = 25
+
+_Key = Tuple[str, int, str]  # (filename, first line, function): the pstats function key
+
+enabled = False
+_patterns: List[str] = []
+_every = 1
+_interval = DEFAULT_INTERVAL_MS / 1000.0
+_memory = True
+_max = DEFAULT_MAX
+_calls: Counter = Counter()
+_captures: Counter = Counter()
+_busy = threading.Lock()
+_NULL = nullcontext()
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name, "").strip()
+    return int(raw) if raw.isdigit() and int(raw) > 0 else default
+
+
+def configure(spec: Optional[str] = None) -> bool:
+    """(Re)read the configuration; `spec` (a --profile-stages flag) overrides and is exported to child processes."""
+    global enabled, _patterns, _every, _interval, _memory, _max
+    if spec is not None:
+        os.environ[PROFILE_ENV] = spec
+    raw = os.environ.get(PROFILE_ENV, "").strip()
+    if raw.lower() in ("", "0", "off", "false", "no"):
+        enabled, _patterns = False, []
+        return False
+    _patterns = ["*"] if raw.lower() in ("1", "all", "on", "true", "yes") else [p.strip() for p in raw.split(",") if p.strip()]
+    _every = _env_int(EVERY_ENV, 1)
+    try:
+        _interval = max(0.5, float(os.environ.get(INTERVAL_ENV) or DEFAULT_INTERVAL_MS)) / 1000.0
+    except ValueError:
+        _interval = DEFAULT_INTERVAL_MS / 1000.0
+    _memory = os.environ.get(MEMORY_ENV, "1").strip().lower() not in ("0", "off", "false", "no")
+    _max = _env_int(MAX_ENV, DEFAULT_MAX)
+    _calls.clear()
+    _captures.clear()
+    enabled = bool(_patterns)
+    return enabled
+
+
+def _selected(stream: str, event: str) -> bool:
+    stage = f"{stream}.{event}"
+    return any(p in (stream, event) or fnmatchcase(stage, p) for p in _patterns)
+
+
+def profile_dir() -> Path:
+    raw = os.environ.get(DIR_ENV)
+    if raw:
+        return Path(raw).expanduser().resolve()
+    from quantum_aeon_fluxor.utils.metrics import _metrics_dir
+    return _metrics_dir() / "profiles"
+
+
+class _Sampler(threading.Thread):
+    """Samples the stacks of one thread, and of threads started after it, until halted."""
+
+    def __init__(self, target: int, interval: float):
+        super().__init__(name="qaf-profile-sampler", daemon=True)
+        self.interval = interval
+        self.skip = set(sys._current_frames()) - {target}  # threads that predate the region
+        self.stacks: Counter = Counter()
+        self.ticks = 0
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        me = threading.get_ident()
+        while not self._halt.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == me or tid in self.skip:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                self.stacks[tuple(reversed(stack))] += 1
+            self.ticks += 1
+
+    def halt(self) -> None:
+        self._halt.set()
+        self.join()
+
+
+class Capture:
+    """One profiled region; `stop()` writes its artefacts."""
+
+    def __init__(self, stream: str, event: str):
+        self.stream = stream
+        self.event = event
+        self.sampler = _Sampler(threading.get_ident(), _interval)
+        self.memory = _memory
+        self._own_tracing = False
+        self._base: Optional[tracemalloc.Snapshot] = None
+        if self.memory:
+            if tracemalloc.is_tracing():
+                self._base = tracemalloc.take_snapshot()
+            else:
+                tracemalloc.start()
+                self._own_tracing = True
+            tracemalloc.reset_peak()
+        self.sampler.start()
+
+    def stop(self, duration_ms: Optional[float] = None, status: str = "ok") -> Optional[Path]:
+        try:
+            self.sampler.halt()
+            allocs = self._allocations() if self.memory else None
+            return self._write(allocs, duration_ms, status)
+        except Exception:
+            return None  # best-effort, like metrics
+        finally:
+            if self._own_tracing:
+                tracemalloc.stop()
+            _busy.release()
+
+    def _allocations(self) -> Dict[str, Any]:
+        _, peak = tracemalloc.get_traced_memory()
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        stats = snap.compare_to(self._base, "lineno") if self._base is not None else snap.statistics("lineno")
+        top = []
+        for s in stats:
+            size = getattr(s, "size_diff", s.size)
+            if size <= 0:
+                continue
+            frame = s.traceback[0]
+            top.append({"where": f"{frame.filename}:{frame.lineno}", "size_kb": round(size / 1024, 1),
+                        "count": getattr(s, "count_diff", s.count)})
+        top.sort(key=lambda a: -a["size_kb"])
+        return {"peak_kb": round(peak / 1024, 1), "top": top[:TOP_ALLOCATIONS]}
+
+    def _write(self, allocs: Optional[Dict[str, Any]], duration_ms: Optional[float], status: str) -> Path:
+        out = profile_dir()
+        out.mkdir(parents=True, exist_ok=True)
+        stage = _stage_name(self.stream, self.event)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        base = out / f"{stage}-{stamp}-{os.getpid()}-{_captures[(self.stream, self.event)]}"
+        stacks = self.sampler.stacks
+        with open(f"{base}.pstats", "wb") as f:
+            marshal.dump(to_pstats(stacks, self.sampler.interval), f)
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            f.write(to_collapsed(stacks))
+        if allocs is not None:
+            Path(f"{base}.alloc.json").write_text(json.dumps(allocs, indent=1), encoding="utf-8")
+        from quantum_aeon_fluxor.utils.metrics import log_event
+        log_event(PROFILE_STREAM, f"{self.stream}.{self.event}", duration_ms=duration_ms, status=status,
+                  samples=sum(stacks.values()), ticks=self.sampler.ticks,
+                  peak_kb=allocs["peak_kb"] if allocs else None, artefact=base.name)
+        return base
+
+
+def start(stream: str, event: str) -> Optional[Capture]:
+    """A capture for this call of `stream.event` when it is selected and due, else None.
+
+    Call only when `enabled`; `time_block` checks the flag first so disabled profiling costs nothing.
+    """
+    if not _selected(stream, event):
+        return None
+    key = (stream, event)
+    _calls[key] += 1
+    if _calls[key] % _every or _captures[key] >= _max:
+        return None
+    if not _busy.acquire(blocking=False):
+        return None  # another region is being profiled
+    _captures[key] += 1
+    try:
+        return Capture(stream, event)
+    except Exception:
+        _busy.release()
+        return None
+
+
+class _Region:
+    __slots__ = ("stream", "event", "capture")
+
+    def __init__(self, stream: str, event: str):
+        self.stream = stream
+        self.event = event
+        self.capture: Optional[Capture] = None
+
+    def __enter__(self) -> Optional[Capture]:
+        self.capture = start(self.stream, self.event)
+        return self.capture
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if self.capture is not None:
+            self.capture.stop(status="error" if exc_type else "ok")
+
+
+def profiled(stream: str, event: str) -> ContextManager[Optional[Capture]]:
+    """Profile a region that is timed without `time_block` (e.g. ingest's embed_batch)."""
+    return _Region(stream, event) if enabled else _NULL
+
+
+def _stage_name(stream: str, event: str) -> str:
+    return re.sub(r"[^\w.]+", "_", f"{stream}.{event}")
+
+
+def _label(key: _Key) -> str:
+    filename, line, func = key
+    parts = Path(filename).parts
+    return f"{func} ({'/'.join(parts[-2:]) if len(parts) > 1 else filename}:{line})"
+
+
+def to_collapsed(stacks: Counter) -> str:
+    """Folded stacks, one `frame;frame;leaf count` line per distinct stack (root first)."""
+    folded: Counter = Counter()
+    for stack, n in stacks.items():
+        folded[";".join(_label(k).replace(";", ",") for k in stack)] += n
+    return "".join(f"{line} {n}\n" for line, n in folded.most_common())
+
+
+def to_pstats(stacks: Counter, interval: float) -> Dict[_Key, Tuple[int, int, float, float, Dict[_Key, Tuple[int, int, float, float]]]]:
+    """The `pstats` dict of sampled stacks: self time for the leaf, cumulative time for every frame."""
+    stats: Dict[_Key, Any] = {}
+    for stack, n in stacks.items():
+        t = n * interval
+        seen = set()
+        last = len(stack) - 1
+        for i, key in enumerate(stack):
+            leaf_t = t if i == last else 0.0
+            cc, nc, tt, ct, callers = stats.get(key) or (0, 0, 0.0, 0.0, {})
+            first = key not in seen  # recursion: count each function once per sample
+            seen.add(key)
+            stats[key] = (cc + n * first, nc + n * first, tt + leaf_t, ct + t * first, callers)
+            if i:
+                caller = stack[i - 1]
+                c = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (c[0] + n, c[1] + n, c[2] + leaf_t, c[3] + t)
+    return stats
+
+
+# --- qaf-metrics profile ---
+
+
+def _captures_by_stage(directory: Path, stages: Optional[Sequence[str]] = None) -> Dict[str, List[Path]]:
+    out: Dict[str, List[Path]] = {}
+    for p in sorted(directory.glob("*.pstats")):
+        stage = p.stem.rsplit("-", 3)[0]
+        if stages and not any(s == stage or fnmatchcase(stage, s) or stage.startswith(s + ".") for s in stages):
+            continue
+        out.setdefault(stage, []).append(p)
+    return out
+
+
+def summarize(directory: Path, stages: Optional[Sequence[str]] = None, top: int = 15,
+              sort: str = "self") -> Dict[str, Dict[str, Any]]:
+    """Per stage: captures, sampled seconds, hottest functions and merged top allocators."""
+    import pstats
+
+    result: Dict[str, Dict[str, Any]] = {}
+    for stage, files in _captures_by_stage(Path(directory), stages).items():
+        stats: Dict[_Key, Tuple[int, int, float, float]] = {}
+        for path in files:
+            for key, (cc, nc, tt, ct, _callers) in pstats.Stats(str(path)).stats.items():
+                s = stats.get(key, (0, 0, 0.0, 0.0))
+                stats[key] = (s[0] + cc, s[1] + nc, s[2] + tt, s[3] + ct)
+        total = sum(s[2] for s in stats.values())
+        order = 2 if sort == "self" else 3
+        hot = sorted(stats.items(), key=lambda kv: -kv[1][order])[:top]
+        allocs: Dict[str, float] = {}
+        peak = 0.0
+        for path in files:
+            alloc_path = path.with_name(path.stem + ".alloc.json")
+            if alloc_path.exists():
+                data = json.loads(alloc_path.read_text(encoding="utf-8"))
+                peak = max(peak, data.get("peak_kb") or 0.0)
+                for a in data.get("top", []):
+                    allocs[a["where"]] = allocs.get(a["where"], 0.0) + a["size_kb"]
+        result[stage] = {
+            "captures": len(files),
+            "sampled_s": round(total, 3),
+            "functions": [{"function": _label(key), "samples": s[1], "self_s": round(s[2], 3), "cum_s": round(s[3], 3),
+                           "self_pct": round(100 * s[2] / total, 1) if total else 0.0,
+                           "cum_pct": round(100 * s[3] / total, 1) if total else 0.0} for key, s in hot],
+            "peak_kb": peak,
+            "allocations": [{"where": w, "size_kb": round(kb, 1)}
+                            for w, kb in sorted(allocs.items(), key=lambda kv: -kv[1])[:top]],
+        }
+    return result
+
+
+def profile_cli(argv: Optional[Sequence[str]] = None) -> None:
+    from quantum_aeon_fluxor.utils import metrics_summary as ms
+
+    parser = argparse.ArgumentParser(prog="qaf-metrics profile",
+                                     description="Hottest functions and top allocators per profiled stage.")
+    parser.add_argument('--dir', help='Profile directory (default: QAECORE_PROFILE_DIR or <metrics dir>/profiles)')
+    parser.add_argument('--stages', nargs='*', help='Stages to show: stream, stream.event or a pattern (archon.*)')
+    parser.add_argument('--top', type=int, default=15, help='Functions / allocation sites per stage (default 15)')
+    parser.add_argument('--sort', choices=['self', 'cum'], default='self', help='Rank by self or cumulative time')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
+    args = parser.parse_args(argv)
+
+    directory = Path(args.dir or os.environ.get(DIR_ENV) or ms.DEFAULT_DIR / "profiles").expanduser().resolve()
+    summary = summarize(directory, args.stages, args.top, args.sort)
+    if args.format == "json":
+        print(json.dumps(summary, indent=2))
+        return
+    if not summary:
+        print(f"No profiles in {directory} (enable with QAECORE_PROFILE or --profile-stages).")
+        return
+    for stage, s in summary.items():
+        print(f"\n{stage}: {s['captures']} capture(s), {s['sampled_s']:.2f}s sampled")
+        print(f"  {'self%':>6} {'cum%':>6} {'self s':>8} {'cum s':>8}  function")
+        for f in s["functions"]:
+            print(f"  {f['self_pct']:>6.1f} {f['cum_pct']:>6.1f} {f['self_s']:>8.3f} {f['cum_s']:>8.3f}  {f['function']}")
+        if s["allocations"]:
+            print(f"  top allocators (live at region end, peak {s['peak_kb']:.0f} KiB):")
+            for a in s["allocations"][:5]:
+                print(f"    {a['size_kb']:>10.1f} KiB  {a['where']}")
+
+
+configure()
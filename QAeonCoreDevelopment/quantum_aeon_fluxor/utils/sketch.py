@@ -0,0 +1,177 @@
+"""Mergeable quantile sketch (DDSketch) for latency summaries.
+
+`DDSketch` answers quantile queries over a stream of non-negative values (durations in ms)
+in constant memory with a bounded *relative* error: every reported quantile is within
+`relative_accuracy` (default 1%) of a value that holds that rank. Values are counted in
+logarithmic buckets (bucket i covers (gamma^(i-1), gamma^i], gamma = (1+a)/(1-a)), so two
+sketches merge exactly by adding bucket counts — per file, per segment, per time bucket.
+
+Up to `exact_limit` values are kept verbatim, so small groups report exact order
+statistics (same nearest-rank rule as before) and only large streams are approximated.
+Count, sum, min and max are always exact.
+
+    s = DDSketch(); s.add(12.5); s.merge(other); s.quantile(0.95); DDSketch.from_dict(s.to_dict())
+
+`to_bytes`/`from_bytes` give a compact binary form (non-empty bins only) for storage in rollups.
+"""
+from __future__ import annotations
+
+import math
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional
+
+DEFAULT_ACCURACY = 0.01
+EXACT_LIMIT = 1024
+MIN_VALUE = 1e-6  # values at or below this are counted in the zero bucket
+_PACKED = struct.Struct("<dqdddqq")  # alpha, count, sum, min, max, zero, bins; then int32 keys, uint64 counts
+
+
+class DDSketch:
+    __slots__ = ("alpha", "gamma", "_inv_log_gamma", "exact_limit", "bins", "zero", "count", "sum", "min", "max", "_exact")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_ACCURACY, exact_limit: int = EXACT_LIMIT):
+        self.alpha = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(self.gamma)
+        self.exact_limit = exact_limit
+        self.bins: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._exact: Optional[List[float]] = [] if exact_limit > 0 else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if self._exact is not None:
+            self._exact.append(value)
+            if len(self._exact) > self.exact_limit:
+                self._spill()
+            return
+        self._bin(value, 1)
+
+    def _bin(self, value: float, n: int) -> None:
+        if value <= MIN_VALUE:
+            self.zero += n
+        else:
+            key = math.ceil(math.log(value) * self._inv_log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + n
+
+    def _spill(self) -> None:
+        exact, self._exact = self._exact, None
+        for v in exact or ():
+            self._bin(v, 1)
+
+    def merge(self, other: "DDSketch") -> "DDSketch":
+        """Add `other`'s values to this sketch (in place); returns self."""
+        if other.count == 0:
+            return self
+        if self._exact is not None and other._exact is not None and len(self._exact) + len(other._exact) <= self.exact_limit:
+            self._exact.extend(other._exact)
+        else:
+            if self._exact is not None:
+                self._spill()
+            if other._exact is not None:
+                for v in other._exact:
+                    self._bin(v, 1)
+            else:
+                self.zero += other.zero
+                for k, n in other.bins.items():
+                    self.bins[k] = self.bins.get(k, 0) + n
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile `q` in [0, 1] (nearest rank, rank = floor(q * (count - 1)))."""
+        if self.count == 0:
+            return None
+        rank = int(min(1.0, max(0.0, q)) * (self.count - 1))
+        if self._exact is not None:
+            return sorted(self._exact)[rank]
+        if rank < self.zero:
+            return max(self.min, 0.0)
+        seen = self.zero
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                # bucket midpoint in relative terms: within alpha of every value in the bucket
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"a": self.alpha, "n": self.count, "s": self.sum,
+                               "lo": self.min if self.count else None, "hi": self.max if self.count else None}
+        if self._exact is not None:
+            out["e"] = self._exact
+        else:
+            out["z"] = self.zero
+            out["b"] = {str(k): n for k, n in self.bins.items()}
+        return out
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], exact_limit: int = EXACT_LIMIT) -> "DDSketch":
+        s = cls(data.get("a", DEFAULT_ACCURACY), exact_limit)
+        s.count = int(data.get("n", 0))
+        s.sum = float(data.get("s", 0.0))
+        if s.count:
+            s.min, s.max = float(data["lo"]), float(data["hi"])
+        if "e" in data:
+            s._exact = list(data["e"])
+        else:
+            s._exact = None
+            s.zero = int(data.get("z", 0))
+            s.bins = {int(k): int(n) for k, n in data.get("b", {}).items()}
+        return s
+
+    def to_bytes(self) -> bytes:
+        """Binary form: header + little-endian keys and counts of non-empty bins (exact values are binned first)."""
+        bins, zero = self.bins, self.zero
+        if self._exact is not None:
+            binned = DDSketch(self.alpha, exact_limit=0)
+            for v in self._exact:
+                binned._bin(v, 1)
+            bins, zero = binned.bins, binned.zero
+        keys, counts = array("i", bins.keys()), array("Q", bins.values())
+        if sys.byteorder == "big":
+            keys.byteswap()
+            counts.byteswap()
+        lo_v, hi_v = (self.min, self.max) if self.count else (0.0, 0.0)
+        return _PACKED.pack(self.alpha, self.count, self.sum, lo_v, hi_v, zero, len(keys)) + keys.tobytes() + counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, exact_limit: int = 0) -> "DDSketch":
+        alpha, count, total, lo_v, hi_v, zero, n = _PACKED.unpack_from(data)
+        s = cls(alpha, exact_limit)
+        keys, counts = array("i"), array("Q")
+        split = _PACKED.size + n * keys.itemsize
+        keys.frombytes(data[_PACKED.size:split])
+        counts.frombytes(data[split:split + n * counts.itemsize])
+        if sys.byteorder == "big":
+            keys.byteswap()
+            counts.byteswap()
+        if s._exact is not None:
+            s._spill()
+        s.count, s.sum, s.zero = count, total, zero
+        if count:
+            s.min, s.max = lo_v, hi_v
+        s.bins = dict(zip(keys, counts))
+        return s
@@ -0,0 +1,35 @@
+"""Local token estimation for prompt budgeting and cache sizing.
+
+A regex estimator (no tokenizer download or network call) that approximates
+SentencePiece/BPE counts for English prose.
+"""
+from __future__ import annotations
+import re
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model tokens: one per punctuation mark, one per word plus one per 6 further characters."""
+    if not text:
+        return 0
+    n = 0
+    for m in _TOKEN_RE.finditer(text):
+        n += 1 + (m.end() - m.start() - 1) // 6
+    return n
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` at a word boundary so that it (plus an ellipsis) fits `max_tokens`."""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    n = 1  # the ellipsis
+    end = 0
+    for m in _TOKEN_RE.finditer(text):
+        n += 1 + (m.end() - m.start() - 1) // 6
+        if n > max_tokens:
+            break
+        end = m.end()
+    return text[:end].rstrip() + "…"
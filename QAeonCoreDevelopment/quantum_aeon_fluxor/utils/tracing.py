@@ -0,0 +1,332 @@
+"""Span tracing for Archon turns (trace / span IDs across retrieval, embedding and model calls).
+
+A root span (`span(..., root=True)`, opened by `Archon.arun_turn`) starts a trace; every
+`span(...)` opened while it is active becomes a child, and `metrics.time_block` regions
+become spans too. The active span lives in a `ContextVar`, so it follows `await`,
+`asyncio.to_thread` and `asyncio.create_task`. Plain thread pools do not copy context:
+submit `bind(fn)` instead of `fn` to keep worker spans in the caller's trace. Outside an
+active trace, `span()` is a no-op, so library calls made from scripts cost nothing.
+
+Storage: each finished span is written as one event on the `trace` metrics stream (event =
+span name, with trace_id, span_id, parent_id, start (epoch s), duration_ms, status, attrs).
+While a span is active, every `log_event` record also carries its trace_id / span_id, which
+ties e.g. a `gemini` stream event to the turn that caused it. The last few completed traces
+are kept in memory for the REPL (`:trace`, see `last_trace` / `format_waterfall`).
+
+Export: with `QAECORE_TRACE_OTLP_ENDPOINT` set (e.g. http://localhost:4318/v1/traces), each
+completed trace is POSTed as OTLP/HTTP JSON by a background thread (best-effort). Stored
+traces can be converted offline: `qaf-metrics trace --otlp traces.json`.
+
+Config (env):
+    QAECORE_TRACING                 0/off/false disables span creation (default on)
+    QAECORE_TRACE_OTLP_ENDPOINT     OTLP/HTTP traces endpoint (unset = no export)
+    QAECORE_TRACE_SERVICE           service.name resource attribute (default quantum_aeon_fluxor)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import random
+import sys
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from pathlib import Path
+from time import perf_counter, time
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence
+
+TRACING_ENV = "QAECORE_TRACING"
+OTLP_ENDPOINT_ENV = "QAECORE_TRACE_OTLP_ENDPOINT"
+SERVICE_ENV = "QAECORE_TRACE_SERVICE"
+TRACE_STREAM = "trace"
+DEFAULT_SERVICE = "quantum_aeon_fluxor"
+KEEP_TRACES = 16  # completed traces kept in memory
+MAX_OPEN_SPANS = 4096  # per trace; spans beyond this are still written, just not kept in memory
+WATERFALL_WIDTH = 40
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "_t0", "attrs", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attrs: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.start = time()
+        self._t0 = perf_counter()
+        self.attrs = attrs
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set(self, **attrs: Any) -> None:
+        """Add attributes (e.g. result sizes) before the span ends."""
+        self.attrs.update(attrs)
+
+    def record(self, duration_ms: float) -> Dict[str, Any]:
+        rec: Dict[str, Any] = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start, 6),
+            "duration_ms": round(duration_ms, 3),
+            "status": self.status,
+            "attrs": self.attrs,
+        }
+        if self.error:
+            rec["error"] = self.error
+        return rec
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("qaf_current_span", default=None)
+_lock = threading.Lock()
+_open: Dict[str, List[Dict[str, Any]]] = {}  # trace_id -> finished span records, until the root ends
+_recent: Deque[List[Dict[str, Any]]] = deque(maxlen=KEEP_TRACES)
+
+
+def enabled() -> bool:
+    return os.environ.get(TRACING_ENV, "1").strip().lower() not in {"0", "off", "false", "no"}
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, *, root: bool = False, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Time a block as a span; yields the Span (or None when no trace is active / tracing is off).
+
+    `root=True` starts a new trace when none is active (otherwise it nests like any span).
+    Exceptions mark the span `status=error` and propagate.
+    """
+    parent = _current.get()
+    if (parent is None and not root) or not enabled():
+        yield None
+        return
+    if parent is None:
+        sp = Span(name, f"{random.getrandbits(128):032x}", None, attrs)
+        with _lock:
+            _open[sp.trace_id] = []
+    else:
+        sp = Span(name, parent.trace_id, parent.span_id, attrs)
+    token = _current.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.status = "error"
+        sp.error = repr(e)
+        raise
+    finally:
+        _current.reset(token)
+        _finish(sp, (perf_counter() - sp._t0) * 1000.0)
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Run `fn` in a copy of the caller's context (for `executor.submit(bind(fn), ...)`)."""
+    ctx = copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)
+
+
+def _finish(sp: Span, duration_ms: float) -> None:
+    from quantum_aeon_fluxor.utils.metrics import log_event
+
+    rec = sp.record(duration_ms)
+    log_event(TRACE_STREAM, sp.name, **rec)
+    rec["event"] = sp.name
+    completed = None
+    with _lock:
+        spans = _open.get(sp.trace_id)
+        if spans is not None and len(spans) < MAX_OPEN_SPANS:
+            spans.append(rec)
+        if sp.parent_id is None:
+            completed = _open.pop(sp.trace_id, None)
+            if completed is not None:
+                _recent.append(completed)
+    if completed is not None and os.environ.get(OTLP_ENDPOINT_ENV):
+        _exporter().submit(completed)
+
+
+def last_trace() -> List[Dict[str, Any]]:
+    """Span records of the most recently completed trace (empty if none)."""
+    with _lock:
+        return list(_recent[-1]) if _recent else []
+
+
+def recent_traces() -> List[List[Dict[str, Any]]]:
+    with _lock:
+        return [list(t) for t in _recent]
+
+
+# --- rendering ---------------------------------------------------------------------------
+
+def _end(s: Dict[str, Any]) -> float:
+    return float(s["start"]) + float(s.get("duration_ms") or 0.0) / 1000.0
+
+
+def format_waterfall(spans: Sequence[Dict[str, Any]], width: int = WATERFALL_WIDTH) -> str:
+    """Text waterfall of one trace: span tree with offset, duration and a time bar per span."""
+    if not spans:
+        return "No trace recorded yet."
+    ordered = sorted(spans, key=lambda s: float(s["start"]))
+    ids = {s["span_id"] for s in ordered}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+    for s in ordered:
+        parent = s.get("parent_id")
+        children[parent if parent in ids else None].append(s)
+    t0 = float(ordered[0]["start"])
+    total = max(max(_end(s) for s in ordered) - t0, 1e-9)
+
+    rows: List[tuple] = []
+
+    def walk(s: Dict[str, Any], depth: int) -> None:
+        rows.append((depth, s))
+        for c in children.get(s["span_id"], ()):
+            walk(c, depth + 1)
+
+    for r in children[None]:
+        walk(r, 0)
+    label_w = min(48, max(len("  " * d + s["event"]) for d, s in rows))
+    lines = [f"trace {ordered[0]['trace_id']}  {total * 1000:.1f} ms  {len(ordered)} spans",
+             f"{'span':<{label_w}} {'start ms':>9} {'dur ms':>9}"]
+    for depth, s in rows:
+        off = float(s["start"]) - t0
+        dur = float(s.get("duration_ms") or 0.0)
+        a = min(width - 1, int(off / total * width))
+        b = max(a + 1, min(width, round((off + dur / 1000.0) / total * width)))
+        bar = " " * a + "#" * (b - a) + " " * (width - b)
+        label = ("  " * depth + s["event"])[:label_w]
+        attrs = s.get("attrs") or {}
+        extra = " ".join(f"{k}={v}" for k, v in list(attrs.items())[:3])
+        mark = " ERROR" if s.get("status") == "error" else ""
+        lines.append(f"{label:<{label_w}} {off * 1000:9.1f} {dur:9.1f} |{bar}|{mark}{' ' + extra if extra else ''}")
+    return "\n".join(lines)
+
+
+# --- OpenTelemetry (OTLP/HTTP JSON) ------------------------------------------------------
+
+def _otlp_value(v: Any) -> Dict[str, Any]:
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    if isinstance(v, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(x) for x in v]}}
+    return {"stringValue": str(v)}
+
+
+def _otlp_attrs(attrs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attrs.items() if v is not None]
+
+
+def to_otlp(traces: Sequence[Sequence[Dict[str, Any]]], service: Optional[str] = None) -> Dict[str, Any]:
+    """OTLP `ExportTraceServiceRequest` (JSON encoding) for span records, one list per trace."""
+    out = []
+    for spans in traces:
+        for s in spans:
+            start_ns = int(float(s["start"]) * 1e9)
+            item: Dict[str, Any] = {
+                "traceId": s["trace_id"],
+                "spanId": s["span_id"],
+                "name": s["event"],
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(start_ns),
+                "endTimeUnixNano": str(start_ns + int(float(s.get("duration_ms") or 0.0) * 1e6)),
+                "attributes": _otlp_attrs(s.get("attrs") or {}),
+                "status": {"code": 2, "message": s.get("error", "")} if s.get("status") == "error" else {"code": 0},
+            }
+            if s.get("parent_id"):
+                item["parentSpanId"] = s["parent_id"]
+            out.append(item)
+    service = service or os.environ.get(SERVICE_ENV) or DEFAULT_SERVICE
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attrs({"service.name": service})},
+        "scopeSpans": [{"scope": {"name": "quantum_aeon_fluxor.tracing"}, "spans": out}],
+    }]}
+
+
+class _OtlpExporter:
+    """Posts completed traces to the OTLP endpoint from a daemon thread; drops when backed up."""
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.q: "queue.Queue[List[Dict[str, Any]]]" = queue.Queue(maxsize=256)
+        threading.Thread(target=self._run, name="qaf-trace-export", daemon=True).start()
+
+    def submit(self, spans: List[Dict[str, Any]]) -> None:
+        try:
+            self.q.put_nowait(spans)
+        except queue.Full:
+            pass
+
+    def _run(self) -> None:
+        import urllib.request
+
+        from quantum_aeon_fluxor.utils.metrics import log_event
+
+        while True:
+            spans = self.q.get()
+            endpoint = os.environ.get(OTLP_ENDPOINT_ENV)
+            if not endpoint:
+                continue
+            try:
+                req = urllib.request.Request(endpoint, data=json.dumps(to_otlp([spans])).encode("utf-8"),
+                                             headers={"Content-Type": "application/json"}, method="POST")
+                with urllib.request.urlopen(req, timeout=5) as resp:
+                    resp.read()
+            except Exception as e:
+                log_event(TRACE_STREAM, "export_error", endpoint=endpoint, error=str(e))
+
+
+_exporter_instance: Optional[_OtlpExporter] = None
+
+
+def _exporter() -> _OtlpExporter:
+    global _exporter_instance
+    with _lock:
+        if _exporter_instance is None or _exporter_instance.pid != os.getpid():
+            _exporter_instance = _OtlpExporter()
+        return _exporter_instance
+
+
+# --- CLI: qaf-metrics trace --------------------------------------------------------------
+
+def load_traces(directory: Path, since=None, scan: int = 20000) -> List[List[Dict[str, Any]]]:
+    """Traces from the last `scan` records of the trace stream, oldest first (spans in write order)."""
+    from quantum_aeon_fluxor.utils import metrics_summary as ms
+
+    segments = ms.prune_segments(ms.stream_segments(directory, TRACE_STREAM), since)
+    by_trace: Dict[str, List[Dict[str, Any]]] = {}
+    for rec in ms.tail_segments([p for p, _ in segments], scan, since):
+        if rec.get("trace_id") and rec.get("span_id") and "start" in rec:
+            by_trace.setdefault(rec["trace_id"], []).append(rec)
+    return list(by_trace.values())
+
+
+def trace_cli(argv: Optional[Sequence[str]] = None) -> None:
+    from quantum_aeon_fluxor.utils import metrics_summary as ms
+
+    parser = argparse.ArgumentParser(prog="qaf-metrics trace", description="Show stored traces as waterfalls or export them as OTLP JSON.")
+    parser.add_argument('--dir', default=str(ms.DEFAULT_DIR), help='Metrics directory')
+    parser.add_argument('--last', type=int, default=1, help='Number of most recent traces (default 1)')
+    parser.add_argument('--id', help='Only the trace whose id starts with this prefix')
+    parser.add_argument('--since', help='ISO timestamp or relative age (30d, 12h, 90m)')
+    parser.add_argument('--otlp', help='Write the selected traces to this file as OTLP/HTTP JSON instead of printing')
+    parser.add_argument('--width', type=int, default=WATERFALL_WIDTH, help='Waterfall bar width')
+    args = parser.parse_args(argv)
+    traces = load_traces(Path(args.dir).expanduser().resolve(), ms.parse_since(args.since))
+    if args.id:
+        traces = [t for t in traces if t[0]["trace_id"].startswith(args.id)]
+    traces = traces[-max(1, args.last):]
+    if not traces:
+        print("No traces found.")
+        return
+    if args.otlp:
+        Path(args.otlp).write_text(json.dumps(to_otlp(traces)), encoding="utf-8")
+        print(f"Wrote {sum(len(t) for t in traces)} spans from {len(traces)} traces to {args.otlp}")
+        return
+    sys.stdout.write("\n\n".join(format_waterfall(t, args.width) for t in traces) + "\n")
@@ -0,0 +1,172 @@
+"""Benchmark recall & latency across Qdrant collection profiles.
+
+Loads the same vectors into one scratch collection per profile (fast-ram, quantized,
+disk-heavy, ...), then runs identical queries against each and compares the results
+with exact ground truth computed locally in NumPy (brute-force cosine).
+
+Usage (example):
+python -m scripts.bench_collection_profiles --source qaecore_library_v1 --points 5000 --queries 100 --k 10
+python -m scripts.bench_collection_profiles --synthetic 20000 --dim 768 --profiles default quantized
+
+Notes:
+- With --source, vectors are scrolled from an existing collection (held-out points become queries).
+- Scratch collections are named <prefix>_<profile> and deleted afterwards unless --keep.
+- Writes metrics events (stream 'bench') and prints a summary table.
+"""
+from __future__ import annotations
+
+import argparse
+import json as _json
+import time
+
+import numpy as np
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import (
+    COLLECTION_PROFILES,
+    create_collection,
+    get_qdrant_client,
+    search_by_vector,
+    upsert_chunks,
+)
+from quantum_aeon_fluxor.utils.metrics import log_event
+
+
+def load_source_vectors(client, collection: str, limit: int) -> np.ndarray:
+    vecs = []
+    offset = None
+    while len(vecs) < limit:
+        points, offset = client.scroll(
+            collection_name=collection,
+            limit=min(256, limit - len(vecs)),
+            offset=offset,
+            with_payload=False,
+            with_vectors=True,
+        )
+        vecs.extend(p.vector for p in points)
+        if offset is None:
+            break
+    return np.asarray(vecs, dtype=np.float32)
+
+
+def synthetic_vectors(n: int, dim: int, clusters: int = 64, seed: int = 7) -> np.ndarray:
+    # Clustered gaussians: closer to real embedding geometry than uniform noise.
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    assign = rng.integers(0, clusters, size=n)
+    return centers[assign] + 0.35 * rng.normal(size=(n, dim)).astype(np.float32)
+
+
+def _normalize(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return m / norms
+
+
+def wait_until_indexed(client, name: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = client.get_collection(name)
+        if str(getattr(info.status, "value", info.status)) == "green":
+            return
+        time.sleep(0.5)
+    print(f"  warn: {name} not green after {timeout}s; results may reflect partial indexing")
+
+
+def bench_profile(client, name: str, profile: str, corpus: np.ndarray, queries: np.ndarray,
+                  truth: np.ndarray, k: int, timeout: float) -> dict:
+    create_collection(client, name, corpus.shape[1], profile=profile, recreate=True)
+    ids = list(range(1, len(corpus) + 1))
+    for s in range(0, len(corpus), 256):
+        e = s + 256
+        upsert_chunks(client, name, corpus[s:e].tolist(), [{} for _ in ids[s:e]], ids=ids[s:e])
+    wait_until_indexed(client, name, timeout)
+
+    latencies = []
+    recalls = []
+    for qi, q in enumerate(queries):
+        start = time.perf_counter()
+        hits = search_by_vector(client, name, q.tolist(), limit=k, profile=profile)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        got = {int(h.id) - 1 for h in hits}
+        recalls.append(len(got & set(truth[qi].tolist())) / k)
+
+    lat = sorted(latencies)
+
+    def pct(p: float) -> float:
+        return lat[min(len(lat) - 1, int(p * (len(lat) - 1)))]
+
+    return {
+        "profile": profile,
+        "points": len(corpus),
+        "queries": len(queries),
+        "k": k,
+        f"recall@{k}": round(float(np.mean(recalls)), 4),
+        "p50_ms": round(pct(0.5), 2),
+        "p95_ms": round(pct(0.95), 2),
+        "mean_ms": round(float(np.mean(latencies)), 2),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare recall/latency across collection profiles.")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--source", help="Existing collection to sample vectors from")
+    src.add_argument("--synthetic", type=int, help="Generate N synthetic clustered vectors instead")
+    ap.add_argument("--dim", type=int, default=3072, help="Dimension for --synthetic")
+    ap.add_argument("--points", type=int, default=5000, help="Max points sampled from --source")
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--profiles", nargs="+", default=list(COLLECTION_PROFILES), choices=list(COLLECTION_PROFILES))
+    ap.add_argument("--prefix", default="qaf_bench")
+    ap.add_argument("--index-timeout", type=float, default=120.0, help="Seconds to wait for indexing per profile")
+    ap.add_argument("--keep", action="store_true", help="Keep scratch collections")
+    ap.add_argument("--json", dest="json_out", help="Write JSON results to file")
+    args = ap.parse_args()
+
+    client = get_qdrant_client()
+    if args.source:
+        data = load_source_vectors(client, args.source, args.points + args.queries)
+    else:
+        data = synthetic_vectors(args.synthetic + args.queries, args.dim)
+    if len(data) <= args.queries:
+        raise SystemExit("Not enough vectors for the requested number of queries.")
+    queries, corpus = data[: args.queries], data[args.queries:]
+
+    # Exact ground truth (cosine) computed locally.
+    sims = _normalize(queries) @ _normalize(corpus).T
+    truth = np.argsort(-sims, axis=1)[:, : args.k]
+
+    results = []
+    log_event("bench", "profiles:start", points=len(corpus), queries=len(queries), k=args.k, profiles=args.profiles)
+    for profile in args.profiles:
+        name = f"{args.prefix}_{profile.replace('-', '_')}"
+        print(f"[bench] profile={profile} collection={name}", flush=True)
+        try:
+            r = bench_profile(client, name, profile, corpus, queries, truth, args.k, args.index_timeout)
+            results.append(r)
+            log_event("bench", "profile_result", **r)
+        finally:
+            if not args.keep:
+                try:
+                    client.delete_collection(name)
+                except Exception:
+                    pass
+    log_event("bench", "profiles:end")
+
+    if not results:
+        print("No results collected.")
+        return
+    cols = list(results[0].keys())
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in cols}
+    print("  ".join(c.rjust(widths[c]) for c in cols))
+    for r in results:
+        print("  ".join(str(r[c]).rjust(widths[c]) for c in cols))
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            _json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Wrote JSON: {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
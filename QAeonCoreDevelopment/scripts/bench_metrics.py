@@ -0,0 +1,92 @@
+"""Benchmark per-event overhead of metrics logging.
+
+Compares the buffered `log_event` writer against the previous write path (open, write one
+line, close under a global lock, per event), single-threaded and with concurrent threads.
+Caller-side cost is what a hot loop pays; the total includes the final flush to disk.
+
+Usage (example):
+python -m scripts.bench_metrics --events 20000 --threads 1 4 8
+python -m scripts.bench_metrics --json bench_metrics.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+from quantum_aeon_fluxor.utils import metrics
+
+_legacy_lock = threading.Lock()
+
+
+def legacy_log_event(path: Path, event: str, **fields) -> None:
+    """The pre-buffering write path: one open/write/close per event under a global lock."""
+    record = {"ts": datetime.now(timezone.utc).isoformat(), "event": event, **fields}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False)
+    with _legacy_lock:
+        with path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _run(threads: int, events: int, emit) -> float:
+    per_thread = events // threads
+
+    def work(n: int) -> None:
+        for i in range(per_thread):
+            emit(n, i)
+
+    ts = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    t0 = perf_counter()
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    return perf_counter() - t0
+
+
+def bench(events: int, threads: int, root: Path) -> dict:
+    legacy_path = root / f"legacy-{threads}" / "bench.jsonl"
+    legacy_s = _run(threads, events, lambda n, i: legacy_log_event(legacy_path, "embed_batch", worker=n, i=i, duration_ms=1.5))
+
+    os.environ[metrics.METRICS_DIR_ENV] = str(root / f"buffered-{threads}")
+    caller_s = _run(threads, events, lambda n, i: metrics.log_event("bench", "embed_batch", worker=n, i=i, duration_ms=1.5))
+    t0 = perf_counter()
+    metrics.flush()
+    flush_s = perf_counter() - t0
+
+    n = (events // threads) * threads
+    return {
+        "threads": threads,
+        "events": n,
+        "legacy_us_per_event": round(legacy_s / n * 1e6, 2),
+        "buffered_caller_us_per_event": round(caller_s / n * 1e6, 2),
+        "buffered_total_us_per_event": round((caller_s + flush_s) / n * 1e6, 2),
+        "speedup": round(legacy_s / (caller_s + flush_s), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metrics log_event overhead per event.")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        results = [bench(args.events, t, Path(d)) for t in args.threads]
+    print(f"{'threads':>7} {'events':>8} {'legacy us':>10} {'caller us':>10} {'total us':>9} {'speedup':>8}")
+    for r in results:
+        print(f"{r['threads']:>7} {r['events']:>8} {r['legacy_us_per_event']:>10} {r['buffered_caller_us_per_event']:>10} "
+              f"{r['buffered_total_us_per_event']:>9} {r['speedup']:>7}x")
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Local stand-in for the Gemini REST API (generateContent + cachedContents).
+
+Lets GeminiClient, the context cache and streaming run end to end without network access
+or quota. Responses are deterministic echoes; usage metadata reports prompt, cached and
+candidate tokens (~4 chars per token), and an optional per-token latency makes cached
+prefixes measurably faster, so `prompt_usage` / `query` events can be compared.
+
+Usage (example):
+python -m scripts.gemini_standin_server --port 8765 --ms-per-token 0.2
+GEMINI_API_ENDPOINT=http://127.0.0.1:8765 GOOGLE_API_KEY=test QAECORE_CONTEXT_CACHE=1 qaf-cli conversation
+
+Endpoints (v1beta):
+- POST   /v1beta/models/{model}:generateContent
+- POST   /v1beta/models/{model}:streamGenerateContent (JSON array, or SSE with ?alt=sse)
+- POST   /v1beta/cachedContents, GET/PATCH/DELETE /v1beta/cachedContents/{id}
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+_ids = itertools.count(1)
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4) if text else 0
+
+
+def _text_of(content) -> str:
+    """Concatenated text of a Content / list of Contents / string as sent by the SDK."""
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(_text_of(c) for c in content)
+    return "".join(p.get("text", "") for p in content.get("parts", []))
+
+
+def _parse_ttl(value: str | None, default_s: float = 3600.0) -> float:
+    if not value:
+        return default_s
+    return float(value.rstrip("s"))
+
+
+def _iso(ts: datetime) -> str:
+    return ts.isoformat().replace("+00:00", "Z")
+
+
+class StandInState:
+    def __init__(self, ms_per_token: float = 0.0, base_ms: float = 0.0):
+        self.ms_per_token = ms_per_token
+        self.base_ms = base_ms
+        self.caches: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def cache_view(self, name: str) -> dict:
+        c = self.caches[name]
+        return {
+            "name": name,
+            "model": c["model"],
+            "createTime": _iso(c["created"]),
+            "updateTime": _iso(c["updated"]),
+            "expireTime": _iso(c["expires"]),
+            "usageMetadata": {"totalTokenCount": c["tokens"]},
+        }
+
+
+class Handler(BaseHTTPRequestHandler):
+    state: StandInState  # set by make_server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):  # keep test output quiet
+        pass
+
+    def _body(self) -> dict:
+        n = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(n) or b"{}") if n else {}
+
+    def _send(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _cache_name(self, path: str) -> str:
+        return path.split("/v1beta/", 1)[1]
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self._body()
+        if path == "/v1beta/cachedContents":
+            now = datetime.now(timezone.utc)
+            name = f"cachedContents/standin-{next(_ids)}"
+            text = _text_of(body.get("systemInstruction")) + _text_of(body.get("contents"))
+            with self.state.lock:
+                self.state.caches[name] = {
+                    "model": body.get("model", ""),
+                    "text": text,
+                    "tokens": _tokens(text),
+                    "created": now,
+                    "updated": now,
+                    "expires": now + timedelta(seconds=_parse_ttl(body.get("ttl"))),
+                }
+                view = self.state.cache_view(name)
+            return self._send(200, view)
+        if ":generateContent" in path or ":streamGenerateContent" in path:
+            sse = "alt=sse" in urlparse(self.path).query
+            return self._generate(body, stream=":streamGenerateContent" in path, sse=sse)
+        self._send(404, {"error": {"code": 404, "message": f"Unknown path {path}", "status": "NOT_FOUND"}})
+
+    def _generate(self, body: dict, stream: bool, sse: bool = False) -> None:
+        prompt = _text_of(body.get("systemInstruction")) + _text_of(body.get("contents"))
+        cached_tokens = 0
+        name = body.get("cachedContent")
+        if name:
+            with self.state.lock:
+                c = self.state.caches.get(name)
+                if c is None or c["expires"] < datetime.now(timezone.utc):
+                    return self._send(404, {"error": {"code": 404, "message": f"{name} not found", "status": "NOT_FOUND"}})
+                cached_tokens = c["tokens"]
+        prompt_tokens = _tokens(prompt)
+        # cached tokens are cheap: only the uncached part pays the per-token latency
+        time.sleep((self.state.base_ms + self.state.ms_per_token * prompt_tokens) / 1000.0)
+        answer = f"[stand-in] received {prompt_tokens} new prompt tokens ({cached_tokens} cached)."
+        usage = {
+            "promptTokenCount": prompt_tokens + cached_tokens,
+            "cachedContentTokenCount": cached_tokens,
+            "candidatesTokenCount": _tokens(answer),
+            "totalTokenCount": prompt_tokens + cached_tokens + _tokens(answer),
+        }
+
+        def _chunk(text: str, last: bool) -> dict:
+            cand = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+            if last:
+                cand["finishReason"] = "STOP"
+            out = {"candidates": [cand]}
+            if last:
+                out["usageMetadata"] = usage
+            return out
+
+        if not stream:
+            return self._send(200, _chunk(answer, True))
+        pieces = answer.split(" ")
+        chunks = [_chunk(p if i == len(pieces) - 1 else p + " ", i == len(pieces) - 1) for i, p in enumerate(pieces)]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/json")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        # ?alt=sse gets server-sent events; the SDK's REST transport reads a streamed JSON array
+        for i, chunk in enumerate(chunks):
+            if sse:
+                data = f"data: {json.dumps(chunk)}\r\n\r\n"
+            else:
+                data = ("[" if i == 0 else ",\r\n") + json.dumps(chunk) + ("]" if i == len(chunks) - 1 else "")
+            self.wfile.write(data.encode("utf-8"))
+            self.wfile.flush()
+        self.close_connection = True
+
+    def do_GET(self):
+        name = self._cache_name(urlparse(self.path).path)
+        with self.state.lock:
+            if name not in self.state.caches:
+                return self._send(404, {"error": {"code": 404, "message": f"{name} not found", "status": "NOT_FOUND"}})
+            view = self.state.cache_view(name)
+        self._send(200, view)
+
+    def do_PATCH(self):
+        name = self._cache_name(urlparse(self.path).path)
+        body = self._body()
+        with self.state.lock:
+            c = self.state.caches.get(name)
+            if c is None:
+                return self._send(404, {"error": {"code": 404, "message": f"{name} not found", "status": "NOT_FOUND"}})
+            now = datetime.now(timezone.utc)
+            c["updated"] = now
+            c["expires"] = now + timedelta(seconds=_parse_ttl(body.get("ttl")))
+            view = self.state.cache_view(name)
+        self._send(200, view)
+
+    def do_DELETE(self):
+        name = self._cache_name(urlparse(self.path).path)
+        with self.state.lock:
+            self.state.caches.pop(name, None)
+        self._send(200, {})
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, ms_per_token: float = 0.0, base_ms: float = 0.0):
+    handler = type("StandInHandler", (Handler,), {"state": StandInState(ms_per_token, base_ms)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in Gemini REST server (generateContent + cachedContents).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ms-per-token", type=float, default=0.0, help="Simulated latency per uncached prompt token")
+    parser.add_argument("--base-ms", type=float, default=0.0, help="Simulated fixed latency per request")
+    args = parser.parse_args()
+    server = make_server(args.host, args.port, args.ms_per_token, args.base_ms)
+    print(f"Gemini stand-in listening on http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -13,12 +13,13 @@ except Exception as e:
     raise SystemExit(1)
 
 print('\n--- Patch GeminiClient.query ---')
-GeminiClient.query = lambda self, prompt: '[MOCKED RESPONSE] archon received prompt len=' + str(len(prompt))
+GeminiClient.query = lambda self, prompt, **kwargs: '[MOCKED RESPONSE] archon received prompt len=' + str(len(prompt))
 
 print('\n--- Archon run_turn test (retrieval disabled) ---')
 a = Archon()
 a.retrieval_enabled = False
 out = a.run_turn('Test inquiry about emergence and consciousness')
+a.flush_persistence()
 print('Archon output:', out[:120] + ('...' if len(out)>120 else ''))
 
 state_dir = Path(__file__).resolve().parents[1] / 'quantum_aeon_fluxor' / 'hermetic_engine__persistent_data' / 'state'
@@ -0,0 +1,321 @@
+"""Micro-benchmarks for the pure-Python hot paths, with per-machine baselines.
+
+Cases (synthetic inputs of realistic size):
+    chunk_text             a 200 KB chapter into 2000-char chunks (200 overlap)
+    sha256_text            one 2000-char chunk
+    chunk_uuid             point id of one 2000-char chunk
+    ingest_payload         `chunk_payload` for one chunk (what ingest builds per chunk)
+    detect_mode            mode detection over a mix of inputs (regex hits and context fallback)
+    compose_prompt         a full Archon prompt for a 300-char question with recent history
+    log_event              one buffered metrics event (caller-side cost, see scripts/bench_metrics)
+    archon_state_save      `ArchonState.save` of a grown state (no legacy mirror)
+
+Each case is warmed up, its loop count is chosen so a repeat takes at least `--min-time`, and
+`--repeats` repeats give per-call samples. Runs are compared on the best repeat, which, as
+with `timeit`, moves far less between runs than the median. The spread of the repeats (MAD
+scaled to a standard deviation, relative to the median) is the within-run noise. Machines
+also drift between runs (frequency scaling, neighbours on a VM), which one run cannot see.
+Every `--save` therefore keeps each case's best time from the last `KEEP_RUNS` saves. The
+baseline is their median, and their spread is the between-run noise. A case counts as slower
+or faster only when its best time moves by more than `--threshold` and by more than
+`--noise-k` times the combined noise. Anything smaller is reported as unchanged. Save three or
+more runs, ideally at different times, before gating on a noisy machine.
+
+Baselines are per machine (host, OS, CPU architecture, Python version), stored as
+`<machine>.json` in `--baseline-dir` (default `QAECORE_BENCH_DIR`, else `tests/.bench`):
+
+    python tests/microbench.py --save            # record this machine's baseline
+    python tests/microbench.py                   # compare; exits 1 when a case got slower
+    python tests/microbench.py -k chunk --repeats 15 --json bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import re
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+BENCH_DIR_ENV = "QAECORE_BENCH_DIR"
+DEFAULT_BASELINE_DIR = Path(__file__).resolve().parent / ".bench"
+DEFAULT_REPEATS = 7
+DEFAULT_MIN_TIME = 0.05  # seconds per repeat
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_NOISE_K = 3.0
+MAD_TO_SIGMA = 1.4826
+KEEP_RUNS = 5  # best times of the most recent saves kept per case
+
+_WORDS = ("consciousness emergence quantum archon syzygy pleroma hermetic aeon field vacuum "
+          "coherence symmetry entropy memory recursion insight paradox gnosis lattice resonance").split()
+
+BENCHMARKS: Dict[str, Callable[[Path], Callable[[], Any]]] = {}
+
+
+def bench(name: str):
+    """Register `setup(workdir) -> fn`; `fn()` is the timed call."""
+    def register(setup: Callable[[Path], Callable[[], Any]]) -> Callable[[Path], Callable[[], Any]]:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def prose(chars: int, seed: int = 0) -> str:
+    """Deterministic word salad with sentence and paragraph breaks."""
+    out: List[str] = []
+    n = 0
+    i = seed
+    while n < chars:
+        w = _WORDS[(i * 7 + i // 5) % len(_WORDS)]
+        sep = ".\n\n" if i % 97 == 96 else (". " if i % 13 == 12 else " ")
+        out.append(w + sep)
+        n += len(w) + len(sep)
+        i += 1
+    return "".join(out)[:chars]
+
+
+@bench("chunk_text")
+def _chunk_text(workdir: Path):
+    from quantum_aeon_fluxor.hermetic_engine__persistent_data.indexing.index_folder import chunk_text
+    text = prose(200_000)
+    return lambda: chunk_text(text, max_chars=2000, overlap=200)
+
+
+@bench("sha256_text")
+def _sha256_text(workdir: Path):
+    from quantum_aeon_fluxor.utils.hash import sha256_text
+    text = prose(2000)
+    return lambda: sha256_text(text)
+
+
+@bench("chunk_uuid")
+def _chunk_uuid(workdir: Path):
+    from quantum_aeon_fluxor.utils.hash import chunk_uuid
+    path = workdir / "library" / "Corpus_Hermeticum" / "treatise_ix.pdf"
+    text = prose(2000, seed=3)
+    return lambda: chunk_uuid(path, 42, text)
+
+
+@bench("ingest_payload")
+def _ingest_payload(workdir: Path):
+    from quantum_aeon_fluxor.hermetic_engine__persistent_data.indexing.ingest import chunk_payload
+    root = workdir / "library"
+    path = root / "Corpus_Hermeticum" / "treatise_ix.pdf"
+    meta = {"source_path": str(path), "ext": ".pdf", "title": "On Thought and Sense", "author": "Hermes Trismegistus"}
+    text = prose(2000, seed=5)
+    return lambda: chunk_payload(path, root, 42, text, meta)
+
+
+@bench("detect_mode")
+def _detect_mode(workdir: Path):
+    from quantum_aeon_fluxor.syzygy__conversational_framework.Integration_Prototyping.qacore_prompt_engine import (
+        QAeCoreTransitionEngine,
+    )
+    engine = QAeCoreTransitionEngine()
+    inputs = [
+        "How does integrated information relate to the binding problem?",
+        "Please synthesize the last three hypotheses into one model",
+        prose(300, seed=11),  # no pattern: falls back to the context
+        "Meta-Comments: keep answers shorter",
+        prose(600, seed=17) + " and ground it in empirical data",
+    ]
+    history = [prose(400, seed=s) + " evidence and measurement" for s in range(6)]
+
+    def run() -> None:
+        for text in inputs:
+            engine.detect_mode(text, context_history=history)
+    return run
+
+
+@bench("compose_prompt")
+def _compose_prompt(workdir: Path):
+    from quantum_aeon_fluxor.syzygy__conversational_framework.bridge import compose_prompt
+    question = prose(300, seed=23)
+    history = [prose(500, seed=s) for s in range(6)]
+    return lambda: compose_prompt(question, focus_topic="consciousness", recent_history=history)
+
+
+@bench("log_event")
+def _log_event(workdir: Path):
+    from quantum_aeon_fluxor.utils import metrics
+    os.environ[metrics.METRICS_DIR_ENV] = str(workdir / "metrics")
+    return lambda: metrics.log_event("bench", "embed_batch", duration_ms=12.5, batch_size=32, concurrency=4)
+
+
+@bench("archon_state_save")
+def _archon_state_save(workdir: Path):
+    from quantum_aeon_fluxor.archon__supervisor_agent.state import ArchonState
+    state = ArchonState(focus_topic="consciousness", open_questions=[prose(160, seed=s) for s in range(20)],
+                        working_hypotheses=[prose(240, seed=s) for s in range(12)])
+    for s in range(40):
+        state.register_insight(prose(200, seed=s), tags=["emergence", "coherence"], confidence=0.6)
+    path = workdir / "archon_state.json"
+    return lambda: state.save(path, mirror_legacy=False)
+
+
+def _time(fn: Callable[[], Any], number: int) -> float:
+    t0 = perf_counter()
+    for _ in range(number):
+        fn()
+    return perf_counter() - t0
+
+
+def measure(fn: Callable[[], Any], repeats: int = DEFAULT_REPEATS, min_time: float = DEFAULT_MIN_TIME) -> Dict[str, Any]:
+    """Per-call timings in microseconds: median, min, MAD and the samples (one per repeat)."""
+    fn()  # warm-up: imports, caches, first allocation
+    number = 1
+    while True:
+        t = _time(fn, number)
+        if t >= min_time or number >= 1 << 24:
+            break
+        number = max(number * 2, int(number * min_time / t * 1.2)) if t > 0 else number * 10
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # as timeit: collections land in random repeats otherwise
+    try:
+        samples = [_time(fn, number) / number * 1e6 for _ in range(max(1, repeats))]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    med = median(samples)
+    return {
+        "median_us": round(med, 4),
+        "min_us": round(min(samples), 4),
+        "mad_us": round(median(abs(s - med) for s in samples), 4),
+        "number": number,
+        "samples_us": [round(s, 4) for s in samples],
+    }
+
+
+def run(names: Optional[Sequence[str]] = None, repeats: int = DEFAULT_REPEATS,
+        min_time: float = DEFAULT_MIN_TIME) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    saved_dir = os.environ.get("QAECORE_METRICS_DIR")
+    with tempfile.TemporaryDirectory() as d:
+        try:
+            for name in names or list(BENCHMARKS):
+                results[name] = measure(BENCHMARKS[name](Path(d)), repeats, min_time)
+        finally:
+            from quantum_aeon_fluxor.utils import metrics
+            metrics.flush()
+            if saved_dir is None:
+                os.environ.pop("QAECORE_METRICS_DIR", None)
+            else:
+                os.environ["QAECORE_METRICS_DIR"] = saved_dir
+    return results
+
+
+def machine_id() -> str:
+    raw = f"{platform.node() or 'host'}-{platform.system()}-{platform.machine()}-py{sys.version_info[0]}{sys.version_info[1]}"
+    return re.sub(r"[^\w.-]+", "_", raw).lower()
+
+
+def _rel_noise(r: Dict[str, Any]) -> float:
+    return MAD_TO_SIGMA * r["mad_us"] / r["median_us"] if r["median_us"] else 0.0
+
+
+def _between_runs(runs: Sequence[float]) -> float:
+    """Relative spread of the saved best times (0 until two runs are saved)."""
+    if len(runs) < 2:
+        return 0.0
+    mid = median(runs)
+    if len(runs) == 2:
+        return abs(runs[0] - runs[1]) / 2 / mid
+    return MAD_TO_SIGMA * median(abs(r - mid) for r in runs) / mid
+
+
+def compare(baseline: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]],
+            threshold: float = DEFAULT_THRESHOLD, noise_k: float = DEFAULT_NOISE_K) -> List[Dict[str, Any]]:
+    """Per case: relative change of the best time against the baseline, and slower / faster / same / new."""
+    rows = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base or not base.get("min_us"):
+            rows.append({"name": name, "min_us": cur["min_us"], "status": "new"})
+            continue
+        runs = base.get("runs") or [base["min_us"]]
+        base_us = median(runs)
+        change = cur["min_us"] / base_us - 1.0
+        noise = math.sqrt(_rel_noise(base) ** 2 + _rel_noise(cur) ** 2 + _between_runs(runs) ** 2)
+        limit = max(threshold, noise_k * noise)
+        status = "slower" if change > limit else "faster" if change < -limit else "same"
+        rows.append({"name": name, "min_us": cur["min_us"], "baseline_us": round(base_us, 4), "runs": len(runs),
+                     "change": round(change, 4), "limit": round(limit, 4), "status": status})
+    return rows
+
+
+def merge_baseline(previous: Optional[Dict[str, Dict[str, Any]]], results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Baseline results after a save: the latest measurement plus the best times of recent saves."""
+    merged = dict(previous or {})
+    for name, r in results.items():  # a -k run updates only the selected cases
+        runs = list((merged.get(name) or {}).get("runs", []))[-(KEEP_RUNS - 1):] + [r["min_us"]]
+        merged[name] = {**r, "runs": runs}
+    return merged
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the CPU hot paths against a per-machine baseline.")
+    parser.add_argument("-k", dest="select", nargs="*", help="Only cases whose name contains one of these")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed repeats per case (default 7)")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="Seconds per repeat (default 0.05)")
+    parser.add_argument("--save", action="store_true", help="Add the results to this machine's baseline (last 5 saves kept)")
+    parser.add_argument("--baseline-dir", default=os.environ.get(BENCH_DIR_ENV) or str(DEFAULT_BASELINE_DIR))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Minimum relative change to report (default 0.10)")
+    parser.add_argument("--noise-k", type=float, default=DEFAULT_NOISE_K, help="Required multiple of the combined noise (default 3)")
+    parser.add_argument("--json", help="Also write the results (and comparison) to this file")
+    args = parser.parse_args(argv)
+
+    names = [n for n in BENCHMARKS if not args.select or any(s in n for s in args.select)]
+    if not names:
+        parser.error(f"no benchmark matches {args.select} (have: {', '.join(BENCHMARKS)})")
+    results = run(names, args.repeats, args.min_time)
+    baseline_path = Path(args.baseline_dir).expanduser() / f"{machine_id()}.json"
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else None
+    rows = compare(baseline["results"], results, args.threshold, args.noise_k) if baseline else []
+
+    print(f"{'case':<20} {'best us':>12} {'median us':>12} {'noise':>7} {'baseline us':>12} {'change':>8} {'limit':>7}  status")
+    by_name = {r["name"]: r for r in rows}
+    for name, r in results.items():
+        c = by_name.get(name, {})
+        base = f"{c['baseline_us']:.3f}" if "baseline_us" in c else "-"
+        change = f"{c['change'] * 100:+.1f}%" if "change" in c else "-"
+        limit = f"{c['limit'] * 100:.0f}%" if "limit" in c else "-"
+        print(f"{name:<20} {r['min_us']:>12.3f} {r['median_us']:>12.3f} {_rel_noise(r) * 100:>6.1f}% {base:>12} {change:>8} "
+              f"{limit:>7}  {c.get('status', '')}")
+    if baseline is None and not args.save:
+        print(f"\nNo baseline for {machine_id()} in {baseline_path.parent}; record one with --save.")
+    elif rows and min(r.get("runs", KEEP_RUNS) for r in rows) < 3 and not args.save:
+        print("\nBaseline has fewer than 3 saved runs; between-run noise is not known yet (run --save again).")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"machine": machine_id(), "results": results, "comparison": rows}, indent=2),
+                                   encoding="utf-8")
+    if args.save:
+        merged = merge_baseline(baseline["results"] if baseline else None, results)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps({
+            "machine": machine_id(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "results": merged,
+        }, indent=2), encoding="utf-8")
+        print(f"\nBaseline saved: {baseline_path}")
+        return 0
+    slower = [r["name"] for r in rows if r["status"] == "slower"]
+    if slower:
+        print(f"\nSlower than baseline beyond noise: {', '.join(slower)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
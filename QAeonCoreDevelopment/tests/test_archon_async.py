@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+
+import pytest
+
+from quantum_aeon_fluxor.archon__supervisor_agent import archon as archon_mod
+from quantum_aeon_fluxor.archon__supervisor_agent.state import ArchonState
+from quantum_aeon_fluxor.utils import metrics
+
+
+class _FakeClient:
+    def query(self, prompt, **kwargs):
+        return f"echo len={len(prompt)}"
+
+    def query_stream(self, prompt, **kwargs):
+        yield "echo "
+        yield "streamed"
+
+
+@pytest.fixture
+def archon(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    monkeypatch.setenv("QAECORE_WRITE_BEHIND_DIR", str(tmp_path / "spool"))
+    monkeypatch.setenv("QAECORE_HISTORY_DIR", str(tmp_path / "history"))
+    logged = []
+    saved = []
+    release = threading.Event()
+
+    def _slow_log(entries):
+        release.wait(5)
+        logged.extend((speaker, text) for _, speaker, text in entries)
+
+    monkeypatch.setattr(archon_mod, "GeminiClient", _FakeClient)
+    monkeypatch.setattr(archon_mod.ArchonState, "load", classmethod(lambda cls: ArchonState()))
+    monkeypatch.setattr(archon_mod.ArchonState, "save", lambda self: saved.append(self.focus_topic))
+    monkeypatch.setattr(archon_mod, "episodic_log_interactions", _slow_log)
+    a = archon_mod.Archon()
+    a.retrieval_enabled = False
+    return a, logged, saved, release
+
+
+def test_persistence_does_not_delay_the_answer(archon, tmp_path):
+    a, logged, saved, release = archon
+    reply = a.run_turn("What is emergence?")
+    assert reply.startswith("echo len=")
+    assert a.history[-1] == ("Archon", reply)
+    assert a.state.focus_topic == "What is emergence?"
+    assert logged == []  # still blocked in the background worker
+
+    release.set()
+    a.flush_persistence(timeout=5)
+    assert logged == [("Volkh", "What is emergence?"), ("Archon", reply)]
+    assert saved == ["What is emergence?"]
+
+    metrics.flush()
+    events = [json.loads(line) for line in (tmp_path / "archon.jsonl").read_text().splitlines()]
+    names = [e["event"] for e in events]
+    assert "turn_breakdown" in names and "turn_persisted" in names
+    bd = next(e for e in events if e["event"] == "turn_breakdown")
+    assert bd["critical_path_ms"] >= bd["model_ms"]
+
+
+def test_retrieval_and_mode_selection_overlap(archon, tmp_path, monkeypatch):
+    a, _, _, release = archon
+    release.set()
+
+    def _slow_retrieval(text):
+        time.sleep(0.2)
+        return "", [], ""
+
+    def _slow_mode(text, history, forced):
+        time.sleep(0.2)
+        return "REFLECTION"
+
+    monkeypatch.setattr(a, "_retrieve_context", _slow_retrieval)
+    monkeypatch.setattr(a, "_select_mode", _slow_mode)
+    chunks = []
+    assert a.run_turn("Reflect on this", on_chunk=chunks.append) == "echo streamed"
+    assert chunks == ["echo ", "streamed"]
+    a.flush_persistence(timeout=5)
+
+    metrics.flush()
+    events = [json.loads(line) for line in (tmp_path / "archon.jsonl").read_text().splitlines()]
+    bd = next(e for e in events if e["event"] == "turn_breakdown")
+    assert bd["streamed"] is True
+    assert bd["prepare_ms"] < bd["retrieval_ms"] + bd["mode_select_ms"]
+
+
+def test_trace_command_shows_last_turn(archon):
+    a, _, _, release = archon
+    release.set()
+    a.run_turn("What is emergence?")
+    out = a.run_turn(":trace")
+    labels = [line.split()[0] for line in out.splitlines()[2:]]
+    assert labels[0] == "archon.turn"
+    assert {"archon.retrieve", "archon.select_mode", "archon.compose_prompt", "archon.model_query"} <= set(labels)
+    a.flush_persistence(timeout=5)
+
+
+def test_session_switch_starts_a_fresh_history(archon):
+    a, _, _, release = archon
+    release.set()
+    a.run_turn("What is emergence?")
+    assert a.history.session == "default" and len(a.history) == 2
+    assert a.run_turn(":session research") == "session set to 'research'"
+    assert a.history.session == "research" and len(a.history) == 0 and a.history.digest == ""
+    a.run_turn("And polarity?")
+    assert [t for _, t in a.history][0] == "And polarity?"
+    a.flush_persistence(timeout=5)
@@ -0,0 +1,48 @@
+import json
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.bench_retrieval import (
+    HashingEmbedder,
+    LabelledQuery,
+    bench_memory,
+    load_dataset,
+    score_run,
+)
+
+
+def test_hashing_embedder_is_deterministic_and_lexical():
+    a, b = HashingEmbedder(64), HashingEmbedder(64)
+    assert a.embed_texts(["salt sulphur mercury"]) == b.embed_texts(["salt sulphur mercury"])
+    q, near, far = a.embed_texts(["sulphur mercury", "sulphur mercury salt", "quantum field vacuum"])
+    dot = lambda x, y: sum(i * j for i, j in zip(x, y))  # noqa: E731
+    assert dot(q, near) > dot(q, far)
+
+
+def test_memory_backend_reports_recall_mrr_latency(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "alchemy.md").write_text("sulphur mercury and salt are the three alchemical principles " * 3)
+    (corpus / "physics.md").write_text("quantum field theory describes the vacuum and particle creation " * 3)
+    (corpus / "ethics.txt").write_text("virtue ethics asks what a flourishing life requires of character " * 3)
+    ds = tmp_path / "q.jsonl"
+    ds.write_text("\n".join(json.dumps(x) for x in [
+        {"query": "three alchemical principles", "expected": "alchemy.md"},
+        {"query": "particle creation in the vacuum", "expected": ["physics.md"]},
+        {"query": "flourishing life and character", "expected": "ethics.txt"},
+    ]))
+    rows = bench_memory(load_dataset(ds), corpus, chunk_sizes=[2000, 80], dims=[256], ks=[1, 3], overlap=10)
+    assert [r["config"].split()[1] for r in rows] == ["chunk=2000", "chunk=80"]
+    assert rows[0]["chunks"] == 3 and rows[1]["chunks"] > 3
+    for r in rows:
+        assert r["recall@3"] == 1.0
+        assert 0 < r["mrr"] <= 1.0
+        assert r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"]
+    assert rows[0]["recall@1"] == 1.0 and rows[0]["mrr"] == 1.0
+
+
+def test_recall_at_k_cuts_hits_before_deduping_sources():
+    ds = [LabelledQuery("q", frozenset({"b.md"}))]
+    # three chunks of a.md outrank b.md: b.md is the 4th hit, not in the top 2
+    ranked = [["a.md", "a.md", "a.md", "b.md"]]
+    scores = score_run(ranked, ds, ks=[2, 4])
+    assert scores["recall@2"] == 0.0 and scores["recall@4"] == 1.0
+    assert scores["mrr"] == 0.25
@@ -0,0 +1,74 @@
+from quantum_aeon_fluxor.syzygy__conversational_framework.bridge import compose_budgeted_prompt, compose_prompt_parts
+from quantum_aeon_fluxor.syzygy__conversational_framework.context_budget import (
+    ContextBudget,
+    allocate,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+
+
+def _words(n, w="word"):
+    return " ".join([w] * n)
+
+
+def test_estimator_and_truncation():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Hello, world!") == 4
+    assert estimate_tokens("internationalization") > estimate_tokens("cat")
+    cut = truncate_to_tokens(_words(100), 10)
+    assert cut.endswith("…") and estimate_tokens(cut) <= 10
+
+
+def test_context_by_score_and_history_newest_first():
+    budget = ContextBudget(total=130, context_share=0.5, min_item_tokens=8)
+    context = [(0.2, "low " + _words(40)), (0.9, "high " + _words(40)), (0.5, "mid " + _words(40))]
+    history = [("Volkh", "old " + _words(40)), ("Archon", "new " + _words(30))]
+    alloc = allocate(budget, {"persona": _words(10)}, context, history)
+
+    assert alloc.context[0].startswith("high")
+    assert alloc.dropped["context"] == 1 and alloc.truncated["context"] == 1  # mid truncated, low dropped
+    # newest turn kept whole, the older one truncated into the remaining room, order preserved
+    assert [s for s, _ in alloc.history] == ["Volkh", "Archon"]
+    assert alloc.history[0][1].endswith("…") and alloc.truncated["history"] == 1
+    assert alloc.tokens["total"] <= budget.total
+
+
+def test_unused_share_spills_over():
+    budget = ContextBudget(total=200, context_share=0.9)
+    history = [("Volkh", _words(60)), ("Archon", _words(60))]
+    alloc = allocate(budget, {}, context=[], history=history)
+    assert len(alloc.history) == 2 and alloc.dropped["history"] == 0
+
+
+def test_budgeted_prompt_keeps_markers_and_fits():
+    context = [(1.0 - i / 10, f"- [{1.0 - i / 10:.3f}] (c) doc{i}.md :: " + _words(200, "insight")) for i in range(5)]
+    prompt, alloc = compose_budgeted_prompt(
+        "What is mentalism?",
+        context=context,
+        context_header="Sources: c | k=5\n",
+        history=[("Volkh", "earlier question"), ("Archon", "earlier answer")],
+        forced_mode="REFLECTION",
+        budget=ContextBudget(total=900),
+    )
+    assert "[Mode: Reflection]" in prompt
+    assert "=== Context ===" in prompt and "doc0.md" in prompt and "doc4.md" not in prompt
+    assert "Volkh: earlier question" in prompt
+    assert alloc.tokens["total"] <= 900
+    # the stable prefix is reported but not charged; joining newlines/labels are estimated per turn
+    assert estimate_tokens(prompt) <= 900 + alloc.tokens["prefix"] + 5
+
+
+def test_pinned_docs_do_not_crowd_out_context(tmp_path, monkeypatch):
+    doc = tmp_path / "framework.md"
+    doc.write_text(_words(5000, "principle"))
+    monkeypatch.setenv("QAECORE_PINNED_DOCS", str(doc))
+    prefix, suffix, alloc = compose_prompt_parts(
+        "What is mentalism?",
+        context=[(0.9, "- [0.900] (c) doc0.md :: " + _words(50, "insight"))],
+        history=[("Volkh", "earlier question"), ("Archon", "earlier answer")],
+        forced_mode="REFLECTION",
+        budget=ContextBudget(total=3000),
+    )
+    assert "framework.md" in prefix and alloc.tokens["prefix"] > 3000
+    assert alloc.dropped["context"] == 0 and alloc.dropped["history"] == 0
+    assert "doc0.md" in suffix and "Volkh: earlier question" in suffix
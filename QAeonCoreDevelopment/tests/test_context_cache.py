@@ -0,0 +1,85 @@
+import json
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini import context_cache
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.context_cache import ContextCache
+from quantum_aeon_fluxor.syzygy__conversational_framework.bridge import compose_prompt_parts
+from quantum_aeon_fluxor.utils import metrics
+
+
+class FakeCached:
+    def __init__(self, name):
+        self.name = name
+        self.updates = 0
+        self.deleted = False
+
+    def update(self, ttl):
+        self.updates += 1
+
+    def delete(self):
+        self.deleted = True
+
+
+def _cache(created, **kw):
+    def create(model_name, prefix, ttl_s):
+        c = FakeCached(f"cachedContents/{len(created)}")
+        created.append(c)
+        return c
+
+    return ContextCache("m", create=create, make_model=lambda c: ("model", c.name), **kw)
+
+
+PREFIX = "persona " * 200
+
+
+def test_create_once_then_reuse_and_refresh(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    clock = [1000.0]
+    monkeypatch.setattr(context_cache, "time", lambda: clock[0])
+    created = []
+    cache = _cache(created, ttl_s=100, refresh_margin_s=20, min_tokens=10)
+
+    first = cache.model_for(PREFIX)
+    assert cache.model_for(PREFIX) is first and len(created) == 1
+
+    clock[0] += 90  # within the refresh margin: TTL extended, same entry
+    assert cache.model_for(PREFIX) is first and created[0].updates == 1
+    clock[0] += 200  # expired: recreated
+    assert cache.model_for(PREFIX) is not None and len(created) == 2
+
+    metrics.flush()
+    results = [json.loads(line)["result"] for line in (tmp_path / "gemini.jsonl").read_text().splitlines()]
+    assert results == ["create", "refresh", "create"]
+
+
+def test_small_prefix_and_errors_fall_back(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    created = []
+    assert _cache(created, min_tokens=10_000).model_for(PREFIX) is None and not created
+
+    calls = []
+
+    def failing(*a):
+        calls.append(a)
+        raise RuntimeError("quota")
+
+    cache = ContextCache("m", create=failing, min_tokens=10, retry_after_s=600)
+    assert cache.model_for(PREFIX) is None
+    assert cache.model_for(PREFIX) is None and len(calls) == 1  # cooling down, no retry storm
+
+
+def test_eviction_deletes_oldest(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    created = []
+    cache = _cache(created, min_tokens=10, max_entries=1)
+    cache.model_for(PREFIX)
+    cache.model_for(PREFIX + " changed")
+    assert created[0].deleted and not created[1].deleted
+
+
+def test_prompt_parts_keep_dynamic_content_out_of_prefix():
+    p1, s1, _ = compose_prompt_parts("What is mentalism?", forced_mode="REFLECTION")
+    p2, s2, _ = compose_prompt_parts("Explain polarity", forced_mode="SYNTHESIS",
+                                     history=[("Volkh", "earlier")], digest="we talked")
+    assert p1 == p2
+    assert s1.startswith("[Mode: Reflection]") and "What is mentalism?" in s1
+    assert "What is mentalism?" not in p1 and "earlier" in s2 and "we talked" in s2
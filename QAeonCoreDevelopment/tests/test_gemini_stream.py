@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini import GeminiClient as GeminiClient_module
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.GeminiClient import GeminiClient
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.response_cache import ReplayMiss, ResponseCache
+from quantum_aeon_fluxor.utils import metrics
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class _StreamingModel:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.calls = []
+
+    def generate_content(self, prompt, stream=False):
+        self.calls.append((prompt, stream))
+        return iter(_Chunk(p) for p in self.pieces)
+
+
+def _client(tmp_path, model, mode="record"):
+    client = object.__new__(GeminiClient)  # skip API key configuration
+    client.model_name = "fake"
+    client.model = model
+    client.response_cache = ResponseCache(tmp_path / "responses.sqlite", mode=mode)
+    client.semantic_cache = None
+    return client
+
+
+def test_query_stream_yields_chunks_and_logs_ttft(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    model = _StreamingModel(["The ", "Kybalion ", "says..."])
+    client = _client(tmp_path, model)
+
+    assert list(client.query_stream("prompt")) == ["The ", "Kybalion ", "says..."]
+    assert model.calls == [("prompt", True)]
+
+    metrics.flush()
+    events = [json.loads(line) for line in (tmp_path / "gemini.jsonl").read_text().splitlines()]
+    ev = next(e for e in events if e["event"] == "query_stream")
+    assert ev["ok"] is True and ev["ttft_ms"] is not None and ev["tokens_per_s"] > 0
+
+    # the accumulated text was recorded: a rerun is a single cached chunk, no model call
+    assert list(client.query_stream("prompt")) == ["The Kybalion says..."]
+    assert len(model.calls) == 1
+
+
+def test_query_stream_error_yields_message(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+
+    class _Broken:
+        def generate_content(self, prompt, stream=False):
+            raise RuntimeError("boom")
+
+    client = _client(tmp_path, _Broken(), mode="off")
+    out = list(client.query_stream("prompt"))
+    assert len(out) == 1 and out[0].startswith("Error:") and "boom" in out[0]
+
+
+def test_prefix_is_system_instruction_with_or_without_context_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    built = []
+
+    class _SystemModel(_StreamingModel):
+        def __init__(self, name, system_instruction=None):
+            super().__init__(["ok"])
+            self.system_instruction = system_instruction
+            built.append(self)
+
+    monkeypatch.setattr(GeminiClient_module.genai, "GenerativeModel", _SystemModel)
+    client = _client(tmp_path, _StreamingModel(["unused"]), mode="off")
+    client.context_cache = None
+
+    assert list(client.query_stream("question", prefix="persona\n\n")) == ["ok"]
+    assert list(client.query_stream("another", prefix="persona\n\n")) == ["ok"]
+    assert len(built) == 1 and built[0].system_instruction == "persona\n\n"
+    assert [c[0] for c in built[0].calls] == ["question", "another"]  # suffix only, prefix not prepended
+    assert client.model.calls == []
+
+
+def test_replay_miss_is_raised_not_answered(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    client = _client(tmp_path, _StreamingModel(["live"]), mode="replay")
+    with pytest.raises(ReplayMiss):
+        client.query("never recorded")
+    with pytest.raises(ReplayMiss):
+        list(client.query_stream("never recorded"))
+    assert client.model.calls == []
@@ -0,0 +1,46 @@
+import json
+
+from quantum_aeon_fluxor.archon__supervisor_agent.history import BoundedHistory, extractive_digest
+from quantum_aeon_fluxor.syzygy__conversational_framework.context_budget import estimate_tokens
+
+
+def test_memory_stays_bounded_and_old_turns_spill(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    h = BoundedHistory("sess/1", max_turns=8, digest_tokens=60, path=tmp_path / "hist")
+    for i in range(50):
+        h.append(("Volkh" if i % 2 == 0 else "Archon", f"Turn {i} talks about hermetic mentalism and correspondence."))
+    h.flush()
+
+    assert len(h) <= 8 and h.total_turns == 50
+    assert h[-1][1].startswith("Turn 49") and [t for _, t in h[-2:]][0].startswith("Turn 48")
+    assert list(h)[0] == h[0]
+    spilled = [json.loads(line) for line in (tmp_path / "hist" / "sess_1.jsonl").read_text().splitlines()]
+    assert len(spilled) == 50 - len(h) and spilled[0]["text"].startswith("Turn 0")
+    assert h.digest and estimate_tokens(h.digest) <= 60
+
+    # the digest survives a restart of the same session
+    assert BoundedHistory("sess/1", path=tmp_path / "hist").digest == h.digest
+
+
+def test_extractive_digest_prefers_recurring_topics():
+    turns = [
+        ("Volkh", "Mentalism says the all is mind. The weather is nice today."),
+        ("Archon", "Mentalism frames mind as the substrate. Mind and mentalism recur in the Kybalion."),
+    ]
+    digest = extractive_digest("", turns, max_tokens=25)
+    assert "Mentalism" in digest and "weather" not in digest
+    assert estimate_tokens(digest) <= 25
+
+
+def test_turn_leaving_the_prompt_window_reaches_the_digest(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    h = BoundedHistory("win", max_turns=40, digest_tokens=200, path=tmp_path / "hist", window=4)
+    h.append(("Volkh", "Kybalion polarity governs the pendulum of rhythm."))
+    for i in range(4):
+        h.append(("Archon", f"Filler turn {i}."))
+    h.flush()
+
+    # the first turn is no longer in the last 4 (the prompt) and was not evicted, but is in the digest
+    assert len(h) == 5 and "Kybalion" not in " ".join(t for _, t in h[-4:])
+    assert "Kybalion" in h.digest
+    assert not (tmp_path / "hist" / "win.jsonl").exists()
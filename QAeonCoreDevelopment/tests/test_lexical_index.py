@@ -0,0 +1,44 @@
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.lexical_index import (
+    LexicalIndex,
+    build_match_query,
+    rrf_merge,
+)
+
+
+def test_build_match_query_keeps_phrases_drops_stopwords():
+    q = build_match_query('what is the "Emerald Tablet" of hermes')
+    assert q == '"emerald tablet" OR "hermes"'
+    assert build_match_query("the of and") is None
+
+
+def test_lexical_index_bm25_and_skip_existing(tmp_path):
+    idx = LexicalIndex("c", root=tmp_path)
+    idx.add(["a", "b", "c"], [
+        "the kybalion and the principle of mentalism",
+        "notes on quantum fields",
+        "mentalism mentalism as the first hermetic principle",
+    ], [{"n": "a"}, {"n": "b"}, {"n": "c"}])
+    assert idx.add(["a"], ["replaced"]) == 0
+    assert len(idx) == 3
+    hits = idx.search("mentalism", k=5)
+    assert [pid for _, pid, _ in hits] == ["c", "a"]
+    assert hits[0][2] == {"n": "c"}
+    assert idx.add(["b"], ["kybalion"], [{"n": "b2"}], replace=True) == 1
+    assert {pid for _, pid, _ in idx.search("kybalion")} == {"a", "b"}
+    idx.close()
+
+
+def test_rrf_merge_rewards_agreement():
+    dense = [("x", {"n": "x"}), ("y", {"n": "y"}), ("z", {"n": "z"})]
+    lexical = [("z", {"n": "z"}), ("w", {"n": "w"})]
+    out = rrf_merge([dense, lexical], k=2)
+    assert [p["n"] for _, p in out] == ["z", "x"]
+
+
+def test_lexical_index_clear(tmp_path):
+    idx = LexicalIndex("c", root=tmp_path)
+    idx.add(["a", "b"], ["stale mentalism chunk", "stale polarity chunk"])
+    assert idx.clear() == 2 and len(idx) == 0 and idx.search("mentalism") == []
+    assert idx.add(["a"], ["fresh mentalism chunk"]) == 1  # ids are free again
+    assert [pid for _, pid, _ in idx.search("fresh")] == ["a"]
+    idx.close()
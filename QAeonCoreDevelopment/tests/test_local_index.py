@@ -0,0 +1,68 @@
+import threading
+
+import numpy as np
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.local_index import LocalVectorIndex
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import (
+    client_for,
+    ensure_collection,
+    search_by_vector,
+    upsert_chunks,
+)
+from quantum_aeon_fluxor.utils.filelock import FileLock
+
+
+def test_local_index_exact_search_latest_wins(tmp_path):
+    idx = LocalVectorIndex("c", tmp_path / "c")
+    idx.upsert(["a", "b"], [[1.0, 0.0], [2.0, 2.0]], [{"n": "a"}, {"n": "b"}])
+    idx.upsert(["a"], [[0.0, 1.0]], [{"n": "a2"}])
+    # a fresh handle (another process) reads the same files
+    again = LocalVectorIndex("c", tmp_path / "c")
+    hits = again.search([0.0, 1.0], limit=5)
+    assert len(again) == 2
+    assert [h.payload["n"] for h in hits] == ["a2", "b"]
+    assert np.isclose(hits[0].score, 1.0)
+    assert again.compact() == 1
+    assert len(LocalVectorIndex("c", tmp_path / "c")) == 2
+
+
+def test_compact_holds_the_file_lock_and_readers_see_the_rewrite(tmp_path):
+    idx = LocalVectorIndex("c", tmp_path / "c")
+    idx.upsert(["a", "b", "a"], [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]], [{"n": "a"}, {"n": "b"}, {"n": "a2"}])
+    other = LocalVectorIndex("c", tmp_path / "c")
+    assert len(other) == 2  # holds a memmap of the uncompacted file
+
+    result = []
+    with FileLock(idx.lock_path):
+        t = threading.Thread(target=lambda: result.append(idx.compact()))
+        t.start()
+        t.join(0.2)
+        assert t.is_alive()  # waits for the writer holding the lock
+    t.join(5)
+    assert result == [1]
+    assert (tmp_path / "c" / "vectors.f32").stat().st_size == 2 * 2 * 4
+    for h in (idx, other):
+        assert [p.payload["n"] for p in h.search([1.0, 1.0], limit=5)] == ["a2", "b"]
+
+
+def test_in_memory_index_matches_bruteforce():
+    rng = np.random.default_rng(0)
+    corpus = rng.normal(size=(500, 16)).astype(np.float32)
+    idx = LocalVectorIndex("mem")
+    idx.upsert(list(range(500)), corpus, [{"i": i} for i in range(500)])
+    q = rng.normal(size=16)
+    normed = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    expected = list(np.argsort(-(normed @ q))[:10])
+    assert [int(h.id) for h in idx.search(q, limit=10)] == expected
+
+
+def test_qdrant_store_dispatches_local_collections(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_LOCAL_COLLECTIONS", "notes")
+    monkeypatch.setenv("QAECORE_LOCAL_INDEX_DIR", str(tmp_path))
+    client = client_for("notes")
+    assert client is None
+    ensure_collection(client, "notes", 3)
+    upsert_chunks(client, "notes", [[1, 0, 0], [0, 1, 0]], [{"text": "x"}, {"text": "y"}], ids=["1", "2"])
+    hits = search_by_vector(client, "notes", [0.1, 0.9, 0.0], limit=1)
+    assert hits[0].payload == {"text": "y"}
+    assert (tmp_path / "notes" / "vectors.f32").exists()
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from quantum_aeon_fluxor.utils import metrics_diff
+from quantum_aeon_fluxor.utils.metrics_summary import cli
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _write(path, records):
+    with path.open("a", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+
+
+def _turns(hours_ago, n, query_ms, status="ok"):
+    start = NOW - timedelta(hours=hours_ago)
+    out = []
+    for i in range(n):
+        ts = (start + timedelta(seconds=10 * i)).isoformat()
+        out.append({"ts": ts, "event": "model_query:start"})
+        out.append({"ts": ts, "event": "model_query:end", "duration_ms": query_ms + i % 5, "status": status})
+        out.append({"ts": ts, "event": "retrieval_latency", "duration_ms": 20.0 + i % 3})
+    return out
+
+
+def test_format_json_and_csv(tmp_path, capsys):
+    _write(tmp_path / "archon.jsonl", _turns(30, 30, 1000.0) + _turns(1, 10, 1000.0, status="error"))
+    _write(tmp_path / "ingest.jsonl", [{"ts": (NOW - timedelta(seconds=60 - i)).isoformat(), "event": "chunks_upserted", "value": 10}
+                                       for i in range(0, 60, 10)])
+    cli(["--dir", str(tmp_path), "--streams", "archon", "ingest", "--format", "json"])
+    report = json.loads(capsys.readouterr().out)
+    q = report["streams"]["archon"]["events"]["model_query:end"]
+    assert q["count"] == 40 and q["errors"] == 10 and q["error_rate"] == 0.25
+    assert q["p50"] == pytest.approx(1002, rel=0.01) and q["rate_per_s"] > 0
+    assert report["streams"]["archon"]["events"]["model_query:start"]["count"] == 40
+    ingest = report["streams"]["ingest"]
+    assert ingest["span_s"] == 50 and ingest["events"]["chunks_upserted"]["total_per_s"] == 60 / 50
+
+    cli(["--dir", str(tmp_path), "--streams", "archon", "--since", "2h", "--format", "csv"])
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    by_event = {r["event"]: r for r in rows}
+    assert by_event["model_query:end"]["count"] == "10" and by_event["model_query:end"]["errors"] == "10"
+
+    cli(["--dir", str(tmp_path), "--streams", "archon", "--until", "2h", "--format", "json"])
+    report = json.loads(capsys.readouterr().out)
+    assert report["streams"]["archon"]["events"]["model_query:end"]["errors"] == 0
+
+
+def test_diff_windows_exit_code(tmp_path, capsys):
+    _write(tmp_path / "archon.jsonl", _turns(30, 40, 1000.0) + _turns(1, 40, 1500.0))
+    args = ["diff", "--dir", str(tmp_path), "--streams", "archon", "--baseline", "48h..24h", "--candidate", "2h"]
+    with pytest.raises(SystemExit) as e:
+        cli(args)
+    assert e.value.code == 1
+    out = capsys.readouterr().out
+    line = next(ln for ln in out.splitlines() if "model_query:end" in ln)
+    assert "+49.9%" in line and "REGRESSION (p50, p95)" in line
+    assert "model_query:start" not in out
+    assert next(ln for ln in out.splitlines() if "retrieval_latency" in ln).rstrip().endswith("ok")
+
+    # a looser threshold passes; events are matched without the :end suffix
+    assert cli(args + ["--max-p50", "60", "--max-p95", "60", "--events", "model_query"]) == 0
+    assert "retrieval_latency" not in capsys.readouterr().out
+    # too few samples are reported but never gate
+    assert cli(args + ["--min-count", "100"]) == 0
+
+
+def test_diff_against_saved_report(tmp_path, capsys):
+    _write(tmp_path / "archon.jsonl", _turns(1, 30, 800.0))
+    cli(["--dir", str(tmp_path), "--streams", "archon", "--format", "json"])
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(capsys.readouterr().out)
+
+    base = metrics_diff.load_side(str(baseline), tmp_path, ["archon"])
+    same = metrics_diff.load_side(str(tmp_path / "archon.jsonl"), tmp_path, ["archon"])
+    rows = metrics_diff.compare(base, same, ["retrieval_latency"], min_count=1)
+    assert [(r["event"], r["status"], r["p50_change"]) for r in rows] == [("retrieval_latency", "ok", 0.0)]
+
+    cli(["diff", "--baseline", str(baseline), "--candidate", "2h", "--dir", str(tmp_path), "--streams", "archon",
+         "--max-throughput-drop", "10", "--format", "json"])
+    result = json.loads(capsys.readouterr().out)
+    assert result["regressions"] == 0 and {r["event"] for r in result["events"]} == {"model_query:end", "retrieval_latency"}
+
+    with pytest.raises(SystemExit) as e:
+        cli(["diff", "--baseline", str(baseline), "--candidate", "2h", "--dir", str(tmp_path / "empty")])
+    assert e.value.code == 2
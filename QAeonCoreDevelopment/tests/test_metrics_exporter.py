@@ -0,0 +1,66 @@
+import urllib.request
+
+import pytest
+
+from quantum_aeon_fluxor.utils import metrics, metrics_exporter
+from quantum_aeon_fluxor.utils.metrics_exporter import Registry
+
+
+@pytest.fixture(autouse=True)
+def _metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+
+
+def _samples(text):
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+
+def test_registry_maps_events():
+    reg = Registry()
+    reg.observe("ingest", {"event": "embed_batch", "duration_ms": 40.0, "batch_size": 32, "concurrency": 4, "queue_depth": 7})
+    reg.observe("ingest", {"event": "embed_batch", "duration_ms": 700.0, "batch_size": 8, "concurrency": 4, "queue_depth": 6})
+    reg.observe("ingest", {"event": "chunks_upserted", "value": 40})
+    reg.observe("ingest", {"event": "embed:error", "error": "429"})
+    reg.observe("gemini", {"event": "semantic_cache", "result": "hit"})
+    reg.observe("retrieval", {"event": "query_embed", "cache": "miss", "duration_ms": 2.0})
+    reg.observe("archon", {"event": "model_query:start"})
+    reg.observe("archon", {"event": "upsert:start"})
+    reg.observe("archon", {"event": "model_query:end", "duration_ms": 1200.0, "status": "error"})
+    s = _samples(reg.render())
+
+    b = 'qaf_event_duration_seconds_bucket{stream="ingest",event="embed_batch",le="%s"}'
+    assert s[b % "0.05"] == 1 and s[b % "1.0"] == 2 and s[b % "+Inf"] == 2
+    assert s['qaf_event_duration_seconds_sum{stream="ingest",event="embed_batch"}'] == pytest.approx(0.74)
+    assert s['qaf_batch_items_total{stream="ingest",event="embed_batch"}'] == 40
+    assert s['qaf_count_total{stream="ingest",event="chunks_upserted"}'] == 40
+    assert s['qaf_errors_total{stream="ingest",event="embed:error"}'] == 1
+    assert s['qaf_errors_total{stream="archon",event="model_query"}'] == 1
+    assert s['qaf_cache_lookups_total{stream="gemini",event="semantic_cache",result="hit"}'] == 1
+    assert s['qaf_cache_lookups_total{stream="retrieval",event="query_embed",result="miss"}'] == 1
+    assert s['qaf_queue_depth{stream="ingest",event="embed_batch"}'] == 6
+    assert s['qaf_concurrency{stream="ingest",event="embed_batch"}'] == 4
+    assert s['qaf_in_flight{stream="archon",event="model_query"}'] == 0
+    assert s['qaf_in_flight{stream="archon",event="upsert"}'] == 1
+    assert 'qaf_events_total{stream="archon",event="model_query"}' in s  # starts are not counted as events
+    assert reg.render(openmetrics=True).endswith("# EOF\n")
+
+
+def test_endpoint_is_fed_by_log_event():
+    exporter = metrics_exporter.serve(0)
+    try:
+        with metrics.time_block("ingest", "upsert", chunks=3):
+            pass
+        metrics.log_counter("ingest", "chunks_upserted", value=3)
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            s = _samples(resp.read().decode("utf-8"))
+    finally:
+        metrics_exporter.stop()
+    assert s['qaf_event_duration_seconds_count{stream="ingest",event="upsert"}'] == 1
+    assert s['qaf_count_total{stream="ingest",event="chunks_upserted"}'] == 3
+    assert metrics._sinks == []
@@ -0,0 +1,49 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from quantum_aeon_fluxor.utils.metrics_follow import Follower, parse_window
+
+NOW = datetime(2025, 9, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _line(age_s, event="embed_batch", **fields):
+    ts = (NOW - timedelta(seconds=age_s)).isoformat()
+    return json.dumps({"ts": ts, "event": event, **fields}) + "\n"
+
+
+def test_follow_windows_and_incremental_reads(tmp_path):
+    live = tmp_path / "ingest.jsonl"
+    old = "".join(_line(900 + i, duration_ms=5000.0) for i in range(2000))  # outside both windows
+    recent = "".join(_line(200 - i, duration_ms=100.0) for i in range(100))  # 5m window only
+    live.write_text(old + recent)
+    f = Follower(tmp_path, ["ingest"], [60, 300], now=NOW.timestamp())
+    assert f.poll(NOW.timestamp()) == 100  # the window start was bisected; old records are never counted
+
+    with live.open("a") as fh:
+        for i in range(30):
+            fh.write(_line(30 - i, duration_ms=10.0 if i % 10 else 400.0, **({"status": "error"} if i < 3 else {})))
+        fh.write(_line(1)[:25])  # torn line: waits for the next poll
+    assert f.poll(NOW.timestamp()) == 30
+    stats = f.stats(NOW.timestamp())[("ingest", "embed_batch")]
+    assert stats[60]["rate"] == 30 / 60 and stats[60]["err"] == 3 / 30
+    assert stats[60]["p50"] == 10.0 and stats[60]["p95"] == 400.0
+    assert stats[300]["rate"] == 130 / 300 and stats[300]["p50"] == 100.0
+
+    with live.open("a") as fh:
+        fh.write(_line(1)[25:])
+    assert f.poll(NOW.timestamp()) == 1
+
+    seg = tmp_path / "ingest-20250901.jsonl"  # rotation: new segment picked up from its start
+    seg.write_text(_line(0, event="upsert", duration_ms=50.0))
+    live.write_text(_line(0, event="chunks_upserted", value=8))  # truncated and rewritten
+    assert f.poll(NOW.timestamp()) == 2
+    table = f.render(NOW.timestamp())
+    assert "embed_batch" in table and "upsert" in table and "chunks_upserted" in table
+
+    later = NOW.timestamp() + 400  # everything ages out of both windows
+    f.poll(later)
+    assert f.stats(later) == {}
+
+
+def test_parse_window():
+    assert [parse_window(w) for w in ("30s", "1m", "5m", "1h")] == [30, 60, 300, 3600]
@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+from quantum_aeon_fluxor.utils.metrics_rollup import HOUR, MINUTE, RollupStore, compact, default_db
+from quantum_aeon_fluxor.utils.sketch import DDSketch
+
+NOW = datetime(2025, 9, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _write(path, start, n, step_s=20, event="model_query", mode="a"):
+    with path.open(mode, encoding="utf-8") as f:
+        for i in range(n):
+            ts = start + timedelta(seconds=i * step_s)
+            f.write(json.dumps({"ts": ts.isoformat(), "event": event, "duration_ms": float(i % 100 + 1),
+                                **({"status": "error"} if i % 50 == 0 else {})}) + "\n")
+
+
+def test_compact_is_incremental_and_queryable(tmp_path):
+    live = tmp_path / "gemini.jsonl"
+    start = NOW - timedelta(days=2)
+    _write(live, start, 300)
+    assert compact(tmp_path, ["gemini"], now=NOW) == {"gemini": 300}
+    assert compact(tmp_path, ["gemini"], now=NOW) == {"gemini": 0}
+    with live.open("a") as f:
+        f.write('{"ts": "2025-08-30T13:00:00+00:00", "event": "model_query", "dur')  # torn tail: not consumed
+    assert compact(tmp_path, ["gemini"], now=NOW) == {"gemini": 0}
+
+    store = RollupStore(default_db(tmp_path))
+    res, aggs = store.query("gemini", int(start.timestamp()), int(NOW.timestamp()))
+    agg = aggs["model_query"]
+    assert res == HOUR and agg.count == 300 and agg.errors == 6
+    assert agg.min == 1.0 and agg.max == 100.0
+    assert abs(agg.sketch.quantile(0.95) - 95.0) <= 0.02 * 95.0
+    res, aggs = store.query("gemini", int(start.timestamp()), int((start + timedelta(minutes=10)).timestamp()))
+    assert res == MINUTE and aggs["model_query"].count == 30
+    store.close()
+
+
+def test_raw_retention_deletes_compacted_dated_segments(tmp_path):
+    old = tmp_path / "ingest-20250801.jsonl"
+    recent = tmp_path / "ingest-20250831.jsonl"
+    _write(old, datetime(2025, 8, 1, tzinfo=timezone.utc), 10, event="embed_batch")
+    _write(recent, datetime(2025, 8, 31, tzinfo=timezone.utc), 10, event="embed_batch")
+    assert compact(tmp_path, ["ingest"], retain_raw_days=7, now=NOW) == {"ingest": 20}
+    assert not old.exists() and recent.exists()
+    store = RollupStore(default_db(tmp_path))
+    _, aggs = store.query("ingest", int(datetime(2025, 7, 1, tzinfo=timezone.utc).timestamp()), res=HOUR)
+    assert aggs["embed_batch"].count == 20  # rollups outlive the raw segment
+    store.close()
+
+
+def test_archived_segment_is_not_compacted_twice(tmp_path):
+    import gzip
+    import shutil
+
+    seg = tmp_path / "gemini-20250831.jsonl"
+    _write(seg, datetime(2025, 8, 31, tzinfo=timezone.utc), 10)
+    assert compact(tmp_path, ["gemini"], now=NOW) == {"gemini": 10}
+    _write(seg, datetime(2025, 8, 31, 6, tzinfo=timezone.utc), 5)  # appended before archiving
+    with seg.open("rb") as src, gzip.open(str(seg) + ".gz", "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    seg.unlink()
+    assert compact(tmp_path, ["gemini"], now=NOW) == {"gemini": 5}
+    assert compact(tmp_path, ["gemini"], now=NOW) == {"gemini": 0}
+
+
+def test_sketch_bytes_roundtrip():
+    s = DDSketch(exact_limit=0)
+    for v in (0.0, 1.5, 20.0, 20.1, 900.0):
+        s.add(v)
+    r = DDSketch.from_bytes(s.to_bytes())
+    assert (r.count, r.zero, r.bins, r.min, r.max) == (s.count, s.zero, s.bins, s.min, s.max)
+
+
+def test_cli_dispatch(tmp_path):
+    _write(tmp_path / "archon.jsonl", datetime.now(timezone.utc) - timedelta(hours=1), 5, event="turn")
+
+    def run(*a):
+        return subprocess.run(
+            [sys.executable, "-m", "quantum_aeon_fluxor.utils.metrics_summary", *a,
+             "--dir", str(tmp_path), "--streams", "archon"],
+            capture_output=True, text=True, check=True,
+        )
+
+    assert "archon=5" in run("compact").stdout
+    assert "turn: count=5" in run("rollup", "--since", "1d").stdout
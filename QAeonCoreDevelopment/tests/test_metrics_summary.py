@@ -55,6 +55,72 @@ def test_raw_mode():
     assert any('"embed:end"' in line or 'embed:end' in line for line in out_lines)
 
 
+def test_sketch_accuracy_and_merge():
+    import random
+    from quantum_aeon_fluxor.utils.sketch import DDSketch
+
+    rng = random.Random(3)
+    values = [rng.lognormvariate(3, 1.2) for _ in range(20000)]
+    a, b = DDSketch(), DDSketch()
+    for i, v in enumerate(values):
+        (a if i % 2 else b).add(v)
+    merged = DDSketch.from_dict(json.loads(json.dumps(a.to_dict()))).merge(b)
+    data = sorted(values)
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = data[int(q * (len(data) - 1))]
+        assert abs(merged.quantile(q) - exact) <= 0.011 * exact
+    assert merged.count == 20000 and merged.max == data[-1]
+    small = DDSketch()
+    for v in (100.0, 300.0):
+        small.add(v)
+    assert small.quantile(0.5) == 100.0  # small groups stay exact
+
+
+def test_since_bisect_and_tail(tmp_path):
+    from datetime import datetime, timedelta, timezone
+    from quantum_aeon_fluxor.utils.metrics_summary import iter_records, scan_stream, tail_records
+
+    t0 = datetime(2025, 8, 15, tzinfo=timezone.utc)
+    recs = [{"ts": (t0 + timedelta(seconds=i)).isoformat(), "event": "e", "duration_ms": float(i), "pad": "x" * 100}
+            for i in range(5000)]
+    path = write_stream(tmp_path, "big", recs)
+    since = t0 + timedelta(seconds=4000)
+    got = list(iter_records(path, since))
+    assert got[0]["duration_ms"] == 4000.0 and len(got) == 1000
+    assert scan_stream(path, since).buckets["e"].summary()["min"] == 4000.0
+    tail = tail_records(path, 3)
+    assert [r["duration_ms"] for r in tail] == [4997.0, 4998.0, 4999.0]
+    assert len(tail_records(path, 50, t0 + timedelta(seconds=4990))) == 10
+
+
+def test_rotated_segments_gz_pruning_and_parallel(tmp_path, monkeypatch):
+    import gzip
+    from quantum_aeon_fluxor.utils import metrics_summary as ms
+
+    def rec(day, i):
+        return {"ts": f"2025-08-{day}T12:00:{i:02d}+00:00", "event": "embed:end", "duration_ms": float(day)}
+
+    write_stream(tmp_path, "ingest-20250813", [rec(13, i) for i in range(3)])
+    with gzip.open(tmp_path / "ingest-20250814.jsonl.gz", "wt") as f:
+        f.writelines(json.dumps(rec(14, i)) + "\n" for i in range(3))
+    write_stream(tmp_path, "ingest", [rec(15, i) for i in range(3)])
+    segments = ms.stream_segments(tmp_path, "ingest")
+    assert [day for _, day in segments] == ["20250813", "20250814", None]
+
+    out = run_cli(tmp_path).stdout
+    assert "count=9" in out and "3 segments" in out
+    # --since prunes the 13th by file name; the archive is filtered while read
+    out = run_cli(tmp_path, ["--since", "2025-08-14T12:00:01Z", "--last", "50"]).stdout
+    assert "count=5" in out and "2025-08-13" not in out
+
+    paths = [p for p, _ in segments]
+    serial = ms.scan_segments(paths, workers=1)
+    monkeypatch.setattr(ms, "PARALLEL_MIN_BYTES", 0)
+    parallel = ms.scan_segments(paths, workers=3)
+    assert parallel.buckets["embed:end"].summary() == serial.buckets["embed:end"].summary()
+    assert [r["duration_ms"] for r in ms.tail_segments(paths, 4)] == [14.0, 15.0, 15.0, 15.0]
+
+
 if __name__ == "__main__":  # pragma: no cover
     test_summary_basic()
     test_raw_mode()
@@ -0,0 +1,75 @@
+import json
+import multiprocessing as mp
+import os
+import threading
+
+import pytest
+
+from quantum_aeon_fluxor.utils import metrics
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_buffered_until_flush_and_ordered(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    for i in range(10):
+        metrics.log_event("unit", "tick", i=i)
+    with metrics.time_block("unit", "work"):
+        pass
+    metrics.flush()
+    events = _lines(tmp_path / "unit.jsonl")
+    assert [e["i"] for e in events[:10]] == list(range(10))
+    assert [e["event"] for e in events[10:]] == ["work:start", "work:end"]
+
+
+def test_record_captures_fields_at_call_time(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    collections = ["alpha"]
+    metrics.log_event("unit", "search", collections=collections)
+    collections.append("beta")  # mutated before the background flush
+    metrics.flush()
+    assert _lines(tmp_path / "unit.jsonl")[0]["collections"] == ["alpha"]
+
+
+def test_threads_and_rotation(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    monkeypatch.setenv("QAECORE_METRICS_ROTATE_DAILY", "1")
+
+    def worker(n):
+        for i in range(500):
+            metrics.log_event("unit", "tick", worker=n, i=i)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    metrics.flush()
+    (segment,) = tmp_path.glob("unit-*.jsonl")
+    events = _lines(segment)
+    assert len(events) == 2000
+    for n in range(4):  # per-thread order survives batching
+        assert [e["i"] for e in events if e["worker"] == n] == list(range(500))
+
+
+def _child_writes(n):
+    for i in range(2000):
+        metrics.log_event("shared", "tick", pid=os.getpid(), i=i, pad="x" * (n * 50))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_processes_append_whole_lines(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    metrics.log_event("shared", "parent_pending")  # must not be duplicated into the children
+    ctx = mp.get_context("fork")
+    procs = [ctx.Process(target=_child_writes, args=(n,)) for n in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    metrics.flush()
+    events = _lines(tmp_path / "shared.jsonl")  # every line parses: no torn writes
+    assert len(events) == 4 * 2000 + 1
+    assert sum(e["event"] == "parent_pending" for e in events) == 1
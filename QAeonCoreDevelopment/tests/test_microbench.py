@@ -0,0 +1,45 @@
+import json
+
+import microbench
+
+
+def _result(min_us, mad_us=0.0):
+    return {"min_us": min_us, "median_us": min_us, "mad_us": mad_us}
+
+
+def test_every_case_runs():
+    results = microbench.run(repeats=1, min_time=0.0)
+    assert set(results) == set(microbench.BENCHMARKS) >= {
+        "chunk_text", "sha256_text", "chunk_uuid", "ingest_payload", "detect_mode",
+        "compose_prompt", "log_event", "archon_state_save",
+    }
+    assert all(r["min_us"] > 0 and r["number"] >= 1 for r in results.values())
+
+
+def test_compare_is_noise_aware():
+    base = {
+        "steady": {**_result(100.0), "runs": [99.0, 100.0, 101.0]},
+        "noisy": {**_result(100.0), "runs": [70.0, 100.0, 130.0]},
+        "jittery": _result(100.0, mad_us=10.0),
+    }
+    current = {"steady": _result(120.0), "noisy": _result(120.0), "jittery": _result(80.0), "added": _result(5.0)}
+    rows = {r["name"]: r for r in microbench.compare(base, current)}
+    assert rows["steady"]["status"] == "slower" and rows["steady"]["change"] == 0.2
+    assert rows["noisy"]["status"] == "same"  # within 3x the between-run spread
+    assert rows["jittery"]["status"] == "same" and rows["jittery"]["limit"] > 0.2
+    assert rows["added"]["status"] == "new"
+    assert microbench.compare(base, {"steady": _result(80.0)})[0]["status"] == "faster"
+
+
+def test_save_and_gate(tmp_path, capsys):
+    args = ["-k", "sha256", "--repeats", "3", "--min-time", "0", "--baseline-dir", str(tmp_path)]
+    assert microbench.main(args + ["--save"]) == 0
+    assert microbench.main(args + ["--save"]) == 0
+    (path,) = tmp_path.glob("*.json")
+    saved = json.loads(path.read_text())
+    assert path.stem == microbench.machine_id() and len(saved["results"]["sha256_text"]["runs"]) == 2
+
+    saved["results"]["sha256_text"]["runs"] = [1e-4] * 3  # pretend the baseline was far faster
+    path.write_text(json.dumps(saved))
+    assert microbench.main(args) == 1
+    assert "Slower than baseline beyond noise: sha256_text" in capsys.readouterr().out
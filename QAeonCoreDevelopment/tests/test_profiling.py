@@ -0,0 +1,67 @@
+import json
+import pstats
+
+import pytest
+
+from quantum_aeon_fluxor.utils import metrics, profiling
+from quantum_aeon_fluxor.utils.metrics_summary import cli
+
+
+@pytest.fixture(autouse=True)
+def _env(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    for name in ("QAECORE_PROFILE", "QAECORE_PROFILE_EVERY", "QAECORE_PROFILE_DIR"):
+        monkeypatch.delenv(name, raising=False)
+    yield
+    monkeypatch.delenv("QAECORE_PROFILE", raising=False)
+    profiling.configure()
+
+
+def busy_compose(n=60_000):
+    parts = [str(i) * 3 for i in range(n)]  # allocations that are still live at region end
+    return parts, sum(len(p) for p in parts)
+
+
+def test_disabled_by_default(tmp_path):
+    assert profiling.configure() is False and profiling.profiled("ingest", "upsert") is profiling._NULL
+    with metrics.time_block("archon", "compose_prompt"):
+        busy_compose(1000)
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_profiles_selected_regions_every_nth_call(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("QAECORE_PROFILE_EVERY", "2")
+    monkeypatch.setenv("QAECORE_PROFILE_INTERVAL_MS", "1")
+    assert profiling.configure("archon.compose_prompt,ingest.upsert")
+    keep = []
+    for _ in range(4):
+        with metrics.time_block("archon", "compose_prompt"):
+            keep.append(busy_compose())
+        with metrics.time_block("archon", "state_save"):  # not selected
+            busy_compose(1000)
+    with profiling.profiled("ingest", "upsert"):
+        pass  # 1st call: not due
+    with profiling.profiled("ingest", "upsert") as cap:
+        assert cap is not None
+        busy_compose(20_000)
+
+    out = tmp_path / "profiles"
+    captures = sorted(p.name.rsplit("-", 3)[0] for p in out.glob("*.pstats"))
+    assert captures == ["archon.compose_prompt", "archon.compose_prompt", "ingest.upsert"]
+    first = sorted(out.glob("archon.compose_prompt-*.pstats"))[0]
+    stats = pstats.Stats(str(first)).stats
+    assert any(func == "busy_compose" for (_, _, func) in stats)
+    assert "busy_compose (tests/test_profiling.py" in first.with_suffix(".collapsed").read_text()
+    allocs = json.loads(first.with_name(first.stem + ".alloc.json").read_text())
+    assert allocs["peak_kb"] > 0 and any("test_profiling.py" in a["where"] for a in allocs["top"])
+
+    metrics.flush()
+    logged = [json.loads(line) for line in (tmp_path / "profile.jsonl").read_text().splitlines()]
+    assert [r["event"] for r in logged] == ["archon.compose_prompt"] * 2 + ["ingest.upsert"]
+
+    summary = profiling.summarize(out, ["archon"])
+    assert list(summary) == ["archon.compose_prompt"] and summary["archon.compose_prompt"]["captures"] == 2
+    cli(["profile", "--dir", str(out)])
+    text = capsys.readouterr().out
+    assert "archon.compose_prompt: 2 capture(s)" in text and "top allocators" in text
+    assert "(tests/test_profiling.py:" in text.split("top allocators")[0]  # the comprehension dominates self time
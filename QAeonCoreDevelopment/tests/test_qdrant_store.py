@@ -0,0 +1,118 @@
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    BinaryQuantization,
+    Disabled,
+    PointStruct,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarType,
+    SearchParams,
+)
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import (
+    COLLECTION_PROFILES,
+    create_collection,
+    get_profile,
+    reconfigure_collection,
+    search_params,
+)
+
+# (hnsw m, ef_construct, hnsw on_disk, vectors on_disk, quantization type)
+EXPECTED = {
+    "default": (16, 100, False, None, None),
+    "fast-ram": (32, 256, False, None, None),
+    "quantized": (16, 128, False, True, ScalarQuantization),
+    "disk-heavy": (16, 100, True, True, BinaryQuantization),
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # the embedded client keeps the collection but not its HNSW/quantization layout, so record
+    # what qdrant_store sends while still calling through to it
+    monkeypatch.delenv("QAECORE_LOCAL_COLLECTIONS", raising=False)
+    c = QdrantClient(":memory:")
+    c.sent = {}
+    for method in ("create_collection", "update_collection"):
+        real = getattr(c, method)
+
+        def record(*args, _real=real, _method=method, **kwargs):
+            c.sent[(_method, kwargs["collection_name"])] = kwargs
+            return _real(*args, **kwargs)
+
+        monkeypatch.setattr(c, method, record)
+    return c
+
+
+@pytest.mark.parametrize("profile", sorted(COLLECTION_PROFILES))
+def test_create_collection_applies_profile_layout(client, profile):
+    m, ef_construct, hnsw_on_disk, on_disk, quant = EXPECTED[profile]
+    create_collection(client, "c", 8, profile=profile)
+
+    sent = client.sent[("create_collection", "c")]
+    assert sent["vectors_config"].size == 8 and sent["vectors_config"].on_disk is on_disk
+    hnsw = sent["hnsw_config"]
+    assert (hnsw.m, hnsw.ef_construct, hnsw.on_disk) == (m, ef_construct, hnsw_on_disk)
+    if quant is None:
+        assert sent["quantization_config"] is None
+    else:
+        assert isinstance(sent["quantization_config"], quant)
+    if quant is ScalarQuantization:
+        assert sent["quantization_config"].scalar.type == ScalarType.INT8
+        assert sent["quantization_config"].scalar.always_ram is True
+
+    params = client.get_collection("c").config.params.vectors
+    assert params.size == 8 and params.on_disk is on_disk
+
+
+def test_create_collection_recreate_drops_existing(client):
+    create_collection(client, "c", 4)
+    client.upsert("c", points=[PointStruct(id=1, vector=[1.0, 0.0, 0.0, 0.0])])
+    create_collection(client, "c", 4, profile="quantized", recreate=True)
+    assert client.count("c").count == 0
+    assert client.get_collection("c").config.params.vectors.on_disk is True
+
+
+def test_reconfigure_collection_switches_and_reverts(client):
+    create_collection(client, "c", 4)
+    reconfigure_collection(client, "c", "disk-heavy")
+    sent = client.sent[("update_collection", "c")]
+    assert sent["vectors_config"][""].on_disk is True
+    assert sent["hnsw_config"].on_disk is True
+    assert isinstance(sent["quantization_config"], BinaryQuantization)
+
+    # going back to a profile without quantization disables it explicitly
+    reconfigure_collection(client, "c", "fast-ram")
+    sent = client.sent[("update_collection", "c")]
+    assert sent["vectors_config"][""].on_disk is False
+    assert (sent["hnsw_config"].m, sent["hnsw_config"].ef_construct, sent["hnsw_config"].on_disk) == (32, 256, False)
+    assert sent["quantization_config"] == Disabled.DISABLED
+
+
+def test_reconfigure_rejects_local_collections(client, monkeypatch):
+    monkeypatch.setenv("QAECORE_LOCAL_COLLECTIONS", "notes")
+    with pytest.raises(ValueError):
+        reconfigure_collection(client, "notes", "quantized")
+
+
+def test_search_params_from_profile_and_overrides():
+    assert search_params() is None
+    assert search_params("fast-ram") == SearchParams(hnsw_ef=128, exact=False)
+    assert search_params("quantized") == SearchParams(
+        hnsw_ef=128, exact=False, quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+    )
+    assert search_params("disk-heavy") == SearchParams(
+        hnsw_ef=64, exact=False, quantization=QuantizationSearchParams(rescore=True, oversampling=3.0)
+    )
+    # explicit values win over the profile defaults
+    assert search_params("disk-heavy", hnsw_ef=256, rescore=False, oversampling=1.5) == SearchParams(
+        hnsw_ef=256, exact=False, quantization=QuantizationSearchParams(rescore=False, oversampling=1.5)
+    )
+    assert search_params(exact=True) == SearchParams(hnsw_ef=None, exact=True)
+
+
+def test_unknown_profile_is_rejected():
+    assert get_profile(None) is COLLECTION_PROFILES["default"]
+    with pytest.raises(ValueError, match="Choose from"):
+        get_profile("turbo")
@@ -0,0 +1,58 @@
+import json
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding.query_cache import (
+    QueryEmbeddingCache,
+    embed_queries,
+    embed_query,
+)
+from quantum_aeon_fluxor.utils import metrics
+
+
+class _CountingEmbedder:
+    model = "fake-embed"
+    dim = 3
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_texts(self, texts):
+        self.calls += len(texts)
+        return [[float(len(t)), 1.0, 0.0] for t in texts]
+
+
+def test_repeat_queries_hit_cache_and_log_hit_rate(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    emb, cache = _CountingEmbedder(), QueryEmbeddingCache(max_entries=2)
+    v1 = embed_query("hermetic  principles", emb, cache)
+    v2 = embed_query(" hermetic principles ", emb, cache)  # same after normalization
+    assert v1 == v2 and emb.calls == 1
+    embed_query("a", emb, cache)
+    embed_query("b", emb, cache)  # evicts the least recently used entry
+    embed_query("hermetic principles", emb, cache)
+    assert emb.calls == 4
+    metrics.flush()
+    events = [json.loads(line) for line in (tmp_path / "retrieval.jsonl").read_text().splitlines()]
+    assert [e["cache"] for e in events] == ["miss", "hit", "miss", "miss", "miss"]
+    assert events[1]["hit_rate"] == 0.5
+
+
+def test_disk_tier_survives_restart_and_ttl(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    db = tmp_path / "q.sqlite"
+    emb = _CountingEmbedder()
+    embed_query("query", emb, QueryEmbeddingCache(path=db))
+    assert embed_query("query", emb, QueryEmbeddingCache(path=db)) == [5.0, 1.0, 0.0]
+    assert emb.calls == 1
+    embed_query("query", emb, QueryEmbeddingCache(path=db, ttl_s=-1))
+    assert emb.calls == 2
+
+
+def test_counters_are_exact_under_concurrent_lookups(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    emb, cache = _CountingEmbedder(), QueryEmbeddingCache(max_entries=16)
+    embed_query("warm", emb, cache)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: embed_queries(["warm", "warm"], emb, cache), range(400)))
+    assert cache.hits + cache.misses == 1 + 800 and cache.hits == 800
@@ -0,0 +1,81 @@
+from pathlib import Path
+import tempfile
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.rescore import rescore_hits
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.vector_cache import VectorCache
+
+
+class _Hit:
+    def __init__(self, id, score, payload):
+        self.id, self.score, self.payload = id, score, payload
+
+
+def test_vector_cache_roundtrip_latest_wins():
+    with tempfile.TemporaryDirectory() as d:
+        cache = VectorCache("coll", root=Path(d))
+        cache.put([1, 2], [[1.0, 0.0], [0.0, 1.0]])
+        cache.put([1], [[0.5, 0.5]])
+        # a fresh instance (another process) sees the same data
+        found, mat = VectorCache("coll", root=Path(d)).get([2, 1, 3])
+        assert found == [2, 1]
+        assert np.allclose(mat, [[0.0, 1.0], [0.5, 0.5]])
+
+
+def test_rescore_reorders_and_backfills_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    client = QdrantClient(":memory:")
+    client.create_collection("c", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    client.upsert("c", points=[
+        PointStruct(id=1, vector=[1.0, 0.0], payload={"name": "east"}),
+        PointStruct(id=2, vector=[0.0, 1.0], payload={"name": "north"}),
+        PointStruct(id=3, vector=[0.7, 0.7], payload={"name": "north-east"}),
+    ])
+    # first-stage scores deliberately wrong (as from a coarse quantized index)
+    hits = [_Hit(1, 0.9, {"name": "east"}), _Hit(2, 0.8, {"name": "north"}), _Hit(3, 0.1, {"name": "north-east"})]
+    cache = VectorCache("c", root=tmp_path / "vc")
+    out = rescore_hits(client, "c", [0.0, 1.0], hits, k=2, cache=cache)
+    assert [p["name"] for _, _, p in out] == ["north", "north-east"]
+    assert out[0][0] > 0.99
+    # vectors fetched from Qdrant are now served locally
+    found, _ = cache.get([1, 2, 3])
+    assert sorted(found) == [1, 2, 3]
+
+
+def _put_many(root, offset):
+    cache = VectorCache("coll", root=Path(root))
+    for i in range(offset, offset + 400):
+        cache.put([i], [[float(i), 1.0]])
+
+
+def test_vector_cache_concurrent_writers_stay_aligned(tmp_path):
+    import multiprocessing
+
+    procs = [multiprocessing.Process(target=_put_many, args=(str(tmp_path), off)) for off in (0, 100_000)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    cache = VectorCache("coll", root=tmp_path)
+    ids = list(range(400)) + list(range(100_000, 100_400))
+    found, mat = cache.get(ids)
+    assert len(found) == 800
+    assert np.allclose(mat[:, 0], [float(i) for i in found])  # every row still belongs to its id
+
+
+def test_vector_cache_compact_and_clear(tmp_path):
+    cache = VectorCache("coll", root=tmp_path)
+    cache.put([1, 2], [[1.0, 0.0], [0.0, 1.0]])
+    cache.put([1], [[0.5, 0.5]])
+    assert cache.compact() == 1 and cache.compact() == 0
+    found, mat = VectorCache("coll", root=tmp_path).get([1, 2])
+    assert found == [1, 2] and np.allclose(mat, [[0.5, 0.5], [0.0, 1.0]])
+    assert (tmp_path / "coll.f32").stat().st_size == 2 * 2 * 4
+
+    cache.clear()
+    assert len(cache) == 0 and cache.get([1])[0] == []
+    cache.put([7], [[1.0, 2.0, 3.0]])  # a recreated collection may use another dim
+    assert VectorCache("coll", root=tmp_path).dim == 3
@@ -0,0 +1,77 @@
+import pytest
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.response_cache import (
+    ReplayMiss,
+    ResponseCache,
+    request_key,
+)
+
+
+class _FakeModel:
+    model_name = "models/fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    def answer(self, prompt):
+        self.calls += 1
+        return f"answer to {prompt} #{self.calls}"
+
+
+def test_key_depends_on_model_config_and_prompt():
+    base = request_key("m", "p", {"temperature": 0.7})
+    assert base == request_key("m", "p", {"temperature": 0.7})
+    assert base != request_key("m2", "p", {"temperature": 0.7})
+    assert base != request_key("m", "p", {"temperature": 0.8})
+    assert base != request_key("m", "p2", {"temperature": 0.7})
+
+
+def test_record_then_replay_offline(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    db = tmp_path / "rc.sqlite"
+    model = _FakeModel()
+    rec = ResponseCache(db, mode="record")
+    first = rec.generate("m", "p", lambda: model.answer("p"), {"t": 1})
+    assert rec.generate("m", "p", lambda: model.answer("p"), {"t": 1}) == first
+    assert model.calls == 1
+
+    replay = ResponseCache(db, mode="replay")
+    assert replay.generate("m", "p", lambda: model.answer("p"), {"t": 1}) == first
+    with pytest.raises(ReplayMiss):
+        replay.generate("m", "other", lambda: model.answer("other"))
+    assert model.calls == 1
+
+    off = ResponseCache(db, mode="off")
+    off.generate("m", "p", lambda: model.answer("p"), {"t": 1})
+    assert model.calls == 2
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    cache = ResponseCache(tmp_path / "rc.sqlite", mode="record")
+    for p in ("a", "b", "c"):
+        cache.generate("m", p, lambda p=p: p * 40)
+    cache.max_bytes = cache.stats()["bytes"]  # full: the next entry forces an eviction
+    cache.get(request_key("m", "a"))  # a is now more recent than b
+    cache.generate("m", "d", lambda: "d" * 40)
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    assert cache.get(request_key("m", "a")) is not None
+    assert cache.get(request_key("m", "b")) is None
+    assert cache.get(request_key("m", "d")) is not None
+
+
+def test_interface_replay_miss_fails_instead_of_answering(tmp_path, monkeypatch):
+    from quantum_aeon_fluxor import qacore_gemini_integration as integration
+    from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini import response_cache
+
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    monkeypatch.setattr(response_cache, "_default", ResponseCache(tmp_path / "rc.sqlite", mode="replay"))
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    model = _FakeModel()
+    model.generate_content = lambda prompt, **kw: pytest.fail("replay must not call the model")
+    iface = integration.QAeCoreGeminiInterface()
+    iface.model = model
+    with pytest.raises(ReplayMiss):
+        iface.consciousness_inquiry("consciousness", "never recorded?")
+    with pytest.raises(ReplayMiss):
+        iface.eonic_scrutiny("an unrecorded phenomenon")
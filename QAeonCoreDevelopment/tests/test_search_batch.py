@@ -0,0 +1,66 @@
+import io
+import json
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.embedding import query_cache
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.qdrant_store import upsert_chunks
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.retrieval.search_cli import run_batch
+
+
+class _AxisEmbedder:
+    """Maps a query to a one-hot axis by keyword; counts embedding requests."""
+    model = "fake-embed"
+    dim = 3
+    axes = {"fire": 0, "water": 1, "air": 2}
+
+    def __init__(self):
+        self.requests = 0
+
+    def embed_texts(self, texts):
+        self.requests += 1
+        return [[1.0 if i == self.axes.get(t.split()[0], 2) else 0.0 for i in range(3)] for t in texts]
+
+
+def test_batch_streams_jsonl_in_input_order(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    monkeypatch.setenv("QAECORE_LOCAL_COLLECTIONS", "*")
+    monkeypatch.setenv("QAECORE_LOCAL_INDEX_DIR", str(tmp_path / "idx"))
+    emb = _AxisEmbedder()
+    monkeypatch.setattr(query_cache, "_default_embedder", emb)
+    monkeypatch.setattr(query_cache, "_default_cache", query_cache.QueryEmbeddingCache())
+    for coll in ("a", "b"):
+        upsert_chunks(None, coll, [[1, 0, 0], [0, 1, 0]], [{"text": f"{coll}-fire"}, {"text": f"{coll}-water"}],
+                      ids=["1", "2"])
+
+    src = io.StringIO('water please\n\n{"id": "q2", "query": "fire"}\nwater please\n')
+    out = io.StringIO()
+    totals = run_batch(src, out, ["a", "b"], k=1, embed_batch=8, workers=4)
+
+    recs = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert totals == {"queries": 3, "errors": 0}
+    assert [(r["id"], r["collection"]) for r in recs] == [("1", "a"), ("1", "b"), ("q2", "a"), ("q2", "b"), ("3", "a"), ("3", "b")]
+    assert [r["results"][0]["text"] for r in recs[:4]] == ["a-water", "b-water", "a-fire", "b-fire"]
+    assert all("latency_ms" in r for r in recs)
+    assert emb.requests == 1  # one embedding request for the whole chunk, duplicate query embedded once
+
+
+def test_failed_embedding_request_only_fails_its_chunk(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    monkeypatch.setenv("QAECORE_LOCAL_COLLECTIONS", "*")
+    monkeypatch.setenv("QAECORE_LOCAL_INDEX_DIR", str(tmp_path / "idx"))
+
+    class _Throttled(_AxisEmbedder):
+        def embed_texts(self, texts):
+            if "air" in texts:
+                raise RuntimeError("429 quota exceeded")
+            return super().embed_texts(texts)
+
+    monkeypatch.setattr(query_cache, "_default_embedder", _Throttled())
+    monkeypatch.setattr(query_cache, "_default_cache", query_cache.QueryEmbeddingCache())
+    upsert_chunks(None, "a", [[1, 0, 0], [0, 1, 0]], [{"text": "fire"}, {"text": "water"}], ids=["1", "2"])
+
+    out = io.StringIO()
+    totals = run_batch(io.StringIO("fire\nair\nwater\n"), out, ["a"], k=1, embed_batch=1)
+    recs = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert totals == {"queries": 3, "errors": 1}
+    assert [r["query"] for r in recs] == ["fire", "air", "water"]
+    assert "429" in recs[1]["error"] and recs[2]["results"][0]["text"] == "water"
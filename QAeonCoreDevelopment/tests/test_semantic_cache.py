@@ -0,0 +1,75 @@
+import json
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.conduits__clients.Gemini.semantic_cache import (
+    SemanticResponseCache,
+    split_prompt,
+)
+from quantum_aeon_fluxor.utils import metrics
+
+
+def _embed(text):
+    # bag of known words -> deterministic vector; paraphrases with the same words match
+    vocab = ["heat", "death", "meaning", "entropy", "universe", "virtue"]
+    words = text.lower().split()
+    return [float(sum(w.startswith(v) for w in words)) for v in vocab]
+
+
+def _prompt(question, mode="SOCRATIC", ctx="- [0.9] a.md :: x"):
+    return f"persona\n\n[Mode: {mode}]\n\n{question}\n\n=== Context ===\n{ctx}\n=== End Context ==="
+
+
+def test_split_prompt_extracts_mode_and_context():
+    mode, ctx_hash, text = split_prompt(_prompt("why?"))
+    assert mode == "SOCRATIC" and ctx_hash and "Context" not in text
+
+
+def test_hit_requires_similarity_mode_and_context(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    cache = SemanticResponseCache(_embed, path=tmp_path / "sc.sqlite", threshold=0.9)
+    q = "heat death and meaning of the universe"
+    assert cache.lookup("m", _prompt(q), text=q)[0] is None
+    cache.store("m", _prompt(q), "answer", latency_ms=35000.0, text=q)
+
+    para = "the meaning of universe heat death"
+    assert cache.lookup("m", _prompt(para), text=para)[0] == "answer"
+    assert cache.lookup("m", _prompt(para, mode="DIALECTIC"), text=para)[0] is None
+    assert cache.lookup("m", _prompt(para, ctx="- other"), text=para)[0] is None
+    assert cache.lookup("m", _prompt("virtue"), text="virtue")[0] is None
+    # persisted: a new process sees the entry
+    assert SemanticResponseCache(_embed, path=tmp_path / "sc.sqlite", threshold=0.9).lookup(
+        "m", _prompt(q), text=q)[0] == "answer"
+
+    metrics.flush()
+    events = [json.loads(line) for line in (tmp_path / "gemini.jsonl").read_text().splitlines()]
+    hits = [e for e in events if e.get("result") == "hit"]
+    assert hits and hits[0]["saved_ms"] > 30000
+
+
+def test_ttl_and_size_eviction(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    cache = SemanticResponseCache(_embed, path=tmp_path / "sc.sqlite", threshold=0.9, max_entries=2)
+    for i, q in enumerate(["heat", "entropy", "virtue"]):
+        cache.store("m", _prompt(q), f"r{i}", latency_ms=1.0, text=q)
+    assert len(cache) == 2
+    assert cache.lookup("m", _prompt("heat"), text="heat")[0] is None  # least recently used, evicted
+    expired = SemanticResponseCache(_embed, path=tmp_path / "sc.sqlite", threshold=0.9, ttl_s=-1)
+    assert expired.lookup("m", _prompt("virtue"), text="virtue")[0] is None
+
+
+def test_follow_up_does_not_cross_conversations_or_pinned_docs(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    cache = SemanticResponseCache(_embed, path=tmp_path / "sc.sqlite", threshold=0.9)
+    q = "and the heat death one?"
+
+    def turn(history, persona="persona", digest=""):
+        digest_block = f"\n\n=== Conversation Digest ===\n{digest}\n=== End Conversation Digest ===" if digest else ""
+        return (_prompt(q).replace("persona", persona, 1) + digest_block
+                + f"\n\n=== Recent Conversation ===\n{history}\n=== End Recent Conversation ===")
+
+    cache.store("m", turn("Volkh: list entropy myths"), "answer A", latency_ms=1.0, text=q)
+    assert cache.lookup("m", turn("Volkh: list entropy myths"), text=q)[0] == "answer A"
+    assert cache.lookup("m", turn("Volkh: list cosmology books"), text=q)[0] is None
+    assert cache.lookup("m", turn("Volkh: list entropy myths", digest="earlier"), text=q)[0] is None
+    assert cache.lookup("m", turn("Volkh: list entropy myths", persona="edited pinned doc"), text=q)[0] is None
+    _, _, text = split_prompt(turn("Volkh: list entropy myths"))
+    assert "Recent Conversation" not in text and "persona" not in text
@@ -0,0 +1,97 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from quantum_aeon_fluxor.utils import metrics, tracing
+from quantum_aeon_fluxor.utils.metrics_summary import cli
+
+
+@pytest.fixture(autouse=True)
+def _metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    monkeypatch.delenv("QAECORE_TRACE_OTLP_ENDPOINT", raising=False)
+
+
+def _lines(path):
+    metrics.flush()
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_spans_nest_across_threads_and_tag_events(tmp_path):
+    pool = ThreadPoolExecutor(max_workers=1)
+
+    def lexical():
+        with tracing.span("retrieval.lexical"):
+            pass
+
+    def unbound():
+        with tracing.span("lost"):  # plain pool submit: no active trace in the worker
+            return tracing.current_span()
+
+    async def turn():
+        with tracing.span("archon.turn", root=True) as root:
+            await asyncio.to_thread(metrics.log_event, "gemini", "query", duration_ms=1.0)
+            pool.submit(tracing.bind(lexical)).result()
+            assert pool.submit(unbound).result() is None
+            with metrics.time_block("archon", "compose_prompt"):
+                pass
+            return root
+
+    root = asyncio.run(turn())
+    with tracing.span("no_trace") as sp:  # outside a trace spans are no-ops
+        assert sp is None
+
+    spans = {s["event"]: s for s in tracing.last_trace()}
+    assert set(spans) == {"archon.turn", "retrieval.lexical", "archon.compose_prompt"}
+    assert spans["archon.turn"]["parent_id"] is None
+    assert spans["retrieval.lexical"]["parent_id"] == root.span_id
+    assert {s["trace_id"] for s in spans.values()} == {root.trace_id}
+
+    (query,) = _lines(tmp_path / "gemini.jsonl")
+    assert (query["trace_id"], query["span_id"]) == (root.trace_id, root.span_id)
+    compose_end = _lines(tmp_path / "archon.jsonl")[-1]
+    assert compose_end["span_id"] == spans["archon.compose_prompt"]["span_id"]
+    assert len(_lines(tmp_path / "trace.jsonl")) == 3
+
+
+def test_error_status_and_disable(monkeypatch):
+    with pytest.raises(ValueError):
+        with tracing.span("archon.turn", root=True):
+            with tracing.span("qdrant.search"):
+                raise ValueError("boom")
+    spans = {s["event"]: s for s in tracing.last_trace()}
+    assert spans["qdrant.search"]["status"] == "error" and "boom" in spans["qdrant.search"]["error"]
+
+    monkeypatch.setenv("QAECORE_TRACING", "0")
+    with tracing.span("archon.turn", root=True) as sp:
+        assert sp is None
+
+
+def test_waterfall_otlp_and_cli(tmp_path, capsys):
+    with tracing.span("archon.turn", root=True, chars=5):
+        with tracing.span("archon.retrieve"):
+            with tracing.span("embed.gemini", texts=1):
+                pass
+        with tracing.span("gemini.query"):
+            pass
+    spans = tracing.last_trace()
+    text = tracing.format_waterfall(spans, width=20)
+    lines = text.splitlines()
+    assert lines[0].startswith(f"trace {spans[0]['trace_id']}")
+    assert [ln.split()[0] for ln in lines[2:]] == ["archon.turn", "archon.retrieve", "embed.gemini", "gemini.query"]
+    assert lines[4].startswith("    embed.gemini") and "texts=1" in lines[4]
+
+    otlp = tracing.to_otlp([spans])
+    out = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root = next(s for s in out if s["name"] == "archon.turn")
+    assert "parentSpanId" not in root and {"key": "chars", "value": {"intValue": "5"}} in root["attributes"]
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+
+    metrics.flush()
+    cli(["trace", "--dir", str(tmp_path)])
+    assert "embed.gemini" in capsys.readouterr().out
+    cli(["trace", "--dir", str(tmp_path), "--otlp", str(tmp_path / "otlp.json")])
+    exported = json.loads((tmp_path / "otlp.json").read_text())
+    assert len(exported["resourceSpans"][0]["scopeSpans"][0]["spans"]) == 4
@@ -0,0 +1,98 @@
+import json
+import threading
+
+from quantum_aeon_fluxor.hermetic_engine__persistent_data.write_behind import WriteBehindQueue
+from quantum_aeon_fluxor.utils import metrics
+
+
+def test_batched_ordered_delivery_and_coalescing(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    seen = {"log": [], "state": []}
+    q = WriteBehindQueue(tmp_path / "wb", linger_ms=20)
+    q.register("log", lambda batch: seen["log"].extend(a["n"] for a in batch))
+    q.register("state", lambda batch: seen["state"].append([a["v"] for a in batch]), coalesce=True)
+    q.start()
+    for i in range(5):
+        q.enqueue("log", n=i)
+        q.enqueue("state", v=i)
+    assert q.flush(timeout=5)
+    assert seen["log"] == [0, 1, 2, 3, 4]
+    assert seen["state"][-1] == [4] and all(len(b) == 1 for b in seen["state"])
+    # drained: spool truncated, ack records the last delivered seq
+    assert (tmp_path / "wb" / "spool.jsonl").read_text() == ""
+    assert (tmp_path / "wb" / "spool.ack").read_text() == "10"
+    q.close()
+
+
+def test_replays_unacknowledged_spool_after_crash(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    spool = tmp_path / "wb"
+    spool.mkdir()
+    # a previous process acked seq 1 and died before delivering 2 and 3 (last line torn)
+    ops = [{"seq": i, "kind": "log", "args": {"n": i}} for i in (1, 2, 3)]
+    (spool / "spool.jsonl").write_text("".join(json.dumps(o) + "\n" for o in ops) + '{"seq": 4, "ki')
+    (spool / "spool.ack").write_text("1")
+
+    got = []
+    q = WriteBehindQueue(spool, linger_ms=0)
+    q.register("log", lambda batch: got.extend(a["n"] for a in batch))
+    q.start()
+    assert q.flush(timeout=5)
+    assert got == [2, 3]
+    assert q.enqueue("log", n=99) == 4  # numbering continues past the replayed ops
+    assert q.flush(timeout=5) and got == [2, 3, 99]
+    assert (spool / "spool.jsonl").read_text() == ""
+    q.close()
+
+
+def test_failing_handler_is_dead_lettered_without_blocking(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    ok = []
+
+    def _broken(batch):
+        raise OSError("disk full")
+
+    q = WriteBehindQueue(tmp_path / "wb", linger_ms=0, max_attempts=2, backoff_s=0.01)
+    q.register("embed", _broken)
+    q.register("log", lambda batch: ok.extend(a["n"] for a in batch))
+    q.start()
+    q.enqueue("embed", text="x")
+    q.enqueue("log", n=1)
+    assert q.flush(timeout=5)
+    assert ok == [1]
+    dead = [json.loads(line) for line in (tmp_path / "wb" / "dead.jsonl").read_text().splitlines()]
+    assert [d["kind"] for d in dead] == ["embed"]
+    metrics.flush()
+    errors = [json.loads(line) for line in (tmp_path / "archon.jsonl").read_text().splitlines()
+              if '"write_behind_error"' in line]
+    assert len(errors) == 2
+    q.close()
+
+
+def test_concurrent_queues_get_separate_spools(tmp_path, monkeypatch):
+    monkeypatch.setenv("QAECORE_METRICS_DIR", str(tmp_path))
+    first_seen, second_seen = [], []
+    release = threading.Event()
+    first = WriteBehindQueue(tmp_path / "wb", linger_ms=0)
+    first.register("log", lambda batch: (release.wait(5), first_seen.extend(a["n"] for a in batch)))
+    second = WriteBehindQueue(tmp_path / "wb", linger_ms=0)
+    second.register("log", lambda batch: second_seen.extend(a["n"] for a in batch))
+    first.start()
+    second.start()  # e.g. a second REPL from the same directory
+    assert first.spool_file == tmp_path / "wb" / "spool.jsonl"
+    assert second.spool_file == tmp_path / "wb" / "slot-1" / "spool.jsonl"
+
+    first.enqueue("log", n=1)
+    second.enqueue("log", n=2)
+    assert second.flush(timeout=5) and second_seen == [2]
+    assert (tmp_path / "wb" / "slot-1" / "spool.ack").read_text() == "1"
+    release.set()
+    assert first.flush(timeout=5) and first_seen == [1]
+    second.close()
+    first.close()
+
+    # the base spool is free again for the next process
+    third = WriteBehindQueue(tmp_path / "wb", linger_ms=0)
+    third.register("log", lambda batch: None)
+    assert third.start().spool_file == tmp_path / "wb" / "spool.jsonl"
+    third.close()